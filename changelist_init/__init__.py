@@ -1,40 +1,299 @@
 """ CL-INIT Main Package Methods.
  Author: DK96-OS 2024 - 2025
 """
+import dataclasses
+import threading
+from pathlib import Path
+from typing import Generator
+
+from changelist_data import load_storage
+from changelist_data.file_change import FileChange
 from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
 from changelist_data.storage.storage_type import StorageType
 
-from changelist_init.data import merge_file_changes
-from changelist_init.git import generate_file_changes
+from changelist_init import watch
+from changelist_init.state_file import file_signature
+from changelist_init.data import merge_file_changes, status_fingerprint, fc_to_cl_map, sync_baseline, \
+    set_truncation_note, route_staged_file_changes, changelist_index
+from changelist_init.git import generate_file_changes, git_dir, autotune_status_profile, status_profile, \
+    status_collector, status_change_mapping, GitStatusLists, GitTrackingStatus, StatusOptions
 from changelist_init.input.input_data import InputData
+from changelist_init.watch.watch_changes import WatchChanges
+
+
+# The seconds between checks of the watch stop Event.
+_STOP_CHECK_INTERVAL = 1.0
+
+# The number of changed paths above which an update runs on the whole input scope.
+_MAX_SCOPE_PATHS = 1000
 
 
 def process_cl_init(input_data: InputData):
     """ The Changelist Init Process.
+ - Skips the merge and write when the Status matches the one already merged into the Storage file.
+ - A scope limits both the Git Status and the merge to the files under the given paths.
+ - In incremental mode, only the paths whose FileChanges differ from the last merge are patched into the Changelists.
+ - While the Storage file is unchanged since the last run, a persisted index of the Changelist of each path is patched instead of being rebuilt.
+ - In a git hook, only the paths that the hook event may have changed are updated.
+ - With a staged changelist, fully staged files are routed to it after the merge, classified in the same Status pass.
+ - In watch mode, the Storage file is then kept up to date until the process is interrupted.
+
+**Parameters:**
+ - input_data (InputData): The Changelist Init input data.
+    """
+    if input_data.hook is None:
+        _update_storage_file(input_data)
+    elif (hook_input := _get_hook_input(input_data)).scope is None or len(hook_input.scope) > 0:
+        _update_storage_file(hook_input)
+    if input_data.watch:
+        try:
+            watch_cl_init(input_data)
+        except KeyboardInterrupt:
+            pass
+
+
+def autotune_cl_init(input_data: InputData):
+    """ Tune the Git Status options of the Repository, and print the profile that later runs will use.
+
+**Parameters:**
+ - input_data (InputData): The Changelist Init input data. Untracked file collection is tuned when included.
+    """
+    if (result := autotune_status_profile(input_data.include_untracked, write_index=input_data.write_index)) is None:
+        exit("Autotune requires a Git Repository.")
+    print(f"Default Git Status: {result.default_seconds:.3f}s")
+    print(f"Tuned Git Status: {result.seconds:.3f}s")
+    print(f"Status Profile: {status_profile.describe_profile(result.profile)}")
+
+
+def watch_cl_init(
+    input_data: InputData,
+    stop_event: threading.Event | None = None,
+):
+    """ Keep the Storage file up to date with changes to the Worktree.
+ - Bursts of events are combined, then only the changed paths are updated with a scoped Git Status and merge.
+ - Changes to the Git Index or HEAD update every path in the input scope.
+ - The Storage file is written only when the merge changed its Changelists, as reported by the dirty flag of each.
+ - The Storage file is read again when another program has written to it.
 
 **Parameters:**
  - input_data (InputData): The Changelist Init input data.
+ - stop_event (threading.Event?): An Event that ends the watch when set. Default: None, watch until interrupted.
     """
-    init_storage(
-        storage=input_data.storage,
-        include_untracked=input_data.include_untracked,
+    if (repo_git_dir := git_dir.find_git_dir()) is None or (root := git_dir.find_worktree_root()) is None:
+        exit("Watch mode requires a Git Repository.")
+    storage = input_data.storage
+    storage_path = git_dir.get_root_relative_path(str(storage.update_path), root)
+    storage_signature = file_signature(storage.update_path)
+    with watch.create_watcher(root, repo_git_dir) as watcher:
+        while stop_event is None or not stop_event.is_set():
+            if (changes := watch.wait_for_changes(watcher, timeout=_STOP_CHECK_INTERVAL)) is None:
+                continue
+            if (scope := _get_watch_scope(changes, storage_path, input_data.scope)) is not None and len(scope) == 0:
+                continue
+            if file_signature(storage.update_path) != storage_signature:
+                storage = load_storage(storage.storage_type, storage.update_path)
+            status_lists = None if input_data.staged_changelist is None else GitStatusLists()
+            files = list(_generate_input_file_changes(
+                input_data, scope, changes.full_refresh, truncations := [], status_lists=status_lists,
+            ))
+            deltas = merge_file_changes(storage, files, scope, remove=len(truncations) == 0)
+            routed = _route_staged_file_changes(
+                storage, input_data.staged_changelist, _get_staged_paths(status_lists), scope, len(truncations) > 0,
+            )
+            if _update_truncation_note(storage, truncations, scope) or routed or any(delta.dirty for delta in deltas):
+                _write_storage(storage)
+            storage_signature = file_signature(storage.update_path)
+
+
+def _get_hook_input(input_data: InputData) -> InputData:
+    """ Limit the input scope to the paths changed by the hook event. The status cache is not used for these paths.
+    """
+    from changelist_init import hooks
+    if (paths := hooks.get_hook_paths(input_data.hook[0], input_data.hook[1:])) is None or len(paths) > _MAX_SCOPE_PATHS:
+        return input_data
+    return dataclasses.replace(
+        input_data,
+        scope=[path for path in paths if fc_to_cl_map.is_path_in_scope(path, input_data.scope)],
+        use_status_cache=False,
+        incremental=False,
     )
-    _write_storage(input_data.storage)
+
+
+def _get_watch_scope(
+    changes: WatchChanges,
+    storage_path: str | None,
+    input_scope: list[str] | None,
+) -> list[str] | None:
+    """ Determine the scope of an update, from the changed paths within the input scope.
+ - Returns the input scope for a full refresh, and an empty list when no relevant path changed.
+    """
+    if changes.full_refresh or len(changes.paths) > _MAX_SCOPE_PATHS:
+        return input_scope
+    return sorted(
+        path for path in changes.paths
+        if path != storage_path and fc_to_cl_map.is_path_in_scope(path, input_scope)
+    )
+
+
+def _generate_input_file_changes(
+    input_data: InputData,
+    scope: list[str] | None,
+    use_cache: bool = True,
+    truncations: list[str] | None = None,
+    summaries: list[str] | None = None,
+    status_lists: GitStatusLists | None = None,
+) -> Generator[FileChange, None, None]:
+    return generate_file_changes(
+        input_data.include_untracked,
+        StatusOptions(
+            time_budget=input_data.time_budget,
+            use_cache=use_cache and input_data.use_status_cache,
+            use_index_reader=input_data.use_index_reader,
+            workers=input_data.workers,
+            concurrent_untracked=input_data.concurrent_untracked,
+            status_shards=input_data.status_shards,
+            shard_paths=input_data.shard_paths,
+            scope=scope,
+            incremental=input_data.incremental,
+            fsmonitor=input_data.fsmonitor,
+            write_index=input_data.write_index,
+            collapse_untracked=input_data.collapse_untracked,
+            expand_untracked=input_data.expand_untracked,
+            max_files=input_data.max_files,
+            path_errors=input_data.path_errors,
+            parse_processes=input_data.parse_processes,
+        ),
+        on_truncated=None if truncations is None else lambda truncation: truncations.append(
+            status_collector.describe_truncation(truncation)
+        ),
+        on_summary=None if summaries is None else lambda summary: summaries.append(
+            status_change_mapping.describe_status_summary(summary)
+        ),
+        status_lists=status_lists,
+    )
+
+
+def _get_staged_paths(
+    status_lists: GitStatusLists | None,
+) -> set[str]:
+    if status_lists is None:
+        return set()
+    return status_change_mapping.get_change_paths(status_lists.get_table(GitTrackingStatus.STAGED))
+
+
+def _route_staged_file_changes(
+    storage: ChangelistDataStorage,
+    staged_changelist: str | None,
+    staged_paths: set[str],
+    scope: list[str] | None,
+    truncated: bool = False,
+) -> bool:
+    """ Route the fully staged files to the staged Changelist, when one is named. Returns whether a file was moved.
+ - After a truncated update, files are not moved out of the staged Changelist, as their status may be beyond the limit.
+    """
+    if staged_changelist is None:
+        return False
+    return route_staged_file_changes(storage, staged_paths, staged_changelist, [] if truncated else scope)
+
+
+def _update_truncation_note(
+    storage: ChangelistDataStorage,
+    truncations: list[str],
+    scope: list[str] | None,
+) -> bool:
+    """ Add the note of a truncated update to the Default Changelist. Only an update of every path removes the note.
+ - Returns whether the comment was changed.
+    """
+    if len(truncations) > 0:
+        return set_truncation_note(storage, truncations[-1])
+    if scope is None:
+        return set_truncation_note(storage, None)
+    return False
+
+
+def _update_storage_file(input_data: InputData):
+    truncations, summaries = [], []
+    status_lists = None if input_data.staged_changelist is None else GitStatusLists()
+    files = list(_generate_input_file_changes(
+        input_data, input_data.scope, truncations=truncations, summaries=summaries if input_data.summary else None,
+        status_lists=status_lists,
+    ))
+    for summary in summaries:
+        print(f"Git Status: {summary}")
+    staged_paths = _get_staged_paths(status_lists)
+    fingerprint = status_fingerprint.compute_status_fingerprint(
+        files, input_data.scope, input_data.staged_changelist, staged_paths,
+    )
+    if (repo_git_dir := git_dir.find_git_dir()) is None:
+        state_dir = None
+    elif status_fingerprint.is_storage_current(
+        state_dir := git_dir.get_state_dir(repo_git_dir), input_data.storage, fingerprint
+    ):
+        return
+    if state_dir is None or (input_data.scope is None and not input_data.incremental):
+        index = None  # A merge of every path maps every FileChange, which is faster without the index
+    elif (index := changelist_index.read_changelist_index(state_dir, input_data.storage)) is None:
+        index = changelist_index.ChangelistIndex()  # Rebuilt by the merge
+    truncated = len(truncations) > 0  # FileChanges beyond the file limit keep their Changelist
+    if (patch_paths := _get_patch_paths(input_data, state_dir, files)) is None:
+        deltas = merge_file_changes(input_data.storage, files, input_data.scope, index, remove=not truncated)
+    else:
+        deltas = merge_file_changes(
+            input_data.storage,
+            [fc for fc in files if fc_to_cl_map.is_path_in_scope(fc.before_path or fc.after_path, patch_paths, exact=True)],
+            patch_paths,
+            index,
+            remove=not truncated,
+            exact_scope=True,
+        )
+    routed = _route_staged_file_changes(
+        input_data.storage, input_data.staged_changelist, staged_paths, input_data.scope, truncated,
+    )
+    if written := _update_truncation_note(input_data.storage, truncations, input_data.scope) or routed or\
+            any(delta.dirty for delta in deltas) or not input_data.storage.update_path.exists():
+        _write_storage(input_data.storage)
+    if state_dir is not None and not truncated:  # The state of a truncated update is incomplete
+        status_fingerprint.record_status_fingerprint(state_dir, input_data.storage, fingerprint)
+        if index is not None and routed:  # Routing moved files between Changelists
+            index = changelist_index.create_changelist_index(input_data.storage.get_changelists())
+        if index is not None and (written or index.modified):  # An unchanged index of an unchanged file is not rewritten
+            changelist_index.record_changelist_index(state_dir, input_data.storage, index)
+        if input_data.incremental:
+            sync_baseline.record_sync_baseline(state_dir, input_data.storage, files, input_data.scope)
+
+
+def _get_patch_paths(
+    input_data: InputData,
+    state_dir: Path | None,
+    files: list[FileChange],
+) -> list[str] | None:
+    """ The paths whose FileChanges changed since the last incremental merge, or None to merge the whole input scope.
+ - File paths are matched exactly, and directory paths, with a trailing slash, also match the paths under them.
+    """
+    if not input_data.incremental or state_dir is None:
+        return None
+    if (changed_paths := sync_baseline.get_changed_paths(state_dir, input_data.storage, files, input_data.scope)) is None:
+        return None
+    return changed_paths if len(changed_paths) <= _MAX_SCOPE_PATHS else None
 
 
 def init_storage(
     storage: ChangelistDataStorage,
     include_untracked: bool,
+    time_budget: float | None = None,
+    use_status_cache: bool = False,
 ):
     """ Get New FileChange Information, Merge into Changelists Data Storage.
 
 **Parameters:*
  - storage (ChangelistDataStorage): The Storage object to obtain existing CL from, and send updates to.
  - include_untracked (bool): Whether to tell git to include untracked files.
+ - time_budget (float?): The seconds given to git status before falling back to a cheaper mode. Default: None.
+ - use_status_cache (bool): Whether to reuse cached git status records. Default: False.
     """
     merge_file_changes(
         storage,
-        generate_file_changes(include_untracked)
+        generate_file_changes(include_untracked, StatusOptions(time_budget=time_budget, use_cache=use_status_cache))
     )
 
 
@@ -6,6 +6,21 @@ def main():
     # Validate Input Data
     from changelist_init.input import validate_input
     input_data = validate_input(argv[1:])
+    # Install Git Hooks that run CL-INIT with the other Arguments
+    if input_data.install_hooks:
+        from changelist_init.hooks import install_hooks
+        install_hooks([arg for arg in argv[1:] if arg != '--install_hooks'])
+        return
+    # Tune the Git Status Options of the Repository
+    if input_data.autotune:
+        from changelist_init import autotune_cl_init
+        autotune_cl_init(input_data)
+        return
+    # Serve CL-INIT Requests from Clients
+    if input_data.serve:
+        from changelist_init.server import serve_cl_init
+        serve_cl_init()
+        return
     # Run CL-INIT Process
     from changelist_init import process_cl_init
     process_cl_init(input_data)
@@ -1,5 +1,6 @@
 """ The CL-Init Data Package.
 """
+import uuid
 from typing import Iterable
 
 from changelist_data.changelist import Changelist, get_default_cl
@@ -7,41 +8,170 @@ from changelist_data.file_change import FileChange
 from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
 
 from changelist_init.data import fc_to_cl_map
+from changelist_init.data.changelist_index import ChangelistIndex
+from changelist_init.data.fc_to_cl_map import ChangelistDelta
 
 
 _DEFAULT_CHANGELIST_ID = '4a74640f-90b3-86a1-ab28-af29299c84fd'
 _DEFAULT_CHANGELIST_NAME = "Initial Changelist"
 
+# Starts the line of the Default Changelist comment that records a truncated update.
+_TRUNCATION_NOTE_PREFIX = 'Changelist Init: '
+
 
 def merge_file_changes(
     storage: ChangelistDataStorage,
     files: Iterable[FileChange],
-):
+    scope: list[str] | None = None,
+    index: ChangelistIndex | None = None,
+    remove: bool = True,
+    exact_scope: bool = False,
+) -> list[ChangelistDelta]:
     """ Merge FileChange into Changelists.
- - Leaves existing files in their Changelists.
+ - Leaves existing files in their Changelists, at the same position. Unchanged FileChange objects are kept.
  - Inserts all new files into the default Changelist.
  - Creates DEFAULT_CHANGELIST if storage is empty.
+ - When a scope is given, existing files outside of the scope are left untouched.
+ - Without removal, existing files are only updated, so that FileChanges beyond a file limit keep their Changelist.
+ - With an index of the Changelists, only the paths that differ from the index are patched. The index is kept up to date.
+ - The storage object is updated only when a Changelist was modified.
 
 **Parameters:**
  - storage (ChangelistDataStorage): The in-memory storage object from the changelist_data package.
  - files (Iterable[FileChange]): The FileChanges obtained from Git to merge into storage object.
+ - scope (list[str]?): The paths, relative to the repository root, that the FileChanges were limited to. Default: None.
+ - index (ChangelistIndex?): The index of the Changelists in the storage object. Rebuilt if it does not match. Default: None.
+ - remove (bool): Whether existing files that are not in the FileChanges are removed. Default: True.
+ - exact_scope (bool): Whether the scope paths without a trailing slash are file paths, matched exactly. Default: False.
+
+**Returns:**
+ list[ChangelistDelta] - The changes applied to each Changelist, with a dirty flag for the Changelists that were modified.
     """
     initial_changelists = storage.get_changelists()
+    if index is not None:
+        if not isinstance(files, list):
+            files = list(files)
+        if (deltas := index.merge_file_changes(initial_changelists, files, scope, remove, exact_scope)) is not None:
+            if any(delta.dirty for delta in deltas):
+                storage.update_changelists(initial_changelists)
+            return deltas
     if (default_cl := get_default_cl(initial_changelists)) is None:
         initial_changelists.append(
-            Changelist(
+            default_cl := Changelist(
                 id=_DEFAULT_CHANGELIST_ID,
                 name=_DEFAULT_CHANGELIST_NAME,
-                changes=files if isinstance(files, list) else list(files),
+                changes=list(fc_to_cl_map.map_first_paths(files).values()),
                 comment='',
                 is_default=True,
             )
         )
+        deltas = [
+            fc_to_cl_map.create_changelist_delta(cl.id, len(cl.changes))
+            for cl in initial_changelists if cl is not default_cl
+        ]
+        deltas.append(fc_to_cl_map.create_changelist_delta(
+            default_cl.id, 0, added=len(default_cl.changes),
+        )._replace(dirty=True))  # The new Changelist must be written, even when empty
     else:
-        default_cl.changes.extend(
-            fc_to_cl_map.merge_fc_generator(
-                changelists=initial_changelists,
-                file_changes=files,
-            )
+        deltas = fc_to_cl_map.reconcile_file_changes(
+            changelists=initial_changelists,
+            default_cl=default_cl,
+            file_changes=files,
+            scope=scope,
+            remove=remove,
+            exact_scope=exact_scope,
+        )
+    if any(delta.dirty for delta in deltas):
+        storage.update_changelists(initial_changelists)
+    if index is not None:
+        index.rebuild(initial_changelists)
+    return deltas
+
+
+def route_staged_file_changes(
+    storage: ChangelistDataStorage,
+    staged_paths: set[str],
+    changelist_name: str,
+    scope: list[str] | None = None,
+) -> bool:
+    """ Move the FileChanges of fully staged files into a separate Changelist, after they were merged.
+ - The Changelist is created when a file is staged, with an id derived from its name.
+ - Files in the Changelist that are no longer staged are moved to the Default Changelist.
+ - When a scope is given, files outside of the scope are left untouched.
+
+**Parameters:**
+ - storage (ChangelistDataStorage): The in-memory storage object from the changelist_data package.
+ - staged_paths (set[str]): The FileChange paths of the files with changes only in the Git Index.
+ - changelist_name (str): The name of the Changelist that contains the staged files.
+ - scope (list[str]?): The paths, relative to the repository root, that the Status was limited to. Default: None.
+
+**Returns:**
+ bool - True if a FileChange was moved, and the storage object was updated.
+    """
+    changelists = storage.get_changelists()
+    if (staged_cl := next((cl for cl in changelists if cl.name == changelist_name), None)) is None:
+        if len(staged_paths) == 0:
+            return False
+        staged_cl = Changelist(
+            id=str(uuid.uuid5(uuid.UUID(_DEFAULT_CHANGELIST_ID), changelist_name)),
+            name=changelist_name,
+            changes=[],
+            comment='',
+            is_default=False,
         )
-    storage.update_changelists(initial_changelists)
+        changelists.append(staged_cl)
+    newly_staged = []
+    for cl in changelists:
+        if cl is not staged_cl and len(moved := [fc for fc in cl.changes if _get_path(fc) in staged_paths]) > 0:
+            newly_staged.extend(moved)
+            cl.changes[:] = [fc for fc in cl.changes if _get_path(fc) not in staged_paths]
+    if (default_cl := get_default_cl(changelists)) is staged_cl:
+        unstaged = []
+    elif len(unstaged := [fc for fc in staged_cl.changes if _is_unstaged(fc, staged_paths, scope)]) > 0:
+        default_cl.changes.extend(unstaged)
+        staged_cl.changes[:] = [fc for fc in staged_cl.changes if not _is_unstaged(fc, staged_paths, scope)]
+    if len(newly_staged) == 0 and len(unstaged) == 0:
+        return False
+    staged_cl.changes.extend(newly_staged)
+    storage.update_changelists(changelists)
+    return True
+
+
+def set_truncation_note(
+    storage: ChangelistDataStorage,
+    note: str | None,
+) -> bool:
+    """ Record in the comment of the Default Changelist that the FileChanges were truncated.
+ - A previous note is replaced, and the other lines of the comment are kept.
+
+**Parameters:**
+ - storage (ChangelistDataStorage): The in-memory storage object from the changelist_data package.
+ - note (str?): The description of the files that were not listed, or None to remove the previous note.
+
+**Returns:**
+ bool - True if the comment was changed, and the storage object was updated.
+    """
+    changelists = storage.get_changelists()
+    if (default_cl := get_default_cl(changelists)) is None:
+        return False
+    lines = [line for line in default_cl.comment.splitlines() if not line.startswith(_TRUNCATION_NOTE_PREFIX)]
+    if note is not None:
+        lines.append(_TRUNCATION_NOTE_PREFIX + note)
+    if (comment := '\n'.join(lines)) == default_cl.comment:
+        return False
+    storage.update_changelists([
+        cl._replace(comment=comment) if cl is default_cl else cl for cl in changelists
+    ])
+    return True
+
+
+def _get_path(fc: FileChange) -> str:
+    return fc.before_path or fc.after_path
+
+
+def _is_unstaged(
+    fc: FileChange,
+    staged_paths: set[str],
+    scope: list[str] | None,
+) -> bool:
+    return (file_path := _get_path(fc)) not in staged_paths and fc_to_cl_map.is_path_in_scope(file_path, scope)
@@ -0,0 +1,275 @@
+""" Indexes of the Changelist that contains each FileChange path, persisted for each Changelist Data Storage file.
+ - The index stores the Changelist id and the position in it of the first path of each FileChange, and the length of each Changelist.
+ - While the Storage file is unchanged, a merge looks up the paths of the current Status, instead of mapping every FileChange.
+ - Only the FileChanges whose path was added, modified or removed are patched, and only their locations are updated.
+ - Used for scoped and incremental merges. A merge of every path maps the FileChanges directly.
+"""
+from pathlib import Path
+from typing import Iterable
+
+from changelist_data.changelist import Changelist, get_default_cl
+from changelist_data.file_change import FileChange
+from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
+
+from changelist_init.data.fc_to_cl_map import ChangelistDelta, create_changelist_delta, map_first_paths
+from changelist_init.state_file import file_signature, read_state, storage_key, update_state
+
+
+_INDEX_FILE_NAME = 'changelist_indexes.json'
+
+
+class ChangelistIndex:
+    """ Locates the Changelist, and the position in it, of the first path of each FileChange.
+    """
+
+    __slots__ = ('_locations', '_lengths', '_modified')
+
+    def __init__(
+        self,
+        locations: dict[str, list] | None = None,
+        lengths: dict[str, int] | None = None,
+    ):
+        self._locations: dict[str, list] = {} if locations is None else locations  # The [Changelist id, position] of each path
+        self._lengths: dict[str, int] = {} if lengths is None else lengths  # The number of FileChanges of each Changelist id
+        self._modified = False
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    @property
+    def modified(self) -> bool:
+        """ Whether the index was rebuilt, or a path was added or removed, since it was created or read.
+        """
+        return self._modified
+
+    def get_changelist_id(self, file_path: str) -> str | None:
+        """ Look up the Changelist that contains a FileChange path.
+
+**Parameters:**
+ - file_path (str): The first path of the FileChange, which starts with a slash.
+
+**Returns:**
+ str? - The id of the Changelist, or None if the path is not in a Changelist.
+        """
+        if (location := self._locations.get(file_path)) is None:
+            return None
+        return location[0]
+
+    def rebuild(self, changelists: Iterable[Changelist]):
+        """ Index every FileChange of the Changelists, replacing the previous entries.
+
+**Parameters:**
+ - changelists (Iterable[Changelist]): The Changelists to index.
+        """
+        self._locations, self._lengths = {}, {}
+        for cl in changelists:
+            self._locations.update((_get_first_path(fc), [cl.id, cl_position]) for cl_position, fc in enumerate(cl.changes))
+            self._lengths[cl.id] = len(cl.changes)
+        self._modified = True
+
+    def to_record(self) -> dict:
+        """ The JSON-serializable entries of the index, which are read back by read_changelist_index.
+
+**Returns:**
+ dict - The location of each path, and the length of each Changelist.
+        """
+        return {'locations': self._locations, 'lengths': self._lengths}
+
+    def merge_file_changes(
+        self,
+        changelists: list[Changelist],
+        files: Iterable[FileChange],
+        scope: list[str] | None = None,
+        remove: bool = True,
+        exact_scope: bool = False,
+    ) -> list[ChangelistDelta] | None:
+        """ Merge the FileChanges into the Changelists, patching only the paths that differ from the index.
+ - Modified files are replaced in their Changelist, at the same position. Unchanged FileChange objects are kept.
+ - Indexed paths within the scope that are not in the FileChanges are removed from their Changelist, unless removal is off.
+ - New files are appended to the default Changelist.
+ - The Changelists are not modified when the index does not match them.
+
+**Parameters:**
+ - changelists (list[Changelist]): The Changelists of the Storage file that was indexed.
+ - files (Iterable[FileChange]): The FileChanges obtained from Git.
+ - scope (list[str]?): The paths, relative to the repository root, that the FileChanges were limited to. Default: None.
+ - remove (bool): Whether indexed paths that are not in the FileChanges are removed. Default: True.
+ - exact_scope (bool): Whether the scope paths without a trailing slash are file paths, matched exactly. Default: False.
+
+**Returns:**
+ list[ChangelistDelta]? - The changes applied to each Changelist, or None if the index does not match the Changelists.
+        """
+        if (default_cl := get_default_cl(changelists)) is None or not self._matches(changelists):
+            return None
+        changelist_ids = {cl.id: cl for cl in changelists}
+        current = map_first_paths(files)
+        removed = [] if not remove else [
+            file_path
+            for file_path in (self._locations.keys() if scope is None else self._select_scope_paths(scope, exact_scope)) - current.keys()
+        ]
+        added, replacements = [], []
+        for file_path, fc in current.items():
+            if file_path not in self._locations:
+                added.append(fc)
+            elif _get_indexed_change(changelist_ids, location := self._locations[file_path]) != fc:
+                replacements.append((location, fc))
+        if any((indexed_fc := _get_indexed_change(changelist_ids, location)) is None or
+               _get_first_path(indexed_fc) != file_path for file_path, location in (
+            *((_get_first_path(fc), location) for location, fc in replacements),
+            *((file_path, self._locations[file_path]) for file_path in removed),
+        )):
+            return None
+        updated: dict[str, int] = {}  # The number of replaced FileChanges of each Changelist id
+        for (cl_id, cl_position), fc in replacements:
+            changelist_ids[cl_id].changes[cl_position] = fc
+            updated[cl_id] = updated.get(cl_id, 0) + 1
+        removals: dict[str, set[int]] = {}  # The removed positions of each Changelist id
+        for file_path in removed:
+            cl_id, cl_position = self._locations.pop(file_path)
+            removals.setdefault(cl_id, set()).add(cl_position)
+        for cl_id, cl_positions in removals.items():
+            changes = changelist_ids[cl_id].changes
+            changes[:] = [fc for cl_position, fc in enumerate(changes) if cl_position not in cl_positions]
+            self._lengths[cl_id] = len(changes)
+            for cl_position in range(min(cl_positions), len(changes)):  # The FileChanges after the first removal moved
+                self._locations[_get_first_path(changes[cl_position])] = [cl_id, cl_position]
+        deltas = [
+            create_changelist_delta(
+                cl.id, len(cl.changes), updated.get(cl.id, 0), len(removals.get(cl.id, ())),
+                len(added) if cl is default_cl else 0,
+            ) for cl in changelists
+        ]
+        if len(added) > 0:
+            self._locations.update(
+                (_get_first_path(fc), [default_cl.id, cl_position])
+                for cl_position, fc in enumerate(added, start=len(default_cl.changes))
+            )
+            default_cl.changes.extend(added)
+            self._lengths[default_cl.id] = len(default_cl.changes)
+        if len(added) > 0 or len(removals) > 0:
+            self._modified = True
+        return deltas
+
+    def _matches(self, changelists: list[Changelist]) -> bool:
+        """ Whether every indexed Changelist exists with the same number of FileChanges, and every path is unique.
+ - Only the lengths are compared. The paths are compared only where the merge patches them.
+        """
+        lengths = {cl.id: len(cl.changes) for cl in changelists}
+        if any(lengths.get(cl_id) != length for cl_id, length in self._lengths.items()):
+            return False
+        return sum(lengths.values()) == sum(self._lengths.values()) == len(self._locations)
+
+    def _select_scope_paths(
+        self,
+        scope: list[str],
+        exact: bool = False,
+    ) -> set[str]:
+        """ The indexed paths within the scope.
+ - Exact paths are looked up. Only the directory paths of the scope are compared with every indexed path.
+        """
+        if exact:
+            selected = {file_path for path in scope if (file_path := '/' + path.rstrip('/')) in self._locations}
+            prefixes = tuple('/' + path for path in scope if path.endswith('/'))
+        else:
+            selected = {file_path for path in scope if (file_path := '/' + path) in self._locations}
+            prefixes = tuple('/' + path + '/' for path in scope)
+        if len(prefixes) > 0:
+            selected.update(file_path for file_path in self._locations if file_path.startswith(prefixes))
+        return selected
+
+
+def create_changelist_index(
+    changelists: Iterable[Changelist],
+) -> ChangelistIndex:
+    """ Index every FileChange of the Changelists.
+
+**Parameters:**
+ - changelists (Iterable[Changelist]): The Changelists to index.
+
+**Returns:**
+ ChangelistIndex - The index of the Changelists.
+    """
+    index = ChangelistIndex()
+    index.rebuild(changelists)
+    return index
+
+
+def read_changelist_index(
+    state_dir: Path,
+    storage: ChangelistDataStorage,
+) -> ChangelistIndex | None:
+    """ Read the index recorded for the Storage file.
+ - The Storage file must be unchanged since the index was recorded, with the same modification time and size.
+ - Each location is validated when a merge uses it.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the recorded indexes.
+ - storage (ChangelistDataStorage): The Storage object whose index is read.
+
+**Returns:**
+ ChangelistIndex? - The index of the Storage file, or None if it was not recorded or the file has changed.
+    """
+    if (record := _read_indexes(state_dir).get(storage_key(storage))) is None:
+        return None
+    if record.get('signature') != file_signature(storage.update_path):
+        return None
+    if not isinstance(locations := record.get('locations'), dict) or not isinstance(lengths := record.get('lengths'), dict) or\
+            not all(isinstance(length, int) for length in lengths.values()):
+        return None
+    return ChangelistIndex(locations, lengths)
+
+
+def record_changelist_index(
+    state_dir: Path,
+    storage: ChangelistDataStorage,
+    index: ChangelistIndex,
+):
+    """ Record the index of the Changelists that were written to the Storage file.
+ - Failure to record the index is not an error, the next run will map every FileChange.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the recorded indexes.
+ - storage (ChangelistDataStorage): The Storage object whose file was written.
+ - index (ChangelistIndex): The index of the written Changelists.
+    """
+    def update(indexes: object | None) -> dict:
+        indexes = _validate_indexes(indexes)
+        if (signature := file_signature(storage.update_path)) is None:
+            indexes.pop(storage_key(storage), None)
+        else:
+            indexes[storage_key(storage)] = {'signature': signature, **index.to_record()}
+        return indexes
+    update_state(state_dir, _INDEX_FILE_NAME, update)
+
+
+def _get_first_path(fc: FileChange) -> str:
+    return fc.before_path or fc.after_path
+
+
+def _get_indexed_change(
+    changelist_ids: dict[str, Changelist],
+    location: object,
+) -> FileChange | None:
+    """ The FileChange at an indexed location, or None if the location is not in the Changelists.
+    """
+    try:
+        cl_id, cl_position = location
+        if cl_position < 0:
+            return None
+        return changelist_ids[cl_id].changes[cl_position]
+    except (TypeError, ValueError, KeyError, IndexError):
+        return None
+
+
+def _read_indexes(
+    state_dir: Path,
+) -> dict[str, dict]:
+    return _validate_indexes(read_state(state_dir, _INDEX_FILE_NAME))
+
+
+def _validate_indexes(
+    indexes: object | None,
+) -> dict[str, dict]:
+    if not isinstance(indexes, dict):
+        return {}
+    return {key: record for key, record in indexes.items() if isinstance(record, dict)}
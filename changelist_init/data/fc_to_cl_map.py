@@ -1,23 +1,175 @@
 """ Methods for Mapping FileChanges into Changelist Data structures.
+
+**ChangelistDelta NamedTuple Fields:**
+ - changelist_id (str): The id of the Changelist.
+ - kept (int): The number of FileChanges left unchanged, at their positions.
+ - updated (int): The number of FileChanges replaced, at their positions.
+ - removed (int): The number of FileChanges removed.
+ - added (int): The number of FileChanges appended.
+ - dirty (bool): Whether the Changelist was modified, and must be written.
 """
+import warnings
+from collections import namedtuple
 from typing import Iterable, Generator
 
 from changelist_data import Changelist
+from changelist_data.changelist import get_default_cl
 from changelist_data.file_change import FileChange
 
 
+ChangelistDelta = namedtuple(
+    'ChangelistDelta',
+    'changelist_id kept updated removed added dirty',
+)
+
+
+def is_path_in_scope(
+    file_path: str,
+    scope: list[str] | None,
+    exact: bool = False,
+) -> bool:
+    """ Determine whether a FileChange path is within a scope.
+ - With exact matching, a scope path is a file path, unless it ends with a slash. Only directory paths match the paths under them.
+
+**Parameters:**
+ - file_path (str): The FileChange path, which starts with a slash.
+ - scope (list[str]?): The paths, relative to the repository root. None matches every path.
+ - exact (bool): Whether the scope paths without a trailing slash match only the equal path. Default: False.
+
+**Returns:**
+ bool - True if the path is equal to, or under, a path in the scope.
+    """
+    if scope is None:
+        return True
+    file_path = file_path.lstrip('/')
+    if exact:
+        return any(
+            file_path == path.rstrip('/') or (path.endswith('/') and file_path.startswith(path)) for path in scope
+        )
+    return any(file_path == path or file_path.startswith(path + '/') for path in scope)
+
+
+def _get_first_path(file: FileChange) -> str:
+    if file.before_path:
+        return file.before_path
+    if file.after_path:
+        return file.after_path
+    exit("A Git Reader Error may have occurred.")
+
+
+def map_first_paths(
+    file_changes: Iterable[FileChange],
+) -> dict[str, FileChange]:
+    """ Map the first path of each FileChange to the first FileChange with that path.
+
+**Parameters:**
+ - file_changes (Iterable[FileChange]): The FileChanges, which may repeat a path.
+
+**Returns:**
+ dict[str, FileChange] - The FileChange of each first path, in the order of the FileChanges.
+    """
+    first_paths: dict[str, FileChange] = {}
+    for fc in file_changes:
+        first_paths.setdefault(_get_first_path(fc), fc)
+    return first_paths
+
+
+def reconcile_file_changes(
+    changelists: list[Changelist],
+    default_cl: Changelist,
+    file_changes: Iterable[FileChange],
+    scope: list[str] | None = None,
+    remove: bool = True,
+    exact_scope: bool = False,
+) -> list[ChangelistDelta]:
+    """ Reconcile the Changelists with the FileChanges, applying only the differences to each Changelist.
+ - Existing FileChange objects that are unchanged are kept, and the order of every Changelist is preserved.
+ - Modified files are replaced at their position. Files no longer in the FileChanges are removed.
+ - New files are appended to the default Changelist, in the order of the FileChanges. Only the first FileChange of a path is merged.
+ - A path found in more than one Changelist is kept in the first, and removed from the others.
+ - When a scope is given, FileChanges outside of the scope are kept.
+ - Without removal, files no longer in the FileChanges are kept, for FileChanges that were truncated.
+
+**Parameters:**
+ - changelists (list[Changelist]): The existing Changelists, which are modified in place.
+ - default_cl (Changelist): The Changelist that receives new files. It must be one of the changelists.
+ - file_changes (Iterable[FileChange]): The FileChange objects produced during initialization.
+ - scope (list[str]?): The paths of the files being updated. Default: None, all files.
+ - remove (bool): Whether files no longer in the FileChanges are removed. Default: True.
+ - exact_scope (bool): Whether the scope paths without a trailing slash are file paths, matched exactly. Default: False.
+
+**Returns:**
+ list[ChangelistDelta] - The changes applied to each Changelist, in the order of the changelists.
+    """
+    current = map_first_paths(file_changes)
+    deltas = []
+    for cl in changelists:
+        changes, updated, removed_positions = cl.changes, 0, set()
+        for position, fc in enumerate(changes):
+            if not is_path_in_scope(file_path := _get_first_path(fc), scope, exact_scope):
+                continue  # Outside of the scope, the FileChange is kept
+            if (new_fc := current.pop(file_path, None)) is None:
+                if remove:
+                    removed_positions.add(position)
+            elif new_fc != fc:
+                changes[position] = new_fc
+                updated += 1
+        if len(removed_positions) > 0:
+            changes[:] = [fc for position, fc in enumerate(changes) if position not in removed_positions]
+        deltas.append(create_changelist_delta(cl.id, len(changes), updated, len(removed_positions)))
+    if len(current) > 0:
+        default_cl.changes.extend(current.values())
+        deltas = [
+            create_changelist_delta(delta.changelist_id, delta.kept + delta.updated, delta.updated, delta.removed, len(current))
+            if cl is default_cl else delta
+            for cl, delta in zip(changelists, deltas)
+        ]
+    return deltas
+
+
+def create_changelist_delta(
+    changelist_id: str,
+    length: int,
+    updated: int = 0,
+    removed: int = 0,
+    added: int = 0,
+) -> ChangelistDelta:
+    """ Count the FileChanges of a reconciled Changelist by what was applied to them.
+
+**Parameters:**
+ - changelist_id (str): The id of the Changelist.
+ - length (int): The number of FileChanges in the Changelist, before new files were appended.
+ - updated (int): The number of FileChanges replaced. Default: 0.
+ - removed (int): The number of FileChanges removed. Default: 0.
+ - added (int): The number of FileChanges appended. Default: 0.
+
+**Returns:**
+ ChangelistDelta - The counts, and whether the Changelist was modified.
+    """
+    return ChangelistDelta(
+        changelist_id=changelist_id,
+        kept=length - updated,
+        updated=updated,
+        removed=removed,
+        added=added,
+        dirty=updated + removed + added > 0,
+    )
+
+
 def create_fc_to_cl_dict(
     changelists: Iterable[Changelist],
 ) -> dict[str, Changelist]:
     """ Initialize the Map of Existing FileChanges.
+ - Deprecated: reconcile_file_changes applies the FileChanges without clearing the Changelists.
  - Clears each Changelist contents as they are inserted into the map.
 
-**Parameters:
+**Parameters:**
  - changelists (Iterable[Changelist]): The changelists to be inserted into the map.
 
 **Returns:**
  dict[str, Changelist] - A map from file path to the Changelist object that contains it.
     """
+    warnings.warn("create_fc_to_cl_dict is deprecated, use reconcile_file_changes.", DeprecationWarning, stacklevel=2)
     cl_map: dict[str, Changelist] = {}
     for cl in changelists:
         for fc in cl.changes:
@@ -31,7 +183,7 @@ def offer_fc_to_cl_dict(
     file: FileChange
 ) -> bool:
     """ Map a FileChange into an existing Changelist.
- - Searches the Dict for both FileChange paths, starting with the before_path.
+ - Deprecated: reconcile_file_changes applies the FileChanges without clearing the Changelists.
  - Appends FC to CL changes and returns true if found.
 
 **Parameters:**
@@ -41,35 +193,34 @@ def offer_fc_to_cl_dict(
 **Returns:**
  bool - True if the FC was added to a CL. False if the file was not found.
     """
+    warnings.warn("offer_fc_to_cl_dict is deprecated, use reconcile_file_changes.", DeprecationWarning, stacklevel=2)
     if (cl := fc_map.get(_get_first_path(file))) is not None:  # Match!
         cl.changes.append(file)
         return True
     return False # FC not in map
 
 
-def _get_first_path(file: FileChange) -> str:
-    if file.before_path:
-        return file.before_path
-    if file.after_path:
-        return file.after_path
-    exit("A Git Reader Error may have occurred.")
-
-
 def merge_fc_generator(
     changelists: Iterable[Changelist],
     file_changes: Iterable[FileChange],
 ) -> Generator[FileChange, None, None]:
-    """ Merge FC into existing CL, applying the fc_to_cl_map module.
+    """ Merge FC into existing CL, through reconcile_file_changes.
+ - Deprecated: reconcile_file_changes also appends the new files to the default Changelist.
+ - Existing files are updated at their position, and files no longer in the FileChanges are removed.
 
 **Parameters:**
- - existing_lists (Iterable[Changelist]): The list of existing Changelists.
- - files (Iterable[FileChange]): The iterable FileChange objects produced during initialization.
+ - changelists (Iterable[Changelist]): The list of existing Changelists.
+ - file_changes (Iterable[FileChange]): The iterable FileChange objects produced during initialization.
 
 **Yields:**
  FileChange - The FileChange objects that are new, not present in existing Changelists.
     """
-    cl_map = create_fc_to_cl_dict(changelists)
-    # Search for matches using map
+    warnings.warn("merge_fc_generator is deprecated, use reconcile_file_changes.", DeprecationWarning, stacklevel=2)
+    changelists = list(changelists)
+    existing_paths = {_get_first_path(fc) for cl in changelists for fc in cl.changes}
+    existing_files, new_files = [], []
     for fc in file_changes:
-        if not offer_fc_to_cl_dict(cl_map, fc):
-            yield fc
+        (existing_files if _get_first_path(fc) in existing_paths else new_files).append(fc)
+    # Every existing file is in a Changelist, so none is appended to the default Changelist
+    reconcile_file_changes(changelists, get_default_cl(changelists), existing_files)
+    yield from new_files
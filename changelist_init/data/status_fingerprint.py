@@ -0,0 +1,100 @@
+""" Fingerprints of the Status merged into each Changelist Data Storage file.
+ - A matching fingerprint means the merge would not change the storage file, so it can be skipped.
+"""
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+from changelist_data.file_change import FileChange
+from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
+
+from changelist_init.state_file import file_signature, read_state, storage_key, update_state
+
+
+_FINGERPRINT_FILE_NAME = 'status_fingerprints.json'
+
+
+def compute_status_fingerprint(
+    files: Iterable[FileChange],
+    scope: list[str] | None = None,
+    staged_changelist: str | None = None,
+    staged_paths: Iterable[str] = (),
+) -> str:
+    """ Compute a content hash of the FileChange sequence produced from Git Status.
+ - Staging a file does not change its FileChange, so the paths routed to the staged Changelist are hashed too.
+
+**Parameters:**
+ - files (Iterable[FileChange]): The FileChanges, in the order they were produced.
+ - scope (list[str]?): The paths the FileChanges were limited to. A scoped merge differs from a full merge.
+ - staged_changelist (str?): The name of the Changelist that staged files are routed to. Default: None, not routed.
+ - staged_paths (Iterable[str]): The FileChange paths of the staged files. Default: empty.
+
+**Returns:**
+ str - The hexadecimal digest of the FileChange paths and kinds.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if scope is not None:
+        digest.update(('\0'.join(scope) + '\0\0').encode(errors='surrogateescape'))
+    for fc in files:
+        digest.update(f"{fc.before_path or ''}\0{fc.after_path or ''}\0{fc.after_dir or ''}\n".encode(errors='surrogateescape'))
+    if staged_changelist is not None:
+        digest.update(('\0'.join([staged_changelist, *sorted(staged_paths)]) + '\0\0').encode(errors='surrogateescape'))
+    return digest.hexdigest()
+
+
+def is_storage_current(
+    state_dir: Path,
+    storage: ChangelistDataStorage,
+    fingerprint: str,
+) -> bool:
+    """ Determine whether the Storage file already contains the merge of a Status with this fingerprint.
+ - The Storage file must be unchanged since the fingerprint was recorded.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the recorded fingerprints.
+ - storage (ChangelistDataStorage): The Storage object whose file is checked.
+ - fingerprint (str): The fingerprint of the current Status.
+
+**Returns:**
+ bool - True if the merge and write can be skipped.
+    """
+    if (record := _read_fingerprints(state_dir).get(storage_key(storage))) is None:
+        return False
+    if (signature := file_signature(storage.update_path)) is None:
+        return False
+    return record == [fingerprint, signature]
+
+
+def record_status_fingerprint(
+    state_dir: Path,
+    storage: ChangelistDataStorage,
+    fingerprint: str,
+):
+    """ Record the fingerprint of the Status that was merged and written to the Storage file.
+ - Failure to record the fingerprint is not an error, the next run will merge again.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the recorded fingerprints.
+ - storage (ChangelistDataStorage): The Storage object whose file was written.
+ - fingerprint (str): The fingerprint of the merged Status.
+    """
+    def update(fingerprints: object | None) -> dict:
+        fingerprints = _validate_fingerprints(fingerprints)
+        if (signature := file_signature(storage.update_path)) is None:
+            fingerprints.pop(storage_key(storage), None)
+        else:
+            fingerprints[storage_key(storage)] = [fingerprint, signature]
+        return fingerprints
+    update_state(state_dir, _FINGERPRINT_FILE_NAME, update)
+
+
+def _read_fingerprints(
+    state_dir: Path,
+) -> dict[str, list]:
+    return _validate_fingerprints(read_state(state_dir, _FINGERPRINT_FILE_NAME))
+
+
+def _validate_fingerprints(
+    fingerprints: object | None,
+) -> dict[str, list]:
+    return fingerprints if isinstance(fingerprints, dict) else {}
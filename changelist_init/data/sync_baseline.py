@@ -0,0 +1,107 @@
+""" Baselines of the FileChanges merged into each Changelist Data Storage file.
+ - While the Storage file is unchanged, only the paths whose FileChanges differ from the baseline need to be merged.
+ - A baseline records a checksum of the FileChanges of each path, rather than the FileChanges.
+"""
+import zlib
+from pathlib import Path
+
+from changelist_data.file_change import FileChange
+from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
+
+from changelist_init.state_file import file_signature, read_state, storage_key, update_state
+
+
+_BASELINE_FILE_NAME = 'sync_baselines.json'
+
+
+def get_changed_paths(
+    state_dir: Path,
+    storage: ChangelistDataStorage,
+    files: list[FileChange],
+    scope: list[str] | None = None,
+) -> list[str] | None:
+    """ Determine the paths whose FileChanges differ from the baseline recorded for the Storage file.
+ - The Storage file must be unchanged since the baseline was recorded, with the same scope.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the recorded baselines.
+ - storage (ChangelistDataStorage): The Storage object whose baseline is compared.
+ - files (list[FileChange]): The FileChanges of the current Status.
+ - scope (list[str]?): The paths the FileChanges were limited to. Default: None, the whole repository.
+
+**Returns:**
+ list[str]? - The sorted first paths of the changed FileChanges, without the leading slash, and with a trailing slash for directories. None if there is no baseline.
+    """
+    if (record := _read_baselines(state_dir).get(storage_key(storage))) is None:
+        return None
+    if record.get('signature') != file_signature(storage.update_path) or record.get('scope') != scope:
+        return None
+    if not isinstance(baseline := record.get('files'), dict):  # Malformed Baseline Record
+        return None
+    current = _get_path_checksums(files)
+    return sorted(
+        path for path in baseline.keys() | current.keys() if baseline.get(path) != current.get(path)
+    )
+
+
+def record_sync_baseline(
+    state_dir: Path,
+    storage: ChangelistDataStorage,
+    files: list[FileChange],
+    scope: list[str] | None = None,
+):
+    """ Record the checksums of the FileChanges that were merged and written to the Storage file.
+ - The baselines file is not rewritten when the baseline is unchanged.
+ - Failure to record the baseline is not an error, the next run will merge every path.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the recorded baselines.
+ - storage (ChangelistDataStorage): The Storage object whose file was written.
+ - files (list[FileChange]): The merged FileChanges.
+ - scope (list[str]?): The paths the FileChanges were limited to. Default: None, the whole repository.
+    """
+    def update(baselines: object | None) -> dict | None:
+        baselines = _validate_baselines(baselines)
+        if (signature := file_signature(storage.update_path)) is None:
+            if baselines.pop(storage_key(storage), None) is None:
+                return None
+        else:
+            record = {
+                'signature': signature,
+                'scope': scope,
+                'files': _get_path_checksums(files),
+            }
+            if baselines.get(storage_key(storage)) == record:
+                return None
+            baselines[storage_key(storage)] = record
+        return baselines
+    update_state(state_dir, _BASELINE_FILE_NAME, update)
+
+
+def _get_path_checksums(
+    files: list[FileChange],
+) -> dict[str, int]:
+    """ The CRC-32 checksum of the FileChanges of each first path, without the leading slash.
+ - The path of a directory FileChange has a trailing slash, so that it is distinct from a file at the same path.
+    """
+    checksums = {}
+    for fc in files:
+        path = (fc.before_path or fc.after_path or '').lstrip('/')
+        if fc.before_dir if fc.before_path else fc.after_dir:
+            path += '/'
+        checksums[path] = zlib.crc32(repr(tuple(fc)).encode(), checksums.get(path, 0))
+    return checksums
+
+
+def _read_baselines(
+    state_dir: Path,
+) -> dict[str, dict]:
+    return _validate_baselines(read_state(state_dir, _BASELINE_FILE_NAME))
+
+
+def _validate_baselines(
+    baselines: object | None,
+) -> dict[str, dict]:
+    if not isinstance(baselines, dict):
+        return {}
+    return {key: record for key, record in baselines.items() if isinstance(record, dict)}
@@ -1,25 +1,236 @@
 """ Git Management Package.
 """
-from typing import Generator
+from typing import Callable, Generator
 
 from changelist_data.file_change import FileChange
 
-from changelist_init.git import status_runner, status_reader, status_change_mapping
+from changelist_init.git import status_runner, status_change_mapping, status_collector, status_cache, \
+    index_status, git_dir, git_capabilities, status_profile, status_reader
+from changelist_init.git.git_status_lists import GitStatusLists
+from changelist_init.git.git_tracking_status import GitTrackingStatus as GitTrackingStatus
+from changelist_init.git.status_profile import AutotuneResult, StatusProfile
+from changelist_init.git.status_change_mapping import StatusSummary
+from changelist_init.git.status_options import StatusOptions, DEFAULT_OPTIONS
+from changelist_init.git.status_collector import StatusTruncation
+from changelist_init.git.status_reader import GitFileStatus
+from changelist_init.git.status_table import StatusTable as StatusTable
 
 
 def generate_file_changes(
     include_untracked: bool,
+    options: StatusOptions = DEFAULT_OPTIONS,
+    on_progress: Callable[[int], None] | None = None,
+    on_truncated: Callable[[StatusTruncation], None] | None = None,
+    on_summary: Callable[[StatusSummary], None] | None = None,
+    status_lists: GitStatusLists | None = None,
 ) -> Generator[FileChange, None, None]:
     """ Initialize FileChanges with a Generator.
 
 **Parameters:**
  - include_untracked (bool): Whether to include untracked files in the git status output.
+ - options (StatusOptions): The options that control the collection of the Git Status records. Default: the default options.
+ - on_progress (Callable[[int], None]?): Receives the number of status records collected so far.
+ - on_truncated (Callable[[StatusTruncation], None]?): Receives the counts of the files beyond the limit, if any.
+ - on_summary (Callable[[StatusSummary], None]?): Receives the counts of the records of each status code, after the last FileChange.
+ - status_lists (GitStatusLists?): Receives the record of each FileChange, by Tracking Status, as it is mapped. Default: None.
 
 **Yields:**
- FileChange - Those precious File Changes, created from Git Status output.
+ FileChange - Those precious File Changes, created from Git Status output while Git is running.
     """
-    yield from status_change_mapping.map_file_status_to_changes(
-        status_reader.generate_file_status(
-            status_runner.run_git_status(include_untracked)
+    profile = status_profile.get_repository_profile()
+    status_config, write_index = _get_status_config(profile, options.fsmonitor, options.write_index)
+    options = options._replace(
+        concurrent_untracked=options.concurrent_untracked or profile.concurrent_untracked, write_index=write_index,
+    )
+    is_single_status_run = options.time_budget is None and on_progress is None and not options.use_cache\
+        and not options.use_index_reader and not options.concurrent_untracked and options.status_shards < 2\
+        and options.max_files is None\
+        and not (include_untracked and options.collapse_untracked and options.expand_untracked > 0)
+    if options.parse_processes > 1 and is_single_status_run:
+        # The whole output of a single Git Status Process is split between the parse processes
+        from changelist_init.git import status_pool
+        yield from status_pool.map_status_buffer(
+            status_runner.read_git_status_buffer(
+                _get_untracked_mode(include_untracked, options.collapse_untracked),
+                None if options.scope is None else status_runner.get_scope_pathspecs(options.scope),
+                status_config,
+                options.write_index,
+            ),
+            options.parse_processes, include_untracked and options.collapse_untracked, options.path_errors,
+            on_summary, status_lists,
+        )
+        return
+    if is_single_status_run:
+        # The records of each output block are mapped from its parallel lists of status codes and paths
+        yield from status_change_mapping.map_file_status_to_changes(
+            status_reader.generate_status_pairs(
+                status_runner.stream_git_status_blocks(
+                    untracked_mode=_get_untracked_mode(include_untracked, options.collapse_untracked),
+                    pathspecs=None if options.scope is None else status_runner.get_scope_pathspecs(options.scope),
+                    config=status_config,
+                    write_index=options.write_index,
+                ),
+                include_untracked and options.collapse_untracked,
+            ),
+            options.path_errors, on_summary, status_lists,
         )
+        return
+    file_status = _generate_file_status(
+        include_untracked, options, on_progress, status_config,
+        _split_status_shards(options.status_shards, options.shard_paths, options.scope),
+    )
+    if options.use_cache:
+        file_status = status_cache.cached_file_status(
+            include_untracked, file_status, scope=options.scope,
+            refresh_status=None if not options.incremental else lambda paths: _generate_file_status(
+                include_untracked, options._replace(scope=paths), on_progress, status_config,
+            ),
+            collection_options=[options.expand_untracked] if include_untracked and options.collapse_untracked else None,
+        )
+    if options.max_files is not None:
+        file_status = status_collector.limit_file_status(file_status, options.max_files, on_truncated)
+    yield from status_change_mapping.map_file_status_to_changes(file_status, options.path_errors, on_summary, status_lists)
+
+
+def get_status_lists(
+    include_untracked: bool = False,
+    scope: list[str] | None = None,
+) -> GitStatusLists:
+    """ Collect the Git Status records, grouped by Tracking Status.
+
+**Parameters:**
+ - include_untracked (bool): Whether to include untracked files.
+ - scope (list[str]?): The paths, relative to the repository root, that limit the files git scans. Default: None.
+
+**Returns:**
+ GitStatusLists - The records of each Tracking Status. Ignored files are not included.
+    """
+    profile = status_profile.get_repository_profile()
+    return GitStatusLists(_generate_file_status(
+        include_untracked,
+        StatusOptions(concurrent_untracked=profile.concurrent_untracked, scope=scope),
+        None,
+        profile.config,
+    ))
+
+
+def autotune_status_profile(
+    include_untracked: bool,
+    repeats: int = 3,
+    write_index: bool = False,
+) -> AutotuneResult | None:
+    """ Benchmark Git Status options on the repository, and persist the fastest profile for later runs.
+
+**Parameters:**
+ - include_untracked (bool): Whether to tune the collection of untracked files.
+ - repeats (int): The number of timed runs of each candidate profile. Default: 3.
+ - write_index (bool): Whether Git Status may write the refreshed Index, as in the runs that use the profile. Default: False.
+
+**Returns:**
+ AutotuneResult? - The fastest profile and its time, compared with the default. None when not in a repository.
+    """
+    if (repo_git_dir := git_dir.find_git_dir()) is None:
+        return None
+    result = status_profile.find_fastest_profile(
+        lambda profile: _generate_file_status(
+            include_untracked,
+            StatusOptions(concurrent_untracked=profile.concurrent_untracked, write_index=write_index),
+            None,
+            profile.config,
+        ),
+        include_untracked,
+        git_capabilities.probe_capabilities(repo_git_dir),
+        repeats,
     )
+    status_profile.write_status_profile(git_dir.get_state_dir(repo_git_dir), result.profile)
+    return result
+
+
+def _get_status_config(
+    profile: StatusProfile,
+    fsmonitor: bool,
+    write_index: bool,
+) -> tuple[list[str] | None, bool]:
+    """ Combine the config of the Status Profile with the fsmonitor overrides, which take precedence.
+ - The fsmonitor overrides also write to the Index, where git keeps the untracked cache and fsmonitor state.
+    """
+    if not fsmonitor or (overrides := git_capabilities.get_repository_status_config()) is None:
+        return profile.config, write_index
+    return (profile.config or []) + overrides, True
+
+
+def _get_untracked_mode(
+    include_untracked: bool,
+    collapse_untracked: bool,
+) -> str:
+    if not include_untracked:
+        return 'no'
+    return 'normal' if collapse_untracked else 'all'
+
+
+def _generate_file_status(
+    include_untracked: bool,
+    options: StatusOptions,
+    on_progress: Callable[[int], None] | None,
+    status_config: list[str] | None,
+    pathspec_shards: list[list[str]] | None = None,
+) -> Generator[GitFileStatus, None, bool]:
+    """ Create the GitFileStatus Generator for the collection options.
+    """
+    scope = options.scope
+    pathspecs = None if scope is None else status_runner.get_scope_pathspecs(scope)
+    if include_untracked and options.concurrent_untracked:
+        if options.use_index_reader:
+            tracked_file_status = _read_index_or_collect(None, None, options.workers, pathspec_shards, scope)
+        else:
+            tracked_file_status = status_collector.collect_file_status(
+                False, pathspec_shards=pathspec_shards, pathspecs=pathspecs, status_config=status_config,
+                write_index=options.write_index,
+            )
+        file_status = status_collector.collect_file_status_concurrently(
+            tracked_file_status, options.time_budget, on_progress, pathspecs, options.collapse_untracked
+        )
+    elif options.use_index_reader and not include_untracked:
+        return _read_index_or_collect(options.time_budget, on_progress, options.workers, pathspec_shards, scope)
+    else:
+        file_status = status_collector.collect_file_status(
+            include_untracked, options.time_budget, on_progress, pathspec_shards, pathspecs, status_config,
+            options.collapse_untracked, options.write_index,
+        )
+    if include_untracked and options.collapse_untracked and options.expand_untracked > 0 and\
+            (root := git_dir.find_worktree_root()) is not None:
+        return status_collector.expand_untracked_directories(file_status, root, options.expand_untracked)
+    return file_status
+
+
+def _read_index_or_collect(
+    time_budget: float | None,
+    on_progress: Callable[[int], None] | None,
+    workers: int | None,
+    pathspec_shards: list[list[str]] | None,
+    scope: list[str] | None,
+) -> Generator[GitFileStatus, None, bool]:
+    """ Read tracked file status from the Git Index, falling back to git when the Index reader is not supported.
+    """
+    if (records := index_status.read_index_status(workers=workers, scope=scope)) is None:
+        return (yield from status_collector.collect_file_status(
+            False, time_budget, on_progress, pathspec_shards,
+            None if scope is None else status_runner.get_scope_pathspecs(scope),
+        ))
+    yield from records
+    return True
+
+
+def _split_status_shards(
+    status_shards: int,
+    shard_paths: list[str] | None,
+    scope: list[str] | None,
+) -> list[list[str]] | None:
+    """ Split the repository into pathspec shards, or return None when git status runs in a single process.
+ - A scope replaces the shard paths, so that only the paths within the scope are scanned.
+    """
+    if status_shards < 2 or (root := git_dir.find_worktree_root()) is None:
+        return None
+    if scope is not None:
+        return status_runner.split_pathspec_shards(root, status_shards, scope, exhaustive=False)
+    return status_runner.split_pathspec_shards(root, status_shards, shard_paths)
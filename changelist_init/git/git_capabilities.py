@@ -0,0 +1,167 @@
+""" Probes the Git features that let Git Status avoid a full directory walk.
+ - The probe runs the Git binary once, and the result is cached in the state directory of the repository.
+ - The cached result is keyed by the path and stat signature of the Git binary, so an upgrade probes again.
+
+**GitCapabilities NamedTuple Fields:**
+ - version (tuple[int, ...]): The git version numbers, such as (2, 43, 0). Empty when the version is unknown.
+ - fsmonitor_daemon (bool): Whether git was built with the builtin fsmonitor daemon.
+ - untracked_cache (bool): Whether the git version supports the untracked cache.
+"""
+import os
+import re
+import shutil
+import subprocess
+from collections import namedtuple
+from pathlib import Path
+
+from changelist_init import state_file
+from changelist_init.git import git_dir, git_config
+
+
+GitCapabilities = namedtuple(
+    'GitCapabilities',
+    'version fsmonitor_daemon untracked_cache',
+)
+
+_CAPABILITIES_FILE_NAME = 'git_capabilities.json'
+
+# The first git version with the untracked cache.
+_UNTRACKED_CACHE_VERSION = (2, 8)
+
+_VERSION_PATTERN = re.compile(r'git version (\d+(?:\.\d+)*)')
+
+
+def probe_capabilities(
+    repo_git_dir: Path,
+) -> GitCapabilities:
+    """ Obtain the capabilities of the Git binary, from the cache or by running it.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository, where the probe result is cached.
+
+**Returns:**
+ GitCapabilities - The features available to Git Status. None of the features are available if git could not be run.
+    """
+    binary_key = get_binary_key()
+    state_dir = git_dir.get_state_dir(repo_git_dir)
+    if (capabilities := _read_capabilities(state_dir, binary_key)) is not None:
+        return capabilities
+    try:
+        result = subprocess.run(
+            args=['git', 'version', '--build-options'],
+            capture_output=True,
+            text=True,
+            shell=False,
+        )
+    except OSError:
+        return GitCapabilities(version=(), fsmonitor_daemon=False, untracked_cache=False)
+    capabilities = read_build_options(result.stdout if result.returncode == 0 else '')
+    _write_capabilities(state_dir, binary_key, capabilities)
+    return capabilities
+
+
+def read_build_options(
+    output: str,
+) -> GitCapabilities:
+    """ Read the output of git version --build-options.
+
+**Parameters:**
+ - output (str): The stdout of the git version command.
+
+**Returns:**
+ GitCapabilities - The features of the Git binary.
+    """
+    if (match := _VERSION_PATTERN.search(output)) is None:
+        version = ()
+    else:
+        version = tuple(int(number) for number in match.group(1).split('.'))
+    return GitCapabilities(
+        version=version,
+        fsmonitor_daemon='feature: fsmonitor--daemon' in output,
+        untracked_cache=version >= _UNTRACKED_CACHE_VERSION,
+    )
+
+
+def get_status_config(
+    capabilities: GitCapabilities,
+    config: dict[str, str],
+) -> list[str]:
+    """ Determine the config overrides that enable the untracked cache and fsmonitor for Git Status.
+ - Settings that the repository or user configured to false, or to another fsmonitor hook, are respected.
+
+**Parameters:**
+ - capabilities (GitCapabilities): The features of the Git binary.
+ - config (dict[str, str]): The configuration values, from git_config.read_config_values.
+
+**Returns:**
+ list[str] - The name=value pairs to pass to git with -c.
+    """
+    overrides = []
+    if capabilities.untracked_cache and _is_unset_or_true(config.get('core.untrackedcache')):
+        overrides.append('core.untrackedCache=true')
+    if capabilities.fsmonitor_daemon and _is_unset_or_true(config.get('core.fsmonitor')):
+        overrides.append('core.fsmonitor=true')
+    return overrides
+
+
+def get_repository_status_config() -> list[str] | None:
+    """ Probe the Git binary, and determine the config overrides for the repository in the current directory.
+
+**Returns:**
+ list[str]? - The name=value pairs to pass to git with -c, or None when not in a repository.
+    """
+    if (repo_git_dir := git_dir.find_git_dir()) is None:
+        return None
+    return get_status_config(probe_capabilities(repo_git_dir), git_config.read_config_values(repo_git_dir))
+
+
+def get_binary_key() -> list | None:
+    """ Identify the Git binary on the PATH by its real path and stat signature.
+
+**Returns:**
+ list? - The JSON-serializable key, or None if git was not found.
+    """
+    if (binary := shutil.which('git')) is None:
+        return None
+    try:
+        stat = os.stat(binary)
+    except OSError:
+        return None
+    return [os.path.realpath(binary), stat.st_mtime_ns, stat.st_size]
+
+
+def _is_unset_or_true(
+    value: str | None,
+) -> bool:
+    return value is None or git_config.is_true(value)
+
+
+def _read_capabilities(
+    state_dir: Path,
+    binary_key: list | None,
+) -> GitCapabilities | None:
+    if binary_key is None:
+        return None
+    try:
+        cached = state_file.read_state(state_dir, _CAPABILITIES_FILE_NAME)
+        if cached['binary'] != binary_key:
+            return None
+        return GitCapabilities(
+            version=tuple(int(number) for number in cached['version']),
+            fsmonitor_daemon=cached['fsmonitor_daemon'] is True,
+            untracked_cache=cached['untracked_cache'] is True,
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_capabilities(
+    state_dir: Path,
+    binary_key: list | None,
+    capabilities: GitCapabilities,
+):
+    """ Failure to write the probe result is not an error, the next run will probe again.
+    """
+    if binary_key is None:
+        return
+    state_file.write_state(state_dir, _CAPABILITIES_FILE_NAME, {'binary': binary_key, **capabilities._asdict()})
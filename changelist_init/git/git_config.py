@@ -0,0 +1,157 @@
+""" Reads Git Configuration Files without running a Git Process.
+ - Supports the subset of the config syntax needed to check a few settings.
+ - The global, repository and worktree config files are read directly.
+ - Configuration that the reader does not follow is listed by git config instead: a system config file,
+   include directives, and config given through the environment.
+"""
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from changelist_init.git import git_dir
+
+
+def read_config_values(
+    repo_git_dir: Path,
+) -> dict[str, str]:
+    """ Read the global, repository and worktree configuration values, with the more specific values taking precedence.
+ - When a system config file exists, a config file has include directives, or the environment adds config values,
+   the values are listed by git config. If git cannot be run, the values of the config files are returned.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository.
+
+**Returns:**
+ dict[str, str] - A map from lowercase section.key (or section.subsection.key) names to their last value.
+    """
+    values: dict[str, str] = {}
+    for config_path in (*_global_config_paths(), git_dir.get_common_dir(repo_git_dir) / 'config'):
+        values.update(_read_config_file(config_path))
+    if is_true(values.get('extensions.worktreeconfig')):
+        values.update(_read_config_file(repo_git_dir / 'config.worktree'))
+    if _has_includes(values) or _has_environment_config() or any(path.is_file() for path in _system_config_paths()):
+        if (listed_values := list_config_values(repo_git_dir)) is not None:
+            return listed_values
+    return values
+
+
+def list_config_values(
+    repo_git_dir: Path,
+) -> dict[str, str] | None:
+    """ List the configuration values that apply to the repository, by running git config.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository.
+
+**Returns:**
+ dict[str, str]? - A map from lowercase section.key (or section.subsection.key) names to their last value. None if git failed.
+    """
+    try:
+        result = subprocess.run(
+            args=['git', f"--git-dir={repo_git_dir}", 'config', '--null', '--list'],
+            capture_output=True,
+            shell=False,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    values: dict[str, str] = {}
+    for entry in result.stdout.decode(errors='replace').split('\0'):
+        if len(entry) > 0:
+            key, separator, value = entry.partition('\n')
+            values[key] = value if len(separator) > 0 else 'true'
+    return values
+
+
+def parse_config(
+    contents: str,
+) -> dict[str, str]:
+    """ Parse the contents of a Git Config file.
+ - Keys without a value are boolean true, as in git.
+
+**Parameters:**
+ - contents (str): The text of the config file.
+
+**Returns:**
+ dict[str, str] - A map from lowercase section.key (or section.subsection.key) names to their last value.
+    """
+    values: dict[str, str] = {}
+    section = ''
+    for line in contents.splitlines():
+        if len(line := line.strip()) == 0 or line[0] in '#;':
+            continue
+        if line.startswith('['):
+            header = line[1:line.find(']')].strip()
+            if '"' in header:  # Subsection names are case-sensitive
+                name, subsection = header.split('"', 1)
+                section = name.strip().lower() + '.' + subsection.rstrip('"')
+            else:
+                section = header.lower()
+            continue
+        key, separator, value = line.partition('=')
+        if len(separator) == 0:
+            value = 'true'
+        else:
+            value = value.split(' #', 1)[0].split(' ;', 1)[0].strip().strip('"')
+        values[f"{section}.{key.strip().lower()}"] = value
+    return values
+
+
+def is_true(
+    value: str | None,
+) -> bool:
+    """ Interpret a Git Config boolean value.
+
+**Parameters:**
+ - value (str?): The config value, or None if it was not set.
+
+**Returns:**
+ bool - True for the git true values (true, yes, on, 1).
+    """
+    return value is not None and value.lower() in ('true', 'yes', 'on', '1')
+
+
+def _read_config_file(
+    config_path: Path,
+) -> dict[str, str]:
+    try:
+        return parse_config(config_path.read_text(errors='replace'))
+    except OSError:
+        return {}
+
+
+def _has_includes(
+    values: dict[str, str],
+) -> bool:
+    return any(key == 'include.path' or (key.startswith('includeif.') and key.endswith('.path')) for key in values)
+
+
+def _has_environment_config() -> bool:
+    return 'GIT_CONFIG_PARAMETERS' in os.environ or 'GIT_CONFIG_COUNT' in os.environ
+
+
+def _system_config_paths() -> list[Path]:
+    """ The paths where the system config file of git may be, which depends on the installation prefix of git.
+    """
+    if is_true(os.environ.get('GIT_CONFIG_NOSYSTEM')):
+        return []
+    if (system_path := os.environ.get('GIT_CONFIG_SYSTEM')) is not None:
+        return [Path(system_path)]
+    paths = [Path('/etc/gitconfig')]
+    if (git_path := shutil.which('git')) is not None:
+        paths.append(Path(git_path).parent.parent / 'etc' / 'gitconfig')
+    return paths
+
+
+def _global_config_paths() -> list[Path]:
+    if (global_path := os.environ.get('GIT_CONFIG_GLOBAL')) is not None:
+        return [Path(global_path)]
+    paths = []
+    if (xdg_home := os.environ.get('XDG_CONFIG_HOME')) is not None:
+        paths.append(Path(xdg_home) / 'git' / 'config')
+    else:
+        paths.append(Path.home() / '.config' / 'git' / 'config')
+    paths.append(Path.home() / '.gitconfig')
+    return paths
@@ -0,0 +1,184 @@
+""" Locates Git Repository Files without running a Git Process.
+"""
+import os
+from pathlib import Path
+
+
+_STATE_DIR_NAME = 'changelist-init'
+
+
+def find_git_dir(
+    start: Path | None = None,
+) -> Path | None:
+    """ Find the Git Directory of the Repository containing the start directory.
+ - Respects the GIT_DIR environment variable.
+ - Follows the gitdir file used by linked worktrees and submodules.
+
+**Parameters:**
+ - start (Path?): The directory to begin searching from. Default: the current working directory.
+
+**Returns:**
+ Path? - The Git Directory, or None if no repository was found.
+    """
+    if (env_git_dir := os.environ.get('GIT_DIR')) is not None:
+        return Path(env_git_dir).absolute()
+    if (found := _find_dot_git(start)) is None:
+        return None
+    if found.is_dir():
+        return found
+    return _read_gitdir_file(found)
+
+
+def find_worktree_root(
+    start: Path | None = None,
+) -> Path | None:
+    """ Find the top-level directory of the Worktree containing the start directory.
+ - Git Status paths are relative to this directory.
+
+**Parameters:**
+ - start (Path?): The directory to begin searching from. Default: the current working directory.
+
+**Returns:**
+ Path? - The Worktree root directory, or None if no repository was found.
+    """
+    if (env_work_tree := os.environ.get('GIT_WORK_TREE')) is not None:
+        return Path(env_work_tree).absolute()
+    if (found := _find_dot_git(start)) is None:
+        return None
+    return found.parent
+
+
+def get_root_relative_path(
+    path: str,
+    root: Path,
+) -> str | None:
+    """ Convert a path relative to the working directory into a path relative to the Worktree root.
+
+**Parameters:**
+ - path (str): The path, relative to the working directory or absolute.
+ - root (Path): The Worktree root directory.
+
+**Returns:**
+ str? - The normalized path with forward slashes, an empty string for the root, or None if outside the Worktree.
+    """
+    try:
+        relative = Path(os.path.abspath(path)).relative_to(root.absolute())
+    except ValueError:
+        return None
+    return '' if relative == Path('.') else relative.as_posix()
+
+
+def _find_dot_git(
+    start: Path | None,
+) -> Path | None:
+    directory = (Path.cwd() if start is None else start).absolute()
+    for candidate in (directory, *directory.parents):
+        if (dot_git := candidate / '.git').exists():
+            return dot_git
+    return None
+
+
+def _read_gitdir_file(
+    dot_git: Path,
+) -> Path | None:
+    try:
+        contents = dot_git.read_text().strip()
+    except OSError:
+        return None
+    if not contents.startswith('gitdir:'):
+        return None
+    return (dot_git.parent / contents[7:].strip()).resolve()
+
+
+def read_head(
+    git_dir: Path,
+) -> str | None:
+    """ Read the HEAD reference, and the object id it resolves to.
+ - Loose refs are preferred over packed refs, as in git.
+
+**Parameters:**
+ - git_dir (Path): The Git Directory of the repository.
+
+**Returns:**
+ str? - The HEAD contents followed by the resolved object id, or None if HEAD could not be read.
+    """
+    try:
+        head = (git_dir / 'HEAD').read_text().strip()
+    except OSError:
+        return None
+    if not head.startswith('ref:'):
+        return head  # Detached HEAD
+    ref_name = head[4:].strip()
+    return f"{head} {resolve_ref(git_dir, ref_name) or ''}"
+
+
+def resolve_ref(
+    git_dir: Path,
+    ref_name: str,
+) -> str | None:
+    """ Resolve a reference name to an object id from loose or packed refs.
+
+**Parameters:**
+ - git_dir (Path): The Git Directory of the repository.
+ - ref_name (str): The full name of the reference, such as refs/heads/main.
+
+**Returns:**
+ str? - The object id, or None if the reference does not exist yet.
+    """
+    for ref_dir in _ref_dirs(git_dir):
+        try:
+            return (ref_dir / ref_name).read_text().strip()
+        except OSError:
+            pass
+        try:
+            with open(ref_dir / 'packed-refs') as packed_refs:
+                for line in packed_refs:
+                    if line.rstrip('\n').endswith(' ' + ref_name):
+                        return line.split(' ', 1)[0]
+        except OSError:
+            pass
+    return None
+
+
+def _ref_dirs(
+    git_dir: Path,
+) -> list[Path]:
+    """ Linked worktrees keep shared refs in the common directory.
+    """
+    if (common_dir := get_common_dir(git_dir)) == git_dir:
+        return [git_dir]
+    return [git_dir, common_dir]
+
+
+def get_common_dir(
+    git_dir: Path,
+) -> Path:
+    """ Obtain the directory containing the objects, config and shared refs of the repository.
+ - A linked worktree has its own Git Directory, which points to the common directory.
+
+**Parameters:**
+ - git_dir (Path): The Git Directory of the repository or linked worktree.
+
+**Returns:**
+ Path - The common directory, which is the Git Directory itself unless it is a linked worktree.
+    """
+    try:
+        common_dir = (git_dir / 'commondir').read_text().strip()
+    except OSError:
+        return git_dir
+    return (git_dir / common_dir).resolve()
+
+
+def get_state_dir(
+    git_dir: Path,
+) -> Path:
+    """ Obtain the directory where Changelist Init keeps its repository state and caches.
+ - Inside the Git Directory, so that state files never appear in git status output.
+
+**Parameters:**
+ - git_dir (Path): The Git Directory of the repository.
+
+**Returns:**
+ Path - The state directory path. It may not exist yet.
+    """
+    return git_dir / _STATE_DIR_NAME
@@ -0,0 +1,69 @@
+""" A Collection of Git Status records, grouped by Tracking Status.
+"""
+from typing import Iterable
+
+from changelist_init.git.git_tracking_status import GitTrackingStatus, get_tracking_status
+from changelist_init.git.status_reader import GitFileStatus
+from changelist_init.git.status_table import StatusTable
+
+
+class GitStatusLists:
+    """ Stores each Git Status record in the StatusTable of its Tracking Status.
+    """
+
+    __slots__ = ('_tables', '_tracking_statuses')
+
+    def __init__(self, file_status: Iterable[GitFileStatus] = ()):
+        self._tables = {tracking_status: StatusTable() for tracking_status in GitTrackingStatus}
+        self._tracking_statuses: dict[str, GitTrackingStatus | None] = {}
+        for record in file_status:
+            self.add_file_status(record)
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self._tables.values())
+
+    def add_file_status(self, file_status: GitFileStatus) -> bool:
+        """ Add a record to the list of its Tracking Status.
+
+**Parameters:**
+ - file_status (GitFileStatus): The status code and file path.
+
+**Returns:**
+ bool - Whether the record was added. Ignored files and codes without a change are not.
+        """
+        if (table := self.get_code_table(file_status.code)) is None:
+            return False
+        table.append(file_status)
+        return True
+
+    def get_code_table(self, code: str) -> StatusTable | None:
+        """ Obtain the StatusTable that records with a status code are added to.
+ - The Tracking Status of each code is computed once, so a caller can look up the table once per code.
+
+**Parameters:**
+ - code (str): The two character status code.
+
+**Returns:**
+ StatusTable? - The table of the Tracking Status of the code, or None for ignored files and codes without a change.
+        """
+        if code in self._tracking_statuses:
+            tracking_status = self._tracking_statuses[code]
+        else:
+            tracking_status = self._tracking_statuses[code] = get_tracking_status(code)
+        return None if tracking_status is None else self._tables[tracking_status]
+
+    def get_list(self, tracking_status: GitTrackingStatus) -> list[GitFileStatus]:
+        """ Obtain the records with a Tracking Status, in the order they were added.
+
+**Parameters:**
+ - tracking_status (GitTrackingStatus): The Tracking Status of the list.
+
+**Returns:**
+ list[GitFileStatus] - A new list of the records.
+        """
+        return list(self._tables[tracking_status])
+
+    def get_table(self, tracking_status: GitTrackingStatus) -> StatusTable:
+        """ Obtain the StatusTable of a Tracking Status, without creating a GitFileStatus for each record.
+        """
+        return self._tables[tracking_status]
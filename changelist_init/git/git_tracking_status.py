@@ -0,0 +1,33 @@
+""" The Tracking Status of a file, derived from the index (X) and worktree (Y) sides of its Git Status code.
+"""
+from enum import Enum
+
+
+class GitTrackingStatus(Enum):
+    """ Whether the changes to a file are untracked, in the worktree, in the index, or in both.
+    """
+    UNTRACKED = 'untracked'
+    UNSTAGED = 'unstaged'
+    STAGED = 'staged'
+    PARTIAL_STAGE = 'partial_stage'
+
+
+def get_tracking_status(
+    code: str,
+) -> GitTrackingStatus | None:
+    """ Classify a Git Status code by the sides of the repository that changed.
+ - Unmerged codes have changes on both sides, and are partially staged.
+
+**Parameters:**
+ - code (str): The two character status code.
+
+**Returns:**
+ GitTrackingStatus? - The Tracking Status, or None for ignored files and codes without a change.
+    """
+    if code == '??':
+        return GitTrackingStatus.UNTRACKED
+    if len(code) != 2 or code == '!!':
+        return None
+    if code[0] == ' ':
+        return None if code[1] == ' ' else GitTrackingStatus.UNSTAGED
+    return GitTrackingStatus.STAGED if code[1] == ' ' else GitTrackingStatus.PARTIAL_STAGE
@@ -0,0 +1,155 @@
+""" Reader for the Git Index file (versions 2, 3 and 4).
+ - Split indexes, sparse indexes and unmerged entries are reported as unsupported with a ValueError.
+"""
+import struct
+from collections import namedtuple
+from pathlib import Path
+
+from changelist_init.git.object_reader import read_offset_varint
+
+
+IndexEntry = namedtuple(
+    'IndexEntry',
+    'path mtime_s mtime_ns ino mode size oid skip_worktree assume_valid intent_to_add',
+)
+
+GitIndex = namedtuple(
+    'GitIndex',
+    'version entries cache_tree',
+)
+
+_ENTRY_HEADER = struct.Struct('>10I20sH')
+
+_FLAG_ASSUME_VALID = 0x8000
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_MASK = 0x3000
+_FLAG_NAME_MASK = 0x0fff
+_EXTENDED_SKIP_WORKTREE = 0x4000
+_EXTENDED_INTENT_TO_ADD = 0x2000
+
+_OID_SIZE = 20
+_SPARSE_DIRECTORY_MODE = 0o40000
+
+
+def read_index(
+    index_path: Path,
+) -> GitIndex:
+    """ Read the entries and cache tree of a Git Index file.
+
+**Parameters:**
+ - index_path (Path): The path to the index file, usually .git/index.
+
+**Returns:**
+ GitIndex - The index version, the entries in index order, and the valid cache tree object ids by directory.
+
+**Raises:**
+ ValueError - When the index uses a feature this reader does not support.
+ OSError - When the index file cannot be read.
+    """
+    data = index_path.read_bytes()
+    if data[:4] != b'DIRC':
+        raise ValueError("Not a Git Index file.")
+    version, count = struct.unpack_from('>II', data, 4)
+    if version not in (2, 3, 4):
+        raise ValueError(f"Unsupported index version: {version}")
+    entries = []
+    position = 12
+    previous_path = b''
+    for _ in range(count):
+        entry_start = position
+        (
+            _ctime_s, _ctime_ns, mtime_s, mtime_ns, _dev, ino, mode, _uid, _gid, size, oid, flags
+        ) = _ENTRY_HEADER.unpack_from(data, position)
+        position += _ENTRY_HEADER.size
+        extended_flags = 0
+        if flags & _FLAG_EXTENDED:
+            if version < 3:
+                raise ValueError("Extended flags in a version 2 index.")
+            extended_flags = struct.unpack_from('>H', data, position)[0]
+            position += 2
+        if flags & _FLAG_STAGE_MASK:
+            raise ValueError("Unmerged index entries are not supported.")
+        if mode == _SPARSE_DIRECTORY_MODE:
+            raise ValueError("Sparse index directories are not supported.")
+        if version == 4:
+            strip_length, position = read_offset_varint(data, position)
+            end = data.index(b'\0', position)
+            path = previous_path[:len(previous_path) - strip_length] + data[position:end]
+            position = end + 1
+        else:
+            name_length = flags & _FLAG_NAME_MASK
+            if name_length < _FLAG_NAME_MASK:
+                end = position + name_length
+            else:  # Long names are NUL terminated
+                end = data.index(b'\0', position)
+            path = data[position:end]
+            # Entries are padded with 1-8 NUL bytes to a multiple of 8 bytes
+            position = entry_start + ((end - entry_start + 8) & ~7)
+        previous_path = path
+        entries.append(
+            IndexEntry(
+                path=path,
+                mtime_s=mtime_s,
+                mtime_ns=mtime_ns,
+                ino=ino,
+                mode=mode,
+                size=size,
+                oid=oid,
+                skip_worktree=bool(extended_flags & _EXTENDED_SKIP_WORKTREE),
+                assume_valid=bool(flags & _FLAG_ASSUME_VALID),
+                intent_to_add=bool(extended_flags & _EXTENDED_INTENT_TO_ADD),
+            )
+        )
+    return GitIndex(
+        version=version,
+        entries=entries,
+        cache_tree=_read_extensions(data, position),
+    )
+
+
+def _read_extensions(
+    data: bytes,
+    position: int,
+) -> dict[bytes, bytes]:
+    cache_tree: dict[bytes, bytes] = {}
+    end = len(data) - _OID_SIZE  # The trailing checksum
+    while position + 8 <= end:
+        signature = data[position:position + 4]
+        size = struct.unpack_from('>I', data, position + 4)[0]
+        position += 8
+        if signature == b'TREE':
+            _read_cache_tree(data[position:position + size], cache_tree)
+        elif not b'A' <= signature[:1] <= b'Z':
+            # Required extensions, such as link (split index) and sdir (sparse index)
+            raise ValueError(f"Unsupported index extension: {signature!r}")
+        position += size
+    return cache_tree
+
+
+def _read_cache_tree(
+    data: bytes,
+    cache_tree: dict[bytes, bytes],
+):
+    """ Read the valid Cache Tree object ids into the dict, keyed by directory path without a trailing slash.
+    """
+    # A stack of (directory path, remaining subtree count)
+    stack: list[list] = []
+    position = 0
+    while position < len(data):
+        nul = data.index(b'\0', position)
+        name = data[position:nul]
+        newline = data.index(b'\n', nul)
+        entry_count, subtree_count = (int(n) for n in data[nul + 1:newline].split(b' '))
+        position = newline + 1
+        while len(stack) > 0 and stack[-1][1] == 0:
+            stack.pop()
+        if len(stack) > 0:
+            stack[-1][1] -= 1
+            parent = stack[-1][0]
+            path = name if len(parent) == 0 else parent + b'/' + name
+        else:
+            path = name
+        if entry_count >= 0:
+            cache_tree[path] = data[position:position + _OID_SIZE]
+            position += _OID_SIZE
+        stack.append([path, subtree_count])
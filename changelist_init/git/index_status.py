@@ -0,0 +1,389 @@
+""" Tracked File Status from the Git Index, without running a Git Process.
+ - Staged changes compare the Index with the HEAD tree, skipping subtrees whose Cache Tree matches HEAD.
+ - Unstaged changes compare the Index with the Worktree, hashing only files whose stat data has changed.
+ - Returns None when the repository uses a feature that requires git, so callers can fall back.
+"""
+import hashlib
+import os
+import stat
+import zlib
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+
+from changelist_init.git import git_dir, git_config
+from changelist_init.git.index_reader import GitIndex, IndexEntry, read_index
+from changelist_init.git.object_reader import ObjectReader, is_tree_mode
+from changelist_init.git.status_reader import GitFileStatus
+
+
+_GITLINK_MODE = 0o160000
+_SYMLINK_MODE = 0o120000
+_TYPE_MASK = 0o170000
+
+# The number of Index entries that justifies each additional worktree comparison thread.
+_ENTRIES_PER_WORKER = 2000
+_MAX_WORKERS = 32
+_SHARDS_PER_WORKER = 4
+
+# The attribute names that may transform file contents between the worktree and the index.
+_FILTER_ATTRIBUTES = (b'text', b'eol', b'crlf', b'filter', b'ident', b'working-tree-encoding')
+
+
+def read_index_status(
+    repo_git_dir: Path | None = None,
+    root: Path | None = None,
+    workers: int | None = None,
+    scope: list[str] | None = None,
+) -> list[GitFileStatus] | None:
+    """ Read the Status of tracked files from the Git Index, sorted by path.
+ - Worktree files are compared with the Index in parallel threads, as stat calls release the GIL.
+
+**Parameters:**
+ - repo_git_dir (Path?): The Git Directory of the repository. Default: found from the working directory.
+ - root (Path?): The Worktree root directory. Default: found from the working directory.
+ - workers (int?): The number of worktree comparison threads. Default: sized by the number of Index entries.
+ - scope (list[str]?): The paths, relative to the root, that limit the files read. Default: None, the whole repository.
+
+**Returns:**
+ list[GitFileStatus]? - The Status of each changed tracked file, or None if git is required.
+    """
+    if repo_git_dir is None:
+        repo_git_dir = git_dir.find_git_dir()
+    if root is None:
+        root = git_dir.find_worktree_root()
+    if repo_git_dir is None or root is None:
+        return None
+    try:
+        return _read_index_status(repo_git_dir, root, workers, scope)
+    except (ValueError, KeyError, OSError, IndexError, zlib.error):
+        return None
+
+
+def read_worktree_changes(
+    repo_git_dir: Path,
+    root: Path,
+    workers: int | None = None,
+    scope: list[str] | None = None,
+    excluded_paths: set[str] | None = None,
+) -> list[str] | None:
+    """ Compare the tracked files in the Worktree with the Git Index, without reading HEAD.
+ - Files are hashed only when their stat data differs from the Index, as git does when refreshing the Index.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository.
+ - root (Path): The Worktree root directory.
+ - workers (int?): The number of worktree comparison threads. Default: sized by the number of Index entries.
+ - scope (list[str]?): The paths, relative to the root, that limit the files compared. Default: None, the whole repository.
+ - excluded_paths (set[str]?): The paths, relative to the root, that are not compared. Default: None.
+
+**Returns:**
+ list[str]? - The sorted paths of the tracked files that differ from the Index, or None if git is required.
+    """
+    try:
+        if (worktree := _read_worktree_codes(repo_git_dir, root, workers, scope, excluded_paths)) is None:
+            return None
+    except (ValueError, KeyError, OSError, IndexError):
+        return None
+    return sorted(path.decode('utf-8', 'surrogateescape') for path in worktree[1])
+
+
+def _read_index_status(
+    repo_git_dir: Path,
+    root: Path,
+    workers: int | None,
+    scope: list[str] | None,
+) -> list[GitFileStatus] | None:
+    if (worktree := _read_worktree_codes(repo_git_dir, root, workers, scope)) is None:
+        return None
+    index, worktree_codes = worktree
+    codes: dict[bytes, list[str]] = {path: [' ', code] for path, code in worktree_codes.items()}
+    if scope is not None:
+        scope_paths = [os.fsencode(path) for path in scope]
+    with ObjectReader(repo_git_dir) as reader:
+        for path, staged_code in _diff_head_with_index(repo_git_dir, reader, index).items():
+            if scope is None or _is_in_scope(path, scope_paths):
+                codes.setdefault(path, [' ', ' '])[0] = staged_code
+    return [
+        GitFileStatus(code=''.join(code), file_path=path.decode('utf-8', 'surrogateescape'))
+        for path, code in sorted(codes.items())
+    ]
+
+
+def _read_worktree_codes(
+    repo_git_dir: Path,
+    root: Path,
+    workers: int | None,
+    scope: list[str] | None,
+    excluded_paths: set[str] | None = None,
+) -> tuple[GitIndex | None, dict[bytes, str]] | None:
+    """ Read the Index, and the worktree status code (Y) of each Index entry that differs from the Worktree.
+    """
+    config = git_config.read_config_values(repo_git_dir)
+    if config.get('extensions.objectformat', 'sha1').lower() != 'sha1':
+        return None
+    if (index_path := repo_git_dir / 'index').exists():
+        index = read_index(index_path)
+        index_mtime_ns = os.stat(index_path).st_mtime_ns
+    else:  # No files have been added yet
+        index, index_mtime_ns = None, 0
+    entries = [] if index is None else index.entries
+    if any(e.mode == _GITLINK_MODE for e in entries):
+        return None  # Submodule status requires git
+    comparison = _WorktreeComparison(
+        root=root,
+        index_mtime_ns=index_mtime_ns,
+        check_filemode=git_config.is_true(config.get('core.filemode', 'false' if os.name == 'nt' else 'true')),
+        check_symlinks=git_config.is_true(config.get('core.symlinks', 'false' if os.name == 'nt' else 'true')),
+        may_filter=_may_filter_contents(repo_git_dir, root, config, entries),
+    )
+    if scope is not None:
+        scope_paths = [os.fsencode(path) for path in scope]
+        entries = [e for e in entries if _is_in_scope(e.path, scope_paths)]
+    if excluded_paths is not None and len(excluded_paths) > 0:
+        excluded = {os.fsencode(path) for path in excluded_paths}
+        entries = [e for e in entries if e.path not in excluded]
+    codes: dict[bytes, str] = {}
+    for entry, worktree_code in zip(entries, _compare_worktree(comparison, entries, workers)):
+        if worktree_code is None:
+            return None
+        if worktree_code != ' ':
+            codes[entry.path] = worktree_code
+    return index, codes
+
+
+def _is_in_scope(
+    path: bytes,
+    scope_paths: list[bytes],
+) -> bool:
+    return any(path == s or path.startswith(s + b'/') for s in scope_paths)
+
+
+class _WorktreeComparison:
+    """ Compares Index entries with the Worktree, as git does when refreshing the index.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index_mtime_ns: int,
+        check_filemode: bool,
+        check_symlinks: bool,
+        may_filter: bool,
+    ):
+        self.root = root
+        self.index_mtime_ns = index_mtime_ns
+        self.check_filemode = check_filemode
+        self.check_symlinks = check_symlinks
+        self.may_filter = may_filter
+
+    def compare(self, entry: IndexEntry) -> str | None:
+        """ Determine the worktree status code (Y) of an Index entry, or None if git is required.
+        """
+        if entry.skip_worktree or entry.assume_valid:
+            return ' '
+        if entry.intent_to_add:
+            return 'A'
+        try:
+            file_stat = os.lstat(self.root / os.fsdecode(entry.path))
+        except (FileNotFoundError, NotADirectoryError):
+            return 'D'
+        return self.compare_stat(entry, file_stat)
+
+    def compare_stat(self, entry: IndexEntry, file_stat: os.stat_result) -> str | None:
+        """ Determine the worktree status code (Y) of an Index entry from its worktree stat data.
+        """
+        if stat.S_ISDIR(file_stat.st_mode):
+            return 'D'
+        is_symlink = stat.S_ISLNK(file_stat.st_mode)
+        if (entry.mode & _TYPE_MASK) == _SYMLINK_MODE:
+            if not self.check_symlinks:
+                return None
+            if not is_symlink:
+                return 'T'
+        elif is_symlink:
+            return 'T'
+        elif self.check_filemode and bool(file_stat.st_mode & 0o100) != bool(entry.mode & 0o100):
+            return 'M'
+        if file_stat.st_size != entry.size and not self.may_filter:
+            return 'M'
+        if self._is_stat_clean(entry, file_stat):
+            return ' '
+        if _hash_worktree_file(self.root / os.fsdecode(entry.path), is_symlink) == entry.oid:
+            return ' '
+        return None if self.may_filter else 'M'
+
+    def _is_stat_clean(self, entry: IndexEntry, file_stat: os.stat_result) -> bool:
+        mtime_s, mtime_ns = divmod(file_stat.st_mtime_ns, 1_000_000_000)
+        if (mtime_s, mtime_ns) != (entry.mtime_s, entry.mtime_ns):
+            return False
+        if file_stat.st_size != entry.size or (entry.ino != 0 and entry.ino != file_stat.st_ino & 0xffffffff):
+            return False
+        # Racily clean: modified in the same instant as the index was written
+        return file_stat.st_mtime_ns < self.index_mtime_ns
+
+
+def get_worker_count(
+    entry_count: int,
+) -> int:
+    """ Size the worktree comparison thread pool for an Index.
+ - Small indexes are compared in the calling thread, where the pool startup would cost more than it saves.
+
+**Parameters:**
+ - entry_count (int): The number of Index entries to compare.
+
+**Returns:**
+ int - The number of threads, at least 1.
+    """
+    return max(1, min(_MAX_WORKERS, (os.cpu_count() or 1) + 4, entry_count // _ENTRIES_PER_WORKER))
+
+
+def _compare_worktree(
+    comparison: _WorktreeComparison,
+    entries: list[IndexEntry],
+    workers: int | None,
+) -> list[str | None]:
+    """ Compare each Index entry with the Worktree, returning the codes in Index order.
+    """
+    if workers is None:
+        workers = get_worker_count(len(entries))
+    if workers <= 1 or len(entries) < 2:
+        return [comparison.compare(e) for e in entries]
+    # Several shards per thread balance the load when hashing is concentrated in one part of the tree
+    shard_size = -(-len(entries) // (workers * _SHARDS_PER_WORKER))
+    shards = [entries[i:i + shard_size] for i in range(0, len(entries), shard_size)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Map returns the shard results in submission order
+        return list(chain.from_iterable(
+            executor.map(lambda shard: [comparison.compare(e) for e in shard], shards)
+        ))
+
+
+def _hash_worktree_file(
+    path: Path,
+    is_symlink: bool,
+) -> bytes:
+    if is_symlink:
+        contents = os.fsencode(os.readlink(path))
+    else:
+        contents = path.read_bytes()
+    return hashlib.sha1(b'blob %d\0' % len(contents) + contents).digest()
+
+
+def _may_filter_contents(
+    repo_git_dir: Path,
+    root: Path,
+    config: dict[str, str],
+    entries: list[IndexEntry],
+) -> bool:
+    """ Whether line ending conversion or content filters may apply, so worktree hashes can differ from the index.
+    """
+    if os.name == 'nt':  # Line ending conversion is configured system-wide
+        return True
+    if config.get('core.autocrlf', 'false').lower() != 'false' or 'core.attributesfile' in config:
+        return True
+    attribute_files = [git_dir.get_common_dir(repo_git_dir) / 'info' / 'attributes']
+    attribute_files.extend(
+        root / os.fsdecode(e.path)
+        for e in entries if e.path == b'.gitattributes' or e.path.endswith(b'/.gitattributes')
+    )
+    for attribute_file in attribute_files:
+        try:
+            contents = attribute_file.read_bytes()
+        except OSError:
+            continue
+        if any(name in contents for name in _FILTER_ATTRIBUTES):
+            return True
+    return False
+
+
+def _diff_head_with_index(
+    repo_git_dir: Path,
+    reader: ObjectReader,
+    index: GitIndex | None,
+) -> dict[bytes, str]:
+    """ Determine the staged status code (X) of each path that differs between HEAD and the Index.
+    """
+    entries = {} if index is None else {e.path: e for e in index.entries if not e.intent_to_add}
+    head = git_dir.read_head(repo_git_dir)
+    if head is None or len(head_oid := head.rsplit(' ', 1)[-1]) == 0:  # Unborn branch
+        return {path: 'A' for path in entries}
+    return _TreeDiff(
+        reader=reader,
+        entries=entries,
+        cache_tree={} if index is None else index.cache_tree,
+    ).diff(reader.read_commit_tree(bytes.fromhex(head_oid)))
+
+
+class _TreeDiff:
+    """ Compares the HEAD tree with the Index entries, one directory at a time.
+    """
+
+    def __init__(self, reader: ObjectReader, entries: dict[bytes, IndexEntry], cache_tree: dict[bytes, bytes]):
+        self.reader = reader
+        self.entries = entries
+        self.paths = sorted(entries)
+        self.cache_tree = cache_tree
+        self.codes: dict[bytes, str] = {}
+
+    def diff(self, tree_oid: bytes) -> dict[bytes, str]:
+        self._diff_tree(tree_oid, b'')
+        return self.codes
+
+    def _diff_tree(self, tree_oid: bytes, prefix: bytes):
+        if self.cache_tree.get(prefix.rstrip(b'/')) == tree_oid:
+            return  # The Index matches HEAD within this directory
+        index_files, index_dirs = self._index_children(prefix)
+        head_files, head_dirs = set(), set()
+        for name, mode, oid in self.reader.read_tree(tree_oid):
+            path = prefix + name
+            if is_tree_mode(mode):
+                head_dirs.add(name)
+                if name in index_dirs:
+                    self._diff_tree(oid, path + b'/')
+                else:
+                    self._mark_tree_deleted(oid, path + b'/')
+            elif (entry := index_files.get(name)) is None:
+                head_files.add(name)
+                self.codes[path] = 'D'
+            else:
+                head_files.add(name)
+                if (entry.mode & _TYPE_MASK) != (mode & _TYPE_MASK):
+                    self.codes[path] = 'T'
+                elif entry.oid != oid or entry.mode != mode:
+                    self.codes[path] = 'M'
+        for name, entry in index_files.items():
+            if name not in head_files:
+                self.codes[entry.path] = 'A'
+        for name in index_dirs:
+            if name not in head_dirs:
+                for path in self._paths_under(prefix + name + b'/'):
+                    self.codes[path] = 'A'
+
+    def _mark_tree_deleted(self, tree_oid: bytes, prefix: bytes):
+        for name, mode, oid in self.reader.read_tree(tree_oid):
+            if is_tree_mode(mode):
+                self._mark_tree_deleted(oid, prefix + name + b'/')
+            else:
+                self.codes[prefix + name] = 'D'
+
+    def _paths_under(self, prefix: bytes) -> list[bytes]:
+        low = bisect_left(self.paths, prefix)
+        high = bisect_left(self.paths, prefix[:-1] + b'0')  # The byte after '/'
+        return self.paths[low:high]
+
+    def _index_children(self, prefix: bytes) -> tuple[dict[bytes, IndexEntry], set[bytes]]:
+        files: dict[bytes, IndexEntry] = {}
+        dirs: set[bytes] = set()
+        if len(prefix) == 0:
+            paths = self.paths
+        else:
+            paths = self._paths_under(prefix)
+        for path in paths:
+            name = path[len(prefix):]
+            if (slash := name.find(b'/')) < 0:
+                files[name] = self.entries[path]
+            else:
+                dirs.add(name[:slash])
+        return files, dirs
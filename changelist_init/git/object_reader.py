@@ -0,0 +1,278 @@
+""" Reads Git Objects from loose object files and pack files without running a Git Process.
+ - Supports SHA-1 repositories with version 2 pack indexes, and both kinds of delta objects.
+ - Missing objects raise KeyError, so callers can fall back to running git.
+"""
+import mmap
+import struct
+import zlib
+from bisect import bisect_left
+from pathlib import Path
+
+from changelist_init.git import git_dir
+
+
+_OID_SIZE = 20
+_PACK_INDEX_MAGIC = b'\377tOc'
+
+_PACK_OBJECT_TYPES = {
+    1: b'commit',
+    2: b'tree',
+    3: b'blob',
+    4: b'tag',
+}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+
+_TREE_MODE = 0o40000
+
+
+class ObjectReader:
+    """ Reads Objects from the Object Databases of a Repository.
+ - Pack files are memory-mapped when first needed, and closed by close().
+    """
+
+    def __init__(self, repo_git_dir: Path):
+        self._object_dirs = _find_object_dirs(git_dir.get_common_dir(repo_git_dir) / 'objects')
+        self._packs: list[_Pack] | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Close the memory maps of any opened pack files.
+        """
+        for pack in self._packs or ():
+            pack.close()
+        self._packs = None
+
+    def read(self, oid: bytes) -> tuple[bytes, bytes]:
+        """ Read an Object by its binary object id.
+
+**Parameters:**
+ - oid (bytes): The 20 byte binary object id.
+
+**Returns:**
+ tuple[bytes, bytes] - The object type (commit, tree, blob, tag) and the object contents.
+
+**Raises:**
+ KeyError - When the object is not in any object database.
+        """
+        hex_oid = oid.hex()
+        for object_dir in self._object_dirs:
+            try:
+                compressed = (object_dir / hex_oid[:2] / hex_oid[2:]).read_bytes()
+            except OSError:
+                continue
+            header, _, contents = zlib.decompress(compressed).partition(b'\0')
+            return header.split(b' ', 1)[0], contents
+        if self._packs is None:
+            self._packs = [_Pack(idx) for object_dir in self._object_dirs for idx in sorted((object_dir / 'pack').glob('*.idx'))]
+        for pack in self._packs:
+            if (offset := pack.find_offset(oid)) is not None:
+                return pack.read_at(offset, self)
+        raise KeyError(hex_oid)
+
+    def read_commit_tree(self, oid: bytes) -> bytes:
+        """ Read the root tree object id of a commit.
+
+**Parameters:**
+ - oid (bytes): The binary object id of the commit.
+
+**Returns:**
+ bytes - The binary object id of the root tree.
+        """
+        object_type, contents = self.read(oid)
+        if object_type != b'commit' or not contents.startswith(b'tree '):
+            raise ValueError(f"Not a commit: {oid.hex()}")
+        return bytes.fromhex(contents[5:5 + 2 * _OID_SIZE].decode())
+
+    def read_tree(self, oid: bytes) -> list[tuple[bytes, int, bytes]]:
+        """ Read the entries of a tree object.
+
+**Parameters:**
+ - oid (bytes): The binary object id of the tree.
+
+**Returns:**
+ list[tuple[bytes, int, bytes]] - The name, mode and binary object id of each entry.
+        """
+        object_type, contents = self.read(oid)
+        if object_type != b'tree':
+            raise ValueError(f"Not a tree: {oid.hex()}")
+        entries = []
+        position = 0
+        while position < len(contents):
+            space = contents.index(b' ', position)
+            nul = contents.index(b'\0', space)
+            entries.append(
+                (contents[space + 1:nul], int(contents[position:space], 8), contents[nul + 1:nul + 1 + _OID_SIZE])
+            )
+            position = nul + 1 + _OID_SIZE
+        return entries
+
+
+def is_tree_mode(mode: int) -> bool:
+    """ Whether a tree entry mode describes a subtree.
+    """
+    return mode == _TREE_MODE
+
+
+class _Pack:
+    """ A Pack file and its version 2 index, memory-mapped for lookups.
+    """
+
+    def __init__(self, idx_path: Path):
+        with open(idx_path, 'rb') as idx_file:
+            self._idx = mmap.mmap(idx_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._idx[:4] != _PACK_INDEX_MAGIC or struct.unpack_from('>I', self._idx, 4)[0] != 2:
+            self.close()
+            raise ValueError(f"Unsupported pack index: {idx_path}")
+        self._fanout = struct.unpack_from('>256I', self._idx, 8)
+        self._count = self._fanout[255]
+        self._oids_offset = 8 + 256 * 4
+        self._offsets_offset = self._oids_offset + self._count * (_OID_SIZE + 4)
+        self._large_offsets_offset = self._offsets_offset + self._count * 4
+        with open(idx_path.with_suffix('.pack'), 'rb') as pack_file:
+            self._pack = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        for mapping in (getattr(self, '_idx', None), getattr(self, '_pack', None)):
+            if mapping is not None:
+                mapping.close()
+
+    def find_offset(self, oid: bytes) -> int | None:
+        low = self._fanout[oid[0] - 1] if oid[0] > 0 else 0
+        high = self._fanout[oid[0]]
+        index = bisect_left(_OidTable(self._idx, self._oids_offset), oid, low, high)
+        if index >= high or self._oid_at(index) != oid:
+            return None
+        offset = struct.unpack_from('>I', self._idx, self._offsets_offset + 4 * index)[0]
+        if offset & 0x80000000:
+            large_index = offset & 0x7fffffff
+            offset = struct.unpack_from('>Q', self._idx, self._large_offsets_offset + 8 * large_index)[0]
+        return offset
+
+    def _oid_at(self, index: int) -> bytes:
+        start = self._oids_offset + index * _OID_SIZE
+        return self._idx[start:start + _OID_SIZE]
+
+    def read_at(self, offset: int, reader: ObjectReader) -> tuple[bytes, bytes]:
+        byte = self._pack[offset]
+        object_type = (byte >> 4) & 0x7
+        position = offset + 1
+        while byte & 0x80:
+            byte = self._pack[position]
+            position += 1
+        if object_type == _OFS_DELTA:
+            base_distance, position = read_offset_varint(self._pack, position)
+            base_type, base = self.read_at(offset - base_distance, reader)
+            return base_type, apply_delta(base, self._inflate(position))
+        if object_type == _REF_DELTA:
+            base_type, base = reader.read(self._pack[position:position + _OID_SIZE])
+            return base_type, apply_delta(base, self._inflate(position + _OID_SIZE))
+        if (type_name := _PACK_OBJECT_TYPES.get(object_type)) is None:
+            raise ValueError(f"Unknown pack object type: {object_type}")
+        return type_name, self._inflate(position)
+
+    def _inflate(self, position: int) -> bytes:
+        decompressor = zlib.decompressobj()
+        output = []
+        while not decompressor.eof:
+            if position >= len(self._pack):
+                raise ValueError("Truncated pack object.")
+            output.append(decompressor.decompress(self._pack[position:position + 65536]))
+            position += 65536
+        return b''.join(output)
+
+
+class _OidTable:
+    """ A sequence view of the sorted object ids in a pack index, for bisect.
+    """
+
+    def __init__(self, idx: mmap.mmap, oids_offset: int):
+        self._idx = idx
+        self._oids_offset = oids_offset
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self._oids_offset + index * _OID_SIZE
+        return self._idx[start:start + _OID_SIZE]
+
+
+def read_offset_varint(
+    data: bytes | mmap.mmap,
+    position: int,
+) -> tuple[int, int]:
+    """ Read the variable-length offset encoding shared by pack OFS_DELTA objects and index v4 paths.
+
+**Parameters:**
+ - data (bytes | mmap): The buffer to read from.
+ - position (int): The position of the first byte of the encoded value.
+
+**Returns:**
+ tuple[int, int] - The decoded value, and the position after it.
+    """
+    byte = data[position]
+    value = byte & 0x7f
+    position += 1
+    while byte & 0x80:
+        byte = data[position]
+        position += 1
+        value = ((value + 1) << 7) | (byte & 0x7f)
+    return value, position
+
+
+def apply_delta(
+    base: bytes,
+    delta: bytes,
+) -> bytes:
+    """ Apply a Git pack delta to its base object contents.
+
+**Parameters:**
+ - base (bytes): The contents of the base object.
+ - delta (bytes): The delta instructions.
+
+**Returns:**
+ bytes - The contents of the resulting object.
+    """
+    position = 0
+    for _ in range(2):  # Skip the source and target sizes
+        while delta[position] & 0x80:
+            position += 1
+        position += 1
+    output = bytearray()
+    while position < len(delta):
+        opcode = delta[position]
+        position += 1
+        if opcode & 0x80:  # Copy from the base
+            copy_offset = copy_size = 0
+            for shift in range(4):
+                if opcode & (1 << shift):
+                    copy_offset |= delta[position] << (8 * shift)
+                    position += 1
+            for shift in range(3):
+                if opcode & (0x10 << shift):
+                    copy_size |= delta[position] << (8 * shift)
+                    position += 1
+            output += base[copy_offset:copy_offset + (copy_size or 0x10000)]
+        elif opcode > 0:  # Insert new data
+            output += delta[position:position + opcode]
+            position += opcode
+        else:
+            raise ValueError("Invalid delta opcode.")
+    return bytes(output)
+
+
+def _find_object_dirs(
+    objects_dir: Path,
+) -> list[Path]:
+    object_dirs = [objects_dir]
+    try:
+        alternates = (objects_dir / 'info' / 'alternates').read_text().splitlines()
+    except OSError:
+        return object_dirs
+    for alternate in alternates:
+        if len(alternate := alternate.strip()) > 0 and not alternate.startswith('#'):
+            object_dirs.append((objects_dir / alternate).resolve())
+    return object_dirs
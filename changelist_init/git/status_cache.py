@@ -0,0 +1,337 @@
+""" Persistent Cache of Git Status Records.
+ - Keyed on the stat signature of the Git Index, the HEAD reference, and an optional fsmonitor token.
+ - Cached paths are stat-validated, so edits to files that were already changed invalidate the cache.
+ - The other tracked files are compared with the Git Index, hashing only the files whose stat data differs from it.
+ - With untracked files, the stat signature of each Worktree directory detects files that were added or removed.
+ - The cache is only used where the Index reader supports the repository, otherwise git runs every time.
+ - An incremental refresh replaces a cache invalidated by HEAD or the Index, with the status of the paths that may have changed.
+"""
+import os
+import time
+from pathlib import Path
+from typing import Callable, Generator, Iterable
+
+from changelist_init import state_file
+from changelist_init.git import git_dir, status_runner, index_status
+from changelist_init.git.status_reader import GitFileStatus
+from changelist_init.git.status_table import StatusTable
+
+
+_CACHE_FILE_NAME = 'status_cache.json'
+_CACHE_VERSION = 2
+
+# Stat signatures modified this close to the start of the collection are not recorded, as git may not have seen the change.
+_RACY_INTERVAL_NS = 2_000_000_000
+
+# The number of paths above which an incremental refresh runs on the whole scope instead.
+_MAX_REFRESH_PATHS = 1000
+
+
+def cached_file_status(
+    include_untracked: bool,
+    file_status: Generator[GitFileStatus, None, bool],
+    fsmonitor_token: str | None = None,
+    scope: list[str] | None = None,
+    refresh_status: Callable[[list[str]], Generator[GitFileStatus, None, bool]] | None = None,
+    collection_options: list | None = None,
+) -> Generator[GitFileStatus, None, None]:
+    """ Replay cached GitFileStatus records, or record the output of the given Generator.
+ - On a cache hit, the Generator is closed before it starts, so no Git Process is created.
+ - On a miss, the refresh function replaces the Generator when the cache can be refreshed incrementally.
+ - The records are written to the cache only if the Generator completed in the requested mode.
+
+**Parameters:**
+ - include_untracked (bool): Whether the records include untracked files. Part of the cache key.
+ - file_status (Generator[GitFileStatus, None, bool]): The status records, returning True when complete.
+ - fsmonitor_token (str?): A token that changes whenever the worktree changes, such as an fsmonitor clock.
+ - scope (list[str]?): The paths that limit the records. Part of the cache key.
+ - refresh_status (Callable?): Collects the status of a list of paths. Default: None, no incremental refresh.
+ - collection_options (list?): Other options that change the records, such as collapsed directories. Part of the cache key.
+
+**Yields:**
+ GitFileStatus - The file information including status code and file path.
+    """
+    if (repo_git_dir := git_dir.find_git_dir()) is None or (root := git_dir.find_worktree_root()) is None:
+        yield from file_status
+        return None
+    key = compute_cache_key(repo_git_dir, include_untracked, fsmonitor_token, scope, collection_options)
+    head = get_head_commit(repo_git_dir)
+    if (cached_records := read_cache(repo_git_dir, root, key, scope)) is not None:
+        file_status.close()
+        yield from cached_records
+        return None
+    if refresh_status is not None and\
+            (refresh_paths := get_refresh_paths(repo_git_dir, key, head, scope, root)) is not None:
+        file_status.close()
+        file_status = refresh_status(refresh_paths) if len(refresh_paths) > 0 else _empty_status()
+    records = StatusTable()
+    started_ns = time.time_ns()
+    if (yield from _record_into(records, file_status)) and key == compute_cache_key(
+        repo_git_dir, include_untracked, fsmonitor_token, scope, collection_options
+    ):
+        write_cache(repo_git_dir, root, key, records, head, started_ns, include_untracked, scope)
+
+
+def _empty_status() -> Generator[GitFileStatus, None, bool]:
+    yield from ()
+    return True
+
+
+def _record_into(
+    records: StatusTable,
+    file_status: Generator[GitFileStatus, None, bool],
+) -> Generator[GitFileStatus, None, bool]:
+    while True:
+        try:
+            record = next(file_status)
+        except StopIteration as stop:
+            return bool(stop.value)
+        records.append(record)
+        yield record
+
+
+def compute_cache_key(
+    repo_git_dir: Path,
+    include_untracked: bool,
+    fsmonitor_token: str | None = None,
+    scope: list[str] | None = None,
+    collection_options: list | None = None,
+) -> list:
+    """ Compute the Cache Key from Repository state that changes with the Git Index, HEAD and the exclude file.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository.
+ - include_untracked (bool): Whether the records include untracked files.
+ - fsmonitor_token (str?): A token that changes whenever the worktree changes.
+ - scope (list[str]?): The paths that limit the records. Default: None, the whole repository.
+ - collection_options (list?): Other options that change the records. Default: None.
+
+**Returns:**
+ list - The JSON-serializable cache key.
+    """
+    return [
+        _CACHE_VERSION,
+        include_untracked,
+        _stat_signature(repo_git_dir / 'index'),
+        git_dir.read_head(repo_git_dir),
+        fsmonitor_token,
+        scope,
+        collection_options,
+        _stat_signature(git_dir.get_common_dir(repo_git_dir) / 'info' / 'exclude') if include_untracked else None,
+    ]
+
+
+def get_head_commit(
+    repo_git_dir: Path,
+) -> str | None:
+    """ Read the object id of the commit that HEAD resolves to.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository.
+
+**Returns:**
+ str? - The commit object id, or None if HEAD could not be read or the branch has no commits yet.
+    """
+    if (head := git_dir.read_head(repo_git_dir)) is None or len(commit := head.rsplit(' ', 1)[-1]) == 0:
+        return None
+    return commit
+
+
+def get_refresh_paths(
+    repo_git_dir: Path,
+    key: list,
+    head: str | None,
+    scope: list[str] | None = None,
+    root: Path | None = None,
+) -> list[str] | None:
+    """ Determine the paths whose status may differ from the cache, when only HEAD, the Index or cached paths changed.
+ - The cached paths, the paths changed by commits since the cache was written, and the staged paths.
+ - The tracked files that differ from the Index, and the directories whose entries changed.
+ - A changed .gitignore file, or a change to the root directory, requires the whole scope when untracked files are included.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository, where the cache is stored.
+ - key (list): The current cache key. The options in the key must match the cache.
+ - head (str?): The commit object id that HEAD currently resolves to.
+ - scope (list[str]?): The paths that limit the records. Default: None, the whole repository.
+ - root (Path?): The Worktree root directory. Default: found from the working directory.
+
+**Returns:**
+ list[str]? - The sorted paths to refresh, or None if the cache cannot be refreshed incrementally.
+    """
+    if root is None and (root := git_dir.find_worktree_root()) is None:
+        return None
+    if head is None or (cache := _read_cache_file(repo_git_dir)) is None:
+        return None
+    if not isinstance(cached_key := cache.get('key'), list) or len(cached_key) != len(key) or\
+            not _is_same_options(cached_key, key) or not isinstance(cached_head := cache.get('head'), str):
+        return None
+    try:
+        paths = {file_path for _, file_path, _ in cache.get('records', [])}
+    except (TypeError, ValueError):  # Malformed Cache Records
+        return None
+    if cached_head != head:
+        if (committed_paths := status_runner.run_git_diff_paths([cached_head, head])) is None:
+            return None
+        paths.update(committed_paths)
+    if (staged_paths := status_runner.run_git_diff_paths([head], cached=True)) is None:
+        return None
+    paths.update(staged_paths)
+    if (changed_directories := _get_changed_directories(root, cache.get('directories'))) is None:
+        return None
+    paths.update(changed_directories)
+    if (worktree_paths := index_status.read_worktree_changes(repo_git_dir, root, None, scope, paths)) is None:
+        return None
+    paths.update(worktree_paths)
+    if key[1] and ('' in paths or any(p == '.gitignore' or p.endswith('/.gitignore') for p in paths)):
+        return None  # Untracked files may be listed or ignored anywhere
+    if scope is not None:
+        paths = {p for p in paths if any(p == s or p.startswith(s + '/') for s in scope)}
+    if len(paths) > _MAX_REFRESH_PATHS:
+        return None
+    return sorted(paths)
+
+
+def _is_same_options(
+    cached_key: list,
+    key: list,
+) -> bool:
+    """ The version, untracked files mode, fsmonitor token, scope and exclude file. The Index and HEAD may differ.
+    """
+    return cached_key[:2] == key[:2] and cached_key[4:] == key[4:]
+
+
+def read_cache(
+    repo_git_dir: Path,
+    root: Path,
+    key: list,
+    scope: list[str] | None = None,
+) -> StatusTable | None:
+    """ Read the cached records, if the key matches and the Worktree is unchanged.
+ - Every cached path has the same stat signature, and every other tracked file matches the Index.
+ - Every directory recorded with the cache has the same stat signature.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository, where the cache is stored.
+ - root (Path): The Worktree root directory, which the cached paths are relative to.
+ - key (list): The current cache key.
+ - scope (list[str]?): The paths that limit the records. Default: None, the whole repository.
+
+**Returns:**
+ StatusTable? - The cached records, or None if the cache is missing or invalid.
+    """
+    if (cache := _read_cache_file(repo_git_dir)) is None or cache.get('key') != key:
+        return None
+    records = StatusTable()
+    try:
+        for code, file_path, signature in cache.get('records', []):
+            if _stat_signature(root / file_path) != signature:
+                return None
+            records.append(GitFileStatus(code=code, file_path=file_path))
+    except (TypeError, ValueError, AttributeError):  # Malformed Cache Records
+        return None
+    if _get_changed_directories(root, cache.get('directories')) != set():
+        return None
+    worktree_paths = index_status.read_worktree_changes(repo_git_dir, root, None, scope, {r.file_path for r in records})
+    if worktree_paths is None or len(worktree_paths) > 0:
+        return None
+    return records
+
+
+def _get_changed_directories(
+    root: Path,
+    directories: dict | None,
+) -> set[str] | None:
+    """ The recorded directories whose stat signature has changed, or None if the record is malformed.
+    """
+    if directories is None:
+        return set()
+    if not isinstance(directories, dict):
+        return None
+    return {path for path, signature in directories.items() if _stat_signature(root / path) != signature}
+
+
+def _read_cache_file(
+    repo_git_dir: Path,
+) -> dict | None:
+    cache = state_file.read_state(git_dir.get_state_dir(repo_git_dir), _CACHE_FILE_NAME)
+    return cache if isinstance(cache, dict) else None
+
+
+def write_cache(
+    repo_git_dir: Path,
+    root: Path,
+    key: list,
+    records: Iterable[GitFileStatus],
+    head: str | None = None,
+    started_ns: int | None = None,
+    include_untracked: bool = False,
+    scope: list[str] | None = None,
+):
+    """ Write the records to the cache, with the stat signature of each path.
+ - With untracked files, the stat signature of each Worktree directory within the scope is also recorded.
+ - A signature modified close to the start of the collection is recorded as empty, so it never matches.
+ - The cache file is replaced atomically. Failure to write the cache is not an error.
+
+**Parameters:**
+ - repo_git_dir (Path): The Git Directory of the repository, where the cache is stored.
+ - root (Path): The Worktree root directory, which the record paths are relative to.
+ - key (list): The cache key computed before the records were collected.
+ - records (Iterable[GitFileStatus]): The complete collection of status records.
+ - head (str?): The commit object id that HEAD resolved to, the base of an incremental refresh. Default: None.
+ - started_ns (int?): The time.time_ns() value when the collection started. Default: None, every signature is recorded.
+ - include_untracked (bool): Whether the records include untracked files. Default: False.
+ - scope (list[str]?): The paths that limit the records. Default: None, the whole repository.
+    """
+    cache = {
+        'key': key,
+        'head': head,
+        'records': [
+            (r.code, r.file_path, _settled_signature(root / r.file_path, started_ns)) for r in records
+        ],
+    }
+    if include_untracked:
+        cache['directories'] = {
+            path: _settled_signature(root / path, started_ns) for path in _list_directories(root, scope)
+        }
+    state_file.write_state(git_dir.get_state_dir(repo_git_dir), _CACHE_FILE_NAME, cache)
+
+
+def _list_directories(
+    root: Path,
+    scope: list[str] | None,
+) -> list[str]:
+    """ The paths, relative to the root, of the Worktree directories within the scope and the parent of each scope path.
+    """
+    paths = {''} if scope is None else {p.rpartition('/')[0] for p in scope}
+    pending = [''] if scope is None else list(scope)
+    while len(pending) > 0:
+        path = pending.pop()
+        try:
+            with os.scandir(root / path) as entries:
+                for entry in entries:
+                    if entry.name != '.git' and entry.is_dir(follow_symlinks=False):
+                        pending.append(f"{path}/{entry.name}" if len(path) > 0 else entry.name)
+        except OSError:  # Not a directory, or removed
+            continue
+        paths.add(path)
+    return sorted(paths)
+
+
+def _settled_signature(
+    path: Path,
+    started_ns: int | None,
+) -> list[int] | None:
+    if (signature := _stat_signature(path)) is None or started_ns is None:
+        return signature
+    return signature if signature[0] < started_ns - _RACY_INTERVAL_NS else []
+
+
+def _stat_signature(
+    path: Path,
+) -> list[int] | None:
+    try:
+        stat = os.lstat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
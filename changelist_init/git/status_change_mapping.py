@@ -1,33 +1,79 @@
 """ Maps Git Status data into FileChange data.
+
+**StatusSummary NamedTuple Fields:**
+ - code_counts (dict[str, int]): The number of records with each status code.
+ - created (int): The number of records mapped to created files and directories.
+ - updated (int): The number of records mapped to updated files.
+ - deleted (int): The number of records mapped to deleted files.
+ - unrecognized (int): The number of records with a status code that was not mapped.
 """
-from itertools import groupby
+from collections import namedtuple
 from typing import Callable, Iterable, Generator
 
 from changelist_data import file_change
 from changelist_data.file_change import FileChange
 
+from changelist_init.git.git_status_lists import GitStatusLists
 from changelist_init.git.status_reader import GitFileStatus
 
 
+StatusSummary = namedtuple(
+    'StatusSummary',
+    'code_counts created updated deleted unrecognized',
+)
+
+# The characters of each side of a Porcelain XY status code.
+_XY_CHARACTERS = ' MTADRCU'
+
+_UNKNOWN_CODE = object()
+
+
 def map_file_status_to_changes(
-    git_files: Iterable[GitFileStatus],
+    git_files: Iterable[GitFileStatus | tuple[str, str]],
+    path_errors: str = 'backslashreplace',
+    on_summary: Callable[[StatusSummary], None] | None = None,
+    status_lists: GitStatusLists | None = None,
 ) -> Generator[FileChange, None, None]:
-    """ Categorize by Status Code, and Map to FileChange data objects.
+    """ Map each GitFileStatus to a FileChange, through a table of the mapping function of each status code.
+ - A collapsed untracked directory, with a trailing slash, is mapped to a single directory FileChange.
+ - Status paths keep undecodable bytes as surrogates. They are converted by the error policy only here, for non-ASCII paths.
+ - Each unrecognized status code is printed once, and its records are skipped.
+ - Mapped records are classified by Tracking Status in the same pass, with the converted path of their FileChange.
 
 **Parameters:**
- - git_files (Iterable[GitFileStatus]): An iterable or Generator providing GitFileStatus objects.
+ - git_files (Iterable[GitFileStatus | tuple[str, str]]): An iterable or Generator providing GitFileStatus objects, or status code and file path pairs.
+ - path_errors (str): The codecs error handler for bytes that are not UTF-8. Default: backslashreplace, valid in XML files.
+ - on_summary (Callable[[StatusSummary], None]?): Receives the counts of the records, after the last is mapped.
+ - status_lists (GitStatusLists?): Receives each mapped record, in the table of its Tracking Status. Default: None.
 
 **Yields:**
  FileChange - Generated File Changes.
     """
-    for code, group in groupby(git_files, lambda w: w.code):
-        if (mapping_function := get_status_code_change_map(code)) is None:
-            print(f"Unrecognized Git Status Code:({code})")
+    code_entries: dict[str, list] = {}  # The mapping function, record count and Tracking Status table of each code
+    for code, status_path in git_files:
+        if (entry := code_entries.get(code)) is None:
+            entry = code_entries[code] = [
+                _get_change_map(code), 0, None if status_lists is None else status_lists.get_code_table(code),
+            ]
+            if entry[0] is None:
+                print(f"Unrecognized Git Status Code:({code})")
+        entry[1] += 1
+        if (mapping_function := entry[0]) is None:
             continue
-        for file_status in group:
-            yield mapping_function(
-                _map_status_path_to_change(file_status.file_path)
+        if not status_path.isascii():
+            status_path = _apply_path_errors(status_path, path_errors)
+        if (tracking_table := entry[2]) is not None:
+            tracking_table.append(GitFileStatus(code, status_path))
+        if status_path.endswith('/'):
+            yield create_directory_fc(
+                _map_status_path_to_change(status_path[:-1])
             )
+        elif status_path.startswith('/'):
+            yield mapping_function(status_path)
+        else:
+            yield mapping_function('/' + status_path)
+    if on_summary is not None:
+        on_summary(create_status_summary({code: entry[1] for code, entry in code_entries.items()}))
 
 
 def get_status_code_change_map(
@@ -51,6 +97,88 @@ def get_status_code_change_map(
     return None
 
 
+# The mapping function of every Porcelain status code, computed once. Other codes are looked up when they appear.
+_CODE_CHANGE_MAPS: dict[str, Callable[[str, ], FileChange] | None] = {
+    code: get_status_code_change_map(code) for code in (
+        *(x + y for x in _XY_CHARACTERS for y in _XY_CHARACTERS), '??', '!!',
+    )
+}
+
+
+def get_change_paths(
+    file_status: Iterable[GitFileStatus],
+) -> set[str]:
+    """ Obtain the FileChange path of each record, such as the records of a Tracking Status.
+
+**Parameters:**
+ - file_status (Iterable[GitFileStatus]): The records, with status paths.
+
+**Returns:**
+ set[str] - The FileChange paths, which start with a slash. Directory paths do not end with a slash.
+    """
+    return {_map_status_path_to_change(record.file_path.rstrip('/')) for record in file_status}
+
+
+def create_status_summary(
+    code_counts: dict[str, int],
+) -> StatusSummary:
+    """ Total the records of each status code by the kind of FileChange they map to.
+
+**Parameters:**
+ - code_counts (dict[str, int]): The number of records with each status code.
+
+**Returns:**
+ StatusSummary - The code counts, with the totals of created, updated, deleted and unrecognized records.
+    """
+    totals = {file_change.create_fc: 0, file_change.update_fc: 0, file_change.delete_fc: 0, None: 0}
+    for code, count in code_counts.items():
+        totals[_get_change_map(code)] += count
+    return StatusSummary(
+        code_counts=code_counts,
+        created=totals[file_change.create_fc],
+        updated=totals[file_change.update_fc],
+        deleted=totals[file_change.delete_fc],
+        unrecognized=totals[None],
+    )
+
+
+def describe_status_summary(
+    summary: StatusSummary,
+) -> str:
+    """ Describe the totals of a StatusSummary, for display.
+
+**Parameters:**
+ - summary (StatusSummary): The counts of the mapped records.
+
+**Returns:**
+ str - The number of created, updated, deleted and unrecognized files.
+    """
+    return f"{summary.created} created, {summary.updated} updated, {summary.deleted} deleted, " \
+        f"{summary.unrecognized} unrecognized"
+
+
+def create_directory_fc(
+    directory_path: str,
+) -> FileChange:
+    """ Build a FileChange for a created directory, which stands for all of the untracked files it contains.
+
+**Parameters:**
+ - directory_path (str): The FileChange path of the directory, without a trailing slash.
+
+**Returns:**
+ FileChange - The FileChange, with the directory in the after_path attribute.
+    """
+    return FileChange(None, None, directory_path, True)
+
+
+def _get_change_map(
+    code: str,
+) -> Callable[[str, ], FileChange] | None:
+    if (mapping_function := _CODE_CHANGE_MAPS.get(code, _UNKNOWN_CODE)) is _UNKNOWN_CODE:
+        return get_status_code_change_map(code)
+    return mapping_function
+
+
 def _map_status_path_to_change(
     status_path: str,
 ) -> str:
@@ -58,3 +186,14 @@ def _map_status_path_to_change(
  - Adds a leading slash character if not present.
     """
     return '/' + status_path if not status_path.startswith('/') else status_path
+
+
+def _apply_path_errors(
+    status_path: str,
+    path_errors: str,
+) -> str:
+    """ Convert the surrogates of undecodable bytes with the error policy. Valid UTF-8 paths are unchanged.
+    """
+    if path_errors == 'surrogateescape':
+        return status_path
+    return status_path.encode('utf-8', 'surrogateescape').decode('utf-8', path_errors)
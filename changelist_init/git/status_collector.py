@@ -0,0 +1,368 @@
+""" Deadline-Aware Progressive Collection of Git Status.
+
+**StatusTruncation NamedTuple Fields:**
+ - max_files (int): The number of records that were kept.
+ - overflow_counts (dict[str, int]): The number of records dropped in each top-level directory. The root is an empty string.
+ - is_exhaustive (bool): Whether every dropped record was counted, before the Git Process was stopped.
+"""
+import os
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Callable, Generator, Iterable
+
+from changelist_init.git import status_runner
+from changelist_init.git.status_reader import GitFileStatus, generate_file_status_v2, generate_file_status_blocks, \
+    generate_untracked_file_status
+
+
+# The untracked files modes of Git Status, ordered from most to least expensive.
+_UNTRACKED_MODES = ('all', 'normal', 'no')
+
+# The number of records between each progress report.
+_PROGRESS_INTERVAL = 1000
+
+# The number of directories named in a truncation description.
+_MAX_DESCRIBED_DIRECTORIES = 10
+
+
+StatusTruncation = namedtuple(
+    'StatusTruncation',
+    'max_files overflow_counts is_exhaustive',
+)
+
+
+def collect_file_status(
+    include_untracked: bool,
+    time_budget: float | None = None,
+    on_progress: Callable[[int], None] | None = None,
+    pathspec_shards: list[list[str]] | None = None,
+    pathspecs: list[str] | None = None,
+    status_config: list[str] | None = None,
+    collapse_untracked: bool = False,
+    write_index: bool = False,
+) -> Generator[GitFileStatus, None, bool]:
+    """ Collect GitFileStatus records within a time budget, falling back to cheaper modes.
+ - Records are streamed as they are read, including partial results from a Git Process that ran out of time.
+ - When the budget runs out, Git Status is run again in the next cheaper untracked files mode.
+ - The final mode (tracked files only) runs to completion, so a slow filesystem degrades instead of failing.
+ - Collapsed untracked directories start in the normal mode, and are kept as records with a trailing slash.
+
+**Parameters:**
+ - include_untracked (bool): Whether to include untracked files in the git status output.
+ - time_budget (float?): The number of seconds given to each attempt, except the last. Default: None, no limit.
+ - on_progress (Callable[[int], None]?): Receives the number of records collected so far, periodically.
+ - pathspec_shards (list[list[str]]?): Run a Git Status Process for each shard of pathspecs, and sort the records by path.
+ - pathspecs (list[str]?): The pathspecs that limit the files collected, when there are no shards. Default: None.
+ - status_config (list[str]?): The name=value pairs passed to Git Status with -c. Default: None.
+ - collapse_untracked (bool): Whether an untracked directory is collected once, instead of every file it contains.
+ - write_index (bool): Whether Git Status may write the refreshed Index. Default: False.
+
+**Yields:**
+ GitFileStatus - The file information including status code and file path. Each path is yielded once.
+
+**Returns:**
+ bool - True when the records were collected in the requested mode, False if a cheaper mode was used.
+    """
+    modes = _UNTRACKED_MODES if include_untracked else _UNTRACKED_MODES[-1:]
+    if collapse_untracked:
+        modes = modes[-2:]
+    if time_budget is None:
+        modes = modes[:1]
+    count = 0
+    is_complete = True
+    collected_paths: set[str] | None = set() if len(modes) > 1 else None
+    for mode in modes:
+        deadline = None if mode == modes[-1] else time.monotonic() + time_budget
+        try:
+            for file_status in _generate_mode_status(
+                mode, deadline, pathspec_shards, pathspecs, status_config, collapse_untracked, write_index,
+            ):
+                if collected_paths is not None:
+                    if file_status.file_path in collected_paths:
+                        continue  # Collected by a previous attempt
+                    collected_paths.add(file_status.file_path)
+                count += 1
+                if on_progress is not None and count % _PROGRESS_INTERVAL == 0:
+                    on_progress(count)
+                yield file_status
+        except subprocess.TimeoutExpired:
+            is_complete = False
+            continue
+        break
+    if on_progress is not None:
+        on_progress(count)
+    return is_complete
+
+
+def _generate_mode_status(
+    untracked_mode: str,
+    deadline: float | None,
+    pathspec_shards: list[list[str]] | None,
+    pathspecs: list[str] | None,
+    status_config: list[str] | None = None,
+    keep_directories: bool = False,
+    write_index: bool = False,
+) -> Iterable[GitFileStatus]:
+    if pathspec_shards is None or len(pathspec_shards) < 2:
+        if pathspec_shards is not None:
+            pathspecs = pathspec_shards[0]
+        return generate_file_status_blocks(
+            status_runner.stream_git_status_blocks(
+                deadline=deadline, untracked_mode=untracked_mode, pathspecs=pathspecs, config=status_config,
+                write_index=write_index,
+            ),
+            keep_directories,
+        )
+    return _collect_sharded_status(
+        untracked_mode, deadline, pathspec_shards, status_config, keep_directories, write_index,
+    )
+
+
+def _collect_sharded_status(
+    untracked_mode: str,
+    deadline: float | None,
+    pathspec_shards: list[list[str]],
+    status_config: list[str] | None = None,
+    keep_directories: bool = False,
+    write_index: bool = False,
+) -> list[GitFileStatus]:
+    """ Merge the records of each shard as it completes, then sort them by path so the output is deterministic.
+    """
+    records: dict[str, GitFileStatus] = {}
+    for shard_records in status_runner.run_sharded_git_status(
+        pathspec_shards, untracked_mode, deadline, status_config, write_index,
+    ):
+        for file_status in generate_file_status_v2(shard_records, keep_directories):
+            records.setdefault(file_status.file_path, file_status)
+    return [records[path] for path in sorted(records)]
+
+
+def collect_file_status_concurrently(
+    tracked_file_status: Generator[GitFileStatus, None, bool],
+    time_budget: float | None = None,
+    on_progress: Callable[[int], None] | None = None,
+    pathspecs: list[str] | None = None,
+    collapse_untracked: bool = False,
+) -> Generator[GitFileStatus, None, bool]:
+    """ Collect tracked and untracked GitFileStatus records at the same time, in separate processes.
+ - Untracked files are listed by git ls-files in a background thread, while the tracked records are consumed.
+ - Tracked records are yielded first, followed by the untracked records, as in the Git Status output.
+ - When the budget runs out, untracked files are listed again with collapsed directories, then not at all.
+
+**Parameters:**
+ - tracked_file_status (Generator[GitFileStatus, None, bool]): The tracked file records, and whether they are complete.
+ - time_budget (float?): The number of seconds given to each untracked files listing. Default: None, no limit.
+ - on_progress (Callable[[int], None]?): Receives the number of records collected so far, periodically.
+ - pathspecs (list[str]?): The pathspecs that limit the untracked files listed. Default: None, the whole repository.
+ - collapse_untracked (bool): Whether an untracked directory is listed once, instead of every file it contains.
+
+**Yields:**
+ GitFileStatus - The file information including status code and file path. Each path is yielded once.
+
+**Returns:**
+ bool - True when all untracked files were listed and the tracked records were complete.
+    """
+    untracked = _UntrackedListing(time_budget, pathspecs, collapse_untracked)
+    untracked.start()
+    count = 0
+    try:
+        while True:
+            try:
+                file_status = next(tracked_file_status)
+            except StopIteration as stop:
+                is_complete = stop.value is not False
+                break
+            count += 1
+            if on_progress is not None and count % _PROGRESS_INTERVAL == 0:
+                on_progress(count)
+            yield file_status
+    finally:
+        tracked_file_status.close()
+    untracked.join()
+    if untracked.error is not None:
+        raise untracked.error
+    for file_status in untracked.records:
+        count += 1
+        if on_progress is not None and count % _PROGRESS_INTERVAL == 0:
+            on_progress(count)
+        yield file_status
+    if on_progress is not None:
+        on_progress(count)
+    return is_complete and untracked.is_complete
+
+
+class _UntrackedListing(threading.Thread):
+    """ Lists the untracked files of the repository, in the untracked modes that fit the time budget.
+    """
+
+    def __init__(self, time_budget: float | None, pathspecs: list[str] | None, collapse_untracked: bool = False):
+        super().__init__(daemon=True)
+        self.time_budget = time_budget
+        self.pathspecs = pathspecs
+        self.collapse_untracked = collapse_untracked
+        self.records: list[GitFileStatus] = []
+        self.is_complete = True
+        self.error: Exception | SystemExit | None = None
+
+    def run(self):
+        try:
+            self._list_untracked()
+        except (Exception, SystemExit) as error:  # Runner errors exit, raised again by the consumer
+            self.error = error
+
+    def _list_untracked(self):
+        if self.time_budget is None:
+            self.records.extend(generate_untracked_file_status(
+                status_runner.stream_untracked_files(
+                    collapse_directories=self.collapse_untracked, pathspecs=self.pathspecs,
+                ),
+                self.collapse_untracked,
+            ))
+            return
+        collected_paths: set[str] = set()
+        for collapse_directories in ((True,) if self.collapse_untracked else (False, True)):
+            try:
+                for file_status in generate_untracked_file_status(
+                    status_runner.stream_untracked_files(
+                        deadline=time.monotonic() + self.time_budget,
+                        collapse_directories=collapse_directories,
+                        pathspecs=self.pathspecs,
+                    ),
+                    self.collapse_untracked,
+                ):
+                    if file_status.file_path not in collected_paths:
+                        collected_paths.add(file_status.file_path)
+                        self.records.append(file_status)
+                return
+            except subprocess.TimeoutExpired:
+                self.is_complete = False
+
+
+def expand_untracked_directories(
+    file_status: Generator[GitFileStatus, None, bool],
+    root: Path,
+    max_entries: int,
+) -> Generator[GitFileStatus, None, bool]:
+    """ Replace the collapsed untracked directories that contain few entries with the files they contain.
+ - Each directory is walked only until it exceeds the entry limit, so large directories stay cheap.
+ - Directories containing a nested repository are not expanded, because git does not list their files.
+
+**Parameters:**
+ - file_status (Generator[GitFileStatus, None, bool]): The status records, with collapsed directories.
+ - root (Path): The repository root directory, that the record paths are relative to.
+ - max_entries (int): The largest number of files and subdirectories in a directory that is expanded.
+
+**Yields:**
+ GitFileStatus - The status records. The files of expanded directories follow the other records.
+
+**Returns:**
+ bool - The completion status returned by the file status Generator.
+    """
+    small_directories = []
+    while True:
+        try:
+            record = next(file_status)
+        except StopIteration as stop:
+            is_complete = stop.value
+            break
+        if record.file_path.endswith('/') and _count_entries(root / record.file_path, max_entries) <= max_entries:
+            small_directories.append(record.file_path[:-1])
+        else:
+            yield record
+    if len(small_directories) > 0:
+        yield from generate_untracked_file_status(
+            status_runner.stream_untracked_files(pathspecs=status_runner.get_scope_pathspecs(small_directories))
+        )
+    return is_complete
+
+
+def _count_entries(
+    directory: Path,
+    max_entries: int,
+) -> int:
+    """ Count the entries under a directory, stopping once the count exceeds the limit.
+ - A nested repository counts as more than the limit.
+    """
+    count = 0
+    for _, dir_names, file_names in os.walk(directory):
+        if '.git' in dir_names or '.git' in file_names:
+            return max_entries + 1
+        if (count := count + len(dir_names) + len(file_names)) > max_entries:
+            break
+    return count
+
+
+def limit_file_status(
+    file_status: Generator[GitFileStatus, None, bool],
+    max_files: int,
+    on_truncated: Callable[[StatusTruncation], None] | None = None,
+) -> Generator[GitFileStatus, None, bool]:
+    """ Stop collecting GitFileStatus records once the limit is reached.
+ - Records beyond the limit are counted by top-level directory, up to as many again as the limit, and at least one.
+ - The file status Generator is then closed, which terminates the Git Process.
+
+**Parameters:**
+ - file_status (Generator[GitFileStatus, None, bool]): The status records, returning True when complete.
+ - max_files (int): The largest number of records yielded.
+ - on_truncated (Callable[[StatusTruncation], None]?): Receives the counts of the dropped records, if any were dropped.
+
+**Yields:**
+ GitFileStatus - The first records, up to the limit.
+
+**Returns:**
+ bool - False when records were dropped, otherwise the completion status of the file status Generator.
+    """
+    count = 0
+    overflow_counts: dict[str, int] = {}
+    overflow_limit = max_files + max(max_files, 1)
+    is_exhaustive = True
+    is_complete = False
+    try:
+        while True:
+            try:
+                record = next(file_status)
+            except StopIteration as stop:
+                is_complete = stop.value
+                break
+            if count < max_files:
+                count += 1
+                yield record
+            elif count < overflow_limit:
+                count += 1
+                directory = record.file_path.split('/', 1)[0] if '/' in record.file_path else ''
+                overflow_counts[directory] = overflow_counts.get(directory, 0) + 1
+            else:
+                is_exhaustive = False
+                break
+    finally:
+        file_status.close()
+    if len(overflow_counts) == 0:
+        return is_complete
+    if on_truncated is not None:
+        on_truncated(StatusTruncation(max_files, overflow_counts, is_exhaustive))
+    return False
+
+
+def describe_truncation(
+    truncation: StatusTruncation,
+) -> str:
+    """ Describe the records that were dropped, with the directories that dropped the most first.
+
+**Parameters:**
+ - truncation (StatusTruncation): The counts of the dropped records.
+
+**Returns:**
+ str - A single line description. Counts end with a plus sign when counting stopped early.
+    """
+    suffix = '' if truncation.is_exhaustive else '+'
+    directories = sorted(truncation.overflow_counts.items(), key=lambda item: (-item[1], item[0]))
+    described = [
+        f"{directory + '/' if directory else '/'} {count}{suffix}"
+        for directory, count in directories[:_MAX_DESCRIBED_DIRECTORIES]
+    ]
+    if (remaining := len(directories) - _MAX_DESCRIBED_DIRECTORIES) > 0:
+        described.append(f"{remaining} more directories")
+    return f"Stopped at {truncation.max_files} files. Not listed: {', '.join(described)}."
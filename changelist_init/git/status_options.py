@@ -0,0 +1,47 @@
+""" The options that control how Git Status records are collected and mapped to FileChanges.
+
+**StatusOptions NamedTuple Fields:**
+ - time_budget (float?): The seconds given to git before falling back to a cheaper untracked mode. Default: None.
+ - use_cache (bool): Whether to replay status records cached while the Git Index and HEAD are unchanged. Default: False.
+ - use_index_reader (bool): Whether to read tracked file status from the Git Index instead of running git. Default: False.
+ - workers (int?): The number of parallel workers. Default: None, sized automatically.
+ - concurrent_untracked (bool): Whether untracked files are listed by a separate git process, at the same time as tracked files. Default: False.
+ - status_shards (int): The number of git status processes that run at the same time, on separate paths. Default: 1.
+ - shard_paths (list[str]?): The paths distributed between status shards. Default: None, the top-level directory entries.
+ - scope (list[str]?): The paths, relative to the repository root, that limit the files git scans. Default: None.
+ - incremental (bool): Whether a cache invalidated by HEAD or the Git Index is refreshed on the paths that may have changed. Default: False.
+ - fsmonitor (bool): Whether Git Status uses the untracked cache and the builtin fsmonitor, when git supports them. Git writes their state to the Index. Default: False.
+ - write_index (bool): Whether Git Status may write the refreshed Index. Default: False, git runs with --no-optional-locks.
+ - collapse_untracked (bool): Whether an untracked directory is a single directory FileChange, instead of one per file. Default: False.
+ - expand_untracked (int): The largest number of entries in a collapsed directory that is listed file by file. Default: 0.
+ - max_files (int?): The largest number of FileChanges. Git is stopped once it is reached. Default: None, no limit.
+ - path_errors (str): The codecs error handler for file path bytes that are not UTF-8. Default: backslashreplace.
+ - parse_processes (int): The largest number of processes that parse a large Git Status output. Used when a single Git Status Process runs to completion, without the cache, Index reader or file limit. Default: 1.
+"""
+from collections import namedtuple
+
+
+StatusOptions = namedtuple(
+    'StatusOptions',
+    (
+        'time_budget',
+        'use_cache',
+        'use_index_reader',
+        'workers',
+        'concurrent_untracked',
+        'status_shards',
+        'shard_paths',
+        'scope',
+        'incremental',
+        'fsmonitor',
+        'write_index',
+        'collapse_untracked',
+        'expand_untracked',
+        'max_files',
+        'path_errors',
+        'parse_processes',
+    ),
+    defaults=(None, False, False, None, False, 1, None, None, False, False, False, False, 0, None, 'backslashreplace', 1),
+)
+
+DEFAULT_OPTIONS = StatusOptions()
@@ -0,0 +1,112 @@
+""" Parses and maps large Git Status outputs in worker processes.
+ - The output is split at record boundaries, and shared with the workers without copying it through a pipe.
+ - Each worker maps its chunk to FileChanges, and returns their fields as columns, which pickle faster than tuples.
+ - The FileChanges of the chunks are reassembled in output order.
+ - Records classified by Tracking Status are returned in compact StatusTables, and appended in chunk order.
+"""
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import Callable
+
+from changelist_data.file_change import FileChange
+
+from changelist_init.git.git_status_lists import GitStatusLists
+from changelist_init.git.git_tracking_status import GitTrackingStatus
+from changelist_init.git.status_change_mapping import map_file_status_to_changes, StatusSummary, create_status_summary
+from changelist_init.git.status_reader import generate_status_pairs, split_status_buffer
+
+
+# The smallest number of output bytes given to a worker process, below which the start-up cost is not recovered.
+_MIN_CHUNK_SIZE = 4 << 20
+
+
+def map_status_buffer(
+    status_buffer: bytes,
+    processes: int,
+    keep_directories: bool = False,
+    path_errors: str = 'backslashreplace',
+    on_summary: Callable[[StatusSummary], None] | None = None,
+    status_lists: GitStatusLists | None = None,
+) -> list[FileChange]:
+    """ Map the whole Porcelain V2 output to FileChanges, using worker processes for large outputs.
+ - Outputs too small to give each process a large chunk are mapped in fewer processes, or in this process.
+ - The number of processes is limited to the number of CPUs.
+ - When shared memory is not available, the output is mapped in this process.
+
+**Parameters:**
+ - status_buffer (bytes): The NUL-terminated Porcelain V2 records.
+ - processes (int): The largest number of worker processes.
+ - keep_directories (bool): Whether collapsed untracked directories are mapped to directory FileChanges. Default: False.
+ - path_errors (str): The codecs error handler for file path bytes that are not UTF-8. Default: backslashreplace.
+ - on_summary (Callable[[StatusSummary], None]?): Receives the counts of the records of every chunk.
+ - status_lists (GitStatusLists?): Receives the mapped records of every chunk, by Tracking Status. Default: None.
+
+**Returns:**
+ list[FileChange] - The FileChanges of the records, in output order.
+    """
+    processes = min(processes, os.cpu_count() or 1, len(status_buffer) // _MIN_CHUNK_SIZE)
+    chunks = split_status_buffer(status_buffer, processes)
+    if len(chunks) < 2:
+        return _map_chunk(status_buffer, keep_directories, path_errors, on_summary, status_lists)
+    try:
+        memory = shared_memory.SharedMemory(create=True, size=len(status_buffer))
+    except OSError:
+        return _map_chunk(status_buffer, keep_directories, path_errors, on_summary, status_lists)
+    try:
+        memory.buf[:len(status_buffer)] = status_buffer
+        starts, ends = zip(*chunks)
+        changes, code_counts = [], Counter()
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            for columns, chunk_code_counts, chunk_status_lists in executor.map(
+                _map_shared_chunk,
+                repeat(memory.name), starts, ends, repeat(keep_directories), repeat(path_errors),
+                repeat(status_lists is not None),
+            ):
+                changes.extend(map(FileChange._make, zip(*columns)))
+                code_counts.update(chunk_code_counts)
+                if chunk_status_lists is not None:
+                    for tracking_status in GitTrackingStatus:
+                        status_lists.get_table(tracking_status).extend(chunk_status_lists.get_table(tracking_status))
+    finally:
+        memory.close()
+        memory.unlink()
+    if on_summary is not None:
+        on_summary(create_status_summary(dict(code_counts)))
+    return changes
+
+
+def _map_shared_chunk(
+    memory_name: str,
+    start: int,
+    end: int,
+    keep_directories: bool,
+    path_errors: str,
+    classify: bool,
+) -> tuple[tuple[list, ...], dict[str, int], GitStatusLists | None]:
+    """ Runs in a worker process. Copies the chunk out of the shared memory, and maps it to FileChange field columns.
+ - Returns the columns, the number of records with each status code, and the records by Tracking Status if classified.
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        chunk = bytes(memory.buf[start:end])
+    finally:
+        memory.close()
+    summaries, status_lists = [], GitStatusLists() if classify else None
+    changes = _map_chunk(chunk, keep_directories, path_errors, summaries.append, status_lists)
+    return tuple([change[field] for change in changes] for field in range(len(FileChange._fields))), \
+        summaries[0].code_counts, status_lists
+
+
+def _map_chunk(
+    chunk: bytes,
+    keep_directories: bool,
+    path_errors: str,
+    on_summary: Callable[[StatusSummary], None] | None = None,
+    status_lists: GitStatusLists | None = None,
+) -> list[FileChange]:
+    return list(map_file_status_to_changes(
+        generate_status_pairs((chunk,), keep_directories), path_errors, on_summary, status_lists,
+    ))
@@ -0,0 +1,194 @@
+""" Tunes the Git Status options of a repository, and persists the fastest Status Profile.
+ - Settings are compared one at a time, and a value is kept only when it is faster by a margin and collects the same records.
+ - The profile is stored in the state directory, keyed by the Git binary, and used by later Git Status runs.
+
+**StatusProfile NamedTuple Fields:**
+ - config (list[str]?): The name=value pairs passed to Git Status with -c. Default: None.
+ - concurrent_untracked (bool): Whether untracked files are listed by a separate git process, at the same time.
+
+**AutotuneResult NamedTuple Fields:**
+ - profile (StatusProfile): The fastest Status Profile that collected the same records as the default.
+ - seconds (float): The fastest time of the profile.
+ - default_seconds (float): The fastest time of the default profile.
+"""
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Callable, Generator, Iterable
+
+from changelist_init import state_file
+from changelist_init.git import git_dir, git_capabilities
+from changelist_init.git.git_capabilities import GitCapabilities
+from changelist_init.git.status_reader import GitFileStatus
+
+
+StatusProfile = namedtuple(
+    'StatusProfile',
+    'config concurrent_untracked',
+    defaults=(None, False),
+)
+
+AutotuneResult = namedtuple(
+    'AutotuneResult',
+    'profile seconds default_seconds',
+)
+
+DEFAULT_PROFILE = StatusProfile()
+
+_PROFILE_FILE_NAME = 'status_profile.json'
+
+# The settings compared on every repository, with the values tried for each.
+_TUNED_SETTINGS = (
+    ('index.threads', ('true', 'false')),
+    ('core.preloadIndex', ('true', 'false')),
+)
+
+# The fraction by which a candidate must be faster to replace the current profile, so that noise is not tuned in.
+_MIN_IMPROVEMENT = 0.05
+
+
+def find_fastest_profile(
+    collect: Callable[[StatusProfile], Iterable[GitFileStatus]],
+    include_untracked: bool,
+    capabilities: GitCapabilities,
+    repeats: int = 3,
+) -> AutotuneResult:
+    """ Benchmark the Status Profile candidates, tuning one setting at a time.
+ - The first run of the default profile is not timed, and provides the reference records.
+ - A candidate is rejected when its records differ from the reference.
+
+**Parameters:**
+ - collect (Callable[[StatusProfile], Iterable[GitFileStatus]]): Collects the Git Status records with a profile.
+ - include_untracked (bool): Whether the records include untracked files. Enables the untracked file settings.
+ - capabilities (GitCapabilities): The features of the Git binary.
+ - repeats (int): The number of timed runs of each candidate. The fastest run is compared. Default: 3.
+
+**Returns:**
+ AutotuneResult - The fastest profile, with its time and the time of the default profile.
+    """
+    reference = sorted(collect(DEFAULT_PROFILE))
+    best, best_seconds = DEFAULT_PROFILE, _measure(collect, DEFAULT_PROFILE, reference, repeats)
+    default_seconds = best_seconds
+    candidates = _generate_candidates(include_untracked, capabilities, best)
+    candidate = next(candidates, None)
+    while candidate is not None:
+        if (seconds := _measure(collect, candidate, reference, repeats)) is not None and\
+                seconds < best_seconds * (1 - _MIN_IMPROVEMENT):
+            best, best_seconds = candidate, seconds
+        try:
+            candidate = candidates.send(best)
+        except StopIteration:
+            candidate = None
+    return AutotuneResult(profile=best, seconds=best_seconds, default_seconds=default_seconds)
+
+
+def describe_profile(
+    profile: StatusProfile,
+) -> str:
+    """ Describe the options of a Status Profile, for display.
+
+**Parameters:**
+ - profile (StatusProfile): The profile to describe.
+
+**Returns:**
+ str - The config pairs and the untracked files strategy.
+    """
+    options = list(profile.config or [])
+    if profile.concurrent_untracked:
+        options.append('concurrent untracked')
+    return ', '.join(options) if len(options) > 0 else 'default options'
+
+
+def read_status_profile(
+    state_dir: Path,
+) -> StatusProfile | None:
+    """ Read the Status Profile tuned for the current Git binary.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the Status Profile.
+
+**Returns:**
+ StatusProfile? - The tuned profile, or None if the repository was not tuned with this Git binary.
+    """
+    try:
+        stored = state_file.read_state(state_dir, _PROFILE_FILE_NAME)
+        if stored['binary'] is None or stored['binary'] != git_capabilities.get_binary_key():
+            return None
+        if (config := stored['config']) is not None and not all(isinstance(pair, str) for pair in config):
+            return None
+        return StatusProfile(config=config, concurrent_untracked=stored['concurrent_untracked'] is True)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_status_profile(
+    state_dir: Path,
+    profile: StatusProfile,
+):
+    """ Persist the Status Profile for the current Git binary.
+ - Failure to write the profile is not an error, later runs use the default profile.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the Status Profile.
+ - profile (StatusProfile): The tuned profile.
+    """
+    state_file.write_state(state_dir, _PROFILE_FILE_NAME, {'binary': git_capabilities.get_binary_key(), **profile._asdict()})
+
+
+def get_repository_profile() -> StatusProfile:
+    """ Obtain the Status Profile of the repository in the current directory.
+
+**Returns:**
+ StatusProfile - The tuned profile, or the default profile if the repository was not tuned.
+    """
+    if (repo_git_dir := git_dir.find_git_dir()) is None:
+        return DEFAULT_PROFILE
+    if (profile := read_status_profile(git_dir.get_state_dir(repo_git_dir))) is None:
+        return DEFAULT_PROFILE
+    return profile
+
+
+def _generate_candidates(
+    include_untracked: bool,
+    capabilities: GitCapabilities,
+    best: StatusProfile,
+) -> Generator[StatusProfile, StatusProfile, None]:
+    """ Derive each candidate from the best profile found so far, which is sent after each candidate is measured.
+ - Index writes are not a candidate. They change what Git Status does to the repository, so they are opted into.
+    """
+    settings = list(_TUNED_SETTINGS)
+    if include_untracked and capabilities.untracked_cache:
+        settings.append(('core.untrackedCache', ('true',)))
+    for name, values in settings:
+        for value in values:
+            best = yield best._replace(config=_with_setting(best.config or [], name, value))
+    if include_untracked:
+        yield best._replace(concurrent_untracked=True)
+
+
+def _with_setting(
+    config: list[str],
+    name: str,
+    value: str,
+) -> list[str]:
+    return [pair for pair in config if pair.split('=', 1)[0] != name] + [f'{name}={value}']
+
+
+def _measure(
+    collect: Callable[[StatusProfile], Iterable[GitFileStatus]],
+    profile: StatusProfile,
+    reference: list[GitFileStatus],
+    repeats: int,
+) -> float | None:
+    """ The fastest time of the profile, or None if its records differ from the reference.
+    """
+    fastest = None
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        records = list(collect(profile))
+        seconds = time.perf_counter() - start
+        if sorted(records) != reference:
+            return None
+        if fastest is None or seconds < fastest:
+            fastest = seconds
+    return fastest
@@ -1,7 +1,16 @@
 """ Reader for the Git Status Output String.
+
+**GitFileStatus NamedTuple Fields:**
+ - code (str): The two character status code.
+ - file_path (str): The path relative to the repository root. Undecodable bytes are kept as surrogates.
+
+**StatusBatch NamedTuple Fields:**
+ - codes (list[str]): The status code of each entry.
+ - file_paths (list[str]): The file path of each entry, at the same index as its status code.
 """
 from collections import namedtuple
-from typing import Generator
+from itertools import chain, pairwise
+from typing import Generator, Iterable, Iterator
 
 
 GitFileStatus = namedtuple(
@@ -9,43 +18,245 @@ GitFileStatus = namedtuple(
     'code file_path',
 )
 
+StatusBatch = namedtuple(
+    'StatusBatch',
+    'codes file_paths',
+)
+
+# The number of space-separated fields preceding the path in each Porcelain V2 record type.
+_V2_FIELD_COUNTS = {
+    b'1': 8,
+    b'2': 9,
+    b'u': 10,
+}
 
-def generate_file_status(
-    status_string: str,
+# The Porcelain V1 status codes of the Porcelain V2 XY fields read so far, so each is decoded once.
+_V2_STATUS_CODES: dict[bytes, str] = {}
+
+
+def iterate_status_batch(
+    batch: StatusBatch,
+) -> Iterator[GitFileStatus]:
+    """ View a StatusBatch as GitFileStatus objects.
+
+**Parameters:**
+ - batch (StatusBatch): The parallel lists of status codes and file paths.
+
+**Returns:**
+ Iterator[GitFileStatus] - The file status of each entry, created as it is iterated.
+    """
+    return map(GitFileStatus, batch.codes, batch.file_paths)
+
+
+def generate_file_status_v2(
+    status_records: Iterable[bytes],
+    keep_directories: bool = False,
 ) -> Generator[GitFileStatus, None, None]:
-    """ Generate GitFileStatus objects from the output of Git Status operation.
+    """ Generate GitFileStatus objects from the NUL-separated records of Git Status Porcelain V2.
+ - Header records are ignored, and the original path of a rename record is consumed.
 
 **Parameters:**
- - status_string (str): The output of the Git Status operation, as a string.
+ - status_records (Iterable[bytes]): The Porcelain V2 records, without their NUL terminators.
+ - keep_directories (bool): Whether collapsed untracked directories are kept, with their trailing slash. Default: False.
 
 **Yields:**
  GitFileStatus - The file information including status code and file path.
     """
-    if not isinstance(status_string, str):
-        raise TypeError("Must be a String!")
-    for f in status_string.splitlines():
-        if (file_status := read_git_status_line(f)) is not None:
+    records = iter(status_records)
+    for record in records:
+        if record.startswith(b'2 '):
+            next(records, None)  # The Original Path of a Rename or Copy
+        if (file_status := read_git_status_record(record, keep_directories)) is not None:
             yield file_status
-        else:
-            print(f"Skipped: ${f}")
 
 
-def read_git_status_line(
-    file_status_line: str
+def generate_file_status_blocks(
+    status_blocks: Iterable[bytes],
+    keep_directories: bool = False,
+) -> Generator[GitFileStatus, None, None]:
+    """ Generate GitFileStatus objects from blocks of NUL-terminated Git Status Porcelain V2 records.
+ - Each block is read in one batch while its records are ordinary changes and untracked files.
+ - From the first block that cannot be batched, the remaining records are read one at a time.
+
+**Parameters:**
+ - status_blocks (Iterable[bytes]): The blocks of whole Porcelain V2 records, each ending with a NUL terminator.
+ - keep_directories (bool): Whether collapsed untracked directories are kept, with their trailing slash. Default: False.
+
+**Yields:**
+ GitFileStatus - The file information including status code and file path.
+    """
+    blocks = iter(status_blocks)
+    for block in blocks:
+        if (batch := read_status_batch(block, keep_directories)) is None:
+            yield from _generate_remaining_records(block, blocks, keep_directories)
+            return
+        yield from iterate_status_batch(batch)
+
+
+def generate_status_pairs(
+    status_blocks: Iterable[bytes],
+    keep_directories: bool = False,
+) -> Generator[tuple[str, str], None, None]:
+    """ Generate the status code and file path pairs of blocks of NUL-terminated Git Status Porcelain V2 records.
+ - The pairs of a batched block are zipped from its parallel lists, without creating a GitFileStatus for each record.
+ - From the first block that cannot be batched, the remaining records are read one at a time.
+
+**Parameters:**
+ - status_blocks (Iterable[bytes]): The blocks of whole Porcelain V2 records, each ending with a NUL terminator.
+ - keep_directories (bool): Whether collapsed untracked directories are kept, with their trailing slash. Default: False.
+
+**Yields:**
+ tuple[str, str] - The status code and file path of each record.
+    """
+    blocks = iter(status_blocks)
+    for block in blocks:
+        if (batch := read_status_batch(block, keep_directories)) is None:
+            yield from _generate_remaining_records(block, blocks, keep_directories)
+            return
+        yield from zip(batch.codes, batch.file_paths)
+
+
+def _generate_remaining_records(
+    block: bytes,
+    blocks: Iterator[bytes],
+    keep_directories: bool,
+) -> Generator[GitFileStatus, None, None]:
+    """ Read the records of a block and the blocks after it, one at a time.
+    """
+    yield from generate_file_status_v2(
+        chain.from_iterable(b[:-1].split(b'\0') for b in chain((block,), blocks)), keep_directories,
+    )
+
+
+def read_status_batch(
+    status_block: bytes,
+    keep_directories: bool = False,
+) -> StatusBatch | None:
+    """ Read a block of Porcelain V2 records into parallel lists of status codes and file paths.
+ - The block is decoded once, and split into the ordinary change records followed by the untracked records.
+ - The field widths of the first change record locate the path in every change record, which is checked.
+
+**Parameters:**
+ - status_block (bytes): Whole Porcelain V2 records, each with its NUL terminator.
+ - keep_directories (bool): Whether collapsed untracked directories are kept, with their trailing slash. Default: False.
+
+**Returns:**
+ StatusBatch? - The status codes and file paths, in output order. None if the block has other records, or other fields.
+    """
+    text = status_block.decode('utf-8', 'surrogateescape')
+    if len(records := text.split('\0')) < 2 or len(records.pop()) > 0:
+        return None if len(text) > 0 else StatusBatch([], [])
+    # A NUL only terminates records, so counting NUL and the record type finds the number of records of each type
+    change_count = text.count('\0' + '1 ') + text.startswith('1 ')
+    untracked_count = text.count('\0' + '? ') + text.startswith('? ')
+    if change_count + untracked_count != len(records):
+        return None
+    changes, untracked = records[:change_count], records[change_count:]
+    batch = StatusBatch([], [])
+    if change_count > 0:
+        # The path follows 8 fields: the type, XY, submodule state, 3 modes and 2 object names of the same length
+        path_offset = 2 * (name_end := changes[0].find(' ', 31)) - 29
+        if name_end < 0 or any(
+            r[:2] != '1 ' or r[4:5] != ' ' or r[path_offset - 1:path_offset] != ' ' for r in changes
+        ):
+            return None  # Untracked records before a change record, or other field widths
+        if '/\0' in text and any(r.endswith('/') for r in changes):
+            return None
+        xy_codes = [r[2:4] for r in changes]
+        codes = {xy: xy.replace('.', ' ') for xy in set(xy_codes)}
+        batch.codes.extend(map(codes.__getitem__, xy_codes))
+        batch.file_paths.extend(r[path_offset:] for r in changes)
+    if '/\0' in text or '? \0' in text:  # Collapsed directories and empty paths
+        untracked_paths = [r[2:] for r in untracked if len(r) > 2 and (keep_directories or not r.endswith('/'))]
+    else:
+        untracked_paths = [r[2:] for r in untracked]
+    batch.codes.extend(['??'] * len(untracked_paths))
+    batch.file_paths.extend(untracked_paths)
+    return batch
+
+
+def split_status_buffer(
+    status_buffer: bytes,
+    chunk_count: int,
+) -> list[tuple[int, int]]:
+    """ Split the whole Porcelain V2 output into chunks of similar size, at record boundaries.
+ - A rename or copy record is kept in the same chunk as the original path that follows it.
+
+**Parameters:**
+ - status_buffer (bytes): The NUL-terminated Porcelain V2 records.
+ - chunk_count (int): The largest number of chunks.
+
+**Returns:**
+ list[tuple[int, int]] - The start and end offsets of each chunk, in output order. Empty when the buffer is empty.
+    """
+    bounds = [0]
+    for i in range(1, chunk_count):
+        if (end := status_buffer.find(b'\0', max(len(status_buffer) * i // chunk_count, bounds[-1]))) < 0:
+            break
+        if status_buffer.startswith(b'2 ', status_buffer.rfind(b'\0', 0, end) + 1):
+            if (end := status_buffer.find(b'\0', end + 1)) < 0:
+                break
+        if end + 1 >= len(status_buffer):
+            break
+        bounds.append(end + 1)
+    if len(status_buffer) > 0:
+        bounds.append(len(status_buffer))
+    return list(pairwise(bounds))
+
+
+def generate_untracked_file_status(
+    untracked_paths: Iterable[bytes],
+    keep_directories: bool = False,
+) -> Generator[GitFileStatus, None, None]:
+    """ Generate untracked GitFileStatus objects from the NUL-separated paths listed by git ls-files.
+ - Collapsed directory paths, which end with a slash, are ignored like directory lines in Git Status, unless kept.
+
+**Parameters:**
+ - untracked_paths (Iterable[bytes]): The untracked file paths, without their NUL terminators.
+ - keep_directories (bool): Whether collapsed directories are kept, with their trailing slash. Default: False.
+
+**Yields:**
+ GitFileStatus - The untracked status code and file path.
+    """
+    for path in untracked_paths:
+        if len(path) > 0 and (keep_directories or not path.endswith(b'/')):
+            yield GitFileStatus(
+                code='??',
+                file_path=path.decode('utf-8', 'surrogateescape'),
+            )
+
+
+def read_git_status_record(
+    record: bytes,
+    keep_directories: bool = False,
 ) -> GitFileStatus | None:
-    """ Read a line of output from Git Status, into a GitFileStatus object.
+    """ Read a Git Status Porcelain V2 record into a GitFileStatus object.
+ - The unmodified character (.) in status codes is replaced by a space, matching Porcelain V1 codes.
 
 **Parameters:**
- - file_status_line (str): The line of status output to process into a GitFileStatus object.
+ - record (bytes): The record from the NUL-separated Porcelain V2 output.
+ - keep_directories (bool): Whether a collapsed untracked directory is kept, with its trailing slash. Default: False.
 
 **Returns:**
- GitFileStatus? - The status code and file_path in a tuple, or None if the input string was not accepted.
+ GitFileStatus? - The status code and file_path in a tuple, or None if the record was not accepted.
     """
-    if len(file_status_line.strip()) < 3:
+    if len(record) < 3 or (record.endswith(b'/') and not (keep_directories and record.startswith(b'? '))):
         return None
-    if file_status_line.endswith('/'):
+    if (record_type := record[:1]) == b'?':
+        code, file_path = '??', record[2:]
+    elif record_type == b'!':
+        code, file_path = '!!', record[2:]
+    elif (field_count := _V2_FIELD_COUNTS.get(record_type)) is not None:
+        if len(fields := record.split(b' ', field_count)) <= field_count:
+            return None
+        if (code := _V2_STATUS_CODES.get(xy := fields[1])) is None:
+            code = xy.decode(errors='replace').replace('.', ' ')
+            if len(xy) == 2:
+                _V2_STATUS_CODES[xy] = code
+        file_path = fields[field_count]
+    else:  # Headers and unknown records
         return None
     return GitFileStatus(
-        code=file_status_line[:2],
-        file_path=file_status_line[3:],
+        code=code,
+        file_path=file_path.decode('utf-8', 'surrogateescape'),
     )
@@ -1,32 +1,362 @@
 """ Runner for Git Status Operation.
 """
+import os
 import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Generator, IO, Iterator
 
 
-def run_git_status(
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def stream_git_status(
+    include_untracked: bool = False,
+    deadline: float | None = None,
+    untracked_mode: str | None = None,
+    pathspecs: list[str] | None = None,
+    config: list[str] | None = None,
+    write_index: bool = False,
+) -> Generator[bytes, None, None]:
+    """ Stream Git Status Porcelain V2 records while the Git Process is running.
+ - Reads stdout in chunks, splitting on the NUL terminator of each record.
+ - The Git Process is terminated if the Generator is closed before the output ends.
+ - The Git Process is killed when the deadline passes, and TimeoutExpired is raised after the partial output.
+
+**Parameters:**
+ - include_untracked (bool): Whether to include untracked files in the output.
+ - deadline (float?): The time.monotonic() value at which the Git Process is killed. Default: None, no deadline.
+ - untracked_mode (str?): A git untracked files mode (all, normal, no) that overrides include_untracked.
+ - pathspecs (list[str]?): The pathspecs that limit the files in the output. Default: None, the whole repository.
+ - config (list[str]?): The name=value pairs passed to git with -c. Default: None.
+ - write_index (bool): Whether git may write the refreshed Index. Default: False, git runs with --no-optional-locks.
+
+**Yields:**
+ bytes - A single NUL-terminated field of the Porcelain V2 output, without the terminator.
+
+**Raises:**
+ subprocess.TimeoutExpired - When the deadline passed before the output was complete.
+    """
+    if untracked_mode is None:
+        untracked_mode = 'all' if include_untracked else 'no'
+    yield from _stream_nul_records(_get_status_args(untracked_mode, pathspecs, config, write_index), deadline, 'Git Status')
+
+
+def stream_git_status_blocks(
     include_untracked: bool = False,
-) -> str:
-    """ Run a Git Status Process and Return the Output.
+    deadline: float | None = None,
+    untracked_mode: str | None = None,
+    pathspecs: list[str] | None = None,
+    config: list[str] | None = None,
+    write_index: bool = False,
+) -> Generator[bytes, None, None]:
+    """ Stream Git Status Porcelain V2 output in blocks of whole records while the Git Process is running.
+ - Each block is a chunk of stdout, extended or cut to end with the NUL terminator of a record.
+ - The Git Process is terminated if the Generator is closed before the output ends.
+ - The Git Process is killed when the deadline passes, and TimeoutExpired is raised after the partial output.
 
 **Parameters:**
- - include_untracked (bool): Whether to include untracked files and directories in the output.
+ - include_untracked (bool): Whether to include untracked files in the output.
+ - deadline (float?): The time.monotonic() value at which the Git Process is killed. Default: None, no deadline.
+ - untracked_mode (str?): A git untracked files mode (all, normal, no) that overrides include_untracked.
+ - pathspecs (list[str]?): The pathspecs that limit the files in the output. Default: None, the whole repository.
+ - config (list[str]?): The name=value pairs passed to git with -c. Default: None.
+ - write_index (bool): Whether git may write the refreshed Index. Default: False, git runs with --no-optional-locks.
+
+**Yields:**
+ bytes - The NUL-terminated Porcelain V2 records of a block of the output.
+
+**Raises:**
+ subprocess.TimeoutExpired - When the deadline passed before the output was complete.
+    """
+    if untracked_mode is None:
+        untracked_mode = 'all' if include_untracked else 'no'
+    yield from _stream_nul_records(
+        _get_status_args(untracked_mode, pathspecs, config, write_index), deadline, 'Git Status', _split_nul_blocks,
+    )
+
+
+def read_git_status_buffer(
+    untracked_mode: str = 'no',
+    pathspecs: list[str] | None = None,
+    config: list[str] | None = None,
+    write_index: bool = False,
+) -> bytes:
+    """ Run Git Status to completion, and return the whole Porcelain V2 output.
+
+**Parameters:**
+ - untracked_mode (str): A git untracked files mode (all, normal, no). Default: no.
+ - pathspecs (list[str]?): The pathspecs that limit the files in the output. Default: None, the whole repository.
+ - config (list[str]?): The name=value pairs passed to git with -c. Default: None.
+ - write_index (bool): Whether git may write the refreshed Index. Default: False, git runs with --no-optional-locks.
 
 **Returns:**
- str - The output of the Git Status Operation.
+ bytes - The NUL-terminated Porcelain V2 records.
     """
-    args = ['git', '--no-optional-locks', 'status', '--porcelain', '--no-renames']
-    if include_untracked:
-        args.append('-uall')
-    else:
-        args.append('-uno')
     result = subprocess.run(
-        args=args,
+        args=_get_status_args(untracked_mode, pathspecs, config, write_index),
         capture_output=True,
-        text=True,
-        universal_newlines=True,
         shell=False,
-        timeout=5,
     )
-    if (error := result.stderr) is not None and not len(error) < 1:
-        exit(f"Git Status Runner Error: {error}")
+    if len(error := result.stderr) > 0:
+        exit(f"Git Status Runner Error: {error.decode(errors='replace')}")
     return result.stdout
+
+
+def _get_status_args(
+    untracked_mode: str,
+    pathspecs: list[str] | None,
+    config: list[str] | None,
+    write_index: bool,
+) -> list[str]:
+    # The untracked cache and fsmonitor state are only reused after git writes them to the Index
+    args = ['git'] if write_index else ['git', '--no-optional-locks']
+    for name_value in config or ():
+        args.extend(('-c', name_value))
+    args.extend((
+        '-c', 'status.relativePaths=false',
+        'status', '--porcelain=v2', '-z', '--no-renames', f'-u{untracked_mode}',
+    ))
+    if pathspecs is not None:
+        args.append('--')
+        args.extend(pathspecs)
+    return args
+
+
+def get_scope_pathspecs(
+    scope: list[str],
+) -> list[str]:
+    """ Convert the paths of a scope into literal pathspecs, relative to the repository root.
+
+**Parameters:**
+ - scope (list[str]): The paths relative to the Worktree root, without leading slashes.
+
+**Returns:**
+ list[str] - The pathspecs that match the files within the scope.
+    """
+    return [f':(top,literal){path}' for path in scope]
+
+
+def run_git_diff_paths(
+    revisions: list[str],
+    cached: bool = False,
+) -> list[str] | None:
+    """ Run Git Diff, and return the paths that differ.
+ - Renames are listed as the deleted path and the added path.
+
+**Parameters:**
+ - revisions (list[str]): The commits to compare. Two commits are compared with each other, one with the Index when cached.
+ - cached (bool): Whether the Index is compared with the commit. Default: False.
+
+**Returns:**
+ list[str]? - The paths relative to the repository root, or None if git failed, such as when a commit no longer exists.
+    """
+    args = ['git', '--no-optional-locks', 'diff', '--name-only', '-z', '--no-renames', '--no-ext-diff']
+    if cached:
+        args.append('--cached')
+    args.extend(revisions)
+    args.append('--')
+    result = subprocess.run(
+        args=args,
+        capture_output=True,
+        shell=False,
+    )
+    if result.returncode != 0:
+        return None
+    return [
+        path.decode('utf-8', 'surrogateescape') for path in result.stdout.split(b'\0') if len(path) > 0
+    ]
+
+
+def split_pathspec_shards(
+    root: Path,
+    shard_count: int,
+    paths: list[str] | None = None,
+    exhaustive: bool = True,
+) -> list[list[str]]:
+    """ Split the repository into shards of pathspecs, for Git Status Processes that run at the same time.
+ - The paths are distributed between the shards in sorted order, one at a time.
+ - The last shard matches the whole repository except the paths of the other shards, so no file is missed.
+
+**Parameters:**
+ - root (Path): The Worktree root directory.
+ - shard_count (int): The maximum number of shards.
+ - paths (list[str]?): The paths, relative to the root, to distribute. Default: None, the top-level directory entries.
+ - exhaustive (bool): Whether the last shard matches the rest of the repository. False to match only the paths.
+
+**Returns:**
+ list[list[str]] - The pathspecs of each shard. A single exhaustive shard matches the whole repository.
+    """
+    if paths is None:
+        names = sorted(entry.name for entry in os.scandir(root) if entry.name != '.git')
+    else:
+        names = sorted({p.strip('/') for p in paths} - {''})
+    shard_count = max(1, min(shard_count, len(names)))
+    if not exhaustive:
+        return [get_scope_pathspecs(names[i::shard_count]) for i in range(shard_count)]
+    groups = [names[i::shard_count] for i in range(shard_count - 1)]
+    shards = [get_scope_pathspecs(group) for group in groups]
+    shards.append([':/'] + [f':(top,exclude,literal){name}' for group in groups for name in group])
+    return shards
+
+
+def run_sharded_git_status(
+    pathspec_shards: list[list[str]],
+    untracked_mode: str = 'no',
+    deadline: float | None = None,
+    config: list[str] | None = None,
+    write_index: bool = False,
+) -> Generator[list[bytes], None, None]:
+    """ Run a Git Status Process for each shard of pathspecs at the same time.
+ - The records of each shard are yielded when its Git Process completes, in order of completion.
+
+**Parameters:**
+ - pathspec_shards (list[list[str]]): The pathspecs of each shard.
+ - untracked_mode (str): A git untracked files mode (all, normal, no). Default: no.
+ - deadline (float?): The time.monotonic() value at which the Git Processes are killed. Default: None, no deadline.
+ - config (list[str]?): The name=value pairs passed to git with -c. Default: None.
+ - write_index (bool): Whether git may write the refreshed Index. Default: False.
+
+**Yields:**
+ list[bytes] - The Porcelain V2 records of a single shard.
+
+**Raises:**
+ subprocess.TimeoutExpired - When the deadline passed before the output of a shard was complete.
+    """
+    with ThreadPoolExecutor(max_workers=len(pathspec_shards)) as executor:
+        futures = [
+            executor.submit(
+                lambda pathspecs: list(stream_git_status(
+                    deadline=deadline, untracked_mode=untracked_mode, pathspecs=pathspecs, config=config,
+                    write_index=write_index,
+                )),
+                shard,
+            )
+            for shard in pathspec_shards
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def stream_untracked_files(
+    deadline: float | None = None,
+    collapse_directories: bool = False,
+    pathspecs: list[str] | None = None,
+) -> Generator[bytes, None, None]:
+    """ Stream the paths of untracked files in the repository while the Git Process is running.
+ - Paths are relative to the repository root, and exclude ignored files.
+
+**Parameters:**
+ - deadline (float?): The time.monotonic() value at which the Git Process is killed. Default: None, no deadline.
+ - collapse_directories (bool): Whether a directory with no tracked files is listed once, with a trailing slash.
+ - pathspecs (list[str]?): The pathspecs that limit the files in the output. Default: None, the whole repository.
+
+**Yields:**
+ bytes - The path of an untracked file or directory.
+
+**Raises:**
+ subprocess.TimeoutExpired - When the deadline passed before the output was complete.
+    """
+    args = ['git', '--no-optional-locks', 'ls-files', '--others', '--exclude-standard', '-z', '--full-name']
+    if collapse_directories:
+        args.extend(('--directory', '--no-empty-directory'))
+    if pathspecs is None:
+        args.append(':/')  # The pathspec of the repository root
+    else:
+        args.extend(pathspecs)
+    yield from _stream_nul_records(args, deadline, 'Git Untracked Files')
+
+
+def _stream_nul_records(
+    args: list[str],
+    deadline: float | None,
+    error_name: str,
+    split: Callable[[IO[bytes]], Iterator[bytes]] | None = None,
+) -> Generator[bytes, None, None]:
+    if deadline is not None and deadline <= time.monotonic():
+        raise subprocess.TimeoutExpired(args, 0)
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            args=args,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            shell=False,
+        )
+        timer = _start_deadline_timer(process, deadline)
+        try:
+            yield from (_split_nul_records if split is None else split)(process.stdout)
+            process.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            _close_process(process)
+        if timer is not None and timer.expired.is_set():
+            raise subprocess.TimeoutExpired(args, deadline - timer.started)
+        stderr_file.seek(0)
+        if len(error := stderr_file.read()) > 0:
+            exit(f"{error_name} Runner Error: {error.decode(errors='replace')}")
+
+
+def _split_nul_records(
+    stream: IO[bytes],
+) -> Generator[bytes, None, None]:
+    remainder = b''
+    while len(chunk := stream.read1(_STREAM_CHUNK_SIZE)) > 0:
+        records = (remainder + chunk).split(b'\0')
+        remainder = records.pop()
+        yield from records
+    if len(remainder) > 0:  # Output was not NUL terminated
+        yield remainder
+
+
+def _split_nul_blocks(
+    stream: IO[bytes],
+) -> Generator[bytes, None, None]:
+    remainder = b''
+    while len(chunk := stream.read1(_STREAM_CHUNK_SIZE)) > 0:
+        if (end := chunk.rfind(b'\0')) < 0:
+            remainder += chunk
+            continue
+        yield remainder + chunk[:end + 1]
+        remainder = chunk[end + 1:]
+    if len(remainder) > 0:  # Output was not NUL terminated
+        yield remainder + b'\0'
+
+
+def _close_process(
+    process: subprocess.Popen,
+):
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+    process.stdout.close()
+
+
+class _DeadlineTimer(threading.Timer):
+    """ Kills a Process when the Timer expires, and records the expiry.
+    """
+
+    def __init__(self, interval: float, process: subprocess.Popen):
+        self.expired = threading.Event()
+        self.started = time.monotonic()
+        super().__init__(interval, self._expire, args=(process,))
+        self.daemon = True
+
+    def _expire(self, process: subprocess.Popen):
+        if process.poll() is None:
+            self.expired.set()
+            process.kill()
+
+
+def _start_deadline_timer(
+    process: subprocess.Popen,
+    deadline: float | None,
+) -> _DeadlineTimer | None:
+    if deadline is None:
+        return None
+    timer = _DeadlineTimer(deadline - time.monotonic(), process)
+    timer.start()
+    return timer
@@ -0,0 +1,74 @@
+""" Compact storage for large collections of Git Status records.
+ - Status codes are stored in an array of small integers, which index the distinct codes in the table.
+ - File paths are encoded into one shared buffer, with an array of the end offset of each path.
+ - GitFileStatus objects are created only when the records are read.
+"""
+from array import array
+from typing import Iterable, Iterator
+
+from changelist_init.git.status_reader import GitFileStatus
+
+
+class StatusTable:
+    """ A sequence of Git Status records, stored without an object for each record.
+    """
+
+    __slots__ = ('_codes', '_code_names', '_code_ids', '_paths', '_path_ends')
+
+    def __init__(self, file_status: Iterable[GitFileStatus] = ()):
+        self._codes = array('H')
+        self._code_names: list[str] = []
+        self._code_ids: dict[str, int] = {}
+        self._paths = bytearray()
+        self._path_ends = array('Q')
+        self.extend(file_status)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index: int) -> GitFileStatus:
+        return GitFileStatus(self.get_code(index), self.get_path(index))
+
+    def __iter__(self) -> Iterator[GitFileStatus]:
+        code_names, paths, start = self._code_names, self._paths, 0
+        for code_id, end in zip(self._codes, self._path_ends):
+            yield GitFileStatus(code_names[code_id], paths[start:end].decode('utf-8', 'surrogateescape'))
+            start = end
+
+    def append(self, file_status: GitFileStatus):
+        """ Add a record to the end of the table.
+
+**Parameters:**
+ - file_status (GitFileStatus): The status code and file path.
+        """
+        if (code_id := self._code_ids.get(code := file_status.code)) is None:
+            code_id = self._code_ids[code] = len(self._code_names)
+            self._code_names.append(code)
+        self._codes.append(code_id)
+        self._paths += file_status.file_path.encode('utf-8', 'surrogateescape')
+        self._path_ends.append(len(self._paths))
+
+    def extend(self, file_status: Iterable[GitFileStatus]):
+        """ Add each record to the end of the table.
+
+**Parameters:**
+ - file_status (Iterable[GitFileStatus]): The status records.
+        """
+        for record in file_status:
+            self.append(record)
+
+    def get_code(self, index: int) -> str:
+        """ The status code of a record, without reading its path.
+        """
+        return self._code_names[self._codes[index]]
+
+    def get_path(self, index: int) -> str:
+        """ The file path of a record, without reading its code.
+        """
+        if index < 0:
+            index += len(self._path_ends)
+        if index < 0:
+            raise IndexError('StatusTable index out of range')
+        end = self._path_ends[index]
+        start = 0 if index == 0 else self._path_ends[index - 1]
+        return self._paths[start:end].decode('utf-8', 'surrogateescape')
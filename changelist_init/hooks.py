@@ -0,0 +1,95 @@
+""" Git Hook Integration.
+ - Installs post-commit, post-checkout and post-merge hooks that run Changelist Init with the hook arguments.
+ - The hook arguments determine the paths that may have changed, so that only those paths are updated.
+"""
+import os
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+from changelist_init.git import status_runner
+
+
+HOOK_NAMES = ('post-commit', 'post-checkout', 'post-merge')
+
+# Identifies the hook scripts written by this module, which may be replaced.
+_HOOK_MARKER = '# Installed by changelist-init'
+
+_NULL_COMMIT = '0' * 40
+
+
+def get_hook_paths(
+    hook_name: str,
+    hook_args: list[str],
+) -> list[str] | None:
+    """ Determine the paths that a git hook event may have changed.
+ - post-commit: The paths changed by the new commit.
+ - post-checkout: The paths that differ between the previous and the new HEAD, for a branch checkout.
+ - post-merge: The paths changed by the merge, or the paths staged by a squash merge.
+
+**Parameters:**
+ - hook_name (str): The name of the git hook.
+ - hook_args (list[str]): The arguments git passed to the hook.
+
+**Returns:**
+ list[str]? - The paths relative to the repository root, or None if every path must be updated.
+    """
+    if hook_name == 'post-commit':
+        return status_runner.run_git_diff_paths(['HEAD~1', 'HEAD'])
+    if hook_name == 'post-checkout':
+        if len(hook_args) != 3 or hook_args[2] != '1' or _NULL_COMMIT in hook_args[:2]:
+            return None  # A file checkout does not name its paths, and a clone has no previous HEAD
+        return status_runner.run_git_diff_paths(hook_args[:2])
+    if hook_name == 'post-merge':
+        if len(hook_args) != 1:
+            return None
+        if hook_args[0] == '1':  # A squash merge stages the changes, without a merge commit
+            return status_runner.run_git_diff_paths(['HEAD'], cached=True)
+        return status_runner.run_git_diff_paths(['ORIG_HEAD', 'HEAD'])
+    return None
+
+
+def install_hooks(
+    arguments: list[str],
+) -> list[Path]:
+    """ Write the hook scripts into the hooks directory of the repository.
+ - Existing hooks that were not installed by Changelist Init are left unchanged.
+
+**Parameters:**
+ - arguments (list[str]): The program arguments that each hook passes to Changelist Init.
+
+**Returns:**
+ list[Path] - The paths of the hook scripts that were written.
+    """
+    if (hooks_dir := get_hooks_dir()) is None:
+        exit("Installing hooks requires a Git Repository.")
+    hooks_dir.mkdir(parents=True, exist_ok=True)
+    command = ' '.join(shlex.quote(arg) for arg in [sys.executable, '-m', 'changelist_init', *arguments])
+    installed = []
+    for hook_name in HOOK_NAMES:
+        hook_path = hooks_dir / hook_name
+        if hook_path.exists() and _HOOK_MARKER not in hook_path.read_text(errors='replace'):
+            print(f"Skipped the existing hook: {hook_path}")
+            continue
+        hook_path.write_text(f'#!/bin/sh\n{_HOOK_MARKER}\n{command} --hook {hook_name} "$@"\n')
+        os.chmod(hook_path, 0o755)
+        installed.append(hook_path)
+    return installed
+
+
+def get_hooks_dir() -> Path | None:
+    """ Obtain the directory that git runs hooks from, which respects core.hooksPath.
+
+**Returns:**
+ Path? - The hooks directory, or None if the current directory is not in a repository.
+    """
+    result = subprocess.run(
+        args=['git', 'rev-parse', '--git-path', 'hooks'],
+        capture_output=True,
+        text=True,
+        shell=False,
+    )
+    if result.returncode != 0 or len(hooks_dir := result.stdout.strip()) == 0:
+        return None
+    return Path(hooks_dir).absolute()
@@ -1,20 +1,24 @@
 """ Input Package Method.
 """
 from pathlib import Path
+from typing import Callable
 
 from changelist_data import ChangelistDataStorage, validate_string_argument, load_storage, StorageType
 
+from changelist_init.git import git_dir
 from changelist_init.input.argument_parser import parse_arguments
 from changelist_init.input.input_data import InputData
 
 
 def validate_input(
     arguments: list[str],
+    storage_loader: Callable[[StorageType, Path | None], ChangelistDataStorage | None] = load_storage,
 ) -> InputData:
     """ Parse and Validate the Arguments, and return Input Data.
 
 **Parameters:**
  - arguments (list[str]): The arguments received by the program.
+ - storage_loader (Callable): Loads the Storage of a type, from a path or the default path. Default: load_storage.
 
 **Returns:**
  InputData - The InputData containing the program inputs. The other packages will process the data from here.
@@ -25,24 +29,69 @@ def validate_input(
             arg_data.changelists_file,
             arg_data.workspace_file,
             arg_data.enable_workspace_overwrite,
+            storage_loader,
         ),
         include_untracked=arg_data.include_untracked,
+        time_budget=arg_data.time_budget,
+        use_status_cache=arg_data.status_cache or arg_data.incremental,
+        use_index_reader=arg_data.index_reader,
+        workers=arg_data.workers,
+        concurrent_untracked=arg_data.concurrent_untracked,
+        status_shards=arg_data.status_shards,
+        shard_paths=arg_data.shard_paths,
+        scope=_validate_scope_paths(arg_data.paths),
+        watch=arg_data.watch,
+        serve=arg_data.serve,
+        incremental=arg_data.incremental,
+        hook=arg_data.hook,
+        install_hooks=arg_data.install_hooks,
+        fsmonitor=arg_data.fsmonitor,
+        autotune=arg_data.autotune,
+        collapse_untracked=arg_data.collapse_untracked,
+        expand_untracked=arg_data.expand_untracked,
+        max_files=arg_data.max_files,
+        path_errors=arg_data.path_errors,
+        parse_processes=arg_data.parse_processes,
+        summary=arg_data.summary,
+        staged_changelist=arg_data.staged_changelist,
+        write_index=arg_data.write_index,
     )
 
 
+def _validate_scope_paths(
+    paths: list[str] | None,
+) -> list[str] | None:
+    """ Convert the path arguments into paths relative to the repository root.
+ - Returns None when no paths were given, or a path is the repository root.
+    """
+    if paths is None:
+        return None
+    if (root := git_dir.find_worktree_root()) is None:
+        exit("The path arguments require a Git Repository.")
+    scope = []
+    for path in paths:
+        if (relative_path := git_dir.get_root_relative_path(path, root)) is None:
+            exit(f"The path is outside of the Git Repository: {path}")
+        if len(relative_path) == 0:
+            return None
+        scope.append(relative_path)
+    return scope
+
+
 def _validate_storage_arguments(
     changelists_file: str | None,
     workspace_file: str | None,
     enable_workspace_overwrite: bool,
+    storage_loader: Callable[[StorageType, Path | None], ChangelistDataStorage | None] = load_storage,
 ) -> ChangelistDataStorage | None:
     # Validate given Path arguments if provided.
     if validate_string_argument(changelists_file):
-        return load_storage(StorageType.CHANGELISTS, Path(changelists_file))
+        return storage_loader(StorageType.CHANGELISTS, Path(changelists_file))
     if validate_string_argument(workspace_file):
-        return load_storage(StorageType.WORKSPACE, Path(workspace_file))
+        return storage_loader(StorageType.WORKSPACE, Path(workspace_file))
     # Check Workspace Overwrite Status
     if enable_workspace_overwrite: # Prefer Workspace File
-        if (workspace_storage := load_storage(StorageType.WORKSPACE)) is not None:
+        if (workspace_storage := storage_loader(StorageType.WORKSPACE, None)) is not None:
             return workspace_storage
     # Only Changelist Data File Enabled
-    return load_storage(StorageType.CHANGELISTS)
+    return storage_loader(StorageType.CHANGELISTS, None)
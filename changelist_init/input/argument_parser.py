@@ -7,6 +7,29 @@
  - workspace_file (str?): The string path to the Workspace File.
  - include_untracked (bool): Whether to include untracked files.
  - enable_workspace_overwrite (bool): Indicates that Workspace is the preferred storage option, if present.
+ - time_budget (float?): The seconds given to git status before falling back to a cheaper untracked files mode.
+ - status_cache (bool): Whether to reuse cached git status records while the git index and HEAD are unchanged.
+ - index_reader (bool): Whether to read tracked file status from the git index file instead of running git.
+ - workers (int?): The number of parallel workers. None to size automatically.
+ - concurrent_untracked (bool): Whether untracked files are listed by a separate git process, concurrently.
+ - status_shards (int): The number of git status processes that run at the same time, on separate paths.
+ - shard_paths (list[str]?): The paths distributed between status shards. None for the top-level directory entries.
+ - paths (list[str]?): The paths that limit the init to a subtree of the repository.
+ - watch (bool): Whether to keep running, and update the storage file when the worktree changes.
+ - serve (bool): Whether to keep running, and serve requests from clients on a Unix Domain Socket.
+ - incremental (bool): Whether to sync only the paths that may have changed since the last recorded sync.
+ - hook (list[str]?): The name of the git hook that is running, followed by the arguments git passed to it.
+ - install_hooks (bool): Whether to install the git hooks that run Changelist Init, instead of running it.
+ - fsmonitor (bool): Whether git status uses the untracked cache and the builtin fsmonitor daemon, when supported.
+ - autotune (bool): Whether to benchmark git status options on the repository, and keep the fastest, instead of running.
+ - collapse_untracked (bool): Whether an untracked directory is a single directory entry, instead of one entry per file.
+ - expand_untracked (int): The largest number of entries in a collapsed untracked directory that is listed file by file.
+ - max_files (int?): The largest number of files listed, after which git is stopped. None for no limit.
+ - path_errors (str): The codecs error handler for file path bytes that are not UTF-8.
+ - parse_processes (int): The largest number of processes that parse a large git status output.
+ - summary (bool): Whether to print the number of created, updated, deleted and unrecognized files in the git status.
+ - staged_changelist (str?): The name of the changelist that fully staged files are moved to. None to leave them in place.
+ - write_index (bool): Whether git status may write the refreshed git index, so later runs reuse its stat information.
 """
 from argparse import ArgumentParser
 from collections import namedtuple
@@ -15,6 +38,10 @@ from sys import exit
 from changelist_data.validation.arguments import validate_string_argument
 
 
+# The codecs error handlers that produce valid text for the data files.
+PATH_ERROR_HANDLERS = ('backslashreplace', 'replace')
+
+
 ArgumentData = namedtuple(
     'ArgumentData',
     (
@@ -22,8 +49,34 @@ ArgumentData = namedtuple(
         'workspace_file',
         'include_untracked',
         'enable_workspace_overwrite',
+        'time_budget',
+        'status_cache',
+        'index_reader',
+        'workers',
+        'concurrent_untracked',
+        'status_shards',
+        'shard_paths',
+        'paths',
+        'watch',
+        'serve',
+        'incremental',
+        'hook',
+        'install_hooks',
+        'fsmonitor',
+        'autotune',
+        'collapse_untracked',
+        'expand_untracked',
+        'max_files',
+        'path_errors',
+        'parse_processes',
+        'summary',
+        'staged_changelist',
+        'write_index',
+    ),
+    defaults=(
+        None, None, False, False, None, False, False, None, False, 1, None, None, False, False, False, None, False,
+        False, False, False, 0, None, 'backslashreplace', 1, False, None, False,
     ),
-    defaults=(None, None, False, False),
 )
 
 
@@ -56,11 +109,59 @@ def _validate_arguments(
     elif (workspace_file := parsed_args.workspace_file) is not None:
         if not validate_string_argument(workspace_file):
             exit("The Workspace File name was invalid.")
+    if (time_budget := parsed_args.time_budget) is not None and not time_budget > 0:
+        exit("The Time Budget must be a positive number of seconds.")
+    if (workers := parsed_args.workers) is not None and workers < 1:
+        exit("The number of Workers must be at least 1.")
+    if (status_shards := parsed_args.status_shards) < 1:
+        exit("The number of Status Shards must be at least 1.")
+    if (shard_paths := parsed_args.shard_path) is not None:
+        if not all(validate_string_argument(p) for p in shard_paths):
+            exit("A Shard Path was invalid.")
+    if (paths := parsed_args.path) is not None:
+        if not all(validate_string_argument(p) for p in paths):
+            exit("A Path argument was invalid.")
+    if (expand_untracked := parsed_args.expand_untracked) < 0:
+        exit("The Expand Untracked entry limit must not be negative.")
+    if (max_files := parsed_args.max_files) is not None and max_files < 1:
+        exit("The Max Files limit must be at least 1.")
+    if (parse_processes := parsed_args.parse_processes) < 1:
+        exit("The number of Parse Processes must be at least 1.")
+    if (staged_changelist := parsed_args.staged_changelist) is not None:
+        if not validate_string_argument(staged_changelist):
+            exit("The Staged Changelist name was invalid.")
+    if (hook := parsed_args.hook) is not None:
+        from changelist_init.hooks import HOOK_NAMES
+        if hook[0] not in HOOK_NAMES:
+            exit(f"The Hook name was invalid. Supported hooks: {', '.join(HOOK_NAMES)}")
     return ArgumentData(
         changelists_file=parsed_args.changelists_file,
         workspace_file=parsed_args.workspace_file,
         include_untracked=parsed_args.include_untracked,
         enable_workspace_overwrite=parsed_args.enable_workspace_overwrite,
+        time_budget=time_budget,
+        status_cache=parsed_args.status_cache,
+        index_reader=parsed_args.index_reader,
+        workers=workers,
+        concurrent_untracked=parsed_args.concurrent_untracked,
+        status_shards=status_shards,
+        shard_paths=shard_paths,
+        paths=paths,
+        watch=parsed_args.watch,
+        serve=parsed_args.serve,
+        incremental=parsed_args.incremental,
+        hook=hook,
+        install_hooks=parsed_args.install_hooks,
+        fsmonitor=parsed_args.fsmonitor,
+        autotune=parsed_args.autotune,
+        collapse_untracked=parsed_args.collapse_untracked,
+        expand_untracked=expand_untracked,
+        max_files=max_files,
+        path_errors=parsed_args.path_errors,
+        parse_processes=parse_processes,
+        summary=parsed_args.summary,
+        staged_changelist=staged_changelist,
+        write_index=parsed_args.write_index,
     )
 
 
@@ -102,4 +203,144 @@ def _define_arguments() -> ArgumentParser:
         default=False,
         help='Enable overwriting Workspace file in the default location. Prefers Workspace over Changelist data file, but creates Changelist data file if neither exists.',
     )
+    parser.add_argument(
+        '--time_budget',
+        type=float,
+        default=None,
+        help='The seconds given to git status before falling back to a cheaper untracked files mode. No limit by default.',
+    )
+    parser.add_argument(
+        '--status_cache',
+        action='store_true',
+        default=False,
+        help='Reuse cached git status results while the git index and HEAD are unchanged. Edits to unchanged files may be missed until then.',
+    )
+    parser.add_argument(
+        '--index_reader',
+        action='store_true',
+        default=False,
+        help='Read tracked file status from the git index file instead of running git. Falls back to git when unsupported. Ignored with --include_untracked, unless --concurrent_untracked is given.',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='The number of parallel workers used to compare worktree files with the git index. Sized automatically by default.',
+    )
+    parser.add_argument(
+        '--concurrent_untracked',
+        action='store_true',
+        default=False,
+        help='List untracked files in a separate git process, at the same time as the tracked file status. Used with --include_untracked.',
+    )
+    parser.add_argument(
+        '--status_shards',
+        type=int,
+        default=1,
+        help='The number of git status processes that run at the same time, each on a separate set of top-level directories. Output is sorted by path.',
+    )
+    parser.add_argument(
+        '--shard_path',
+        action='append',
+        default=None,
+        help='A path to distribute between the status shards, instead of the top-level directory entries. May be repeated.',
+    )
+    parser.add_argument(
+        '--path',
+        action='append',
+        default=None,
+        help='Limit git status and the changelist update to the files under this path. Entries outside of the paths are left untouched. May be repeated.',
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        default=False,
+        help='Keep running, and update the changelists when files in the worktree change. Uses inotify on Linux, and polling elsewhere.',
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        default=False,
+        help='Keep running, and serve requests from the cl-init-client program on a socket in the .changelists directory. Keeps data files loaded between requests.',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        default=False,
+        help='Sync only the paths that may have changed since the last run, and patch them into the changelists. Implies --status_cache, and a cache invalidated by commits or the index is refreshed on the paths changed since then, the staged paths, the previously changed paths and the files that differ from the index.',
+    )
+    parser.add_argument(
+        '--hook',
+        nargs='+',
+        default=None,
+        metavar=('NAME', 'ARGS'),
+        help='Run from a git hook (post-commit, post-checkout or post-merge), followed by the hook arguments. Updates only the paths that the hook event may have changed.',
+    )
+    parser.add_argument(
+        '--install_hooks',
+        action='store_true',
+        default=False,
+        help='Install the post-commit, post-checkout and post-merge hooks, which run changelist-init with the other given arguments. Existing hooks are not replaced.',
+    )
+    parser.add_argument(
+        '--fsmonitor',
+        action='store_true',
+        default=False,
+        help='Let git status use the untracked cache and the builtin fsmonitor daemon, when the git version supports them, so that scans avoid a full directory walk. Git may update its index, and starts the daemon.',
+    )
+    parser.add_argument(
+        '--write_index',
+        action='store_true',
+        default=False,
+        help='Let git status write the refreshed stat information and the tuned caches to the git index, so later scans are faster. By default git status runs without optional locks, and does not write the index.',
+    )
+    parser.add_argument(
+        '--autotune',
+        action='store_true',
+        default=False,
+        help='Benchmark git status options on this repository, and keep the fastest profile that finds the same files. Later runs use the profile. Tunes untracked file collection with --include_untracked.',
+    )
+    parser.add_argument(
+        '--collapse_untracked',
+        action='store_true',
+        default=False,
+        help='List an untracked directory as a single directory entry, instead of every file it contains. Git does not walk into the directory. Used with --include_untracked.',
+    )
+    parser.add_argument(
+        '--expand_untracked',
+        type=int,
+        default=0,
+        help='Collapsed untracked directories with at most this many files and subdirectories are listed file by file. Used with --collapse_untracked.',
+    )
+    parser.add_argument(
+        '--max_files',
+        type=int,
+        default=None,
+        help='Stop git once this many files are listed. The default changelist comment then notes the directories of the files that were not listed. No limit by default.',
+    )
+    parser.add_argument(
+        '--path_errors',
+        type=str,
+        choices=PATH_ERROR_HANDLERS,
+        default='backslashreplace',
+        help='How file path bytes that are not UTF-8 are written to the data file. The default escapes each byte as a backslash sequence, replace substitutes the replacement character.',
+    )
+    parser.add_argument(
+        '--parse_processes',
+        type=int,
+        default=1,
+        help='The largest number of processes that parse the git status output. Large outputs are split between them. Used without --time_budget, --status_cache, --index_reader, --concurrent_untracked, --status_shards and --max_files.',
+    )
+    parser.add_argument(
+        '--summary',
+        action='store_true',
+        default=False,
+        help='Print the number of created, updated, deleted and unrecognized files in the git status.',
+    )
+    parser.add_argument(
+        '--staged_changelist',
+        type=str,
+        default=None,
+        help='The name of a changelist that holds the files whose changes are all staged in the git index. It is created when a file is staged, and files that are no longer staged move to the default changelist.',
+    )
     return parser
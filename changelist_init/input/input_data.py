@@ -12,6 +12,52 @@ class InputData:
 **Fields:**
  - storage (ChangelistDataStorage): The Storage object used for Data IO.
  - include_untracked (bool): Whether to include untracked files.
+ - time_budget (float?): The seconds given to git status before falling back to a cheaper mode. Default: None.
+ - use_status_cache (bool): Whether to reuse cached git status records. Default: False.
+ - use_index_reader (bool): Whether to read tracked file status from the git index file. Default: False.
+ - workers (int?): The number of parallel workers. Default: None, sized automatically.
+ - concurrent_untracked (bool): Whether untracked files are listed at the same time as tracked files. Default: False.
+ - status_shards (int): The number of git status processes that run at the same time, on separate paths. Default: 1.
+ - shard_paths (list[str]?): The paths distributed between status shards. Default: None, the top-level directory entries.
+ - scope (list[str]?): The paths, relative to the repository root, that limit the init. Default: None, the whole repository.
+ - watch (bool): Whether to keep the storage file updated with changes to the worktree. Default: False.
+ - serve (bool): Whether to serve requests from clients, instead of running once. Default: False.
+ - incremental (bool): Whether to sync only the paths that may have changed since the last recorded sync. Default: False.
+ - hook (list[str]?): The name and arguments of the git hook that is running. Default: None, not run from a hook.
+ - install_hooks (bool): Whether to install the git hooks, instead of running the init. Default: False.
+ - fsmonitor (bool): Whether git status uses the untracked cache and the builtin fsmonitor daemon. Default: False.
+ - autotune (bool): Whether to tune the git status options of the repository, instead of running the init. Default: False.
+ - collapse_untracked (bool): Whether an untracked directory is a single directory entry. Default: False.
+ - expand_untracked (int): The largest number of entries in a collapsed directory that is listed file by file. Default: 0.
+ - max_files (int?): The largest number of files listed, after which git is stopped. Default: None, no limit.
+ - path_errors (str): The codecs error handler for file path bytes that are not UTF-8. Default: backslashreplace.
+ - parse_processes (int): The largest number of processes that parse a large git status output. Default: 1.
+ - summary (bool): Whether to print the counts of the git status records by kind of change. Default: False.
+ - staged_changelist (str?): The name of the changelist that fully staged files are moved to. Default: None, not moved.
+ - write_index (bool): Whether git status may write the refreshed git index. Default: False.
     """
     storage: ChangelistDataStorage
     include_untracked: bool = False
+    time_budget: float | None = None
+    use_status_cache: bool = False
+    use_index_reader: bool = False
+    workers: int | None = None
+    concurrent_untracked: bool = False
+    status_shards: int = 1
+    shard_paths: list[str] | None = None
+    scope: list[str] | None = None
+    watch: bool = False
+    serve: bool = False
+    incremental: bool = False
+    hook: list[str] | None = None
+    install_hooks: bool = False
+    fsmonitor: bool = False
+    autotune: bool = False
+    collapse_untracked: bool = False
+    expand_untracked: int = 0
+    max_files: int | None = None
+    path_errors: str = 'backslashreplace'
+    parse_processes: int = 1
+    summary: bool = False
+    staged_changelist: str | None = None
+    write_index: bool = False
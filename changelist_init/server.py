@@ -0,0 +1,231 @@
+""" Changelist Init Server.
+ - Listens on a Unix Domain Socket in the .changelists directory, and runs one request at a time.
+ - Storage objects are kept between requests, and read again only after another program writes their file.
+ - A request is a JSON line with the program arguments and the working directory.
+ - The response is a JSON object with the printed output, the error message, and the exit status.
+"""
+import io
+import json
+import os
+import socket
+import subprocess
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from changelist_data import load_storage
+from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
+from changelist_data.storage.storage_type import StorageType
+
+from changelist_init import process_cl_init, autotune_cl_init
+from changelist_init.git import git_dir
+from changelist_init.input import validate_input
+from changelist_init.state_file import file_signature
+from changelist_init_client import get_socket_path, socket_address
+
+
+# The seconds between checks of the stop Event, while waiting for a connection.
+_ACCEPT_TIMEOUT = 1.0
+
+# The seconds a client is given to send its request, and receive the response.
+_CONNECTION_TIMEOUT = 10.0
+
+# The largest request accepted, in bytes.
+_MAX_REQUEST_SIZE = 1024 * 1024
+
+
+class StorageCache:
+    """ Keeps the Storage objects loaded by previous requests, while their files are unchanged.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple, tuple[ChangelistDataStorage, tuple[int, int] | None]] = {}
+
+    def load_storage(
+        self,
+        storage_type: StorageType,
+        file_path: Path | None = None,
+    ) -> ChangelistDataStorage | None:
+        """ Load the Storage, reusing the object from a previous request if its file is unchanged.
+
+**Parameters:**
+ - storage_type (StorageType): The type of Storage file.
+ - file_path (Path?): The path to the Storage file. Default: None, the default path of the Storage type.
+
+**Returns:**
+ ChangelistDataStorage? - The Storage object, or None if the Storage type has no file to load.
+        """
+        key = (storage_type, os.getcwd(), None if file_path is None else str(file_path))
+        if (entry := self._entries.get(key)) is not None:
+            storage, signature = entry
+            if file_signature(storage.update_path) == signature:
+                return storage
+        if (storage := load_storage(storage_type, file_path)) is not None:
+            self._entries[key] = (storage, file_signature(storage.update_path))
+        return storage
+
+    def record_write(
+        self,
+        storage: ChangelistDataStorage,
+    ):
+        """ Record the current signature of a Storage file, after it was written by this process.
+
+**Parameters:**
+ - storage (ChangelistDataStorage): The Storage object that may have been written.
+        """
+        signature = file_signature(storage.update_path)
+        for key, (cached_storage, _) in self._entries.items():
+            if cached_storage is storage:
+                self._entries[key] = (storage, signature)
+
+    def clear(self):
+        """ Remove every Storage object.
+        """
+        self._entries.clear()
+
+
+def serve_cl_init(
+    stop_event: threading.Event | None = None,
+    ready_event: threading.Event | None = None,
+):
+    """ Run Changelist Init requests from clients of the repository socket.
+ - A socket file left by a server that stopped unexpectedly is replaced.
+
+**Parameters:**
+ - stop_event (threading.Event?): An Event that stops the server when set. Default: None, serve until interrupted.
+ - ready_event (threading.Event?): An Event that is set once the server is listening. Default: None.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        exit("Serve mode requires Unix Domain Sockets.")
+    if (root := git_dir.find_worktree_root()) is None:
+        exit("Serve mode requires a Git Repository.")
+    socket_path = get_socket_path(str(root))
+    Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+    if _is_server_listening(socket_path):
+        exit(f"A server is already listening on: {socket_path}")
+    Path(socket_path).unlink(missing_ok=True)
+    storage_cache = StorageCache()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        try:
+            with socket_address(socket_path) as address:
+                server.bind(address)
+        except OSError as e:
+            exit(f"Unable to create the server socket: {e}")
+        try:
+            server.listen()
+            server.settimeout(_ACCEPT_TIMEOUT)
+            if ready_event is not None:
+                ready_event.set()
+            while stop_event is None or not stop_event.is_set():
+                try:
+                    connection, _ = server.accept()
+                except TimeoutError:
+                    continue
+                with connection:
+                    _handle_connection(connection, storage_cache, root)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            Path(socket_path).unlink(missing_ok=True)
+
+
+def run_request(
+    arguments: list[str],
+    cwd: str,
+    storage_cache: StorageCache,
+    root: Path | None = None,
+) -> dict:
+    """ Run Changelist Init with the arguments of a request, in its working directory.
+ - A working directory outside the repository root is rejected.
+ - Operating system, value and subprocess errors are returned as a Server Error. Other exceptions are raised.
+
+**Parameters:**
+ - arguments (list[str]): The program arguments.
+ - cwd (str): The working directory of the client.
+ - storage_cache (StorageCache): The Storage objects kept between requests.
+ - root (Path?): The root of the repository that is served. Default: None, the worktree root of the current directory.
+
+**Returns:**
+ dict - The response, with the printed output, the error message or None, and the exit status.
+    """
+    if root is None and (root := git_dir.find_worktree_root()) is None:
+        return {'output': '', 'error': "The server is not in a Git Repository.", 'status': 1}
+    if not _is_within_root(cwd, root):
+        return {'output': '', 'error': f"The working directory is outside the repository: {cwd}", 'status': 1}
+    output = io.StringIO()
+    initial_cwd = os.getcwd()
+    error, status = None, 0
+    try:
+        os.chdir(cwd)
+        with redirect_stdout(output):
+            input_data = validate_input(arguments, storage_cache.load_storage)
+            if input_data.watch or input_data.serve or input_data.install_hooks:
+                exit("Watch, Serve and Install Hooks modes are not available through the server.")
+            if input_data.autotune:
+                autotune_cl_init(input_data)
+            else:
+                process_cl_init(input_data)
+        storage_cache.record_write(input_data.storage)
+    except SystemExit as e:
+        storage_cache.clear()
+        if isinstance(e.code, str):
+            error, status = e.code, 1
+        elif e.code is not None:
+            status = e.code
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        storage_cache.clear()
+        error, status = f"Server Error: {e!r}", 1
+    finally:
+        os.chdir(initial_cwd)
+    return {'output': output.getvalue(), 'error': error, 'status': status}
+
+
+def _handle_connection(
+    connection: socket.socket,
+    storage_cache: StorageCache,
+    root: Path,
+):
+    connection.settimeout(_CONNECTION_TIMEOUT)
+    try:
+        request = json.loads(_receive_line(connection))
+    except (OSError, ValueError):
+        return
+    if not isinstance(request, dict) or not isinstance(cwd := request.get('cwd'), str) or\
+            not isinstance(arguments := request.get('argv'), list) or\
+            not all(isinstance(arg, str) for arg in arguments):
+        response = {'output': '', 'error': "The request was invalid.", 'status': 1}
+    else:
+        response = run_request(arguments, cwd, storage_cache, root)
+    try:
+        connection.sendall(json.dumps(response).encode() + b'\n')
+    except OSError:
+        pass
+
+
+def _is_within_root(cwd: str, root: Path) -> bool:
+    try:
+        return Path(cwd).resolve().is_relative_to(root.resolve())
+    except (OSError, RuntimeError):  # Symlink loops
+        return False
+
+
+def _receive_line(connection: socket.socket) -> bytes:
+    data = b''
+    while b'\n' not in data:
+        if len(chunk := connection.recv(64 * 1024)) == 0:
+            break
+        if len(data := data + chunk) > _MAX_REQUEST_SIZE:
+            raise ValueError("The request is too large.")
+    return data.split(b'\n', 1)[0]
+
+
+def _is_server_listening(socket_path: str) -> bool:
+    if not os.path.exists(socket_path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            with socket_address(socket_path) as address:
+                probe.connect(address)
+        except OSError:
+            return False
+    return True
@@ -0,0 +1,163 @@
+""" The JSON state files that Changelist Init keeps in the repository state directory.
+ - Each file is replaced atomically, so a reader never sees a partial write.
+ - Read-modify-write cycles hold a lock file, so concurrent processes do not drop each other's records.
+ - Failure to read, lock or write a state file is not an error, every state file is a cache.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
+
+
+_LOCK_TIMEOUT = 1.0
+_LOCK_POLL_INTERVAL = 0.01
+_STALE_LOCK_SECONDS = 10.0
+
+
+def storage_key(
+    storage: ChangelistDataStorage,
+) -> str:
+    """ The key of the records that belong to a Storage file.
+
+**Parameters:**
+ - storage (ChangelistDataStorage): The Storage object.
+
+**Returns:**
+ str - The storage type and the absolute path of the Storage file.
+    """
+    return f"{storage.storage_type.value}:{storage.update_path.absolute()}"
+
+
+def file_signature(
+    path: Path,
+) -> list[int] | None:
+    """ The stat signature of a file, which changes when the file is written.
+
+**Parameters:**
+ - path (Path): The file to stat.
+
+**Returns:**
+ list[int]? - The modification time in nanoseconds and the size, or None if the file could not be read.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def read_state(
+    state_dir: Path,
+    file_name: str,
+) -> object | None:
+    """ Read a JSON state file.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the state file.
+ - file_name (str): The name of the state file.
+
+**Returns:**
+ object? - The decoded JSON value, or None if the file is missing or malformed.
+    """
+    try:
+        with open(state_dir / file_name, encoding='utf-8') as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_state(
+    state_dir: Path,
+    file_name: str,
+    state: object,
+) -> bool:
+    """ Replace a JSON state file atomically.
+ - The temporary file is unique to the process and thread, so concurrent writers never share it.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the state file. It is created if it does not exist.
+ - file_name (str): The name of the state file.
+ - state (object): The JSON-serializable value to write.
+
+**Returns:**
+ bool - True if the state file was replaced.
+    """
+    text = json.dumps(state)
+    temp_path = state_dir / f"{file_name}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        state_dir.mkdir(exist_ok=True)
+        temp_path.write_text(text, encoding='utf-8')
+        os.replace(temp_path, state_dir / file_name)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def update_state(
+    state_dir: Path,
+    file_name: str,
+    update: Callable[[object | None], object | None],
+) -> bool:
+    """ Read, modify and write a JSON state file while holding its lock.
+
+**Parameters:**
+ - state_dir (Path): The directory containing the state file.
+ - file_name (str): The name of the state file.
+ - update (Callable): Receives the value read from the state file, or None. Returns the value to write, or None to leave the file unchanged.
+
+**Returns:**
+ bool - True if the state file was replaced.
+    """
+    lock_path = state_dir / (file_name + '.lock')
+    if not _acquire_lock(state_dir, lock_path):
+        return False
+    try:
+        if (state := update(read_state(state_dir, file_name))) is None:
+            return False
+        return write_state(state_dir, file_name, state)
+    finally:
+        try:
+            os.unlink(lock_path)
+        except OSError:
+            pass
+
+
+def _acquire_lock(
+    state_dir: Path,
+    lock_path: Path,
+) -> bool:
+    """ Create the lock file exclusively, waiting for another process to release it.
+ - A lock file older than the stale limit was left by a process that stopped, and it is removed.
+    """
+    try:
+        state_dir.mkdir(exist_ok=True)
+    except OSError:
+        return False
+    deadline = time.monotonic() + _LOCK_TIMEOUT
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            pass
+        except OSError:
+            return False
+        try:
+            if time.time() - os.stat(lock_path).st_mtime > _STALE_LOCK_SECONDS:
+                os.unlink(lock_path)
+                continue
+        except FileNotFoundError:
+            continue  # Released while checking
+        except OSError:
+            return False
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(_LOCK_POLL_INTERVAL)
@@ -0,0 +1,69 @@
+""" Worktree Watching Package.
+ - Watchers report the paths that changed, and whether the Git Index or HEAD changed.
+ - Uses Linux inotify when available, and falls back to polling the Worktree.
+"""
+import time
+from pathlib import Path
+
+from changelist_init.watch.watch_changes import WatchChanges
+
+
+# The quiet period that ends a burst of events, in seconds.
+DEBOUNCE_SECONDS = 0.3
+
+# The longest time a burst of events can delay an update, in seconds.
+MAX_DELAY_SECONDS = 3.0
+
+
+def create_watcher(
+    root: Path,
+    repo_git_dir: Path,
+):
+    """ Create a Watcher for the Worktree and the Git Directory.
+ - Falls back to polling when inotify is unavailable, or the inotify watch limit is reached.
+
+**Parameters:**
+ - root (Path): The Worktree root directory.
+ - repo_git_dir (Path): The Git Directory containing the Index and HEAD.
+
+**Returns:**
+ InotifyWatcher | PollWatcher - A context manager that reads WatchChanges.
+    """
+    from changelist_init.watch.inotify_watcher import InotifyWatcher, is_inotify_available
+    if is_inotify_available():
+        try:
+            return InotifyWatcher(root, repo_git_dir)
+        except OSError:
+            pass
+    from changelist_init.watch.poll_watcher import PollWatcher
+    return PollWatcher(root, repo_git_dir)
+
+
+def wait_for_changes(
+    watcher,
+    timeout: float | None = None,
+    debounce: float = DEBOUNCE_SECONDS,
+    max_delay: float = MAX_DELAY_SECONDS,
+) -> WatchChanges | None:
+    """ Wait for a burst of changes, and combine them once the Worktree has been quiet for the debounce period.
+
+**Parameters:**
+ - watcher (InotifyWatcher | PollWatcher): The Watcher to read changes from.
+ - timeout (float?): The seconds to wait for the first change. Default: None, wait indefinitely.
+ - debounce (float): The quiet period that ends the burst, in seconds.
+ - max_delay (float): The longest time to wait for the burst to end, in seconds.
+
+**Returns:**
+ WatchChanges? - The combined changes, or None if there were no changes before the timeout.
+    """
+    if (changes := watcher.read_changes(timeout)) is None:
+        return None
+    paths = set(changes.paths)
+    full_refresh = changes.full_refresh
+    deadline = time.monotonic() + max_delay
+    while (remaining := deadline - time.monotonic()) > 0:
+        if (changes := watcher.read_changes(min(debounce, remaining))) is None:
+            break
+        paths.update(changes.paths)
+        full_refresh = full_refresh or changes.full_refresh
+    return WatchChanges(paths=paths, full_refresh=full_refresh)
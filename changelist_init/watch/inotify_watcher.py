@@ -0,0 +1,166 @@
+""" Watches the Worktree with Linux inotify, through ctypes.
+ - Every Worktree directory is watched, except Git Directories. New directories are watched as they appear.
+ - The Git Directory is watched for changes to the Index, HEAD, and the refs that HEAD points to.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+from pathlib import Path
+
+from changelist_init.watch.watch_changes import WatchChanges
+
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+
+_WORKTREE_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_GIT_DIR_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+# The names in the Git Directory whose changes require a full refresh.
+# A commit writes the Index before its branch ref, and releases HEAD.lock once the ref has moved.
+_GIT_STATE_NAMES = (b'index', b'HEAD', b'HEAD.lock', b'packed-refs')
+
+_EVENT_HEADER = struct.Struct('=iIII')
+_READ_SIZE = 64 * 1024
+
+
+def is_inotify_available() -> bool:
+    """ Determine whether the C library provides inotify.
+
+**Returns:**
+ bool - True on Linux, when the inotify functions can be loaded.
+    """
+    return sys.platform.startswith('linux') and _load_libc() is not None
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1') or not hasattr(libc, 'inotify_add_watch'):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    """ Reads the Changes to the Worktree and Git Directory from an inotify file descriptor.
+    """
+
+    def __init__(self, root: Path, repo_git_dir: Path):
+        if (libc := _load_libc()) is None:
+            raise OSError("The inotify functions are not available.")
+        self._libc = libc
+        if (fd := libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)) < 0:
+            raise _errno_error('inotify_init1')
+        self._fd = fd
+        self._root = root
+        self._dirs: dict[int, str] = {}
+        try:
+            self._git_wd = self._add_watch(repo_git_dir, _GIT_DIR_MASK)
+            self._add_tree('', strict=True)
+        except OSError:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Close the inotify file descriptor, removing all watches.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def read_changes(self, timeout: float | None) -> WatchChanges | None:
+        """ Read the Changes that occurred since the last read, waiting for the first event.
+
+**Parameters:**
+ - timeout (float?): The seconds to wait for an event. None to wait indefinitely.
+
+**Returns:**
+ WatchChanges? - The Changes, or None if no relevant event occurred before the timeout.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if len(readable) == 0:
+            return None
+        paths: set[str] = set()
+        full_refresh = False
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            full_refresh = self._read_events(data, paths) or full_refresh
+        if len(paths) == 0 and not full_refresh:
+            return None
+        return WatchChanges(paths=paths, full_refresh=full_refresh)
+
+    def _read_events(self, data: bytes, paths: set[str]) -> bool:
+        """ Add the paths of the events in the buffer to the set, and return whether a full refresh is required.
+        """
+        full_refresh = False
+        position = 0
+        while position + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, position)
+            position += _EVENT_HEADER.size
+            name = data[position:position + length].rstrip(b'\0')
+            position += length
+            if mask & _IN_Q_OVERFLOW:
+                full_refresh = True
+            elif wd == self._git_wd:
+                full_refresh = full_refresh or name in _GIT_STATE_NAMES
+            elif mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+            elif (directory := self._dirs.get(wd)) is not None and len(name) > 0 and name != b'.git':
+                path = os.fsdecode(name) if len(directory) == 0 else directory + '/' + os.fsdecode(name)
+                paths.add(path)
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._add_tree(path)
+        return full_refresh
+
+    def _add_tree(self, directory: str, strict: bool = False):
+        """ Watch a directory and its subdirectories, skipping Git Directories.
+        """
+        for dir_path, dir_names, _ in os.walk(self._root / directory):
+            dir_names[:] = [name for name in dir_names if name != '.git']
+            try:
+                wd = self._add_watch(Path(dir_path), _WORKTREE_MASK)
+            except (FileNotFoundError, NotADirectoryError):
+                continue  # Removed while walking
+            except OSError:
+                if strict:
+                    raise
+                continue  # The watch limit was reached, changes under this directory are missed
+            relative = Path(dir_path).relative_to(self._root).as_posix()
+            self._dirs[wd] = '' if relative == '.' else relative
+
+    def _add_watch(self, path: Path, mask: int) -> int:
+        if (wd := self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)) < 0:
+            raise _errno_error('inotify_add_watch', path)
+        return wd
+
+
+def _errno_error(
+    operation: str,
+    path: Path | None = None,
+) -> OSError:
+    errno = ctypes.get_errno()
+    return OSError(errno, f"{operation}: {os.strerror(errno)}", None if path is None else str(path))
@@ -0,0 +1,98 @@
+""" Watches the Worktree by comparing periodic stat snapshots.
+ - The fallback for platforms without inotify, and for worktrees that exceed the inotify watch limit.
+"""
+import os
+import time
+from pathlib import Path
+
+from changelist_init.git import git_dir
+from changelist_init.watch.watch_changes import WatchChanges
+
+
+# The seconds between each snapshot of the Worktree.
+POLL_INTERVAL = 1.0
+
+_GIT_STATE_NAMES = ('index', 'HEAD')
+
+
+class PollWatcher:
+    """ Reads the Changes to the Worktree and Git Directory by polling file stat data.
+    """
+
+    def __init__(self, root: Path, repo_git_dir: Path, interval: float = POLL_INTERVAL):
+        self._root = root
+        self._repo_git_dir = repo_git_dir
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+        self._git_state = self._take_git_state()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ Release the snapshot.
+        """
+        self._snapshot = {}
+
+    def read_changes(self, timeout: float | None) -> WatchChanges | None:
+        """ Poll for the Changes since the last read, until a change is found or the timeout passes.
+
+**Parameters:**
+ - timeout (float?): The seconds to wait for a change. None to wait indefinitely.
+
+**Returns:**
+ WatchChanges? - The Changes, or None if nothing changed before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if (changes := self._compare_snapshots()) is not None:
+                return changes
+            if deadline is None:
+                time.sleep(self._interval)
+            elif (remaining := deadline - time.monotonic()) > 0:
+                time.sleep(min(self._interval, remaining))
+            else:
+                return None
+
+    def _compare_snapshots(self) -> WatchChanges | None:
+        snapshot = self._take_snapshot()
+        git_state = self._take_git_state()
+        paths = {
+            path for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        full_refresh = git_state != self._git_state
+        self._snapshot = snapshot
+        self._git_state = git_state
+        if len(paths) == 0 and not full_refresh:
+            return None
+        return WatchChanges(paths=paths, full_refresh=full_refresh)
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int, int]]:
+        snapshot = {}
+        for dir_path, dir_names, file_names in os.walk(self._root):
+            dir_names[:] = [name for name in dir_names if name != '.git']
+            relative = Path(dir_path).relative_to(self._root).as_posix()
+            prefix = '' if relative == '.' else relative + '/'
+            for name in file_names:
+                try:
+                    file_stat = os.lstat(os.path.join(dir_path, name))
+                except OSError:
+                    continue
+                snapshot[prefix + name] = (file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_mode)
+        return snapshot
+
+    def _take_git_state(self) -> list[tuple[int, int] | str | None]:
+        # The resolved HEAD detects commits, which move a branch ref after writing the Index
+        state: list[tuple[int, int] | str | None] = [git_dir.read_head(self._repo_git_dir)]
+        for name in _GIT_STATE_NAMES:
+            try:
+                file_stat = os.stat(self._repo_git_dir / name)
+            except OSError:
+                state.append(None)
+                continue
+            state.append((file_stat.st_mtime_ns, file_stat.st_size))
+        return state
@@ -0,0 +1,13 @@
+""" The Changes reported by a Watcher.
+
+**WatchChanges NamedTuple Fields:**
+ - paths (set[str]): The changed file and directory paths, relative to the Worktree root.
+ - full_refresh (bool): Whether the Git Index or HEAD changed, or events were lost, so every path must be updated.
+"""
+from collections import namedtuple
+
+
+WatchChanges = namedtuple(
+    'WatchChanges',
+    'paths full_refresh',
+)
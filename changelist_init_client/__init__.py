@@ -0,0 +1,131 @@
+""" Changelist Init Client.
+ - Forwards the program arguments to a Changelist Init server, and prints the result.
+ - Runs Changelist Init in this process when no server is listening for the repository.
+ - Imports only the standard library modules it needs, so that it starts quickly.
+"""
+import json
+import os
+import socket
+import sys
+from contextlib import contextmanager
+
+
+# The name of the server socket file, in the .changelists directory of the repository.
+SOCKET_FILE_NAME = 'cl-init.sock'
+
+# Socket paths longer than this are bound and connected relative to their directory.
+_MAX_SOCKET_PATH_LENGTH = 100
+
+_RECEIVE_SIZE = 64 * 1024
+
+
+def main():
+    if (response := send_request(sys.argv[1:])) is None:
+        from changelist_init.__main__ import main as run_in_process
+        return run_in_process()
+    if len(output := response.get('output', '')) > 0:
+        print(output, end='')
+    if (error := response.get('error')) is not None:
+        sys.exit(error)
+    if (status := response.get('status', 0)) != 0:
+        sys.exit(status)
+
+
+def find_socket_path(
+    cwd: str,
+) -> str | None:
+    """ Find the server socket path of the repository containing the directory.
+
+**Parameters:**
+ - cwd (str): The directory to search from.
+
+**Returns:**
+ str? - The path of the socket file in the .changelists directory, or None when outside of a repository.
+    """
+    directory = os.path.abspath(cwd)
+    while True:
+        if os.path.exists(os.path.join(directory, '.git')):
+            return get_socket_path(directory)
+        if (parent := os.path.dirname(directory)) == directory:
+            return None
+        directory = parent
+
+
+def get_socket_path(
+    root: str,
+) -> str:
+    """ Get the server socket path of a repository.
+
+**Parameters:**
+ - root (str): The repository root directory.
+
+**Returns:**
+ str - The path of the socket file in the .changelists directory.
+    """
+    return os.path.join(root, '.changelists', SOCKET_FILE_NAME)
+
+
+def send_request(
+    arguments: list[str],
+    cwd: str | None = None,
+) -> dict | None:
+    """ Send the arguments to the server of the repository, and wait for the response.
+
+**Parameters:**
+ - arguments (list[str]): The program arguments.
+ - cwd (str?): The working directory the arguments are relative to. Default: None, the current directory.
+
+**Returns:**
+ dict? - The response, with the output, error and status keys. None if no server could be reached.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    if cwd is None:
+        cwd = os.getcwd()
+    if (socket_path := find_socket_path(cwd)) is None or not os.path.exists(socket_path):
+        return None
+    request = json.dumps({'argv': arguments, 'cwd': os.path.abspath(cwd)}).encode() + b'\n'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            with socket_address(socket_path) as address:
+                client.connect(address)
+            client.sendall(request)
+            client.shutdown(socket.SHUT_WR)
+            response = _receive_all(client)
+        except OSError:
+            return None
+    try:
+        return json.loads(response)
+    except ValueError:
+        return None
+
+
+@contextmanager
+def socket_address(
+    socket_path: str,
+):
+    """ Provide the address used to bind or connect to a socket path.
+ - Long paths exceed the platform limit of socket addresses, so the directory is entered and the file name is used.
+
+**Parameters:**
+ - socket_path (str): The path of the socket file.
+
+**Yields:**
+ str - The socket address.
+    """
+    if len(os.fsencode(socket_path)) <= _MAX_SOCKET_PATH_LENGTH:
+        yield socket_path
+        return
+    initial_cwd = os.getcwd()
+    os.chdir(os.path.dirname(socket_path))
+    try:
+        yield os.path.basename(socket_path)
+    finally:
+        os.chdir(initial_cwd)
+
+
+def _receive_all(connection: socket.socket) -> bytes:
+    chunks = []
+    while len(chunk := connection.recv(_RECEIVE_SIZE)) > 0:
+        chunks.append(chunk)
+    return b''.join(chunks)
@@ -25,6 +25,7 @@ setup(
             'changelist-init=changelist_init.__main__:main',
             'cl-init=changelist_init.__main__:main',
             'cl_init=changelist_init.__main__:main',
+            'cl-init-client=changelist_init_client:main',
         ],
     },
     python_requires='>=3.10',
@@ -1,5 +1,6 @@
 """ Test Data Provider
 """
+import io
 import os
 import subprocess
 import sys
@@ -178,6 +179,50 @@ def git_status_line(code: str, file_path: str) -> str:
     return f"{code} {file_path}"
 
 
+def git_status_v2_output(status_output: str) -> bytes:
+    """ Convert Git Status Porcelain V1 output into the NUL-separated Porcelain V2 format.
+    """
+    records = []
+    for line in status_output.splitlines():
+        code, file_path = line[:2], line[3:]
+        if code == '??':
+            records.append(f"? {file_path}")
+        elif code == '!!':
+            records.append(f"! {file_path}")
+        else:
+            xy = code.replace(' ', '.')
+            records.append(f"1 {xy} N... 100644 100644 100644 {'0' * 40} {'0' * 40} {file_path}")
+    return ''.join(f"{r}\0" for r in records).encode()
+
+
+class MockPopen:
+    """ A Popen replacement that provides the given bytes on stdout.
+    """
+
+    def __init__(self, output: bytes, **kwargs):
+        self.args = kwargs.get('args')
+        self.stdout = io.BytesIO(output)
+        self.returncode = 0
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+    def terminate(self):
+        pass
+
+
+def mock_popen(status_output: str) -> Callable:
+    """ Create a Popen mock that streams the Porcelain V2 form of the given Porcelain V1 output.
+    """
+    return lambda **kwargs: MockPopen(git_status_v2_output(status_output), **kwargs)
+
+
 @pytest.fixture()
 def git_status_line_untracked_setup():
     return git_status_line("??", GIT_STATUS_FILE_PATH_SETUP)
@@ -0,0 +1,194 @@
+""" Testing Changelist Index Methods.
+"""
+import json
+from pathlib import Path
+
+from changelist_data import ChangelistDataStorage, StorageType, new_tree
+from changelist_data.changelist import Changelist
+from changelist_data.file_change import create_fc, update_fc, delete_fc
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR
+
+from changelist_init.data.changelist_index import ChangelistIndex, create_changelist_index, read_changelist_index, \
+    record_changelist_index
+from changelist_init.data.fc_to_cl_map import ChangelistDelta
+
+
+def _write_storage_file():
+    storage = ChangelistDataStorage(new_tree(), StorageType.CHANGELISTS, Path(CHANGELISTS_FILE_PATH_STR))
+    storage.write_to_storage()
+    return storage
+
+
+def _sample_changelists() -> list[Changelist]:
+    return [
+        Changelist('1', 'Main', [update_fc('/a.py'), create_fc('/b.py')], '', True),
+        Changelist('2', 'Feature', [update_fc('/c.py'), update_fc('/d.py')], '', False),
+    ]
+
+
+def test_create_changelist_index_maps_paths_to_changelist_ids():
+    index = create_changelist_index(_sample_changelists())
+    assert len(index) == 4
+    assert index.get_changelist_id('/a.py') == '1'
+    assert index.get_changelist_id('/d.py') == '2'
+    assert index.get_changelist_id('/e.py') is None
+
+
+def test_merge_file_changes_unchanged_files_keep_objects():
+    changelists = _sample_changelists()
+    feature_changes = changelists[1].changes
+    initial_objects = list(feature_changes)
+    index = create_changelist_index(changelists)
+    files = [update_fc('/a.py'), create_fc('/b.py'), update_fc('/c.py'), update_fc('/d.py')]
+    assert not any(delta.dirty for delta in index.merge_file_changes(changelists, files))
+    assert changelists[1].changes is feature_changes
+    assert all(a is b for a, b in zip(changelists[1].changes, initial_objects))
+
+
+def test_merge_file_changes_patches_modified_removed_and_new_files():
+    changelists = _sample_changelists()
+    index = create_changelist_index(changelists)
+    files = [update_fc('/a.py'), delete_fc('/c.py'), create_fc('/e.py')]
+    assert index.merge_file_changes(changelists, files) == [
+        ChangelistDelta('1', kept=1, updated=0, removed=1, added=1, dirty=True),
+        ChangelistDelta('2', kept=0, updated=1, removed=1, added=0, dirty=True),
+    ]
+    assert changelists[0].changes == [update_fc('/a.py'), create_fc('/e.py')]
+    assert changelists[1].changes == [delete_fc('/c.py')]
+    assert index.get_changelist_id('/e.py') == '1'
+    assert index.get_changelist_id('/b.py') is None
+
+
+def test_merge_file_changes_without_remove_keeps_missing_files():
+    changelists = _sample_changelists()
+    index = create_changelist_index(changelists)
+    assert index.merge_file_changes(changelists, [update_fc('/a.py'), create_fc('/c.py')], remove=False) == [
+        ChangelistDelta('1', kept=2, updated=0, removed=0, added=0, dirty=False),
+        ChangelistDelta('2', kept=1, updated=1, removed=0, added=0, dirty=True),
+    ]
+    assert changelists[0].changes == [update_fc('/a.py'), create_fc('/b.py')]
+    assert changelists[1].changes == [create_fc('/c.py'), update_fc('/d.py')]
+
+
+def test_merge_file_changes_outside_scope_are_kept():
+    changelists = _sample_changelists()
+    index = create_changelist_index(changelists)
+    assert index.merge_file_changes(changelists, [], ['a.py'])
+    assert changelists[0].changes == [create_fc('/b.py')]
+    assert len(changelists[1].changes) == 2
+
+
+def test_merge_file_changes_exact_scope_file_path_keeps_paths_under_it():
+    changelists = [Changelist('1', 'Main', [create_fc('/build'), create_fc('/build/x')], '', True)]
+    index = create_changelist_index(changelists)
+    assert index.merge_file_changes(changelists, [], ['build'], exact_scope=True)
+    assert changelists[0].changes == [create_fc('/build/x')]
+
+
+def test_merge_file_changes_exact_scope_directory_path_removes_paths_under_it():
+    changelists = [Changelist('1', 'Main', [create_fc('/build'), create_fc('/build/x')], '', True)]
+    index = create_changelist_index(changelists)
+    assert index.merge_file_changes(changelists, [], ['build/'], exact_scope=True)
+    assert changelists[0].changes == []
+
+
+def test_merge_file_changes_missing_changelist_returns_none():
+    index = create_changelist_index(_sample_changelists())
+    changelists = [Changelist('1', 'Main', [update_fc('/a.py'), create_fc('/b.py')], '', True)]
+    assert index.merge_file_changes(changelists, [update_fc('/a.py'), create_fc('/b.py')]) is None
+    assert changelists[0].changes == [update_fc('/a.py'), create_fc('/b.py')]
+
+
+def test_merge_file_changes_no_changelists_returns_none():
+    assert ChangelistIndex().merge_file_changes([], [update_fc('/a.py')]) is None
+
+
+def test_read_changelist_index_nothing_recorded_returns_none(temp_cwd):
+    assert read_changelist_index(Path('state'), _write_storage_file()) is None
+
+
+def test_record_changelist_index_is_read(temp_cwd):
+    storage = _write_storage_file()
+    record_changelist_index(Path('state'), storage, create_changelist_index(_sample_changelists()))
+    index = read_changelist_index(Path('state'), storage)
+    assert len(index) == 4
+    assert index.get_changelist_id('/c.py') == '2'
+
+
+def test_read_changelist_index_storage_file_modified_returns_none(temp_cwd):
+    storage = _write_storage_file()
+    record_changelist_index(Path('state'), storage, create_changelist_index(_sample_changelists()))
+    storage.update_path.write_text(storage.update_path.read_text() + '\n')
+    assert read_changelist_index(Path('state'), storage) is None
+
+
+def test_read_changelist_index_malformed_file_returns_none(temp_cwd):
+    storage = _write_storage_file()
+    record_changelist_index(Path('state'), storage, ChangelistIndex())
+    Path('state/changelist_indexes.json').write_text('[]')
+    assert read_changelist_index(Path('state'), storage) is None
+
+
+def test_merge_file_changes_empty_index_of_files_returns_none():
+    assert ChangelistIndex().merge_file_changes(_sample_changelists(), []) is None
+
+
+def test_merge_file_changes_moved_path_returns_false_without_changes():
+    index = create_changelist_index(_sample_changelists())
+    changelists = _sample_changelists()
+    changelists[1].changes.reverse()
+    assert index.merge_file_changes(changelists, [delete_fc('/c.py')]) is None
+    assert changelists[1].changes == [update_fc('/d.py'), update_fc('/c.py')]
+
+
+def test_merge_file_changes_index_is_updated_for_next_merge():
+    changelists = _sample_changelists()
+    index = create_changelist_index(changelists)
+    assert index.merge_file_changes(changelists, [update_fc('/b.py'), create_fc('/e.py')], ['a.py', 'b.py', 'e.py'])
+    assert index.merge_file_changes(changelists, [update_fc('/d.py')], ['c.py', 'e.py'])
+    assert changelists[0].changes == [update_fc('/b.py')]
+    assert changelists[1].changes == [update_fc('/d.py')]
+    assert index.get_changelist_id('/e.py') is None
+    assert len(index) == 2
+
+
+def test_merge_file_changes_removal_moves_later_locations():
+    changelists = _sample_changelists()
+    index = create_changelist_index(changelists)
+    assert index.merge_file_changes(changelists, [delete_fc('/d.py')], ['c.py', 'd.py'])
+    assert index.merge_file_changes(changelists, [update_fc('/b.py')], ['a.py', 'b.py'])
+    assert changelists[0].changes == [update_fc('/b.py')]
+    assert changelists[1].changes == [delete_fc('/d.py')]
+    assert index.to_record() == {
+        'locations': {'/b.py': ['1', 0], '/d.py': ['2', 0]}, 'lengths': {'1': 1, '2': 1},
+    }
+
+
+def test_merge_file_changes_replacements_do_not_modify_index():
+    changelists = _sample_changelists()
+    index = ChangelistIndex(**create_changelist_index(changelists).to_record())
+    assert not index.modified
+    assert index.merge_file_changes(changelists, [update_fc('/b.py')], ['b.py'])
+    assert not index.modified
+    assert index.merge_file_changes(changelists, [create_fc('/e.py')], ['e.py'])
+    assert index.modified
+
+
+def test_merge_file_changes_malformed_location_returns_none():
+    changelists = _sample_changelists()
+    record = create_changelist_index(changelists).to_record()
+    record['locations']['/b.py'] = ['1', 5]
+    assert ChangelistIndex(**record).merge_file_changes(changelists, [], ['b.py']) is None
+    record['locations']['/b.py'] = None
+    assert ChangelistIndex(**record).merge_file_changes(changelists, [delete_fc('/b.py')], ['b.py']) is None
+    assert changelists[0].changes == [update_fc('/a.py'), create_fc('/b.py')]
+
+
+def test_read_changelist_index_malformed_lengths_returns_none(temp_cwd):
+    storage = _write_storage_file()
+    record_changelist_index(Path('state'), storage, create_changelist_index(_sample_changelists()))
+    indexes = json.loads((index_file := Path('state/changelist_indexes.json')).read_text())
+    for record in indexes.values():
+        record['lengths'] = {'1': '2'}
+    index_file.write_text(json.dumps(indexes))
+    assert read_changelist_index(Path('state'), storage) is None
@@ -4,9 +4,109 @@ import pytest
 from changelist_data import file_change, Changelist
 from changelist_data.file_change import create_fc
 
-from changelist_init.data.fc_to_cl_map import create_fc_to_cl_dict, offer_fc_to_cl_dict, merge_fc_generator
-from test.changelist_init.conftest import get_sample_fc_path, cl_sample_list, _SAMPLE_FC_0, root_cl_create_file, \
-    _SAMPLE_FC_1, get_cl
+from changelist_init.data.fc_to_cl_map import is_path_in_scope, reconcile_file_changes, ChangelistDelta, \
+    create_fc_to_cl_dict, offer_fc_to_cl_dict, merge_fc_generator
+from test.changelist_init.conftest import cl_sample_list, _SAMPLE_FC_0, _SAMPLE_FC_1, _SAMPLE_FC_2, get_cl, \
+    get_sample_fc_path, root_cl_create_file
+
+
+@pytest.mark.parametrize(
+    'file_path, scope, expected', [
+        ('/setup.py', None, True),
+        ('/setup.py', [], False),
+        ('/setup.py', ['setup.py'], True),
+        ('/test/__init__.py', ['test'], True),
+        ('/test/__init__.py', ['src', 'test'], True),
+        ('/tests/__init__.py', ['test'], False),
+        ('/test', ['test/sub'], False),
+    ]
+)
+def test_is_path_in_scope(file_path, scope, expected):
+    assert is_path_in_scope(file_path, scope) == expected
+
+
+@pytest.mark.parametrize(
+    'file_path, scope, expected', [
+        ('/build', ['build'], True),
+        ('/build/x', ['build'], False),
+        ('/build', ['build/'], True),
+        ('/build/x', ['build/'], True),
+        ('/builds/x', ['build/'], False),
+        ('/test/__init__.py', ['setup.py', 'test/__init__.py'], True),
+    ]
+)
+def test_is_path_in_scope_exact(file_path, scope, expected):
+    assert is_path_in_scope(file_path, scope, exact=True) == expected
+
+
+def test_reconcile_file_changes_unchanged_files_are_not_dirty():
+    changelists = [get_cl(0, [create_fc(_SAMPLE_FC_0)]), get_cl(1, [create_fc(_SAMPLE_FC_1)])]
+    initial_objects = [cl.changes[0] for cl in changelists]
+    result = reconcile_file_changes(changelists, changelists[0], [create_fc(_SAMPLE_FC_1), create_fc(_SAMPLE_FC_0)])
+    assert not any(delta.dirty for delta in result)
+    assert [cl.changes[0] for cl in changelists] == initial_objects
+    assert all(cl.changes[0] is fc for cl, fc in zip(changelists, initial_objects))
+
+
+def test_reconcile_file_changes_applies_deltas_in_place():
+    default_cl = get_cl(0, [create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_1)])
+    other_cl = get_cl(1, [create_fc(_SAMPLE_FC_2)])
+    default_changes = default_cl.changes
+    kept_fc = default_cl.changes[1]
+    result = reconcile_file_changes(
+        [default_cl, other_cl], default_cl, [file_change.delete_fc(_SAMPLE_FC_2), create_fc(_SAMPLE_FC_1), create_fc('/new.py')],
+    )
+    assert result == [
+        ChangelistDelta(default_cl.id, kept=1, updated=0, removed=1, added=1, dirty=True),
+        ChangelistDelta(other_cl.id, kept=0, updated=1, removed=0, added=0, dirty=True),
+    ]
+    assert default_cl.changes is default_changes
+    assert default_cl.changes == [create_fc(_SAMPLE_FC_1), create_fc('/new.py')]
+    assert default_cl.changes[0] is kept_fc
+    assert other_cl.changes == [file_change.delete_fc(_SAMPLE_FC_2)]
+
+
+def test_reconcile_file_changes_without_remove_keeps_missing_files():
+    default_cl = get_cl(0, [create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_1)])
+    result = reconcile_file_changes(
+        [default_cl], default_cl, [file_change.update_fc(_SAMPLE_FC_1), create_fc('/new.py')], remove=False,
+    )
+    assert result == [ChangelistDelta(default_cl.id, kept=1, updated=1, removed=0, added=1, dirty=True)]
+    assert default_cl.changes == [create_fc(_SAMPLE_FC_0), file_change.update_fc(_SAMPLE_FC_1), create_fc('/new.py')]
+
+
+def test_reconcile_file_changes_without_remove_appends_first_fc_of_each_path():
+    default_cl = get_cl(0, [create_fc(_SAMPLE_FC_0)])
+    result = reconcile_file_changes(
+        [default_cl], default_cl, [create_fc('/new.py'), file_change.update_fc('/new.py')], remove=False,
+    )
+    assert result == [ChangelistDelta(default_cl.id, kept=1, updated=0, removed=0, added=1, dirty=True)]
+    assert default_cl.changes == [create_fc(_SAMPLE_FC_0), create_fc('/new.py')]
+
+
+def test_reconcile_file_changes_existing_order_is_kept():
+    default_cl = get_cl(0, [create_fc(_SAMPLE_FC_2), create_fc(_SAMPLE_FC_0)])
+    reconcile_file_changes([default_cl], default_cl, [create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_2)])
+    assert default_cl.changes == [create_fc(_SAMPLE_FC_2), create_fc(_SAMPLE_FC_0)]
+
+
+def test_reconcile_file_changes_scope_retains_files_outside_scope():
+    default_cl = get_cl(0, [create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_1)])
+    result = reconcile_file_changes([default_cl], default_cl, [], ['test'])
+    assert result == [ChangelistDelta(default_cl.id, kept=1, updated=0, removed=1, added=0, dirty=True)]
+    assert default_cl.changes == [create_fc(_SAMPLE_FC_0)]
+
+
+def test_reconcile_file_changes_duplicate_path_is_kept_in_first_changelist():
+    changelists = cl_sample_list(['c', 'c', ''])
+    result = reconcile_file_changes(changelists, changelists[0], [create_fc(_SAMPLE_FC_0)])
+    assert [len(cl.changes) for cl in changelists] == [1, 0]
+    assert [delta.dirty for delta in result] == [False, True]
+
+
+def test_reconcile_file_changes_empty_fc_raises_exit():
+    with pytest.raises(SystemExit):
+        reconcile_file_changes([], get_cl(0, []), [file_change.FileChange()])
 
 
 def test_create_fc_to_cl_dict_empty_list_returns_empty_dict():
@@ -164,3 +264,19 @@ def test_merge_fc_generator_2_changelists_add_file_change():
     assert len(result) == 1
     assert len(initial_cl[0].changes) == 1
     assert len(initial_cl[1].changes) == 0
+
+
+def test_merge_fc_generator_updates_existing_files_in_place():
+    initial_cl = [get_cl(1, [file_change.create_fc(_SAMPLE_FC_1), file_change.create_fc(_SAMPLE_FC_0)])]
+    updated_fc = [file_change.update_fc(_SAMPLE_FC_0), file_change.create_fc(_SAMPLE_FC_2)]
+    assert list(merge_fc_generator(initial_cl, updated_fc)) == [file_change.create_fc(_SAMPLE_FC_2)]
+    assert initial_cl[0].changes == [file_change.update_fc(_SAMPLE_FC_0)]
+
+
+def test_deprecated_methods_warn():
+    with pytest.deprecated_call():
+        cl_map = create_fc_to_cl_dict([])
+    with pytest.deprecated_call():
+        offer_fc_to_cl_dict(cl_map, create_fc(_SAMPLE_FC_0))
+    with pytest.deprecated_call():
+        list(merge_fc_generator([], []))
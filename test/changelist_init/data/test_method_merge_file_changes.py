@@ -1,12 +1,15 @@
 """ Testing Main Package Merge File Changes method.
 """
+from unittest.mock import Mock
+
 import pytest
 from changelist_data.changelist import Changelist
 from changelist_data.file_change import create_fc
 
 from changelist_init.data import merge_file_changes, _DEFAULT_CHANGELIST_NAME, _DEFAULT_CHANGELIST_ID
+from changelist_init.data.changelist_index import ChangelistIndex, create_changelist_index
 from test.changelist_init.conftest import get_cl, fc_sample_list, get_fc_status, cl_sample_list, \
-    create_sample_list_input, construct_new_cl_data_storage, _SAMPLE_FC_0
+    create_sample_list_input, construct_new_cl_data_storage, _SAMPLE_FC_0, _SAMPLE_FC_1, _SAMPLE_FC_2
 
 
 def test_merge_file_changes_empty_storage_no_fc_creates_default_cl():
@@ -233,3 +236,85 @@ def test_multi_cl_containing_three_fc_merge_two_new_fc_returns_multi_cl_two_fc_i
     merge_file_changes(storage, files)
     result = storage.get_changelists()
     assert result == expected_cl
+
+
+def test_merge_file_changes_scope_leaves_files_outside_scope_untouched():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([
+        get_cl(0, [create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_1)]),
+        get_cl(1, [create_fc(_SAMPLE_FC_2)]),
+    ])
+    merge_file_changes(storage, [create_fc('/test/new.py')], ['test'])
+    default_cl, other_cl = storage.get_changelists()
+    assert default_cl.changes == [create_fc(_SAMPLE_FC_0), create_fc('/test/new.py')]
+    assert other_cl.changes == []
+
+
+def test_merge_file_changes_scope_keeps_files_in_their_changelists():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([
+        get_cl(0, [create_fc(_SAMPLE_FC_0)]),
+        get_cl(1, [create_fc(_SAMPLE_FC_2)]),
+    ])
+    merge_file_changes(storage, [create_fc(_SAMPLE_FC_2)], ['test'])
+    default_cl, other_cl = storage.get_changelists()
+    assert default_cl.changes == [create_fc(_SAMPLE_FC_0)]
+    assert other_cl.changes == [create_fc(_SAMPLE_FC_2)]
+
+
+def test_merge_file_changes_exact_scope_file_path_keeps_paths_under_it():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([get_cl(0, [create_fc('/build'), create_fc('/build/x')])])
+    merge_file_changes(storage, [], ['build'], exact_scope=True)
+    assert storage.get_changelists()[0].changes == [create_fc('/build/x')]
+
+
+def test_merge_file_changes_index_not_matching_is_rebuilt():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([Changelist('1', 'Main', [create_fc(_SAMPLE_FC_0)], '', True)])
+    index = ChangelistIndex()
+    merge_file_changes(storage, [create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_1)], index=index)
+    assert len(storage.get_changelists()[0].changes) == 2
+    assert index.get_changelist_id(_SAMPLE_FC_1) == '1'
+
+
+def test_merge_file_changes_index_patches_changelists():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([
+        Changelist('1', 'Main', [create_fc(_SAMPLE_FC_0)], '', True),
+        Changelist('2', 'Other', [create_fc(_SAMPLE_FC_1)], '', False),
+    ])
+    index = create_changelist_index(storage.get_changelists())
+    merge_file_changes(storage, [create_fc(_SAMPLE_FC_1), create_fc(_SAMPLE_FC_2)], index=index)
+    result = storage.get_changelists()
+    assert result[0].changes == [create_fc(_SAMPLE_FC_2)]
+    assert result[1].changes == [create_fc(_SAMPLE_FC_1)]
+
+
+def test_merge_file_changes_empty_storage_new_cl_is_dirty():
+    storage = construct_new_cl_data_storage()
+    result = merge_file_changes(storage, [])
+    assert len(result) == 1
+    assert result[0].changelist_id == _DEFAULT_CHANGELIST_ID
+    assert result[0].dirty
+
+
+def test_merge_file_changes_unchanged_files_do_not_update_storage():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([Changelist('1', 'Main', [create_fc(_SAMPLE_FC_0)], '', True)])
+    update_changelists = Mock()
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(type(storage), 'update_changelists', update_changelists)
+        result = merge_file_changes(storage, [create_fc(_SAMPLE_FC_0)])
+    assert not result[0].dirty
+    update_changelists.assert_not_called()
+
+
+def test_merge_file_changes_keeps_order_of_existing_files():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([Changelist('1', 'Main', [create_fc(_SAMPLE_FC_1), create_fc(_SAMPLE_FC_0)], '', True)])
+    result = merge_file_changes(storage, [create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_1), create_fc(_SAMPLE_FC_2)])
+    assert storage.get_changelists()[0].changes == [
+        create_fc(_SAMPLE_FC_1), create_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_2),
+    ]
+    assert (result[0].kept, result[0].added) == (2, 1)
@@ -0,0 +1,88 @@
+""" Testing Data Package Route Staged File Changes method.
+"""
+from changelist_data.changelist import Changelist
+from changelist_data.file_change import create_fc, update_fc
+
+from changelist_init.data import merge_file_changes, route_staged_file_changes
+from test.changelist_init.conftest import construct_new_cl_data_storage
+
+
+def _get_cl(storage, name: str) -> Changelist | None:
+    return next((cl for cl in storage.get_changelists() if cl.name == name), None)
+
+
+def test_route_staged_file_changes_nothing_staged_does_not_create_cl():
+    storage = construct_new_cl_data_storage()
+    merge_file_changes(storage, [update_fc('/a.py')])
+    assert not route_staged_file_changes(storage, set(), 'Staged')
+    assert len(storage.get_changelists()) == 1
+
+
+def test_route_staged_file_changes_creates_cl_with_staged_files():
+    storage = construct_new_cl_data_storage()
+    merge_file_changes(storage, [update_fc('/a.py'), create_fc('/b.py')])
+    assert route_staged_file_changes(storage, {'/b.py'}, 'Staged')
+    assert _get_cl(storage, 'Initial Changelist').changes == [update_fc('/a.py')]
+    staged_cl = _get_cl(storage, 'Staged')
+    assert staged_cl.changes == [create_fc('/b.py')]
+    assert not staged_cl.is_default
+
+
+def test_route_staged_file_changes_cl_id_is_stable():
+    ids = []
+    for _ in range(2):
+        storage = construct_new_cl_data_storage()
+        merge_file_changes(storage, [update_fc('/a.py')])
+        route_staged_file_changes(storage, {'/a.py'}, 'Staged')
+        ids.append(_get_cl(storage, 'Staged').id)
+    assert ids[0] == ids[1]
+    assert len(ids[0]) == 36
+
+
+def test_route_staged_file_changes_moves_from_other_cl():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([
+        Changelist('1', 'Main', [], '', True),
+        Changelist('2', 'Feature', [update_fc('/a.py'), update_fc('/b.py')], '', False),
+        Changelist('3', 'Staged', [update_fc('/c.py')], '', False),
+    ])
+    route_staged_file_changes(storage, {'/a.py', '/c.py'}, 'Staged')
+    assert _get_cl(storage, 'Feature').changes == [update_fc('/b.py')]
+    assert _get_cl(storage, 'Staged').changes == [update_fc('/c.py'), update_fc('/a.py')]
+
+
+def test_route_staged_file_changes_unstaged_files_move_to_default_cl():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([
+        Changelist('1', 'Main', [update_fc('/a.py')], '', True),
+        Changelist('3', 'Staged', [update_fc('/b.py'), update_fc('/c.py')], '', False),
+    ])
+    route_staged_file_changes(storage, {'/c.py'}, 'Staged')
+    assert _get_cl(storage, 'Main').changes == [update_fc('/a.py'), update_fc('/b.py')]
+    assert _get_cl(storage, 'Staged').changes == [update_fc('/c.py')]
+
+
+def test_route_staged_file_changes_files_outside_scope_are_kept():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([
+        Changelist('1', 'Main', [], '', True),
+        Changelist('3', 'Staged', [update_fc('/docs/b.md'), update_fc('/src/c.py')], '', False),
+    ])
+    route_staged_file_changes(storage, set(), 'Staged', ['src'])
+    assert _get_cl(storage, 'Main').changes == [update_fc('/src/c.py')]
+    assert _get_cl(storage, 'Staged').changes == [update_fc('/docs/b.md')]
+
+
+def test_route_staged_file_changes_staged_default_cl_keeps_unstaged_files():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([Changelist('1', 'Staged', [update_fc('/a.py')], '', True)])
+    route_staged_file_changes(storage, set(), 'Staged')
+    assert _get_cl(storage, 'Staged').changes == [update_fc('/a.py')]
+
+
+def test_route_staged_file_changes_already_routed_returns_false():
+    storage = construct_new_cl_data_storage()
+    merge_file_changes(storage, [update_fc('/a.py'), create_fc('/b.py')])
+    route_staged_file_changes(storage, {'/b.py'}, 'Staged')
+    assert not route_staged_file_changes(storage, {'/b.py'}, 'Staged')
+    assert _get_cl(storage, 'Staged').changes == [create_fc('/b.py')]
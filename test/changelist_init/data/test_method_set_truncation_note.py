@@ -0,0 +1,44 @@
+""" Testing Data Package Set Truncation Note method.
+"""
+from changelist_data.changelist import Changelist
+
+from changelist_init.data import merge_file_changes, set_truncation_note
+from test.changelist_init.conftest import construct_new_cl_data_storage
+
+
+def test_set_truncation_note_empty_storage_does_nothing():
+    storage = construct_new_cl_data_storage()
+    set_truncation_note(storage, 'Stopped at 1 files.')
+    assert storage.get_changelists() == []
+
+
+def test_set_truncation_note_adds_note_to_default_cl():
+    storage = construct_new_cl_data_storage()
+    merge_file_changes(storage, [])
+    assert set_truncation_note(storage, 'Stopped at 1 files.')
+    assert storage.get_changelists()[0].comment == 'Changelist Init: Stopped at 1 files.'
+
+
+def test_set_truncation_note_replaces_note_and_keeps_other_lines():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([
+        Changelist('1', 'Other', [], 'Changelist Init: old', False),
+        Changelist('2', 'Main', [], 'Review first\nChangelist Init: old', True),
+    ])
+    set_truncation_note(storage, 'new')
+    result = storage.get_changelists()
+    assert result[0].comment == 'Changelist Init: old'
+    assert result[1].comment == 'Review first\nChangelist Init: new'
+
+
+def test_set_truncation_note_none_removes_note():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([Changelist('2', 'Main', [], 'Review first\nChangelist Init: old', True)])
+    set_truncation_note(storage, None)
+    assert storage.get_changelists()[0].comment == 'Review first'
+
+
+def test_set_truncation_note_same_note_returns_false():
+    storage = construct_new_cl_data_storage()
+    storage.update_changelists([Changelist('2', 'Main', [], 'Changelist Init: old', True)])
+    assert not set_truncation_note(storage, 'old')
@@ -0,0 +1,85 @@
+""" Testing Status Fingerprint Methods.
+"""
+from pathlib import Path
+
+from changelist_data import ChangelistDataStorage, StorageType, new_tree
+from changelist_data.file_change import create_fc, update_fc, delete_fc
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR
+
+from changelist_init.data.status_fingerprint import compute_status_fingerprint, is_storage_current, \
+    record_status_fingerprint
+from test.changelist_init.conftest import _SAMPLE_FC_0, _SAMPLE_FC_1
+
+
+def _write_storage_file():
+    storage = ChangelistDataStorage(new_tree(), StorageType.CHANGELISTS, Path(CHANGELISTS_FILE_PATH_STR))
+    storage.write_to_storage()
+    return storage
+
+
+def test_compute_status_fingerprint_same_files_are_equal():
+    files = [create_fc(_SAMPLE_FC_0), update_fc(_SAMPLE_FC_1)]
+    assert compute_status_fingerprint(files) == compute_status_fingerprint(list(files))
+
+
+def test_compute_status_fingerprint_change_kind_differs():
+    assert compute_status_fingerprint([create_fc(_SAMPLE_FC_0)]) != compute_status_fingerprint([update_fc(_SAMPLE_FC_0)])
+    assert compute_status_fingerprint([update_fc(_SAMPLE_FC_0)]) != compute_status_fingerprint([delete_fc(_SAMPLE_FC_0)])
+
+
+def test_compute_status_fingerprint_empty_differs_from_files():
+    assert compute_status_fingerprint([]) != compute_status_fingerprint([create_fc(_SAMPLE_FC_0)])
+
+
+def test_is_storage_current_nothing_recorded_returns_false(temp_cwd):
+    storage = _write_storage_file()
+    assert not is_storage_current(Path('state'), storage, compute_status_fingerprint([]))
+
+
+def test_is_storage_current_after_record_returns_true(temp_cwd):
+    storage = _write_storage_file()
+    fingerprint = compute_status_fingerprint([create_fc(_SAMPLE_FC_0)])
+    record_status_fingerprint(Path('state'), storage, fingerprint)
+    assert is_storage_current(Path('state'), storage, fingerprint)
+    assert not is_storage_current(Path('state'), storage, compute_status_fingerprint([]))
+
+
+def test_is_storage_current_storage_file_modified_returns_false(temp_cwd):
+    storage = _write_storage_file()
+    fingerprint = compute_status_fingerprint([])
+    record_status_fingerprint(Path('state'), storage, fingerprint)
+    storage.update_path.write_text(storage.update_path.read_text() + '\n')
+    assert not is_storage_current(Path('state'), storage, fingerprint)
+
+
+def test_is_storage_current_storage_file_deleted_returns_false(temp_cwd):
+    storage = _write_storage_file()
+    fingerprint = compute_status_fingerprint([])
+    record_status_fingerprint(Path('state'), storage, fingerprint)
+    storage.update_path.unlink()
+    assert not is_storage_current(Path('state'), storage, fingerprint)
+    record_status_fingerprint(Path('state'), storage, fingerprint)
+    assert not is_storage_current(Path('state'), storage, fingerprint)
+
+
+def test_is_storage_current_malformed_fingerprint_file_returns_false(temp_cwd):
+    storage = _write_storage_file()
+    Path('state').mkdir()
+    Path('state/status_fingerprints.json').write_text('[]')
+    assert not is_storage_current(Path('state'), storage, compute_status_fingerprint([]))
+
+
+def test_compute_status_fingerprint_scope_differs():
+    files = [create_fc(_SAMPLE_FC_0)]
+    assert compute_status_fingerprint(files) != compute_status_fingerprint(files, ['test'])
+    assert compute_status_fingerprint(files, ['test']) != compute_status_fingerprint(files, ['src'])
+    assert compute_status_fingerprint(files, ['a', 'b']) == compute_status_fingerprint(files, ['a', 'b'])
+
+
+def test_compute_status_fingerprint_staged_paths_differ():
+    files = [update_fc(_SAMPLE_FC_0)]
+    assert compute_status_fingerprint(files) != compute_status_fingerprint(files, None, 'Staged')
+    assert compute_status_fingerprint(files, None, 'Staged') != \
+        compute_status_fingerprint(files, None, 'Staged', [_SAMPLE_FC_0])
+    assert compute_status_fingerprint(files, None, 'Staged', ['/b', '/a']) == \
+        compute_status_fingerprint(files, None, 'Staged', ['/a', '/b'])
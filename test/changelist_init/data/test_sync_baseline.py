@@ -0,0 +1,102 @@
+""" Testing Sync Baseline Methods.
+"""
+import json
+from pathlib import Path
+
+from changelist_data import ChangelistDataStorage, StorageType, new_tree
+from changelist_data.file_change import FileChange, create_fc, update_fc, delete_fc
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR
+
+from changelist_init.data.sync_baseline import get_changed_paths, record_sync_baseline
+from test.changelist_init.conftest import _SAMPLE_FC_0, _SAMPLE_FC_1, _SAMPLE_FC_2
+
+
+def _write_storage_file():
+    storage = ChangelistDataStorage(new_tree(), StorageType.CHANGELISTS, Path(CHANGELISTS_FILE_PATH_STR))
+    storage.write_to_storage()
+    return storage
+
+
+def test_get_changed_paths_nothing_recorded_returns_none(temp_cwd):
+    storage = _write_storage_file()
+    assert get_changed_paths(Path('state'), storage, []) is None
+
+
+def test_get_changed_paths_same_files_returns_empty(temp_cwd):
+    storage = _write_storage_file()
+    files = [create_fc(_SAMPLE_FC_0), update_fc(_SAMPLE_FC_1)]
+    record_sync_baseline(Path('state'), storage, files)
+    assert get_changed_paths(Path('state'), storage, list(reversed(files))) == []
+
+
+def test_get_changed_paths_returns_added_removed_and_modified_paths(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [create_fc(_SAMPLE_FC_0), update_fc(_SAMPLE_FC_1)])
+    files = [update_fc(_SAMPLE_FC_0), create_fc(_SAMPLE_FC_2)]
+    assert get_changed_paths(Path('state'), storage, files) == [
+        'setup.py', 'test/__init__.py', 'test/source_file.py',
+    ]
+
+
+def test_get_changed_paths_deleted_file_uses_before_path(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [])
+    assert get_changed_paths(Path('state'), storage, [delete_fc(_SAMPLE_FC_0)]) == ['setup.py']
+
+
+def test_get_changed_paths_directory_has_trailing_slash(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [])
+    directory_fc = FileChange(after_path='/build', after_dir=True)
+    assert get_changed_paths(Path('state'), storage, [directory_fc, create_fc('/build/x')]) == ['build/', 'build/x']
+
+
+def test_get_changed_paths_storage_file_modified_returns_none(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [])
+    storage.update_path.write_text(storage.update_path.read_text() + '\n')
+    assert get_changed_paths(Path('state'), storage, []) is None
+
+
+def test_get_changed_paths_different_scope_returns_none(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [], ['src'])
+    assert get_changed_paths(Path('state'), storage, [], ['src']) == []
+    assert get_changed_paths(Path('state'), storage, []) is None
+
+
+def test_get_changed_paths_malformed_record_returns_none(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [create_fc(_SAMPLE_FC_0)])
+    baselines = json.loads((baselines_file := Path('state') / 'sync_baselines.json').read_text())
+    for record in baselines.values():
+        record['files'] = [list(create_fc(_SAMPLE_FC_0))]
+    baselines_file.write_text(json.dumps(baselines))
+    assert get_changed_paths(Path('state'), storage, []) is None
+    (Path('state') / 'sync_baselines.json').write_text('[]')
+    assert get_changed_paths(Path('state'), storage, []) is None
+
+
+def test_record_sync_baseline_missing_storage_file_removes_record(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [])
+    storage.update_path.unlink()
+    record_sync_baseline(Path('state'), storage, [])
+    storage.write_to_storage()
+    assert get_changed_paths(Path('state'), storage, []) is None
+
+
+def test_record_sync_baseline_stores_checksum_per_path(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [create_fc(_SAMPLE_FC_0), update_fc(_SAMPLE_FC_1)])
+    record = next(iter(json.loads((Path('state') / 'sync_baselines.json').read_text()).values()))
+    assert sorted(record['files']) == sorted([_SAMPLE_FC_0.lstrip('/'), _SAMPLE_FC_1.lstrip('/')])
+    assert all(isinstance(checksum, int) for checksum in record['files'].values())
+
+
+def test_record_sync_baseline_unchanged_baseline_is_not_rewritten(temp_cwd):
+    storage = _write_storage_file()
+    record_sync_baseline(Path('state'), storage, [create_fc(_SAMPLE_FC_0)])
+    signature = (baselines_file := Path('state') / 'sync_baselines.json').stat().st_mtime_ns
+    record_sync_baseline(Path('state'), storage, [create_fc(_SAMPLE_FC_0)])
+    assert baselines_file.stat().st_mtime_ns == signature
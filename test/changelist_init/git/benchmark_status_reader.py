@@ -0,0 +1,67 @@
+""" Benchmark of the Git Status Porcelain V2 readers, on a synthetic output.
+ - Run from the repository root: python -m test.changelist_init.git.benchmark_status_reader [record count]
+ - The output is split into blocks of whole records, as it is streamed from the Git Process.
+ - Each reader is timed on parsing alone, and on parsing and mapping to FileChanges.
+"""
+import io
+import sys
+import timeit
+from itertools import chain
+
+from changelist_init.git import status_runner
+from changelist_init.git.status_change_mapping import map_file_status_to_changes
+from changelist_init.git.status_reader import generate_file_status_v2, generate_file_status_blocks, generate_status_pairs
+
+
+_REPEATS = 5
+
+
+def create_status_output(
+    record_count: int,
+) -> bytes:
+    """ Create Porcelain V2 output with a modified file record for every three untracked file records.
+ - Git lists the ordinary change records before the untracked records.
+    """
+    object_name = '0' * 40
+    change_count = record_count // 4
+    return b''.join(chain(
+        (f"1 .M N... 100644 100644 100644 {object_name} {object_name} src/package_{n // 100}/module_{n}.py\0".encode()
+         for n in range(change_count)),
+        (f"? build/output_{n // 100}/file_{n}.txt\0".encode() for n in range(change_count, record_count)),
+    ))
+
+
+def split_status_blocks(
+    status_output: bytes,
+) -> list[bytes]:
+    """ Split the output into the blocks streamed by the Git Status runner.
+    """
+    return list(status_runner._split_nul_blocks(io.BufferedReader(io.BytesIO(status_output))))
+
+
+def main(
+    record_count: int = 200_000,
+):
+    blocks = split_status_blocks(create_status_output(record_count))
+    readers = {
+        'record reader': lambda: generate_file_status_v2(chain.from_iterable(b[:-1].split(b'\0') for b in blocks)),
+        'block reader': lambda: generate_file_status_blocks(blocks),
+        'block pairs': lambda: generate_status_pairs(blocks),
+    }
+    print(f"{record_count} records in {len(blocks)} blocks, best of {_REPEATS} runs")
+    baseline = None
+    for name, reader in readers.items():
+        parse_time = min(timeit.repeat(lambda: sum(1 for _ in reader()), number=1, repeat=_REPEATS))
+        map_time = min(timeit.repeat(
+            lambda: sum(1 for _ in map_file_status_to_changes(reader())), number=1, repeat=_REPEATS,
+        ))
+        if baseline is None:
+            baseline = (parse_time, map_time)
+        print(
+            f"{name:>14}: parse {parse_time * 1000:8.1f} ms ({baseline[0] / parse_time:4.1f}x),"
+            f" parse and map {map_time * 1000:8.1f} ms ({baseline[1] / map_time:4.1f}x)"
+        )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
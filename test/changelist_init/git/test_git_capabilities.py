@@ -0,0 +1,138 @@
+""" Testing Git Capabilities Methods.
+"""
+import subprocess
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from changelist_init.git import git_capabilities
+from changelist_init.git.git_capabilities import GitCapabilities, probe_capabilities, read_build_options, \
+    get_status_config, get_repository_status_config
+from changelist_init.git.git_dir import find_git_dir
+from changelist_init.git.status_runner import stream_git_status
+
+
+BUILD_OPTIONS_LINUX = """git version 2.39.5
+cpu: x86_64
+no commit associated with this build
+sizeof-long: 8
+sizeof-size_t: 8
+shell-path: /bin/sh
+"""
+
+BUILD_OPTIONS_DAEMON = """git version 2.45.1.windows.1
+cpu: x86_64
+built from commit: 1234
+sizeof-long: 4
+sizeof-size_t: 8
+shell-path: /bin/sh
+feature: fsmonitor--daemon
+"""
+
+ALL_CAPABILITIES = GitCapabilities(version=(2, 45, 1), fsmonitor_daemon=True, untracked_cache=True)
+
+
+def test_read_build_options_linux_has_untracked_cache_only():
+    result = read_build_options(BUILD_OPTIONS_LINUX)
+    assert result == GitCapabilities(version=(2, 39, 5), fsmonitor_daemon=False, untracked_cache=True)
+
+
+def test_read_build_options_windows_has_fsmonitor_daemon():
+    assert read_build_options(BUILD_OPTIONS_DAEMON) == ALL_CAPABILITIES
+
+
+def test_read_build_options_apple_git_version():
+    assert read_build_options('git version 2.39.3 (Apple Git-145)\n').version == (2, 39, 3)
+
+
+def test_read_build_options_old_version_has_no_untracked_cache():
+    assert not read_build_options('git version 2.7.4\n').untracked_cache
+
+
+def test_read_build_options_empty_output_has_no_capabilities():
+    assert read_build_options('') == GitCapabilities(version=(), fsmonitor_daemon=False, untracked_cache=False)
+
+
+def test_get_status_config_unset_config_enables_both():
+    assert get_status_config(ALL_CAPABILITIES, {}) == ['core.untrackedCache=true', 'core.fsmonitor=true']
+
+
+def test_get_status_config_no_capabilities_is_empty():
+    capabilities = GitCapabilities(version=(2, 7), fsmonitor_daemon=False, untracked_cache=False)
+    assert get_status_config(capabilities, {}) == []
+
+
+@pytest.mark.parametrize(
+    'config, expected', [
+        ({'core.untrackedcache': 'false'}, ['core.fsmonitor=true']),
+        ({'core.fsmonitor': 'false'}, ['core.untrackedCache=true']),
+        ({'core.fsmonitor': '.git/hooks/query-watchman'}, ['core.untrackedCache=true']),
+        ({'core.untrackedcache': 'true', 'core.fsmonitor': 'true'}, ['core.untrackedCache=true', 'core.fsmonitor=true']),
+    ]
+)
+def test_get_status_config_respects_configured_values(config, expected):
+    assert get_status_config(ALL_CAPABILITIES, config) == expected
+
+
+def test_probe_capabilities_result_is_cached(temp_cwd_repo):
+    repo_git_dir = find_git_dir()
+    result = probe_capabilities(repo_git_dir)
+    assert result.version > (2,)
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(git_capabilities.subprocess, 'run', Mock(side_effect=AssertionError('git was run')))
+        assert probe_capabilities(repo_git_dir) == result
+
+
+def test_probe_capabilities_changed_binary_probes_again(temp_cwd_repo):
+    repo_git_dir = find_git_dir()
+    run = Mock(return_value=subprocess.CompletedProcess([], 0, BUILD_OPTIONS_DAEMON, ''))
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(git_capabilities.subprocess, 'run', run)
+        c.setattr(git_capabilities, 'get_binary_key', lambda: ['/usr/bin/git', 1, 1])
+        probe_capabilities(repo_git_dir)
+        c.setattr(git_capabilities, 'get_binary_key', lambda: ['/usr/bin/git', 2, 1])
+        assert probe_capabilities(repo_git_dir) == ALL_CAPABILITIES
+    assert run.call_count == 2
+
+
+def test_probe_capabilities_git_error_has_no_capabilities(temp_cwd_repo):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(git_capabilities.subprocess, 'run', Mock(side_effect=OSError()))
+        result = probe_capabilities(find_git_dir())
+    assert result == GitCapabilities(version=(), fsmonitor_daemon=False, untracked_cache=False)
+
+
+def test_probe_capabilities_malformed_cache_probes_again(temp_cwd_repo):
+    repo_git_dir = find_git_dir()
+    probe_capabilities(repo_git_dir)
+    (repo_git_dir / 'changelist-init' / 'git_capabilities.json').write_text('{"binary": null}')
+    assert probe_capabilities(repo_git_dir).version > (2,)
+
+
+def test_get_repository_status_config_not_repo_returns_none(temp_cwd):
+    assert get_repository_status_config() is None
+
+
+def test_get_repository_status_config_disabled_untracked_cache(temp_cwd_repo):
+    subprocess.run(['git', 'config', 'core.untrackedCache', 'false'], capture_output=True)
+    assert 'core.untrackedCache=true' not in get_repository_status_config()
+
+
+def test_stream_git_status_untracked_cache_is_written_to_index(temp_cwd_repo):
+    Path('setup.py').write_text('')
+    subprocess.run(['git', 'add', 'setup.py'], capture_output=True)
+    Path('module.py').write_text('x = 1')
+    records = list(stream_git_status(untracked_mode='all', config=['core.untrackedCache=true'], write_index=True))
+    assert b'? module.py' in records
+    assert b'UNTR' in (find_git_dir() / 'index').read_bytes()
+
+
+def test_stream_git_status_config_without_write_index_leaves_index(temp_cwd_repo):
+    Path('setup.py').write_text('')
+    subprocess.run(['git', 'add', 'setup.py'], capture_output=True)
+    Path('module.py').write_text('x = 1')
+    index_bytes = (find_git_dir() / 'index').read_bytes()
+    records = list(stream_git_status(untracked_mode='all', config=['core.untrackedCache=true']))
+    assert b'? module.py' in records
+    assert (find_git_dir() / 'index').read_bytes() == index_bytes
@@ -0,0 +1,125 @@
+""" Testing Git Config Methods.
+"""
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from changelist_init.git import git_config
+from changelist_init.git.git_config import parse_config, is_true, read_config_values, list_config_values
+from changelist_init.git.git_dir import find_git_dir
+
+
+def test_parse_config_sections_and_keys_are_lowercase():
+    result = parse_config("[Core]\n\tFileMode = false\n")
+    assert result == {'core.filemode': 'false'}
+
+
+def test_parse_config_subsection_is_case_sensitive():
+    result = parse_config('[remote "Origin"]\n\turl = https://example.com # comment\n')
+    assert result == {'remote.Origin.url': 'https://example.com'}
+
+
+def test_parse_config_key_without_value_is_true():
+    assert parse_config("[core]\n\tbare\n") == {'core.bare': 'true'}
+
+
+def test_parse_config_comments_and_blank_lines_are_ignored():
+    assert parse_config("# comment\n; comment\n\n[core]\nsymlinks = true ; note\n") == {'core.symlinks': 'true'}
+
+
+def test_parse_config_last_value_wins():
+    assert parse_config("[core]\nautocrlf = true\n[core]\nautocrlf = false\n") == {'core.autocrlf': 'false'}
+
+
+@pytest.mark.parametrize(
+    'value, expected', [
+        ('true', True), ('Yes', True), ('on', True), ('1', True),
+        ('false', False), ('no', False), ('0', False), (None, False),
+    ]
+)
+def test_is_true(value, expected):
+    assert is_true(value) == expected
+
+
+def test_read_config_values_repository_overrides_global(temp_cwd_repo, tmp_path):
+    (tmp_path / '.gitconfig').write_text("[core]\n\tautocrlf = true\n\tpager = less\n")
+    with pytest.MonkeyPatch.context() as c:
+        c.setenv('HOME', str(tmp_path))
+        c.setenv('XDG_CONFIG_HOME', str(tmp_path / 'xdg'))
+        with open('.git/config', 'a') as config_file:
+            config_file.write("[core]\n\tautocrlf = false\n")
+        result = read_config_values(find_git_dir())
+    assert result['core.autocrlf'] == 'false'
+    assert result['core.pager'] == 'less'
+
+
+@pytest.fixture
+def isolated_config(tmp_path):
+    """ Isolates the git config from the user and system config files.
+    """
+    with pytest.MonkeyPatch.context() as c:
+        c.setenv('HOME', str(tmp_path))
+        c.setenv('XDG_CONFIG_HOME', str(tmp_path / 'xdg'))
+        c.setenv('GIT_CONFIG_NOSYSTEM', '1')
+        c.delenv('GIT_CONFIG_GLOBAL', raising=False)
+        yield c
+
+
+def test_read_config_values_include_directive_is_followed(temp_cwd_repo, tmp_path, isolated_config):
+    (included := tmp_path / 'included.gitconfig').write_text("[core]\n\tpager = less\n")
+    with open('.git/config', 'a') as config_file:
+        config_file.write(f"[include]\n\tpath = {included}\n")
+    assert read_config_values(find_git_dir())['core.pager'] == 'less'
+
+
+def test_read_config_values_include_if_directive_is_followed(temp_cwd_repo, tmp_path, isolated_config):
+    (included := tmp_path / 'included.gitconfig').write_text("[core]\n\tpager = less\n")
+    (tmp_path / '.gitconfig').write_text(f'[includeIf "gitdir:{find_git_dir().resolve().parent}/"]\n\tpath = {included}\n')
+    assert read_config_values(find_git_dir())['core.pager'] == 'less'
+
+
+def test_read_config_values_system_config_is_read(temp_cwd_repo, tmp_path, isolated_config):
+    (system_config := tmp_path / 'system.gitconfig').write_text("[core]\n\tpager = less\n\tautocrlf = true\n")
+    isolated_config.delenv('GIT_CONFIG_NOSYSTEM')
+    isolated_config.setenv('GIT_CONFIG_SYSTEM', str(system_config))
+    with open('.git/config', 'a') as config_file:
+        config_file.write("[core]\n\tautocrlf = false\n")
+    result = read_config_values(find_git_dir())
+    assert result['core.pager'] == 'less'
+    assert result['core.autocrlf'] == 'false'
+
+
+def test_read_config_values_environment_config_is_read(temp_cwd_repo, isolated_config):
+    isolated_config.setenv('GIT_CONFIG_COUNT', '1')
+    isolated_config.setenv('GIT_CONFIG_KEY_0', 'core.pager')
+    isolated_config.setenv('GIT_CONFIG_VALUE_0', 'less')
+    assert read_config_values(find_git_dir())['core.pager'] == 'less'
+
+
+def test_read_config_values_global_config_variable_replaces_global_files(temp_cwd_repo, tmp_path, isolated_config):
+    (tmp_path / '.gitconfig').write_text("[core]\n\tpager = more\n")
+    (global_config := tmp_path / 'global.gitconfig').write_text("[core]\n\tpager = less\n")
+    isolated_config.setenv('GIT_CONFIG_GLOBAL', str(global_config))
+    assert read_config_values(find_git_dir())['core.pager'] == 'less'
+
+
+def test_read_config_values_worktree_config_is_read(temp_cwd_repo, isolated_config):
+    with open('.git/config', 'a') as config_file:
+        config_file.write("[extensions]\n\tworktreeConfig = true\n[core]\n\tpager = more\n")
+    Path('.git/config.worktree').write_text("[core]\n\tpager = less\n")
+    assert read_config_values(find_git_dir())['core.pager'] == 'less'
+
+
+def test_read_config_values_git_fails_returns_file_values(temp_cwd_repo, tmp_path, isolated_config):
+    with open('.git/config', 'a') as config_file:
+        config_file.write(f"[core]\n\tpager = less\n[include]\n\tpath = {tmp_path / 'missing.gitconfig'}\n")
+    isolated_config.setattr(git_config.subprocess, 'run', Mock(side_effect=OSError))
+    assert read_config_values(find_git_dir())['core.pager'] == 'less'
+
+
+def test_list_config_values_key_without_value_is_true(temp_cwd_repo, isolated_config):
+    with open('.git/config', 'a') as config_file:
+        config_file.write('[remote "Origin"]\n\tmirror\n')
+    result = list_config_values(find_git_dir())
+    assert result['remote.Origin.mirror'] == 'true'
@@ -0,0 +1,115 @@
+""" Testing Git Directory Methods.
+"""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelist_init.git.git_dir import find_git_dir, find_worktree_root, read_head, resolve_ref, get_state_dir, \
+    get_root_relative_path
+
+
+def test_find_git_dir_not_a_repo_returns_none(temp_cwd):
+    with pytest.MonkeyPatch.context() as c:
+        c.delenv('GIT_DIR', raising=False)
+        assert find_git_dir() is None
+        assert find_worktree_root() is None
+
+
+def test_find_git_dir_repo_root_returns_dot_git(temp_cwd_repo):
+    assert find_git_dir() == Path(temp_cwd_repo.name).absolute() / '.git'
+    assert find_worktree_root().samefile(temp_cwd_repo.name)
+
+
+def test_find_git_dir_subdirectory_returns_dot_git(temp_cwd_repo):
+    Path('sub/dir').mkdir(parents=True)
+    os.chdir('sub/dir')
+    assert find_git_dir().samefile(Path(temp_cwd_repo.name) / '.git')
+    assert find_worktree_root().samefile(temp_cwd_repo.name)
+
+
+def test_find_git_dir_gitdir_file_returns_linked_dir(temp_cwd):
+    Path('actual_git_dir').mkdir()
+    Path('worktree').mkdir()
+    Path('worktree/.git').write_text('gitdir: ../actual_git_dir\n')
+    result = find_git_dir(Path('worktree'))
+    assert result.samefile('actual_git_dir')
+    assert find_worktree_root(Path('worktree')).samefile('worktree')
+
+
+def test_find_git_dir_invalid_gitdir_file_returns_none(temp_cwd):
+    Path('.git').write_text('not a gitdir file')
+    assert find_git_dir() is None
+
+
+def test_find_git_dir_env_var_overrides_search(temp_cwd):
+    with pytest.MonkeyPatch.context() as c:
+        c.setenv('GIT_DIR', 'custom')
+        c.setenv('GIT_WORK_TREE', 'tree')
+        assert find_git_dir() == Path('custom').absolute()
+        assert find_worktree_root() == Path('tree').absolute()
+
+
+def test_read_head_unborn_branch_has_no_object_id(temp_cwd_repo):
+    result = read_head(find_git_dir())
+    assert result.startswith('ref: refs/heads/')
+    assert result.endswith(' ')
+
+
+def test_read_head_after_commit_contains_object_id(single_unstaged_modify_repo):
+    oid = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    assert read_head(find_git_dir()).endswith(' ' + oid)
+
+
+def test_read_head_detached_returns_object_id(single_unstaged_modify_repo):
+    subprocess.run(['git', 'checkout', '--detach'], capture_output=True)
+    oid = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    assert read_head(find_git_dir()) == oid
+
+
+def test_read_head_missing_returns_none(temp_cwd):
+    assert read_head(Path('.git')) is None
+
+
+def test_resolve_ref_packed_refs(single_unstaged_modify_repo):
+    subprocess.run(['git', 'pack-refs', '--all'], capture_output=True)
+    oid = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    branch = subprocess.run(['git', 'symbolic-ref', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    assert resolve_ref(find_git_dir(), branch) == oid
+
+
+def test_resolve_ref_linked_worktree_reads_common_dir(single_unstaged_modify_repo):
+    subprocess.run(['git', 'pack-refs', '--all'], capture_output=True)
+    subprocess.run(['git', 'worktree', 'add', '--detach', 'linked'], capture_output=True)
+    branch = subprocess.run(['git', 'symbolic-ref', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    oid = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    linked_git_dir = find_git_dir(Path('linked'))
+    assert linked_git_dir != find_git_dir()
+    assert resolve_ref(linked_git_dir, branch) == oid
+
+
+def test_get_state_dir_is_inside_git_dir():
+    assert get_state_dir(Path('.git')) == Path('.git/changelist-init')
+
+
+@pytest.mark.parametrize(
+    'path, expected', [
+        ('.', ''),
+        ('src', 'src'),
+        ('src/../lib/', 'lib'),
+        ('src/pkg/module.py', 'src/pkg/module.py'),
+        ('..', None),
+    ]
+)
+def test_get_root_relative_path_from_root(temp_cwd, path, expected):
+    assert get_root_relative_path(path, Path.cwd()) == expected
+
+
+def test_get_root_relative_path_from_subdirectory(temp_cwd):
+    root = Path.cwd()
+    Path('src').mkdir()
+    os.chdir('src')
+    assert get_root_relative_path('pkg', root) == 'src/pkg'
+    assert get_root_relative_path('..', root) == ''
+    assert get_root_relative_path(str(root / 'lib'), root) == 'lib'
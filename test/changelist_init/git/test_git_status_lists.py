@@ -0,0 +1,51 @@
+""" Testing Git Status Lists Methods.
+"""
+from changelist_init.git import get_status_lists
+from changelist_init.git.git_status_lists import GitStatusLists
+from changelist_init.git.git_tracking_status import GitTrackingStatus
+from changelist_init.git.status_reader import GitFileStatus
+
+
+def test_add_file_status_groups_by_tracking_status():
+    status_lists = GitStatusLists()
+    for record in [GitFileStatus('??', 'a.py'), GitFileStatus('M ', 'b.py'), GitFileStatus('??', 'c.py')]:
+        assert status_lists.add_file_status(record)
+    assert status_lists.get_list(GitTrackingStatus.UNTRACKED) == [GitFileStatus('??', 'a.py'), GitFileStatus('??', 'c.py')]
+    assert status_lists.get_list(GitTrackingStatus.STAGED) == [GitFileStatus('M ', 'b.py')]
+    assert status_lists.get_list(GitTrackingStatus.UNSTAGED) == []
+    assert len(status_lists) == 3
+
+
+def test_add_file_status_ignored_file_is_not_added():
+    status_lists = GitStatusLists()
+    assert not status_lists.add_file_status(GitFileStatus('!!', 'build.o'))
+    assert len(status_lists) == 0
+
+
+def test_get_table_returns_status_table():
+    status_lists = GitStatusLists([GitFileStatus(' M', 'a.py')])
+    table = status_lists.get_table(GitTrackingStatus.UNSTAGED)
+    assert len(table) == 1
+    assert table.get_path(0) == 'a.py'
+
+
+def test_get_status_lists_single_unstaged_modify(single_unstaged_modify_repo):
+    status_lists = get_status_lists()
+    assert status_lists.get_list(GitTrackingStatus.UNSTAGED) == [GitFileStatus(' M', 'setup.py')]
+
+
+def test_get_status_lists_include_untracked(single_unstaged_plus_multi_files_in_new_dir_repo):
+    status_lists = get_status_lists(include_untracked=True)
+    assert [r.file_path for r in status_lists.get_list(GitTrackingStatus.UNTRACKED)] == [
+        'test/__init__.py', 'test/source_file.py',
+    ]
+
+
+def test_get_code_table_returns_table_of_tracking_status():
+    status_lists = GitStatusLists()
+    assert status_lists.get_code_table('MM') is status_lists.get_table(GitTrackingStatus.PARTIAL_STAGE)
+    assert status_lists.get_code_table('??') is status_lists.get_table(GitTrackingStatus.UNTRACKED)
+
+
+def test_get_code_table_ignored_code_returns_none():
+    assert GitStatusLists().get_code_table('!!') is None
@@ -0,0 +1,24 @@
+""" Testing Git Tracking Status Methods.
+"""
+import pytest
+
+from changelist_init.git.git_tracking_status import GitTrackingStatus, get_tracking_status
+
+
+@pytest.mark.parametrize(
+    'code, expected', [
+        ('??', GitTrackingStatus.UNTRACKED),
+        (' M', GitTrackingStatus.UNSTAGED),
+        (' D', GitTrackingStatus.UNSTAGED),
+        ('M ', GitTrackingStatus.STAGED),
+        ('A ', GitTrackingStatus.STAGED),
+        ('AM', GitTrackingStatus.PARTIAL_STAGE),
+        ('MD', GitTrackingStatus.PARTIAL_STAGE),
+        ('UU', GitTrackingStatus.PARTIAL_STAGE),
+        ('!!', None),
+        ('  ', None),
+        ('?', None),
+    ]
+)
+def test_get_tracking_status(code, expected):
+    assert get_tracking_status(code) is expected
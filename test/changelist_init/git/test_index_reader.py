@@ -0,0 +1,97 @@
+""" Testing Git Index Reader Methods.
+"""
+import struct
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelist_init.git.index_reader import read_index
+
+
+def _ls_files() -> list[bytes]:
+    return subprocess.run(['git', 'ls-files', '-z'], capture_output=True).stdout.split(b'\0')[:-1]
+
+
+def _add_nested_files():
+    for i in range(12):
+        (directory := Path(f"src/pkg{i % 3}")).mkdir(parents=True, exist_ok=True)
+        (directory / f"module_with_a_long_name_{i}.py").write_text(str(i))
+    subprocess.run(['git', 'add', '-A'], capture_output=True)
+
+
+@pytest.mark.parametrize('version', [2, 3, 4])
+def test_read_index_versions_match_git_ls_files(temp_cwd_repo, version):
+    _add_nested_files()
+    if version > 2:  # Intent-to-add requires extended flags, so git keeps version 3
+        Path('ita.py').touch()
+        subprocess.run(['git', 'add', '-N', 'ita.py'])
+    subprocess.run(['git', 'update-index', '--index-version', str(version)], capture_output=True)
+    result = read_index(Path('.git/index'))
+    assert result.version == version
+    assert [e.path for e in result.entries] == _ls_files()
+
+
+def test_read_index_entry_fields(single_staged_modify_repo):
+    entry = read_index(Path('.git/index')).entries[0]
+    oid = subprocess.run(['git', 'rev-parse', ':setup.py'], capture_output=True, text=True).stdout.strip()
+    assert entry.path == b'setup.py'
+    assert entry.oid.hex() == oid
+    assert entry.size == len('Hello World!')
+    assert entry.mode == 0o100644
+    assert not entry.skip_worktree and not entry.assume_valid and not entry.intent_to_add
+
+
+def test_read_index_flags(temp_cwd_repo):
+    _add_nested_files()
+    subprocess.run(['git', 'update-index', '--skip-worktree', 'src/pkg0/module_with_a_long_name_0.py'])
+    subprocess.run(['git', 'update-index', '--assume-unchanged', 'src/pkg1/module_with_a_long_name_1.py'])
+    Path('ita.py').touch()
+    subprocess.run(['git', 'add', '-N', 'ita.py'])
+    entries = {e.path: e for e in read_index(Path('.git/index')).entries}
+    assert entries[b'src/pkg0/module_with_a_long_name_0.py'].skip_worktree
+    assert entries[b'src/pkg1/module_with_a_long_name_1.py'].assume_valid
+    assert entries[b'ita.py'].intent_to_add
+
+
+def test_read_index_cache_tree_after_commit(temp_cwd_repo):
+    _add_nested_files()
+    subprocess.run(['git', '-c', 'user.name=u', '-c', 'user.email=e@x', 'commit', '-qm', 'init'], capture_output=True)
+    cache_tree = read_index(Path('.git/index')).cache_tree
+    for tree_path, revision in ((b'', 'HEAD^{tree}'), (b'src', 'HEAD:src'), (b'src/pkg2', 'HEAD:src/pkg2')):
+        oid = subprocess.run(['git', 'rev-parse', revision], capture_output=True, text=True).stdout.strip()
+        assert cache_tree[tree_path].hex() == oid
+
+
+def test_read_index_not_an_index_raises_value_error(temp_cwd):
+    Path('index').write_bytes(b'JUNK' + bytes(20))
+    with pytest.raises(ValueError):
+        read_index(Path('index'))
+
+
+def test_read_index_unsupported_version_raises_value_error(temp_cwd):
+    Path('index').write_bytes(b'DIRC' + struct.pack('>II', 5, 0) + bytes(20))
+    with pytest.raises(ValueError):
+        read_index(Path('index'))
+
+
+def test_read_index_required_extension_raises_value_error(temp_cwd):
+    Path('index').write_bytes(b'DIRC' + struct.pack('>II', 2, 0) + b'link' + struct.pack('>I', 0) + bytes(20))
+    with pytest.raises(ValueError, match='extension'):
+        read_index(Path('index'))
+
+
+def test_read_index_optional_extension_is_skipped(temp_cwd):
+    Path('index').write_bytes(b'DIRC' + struct.pack('>II', 2, 0) + b'UNTR' + struct.pack('>I', 2) + b'xx' + bytes(20))
+    assert read_index(Path('index')).entries == []
+
+
+def test_read_index_unmerged_entries_raise_value_error(single_unstaged_modify_repo):
+    subprocess.run(['git', 'checkout', '-qb', 'other'], capture_output=True)
+    subprocess.run(['git', 'commit', '-qam', 'other'], capture_output=True)
+    subprocess.run(['git', 'checkout', '-q', '-'], capture_output=True)
+    Path('setup.py').write_text('Conflict')
+    subprocess.run(['git', 'commit', '-qam', 'main'], capture_output=True)
+    subprocess.run(['git', 'merge', 'other'], capture_output=True)
+    with pytest.raises(ValueError, match='Unmerged'):
+        read_index(Path('.git/index'))
@@ -0,0 +1,213 @@
+""" Testing Git Index Status Methods, by comparison with Git Status output.
+"""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelist_init.git import generate_file_changes, status_runner, git_dir, StatusOptions
+from changelist_init.git.index_status import read_index_status, get_worker_count, read_worktree_changes
+from changelist_init.git.status_reader import generate_file_status_v2, GitFileStatus
+from changelist_init.git.status_runner import stream_git_status
+
+
+def _git_status() -> list[GitFileStatus]:
+    return list(generate_file_status_v2(stream_git_status()))
+
+
+def _commit_nested_files():
+    for i in range(12):
+        (directory := Path(f"src/pkg{i % 3}")).mkdir(parents=True, exist_ok=True)
+        (directory / f"module{i}.py").write_text(str(i))
+    subprocess.run(['git', 'add', '-A'], capture_output=True)
+    subprocess.run(['git', 'commit', '-qm', 'nested'], capture_output=True)
+
+
+def test_read_index_status_not_a_repo_returns_none(temp_cwd):
+    with pytest.MonkeyPatch.context() as c:
+        c.delenv('GIT_DIR', raising=False)
+        assert read_index_status() is None
+
+
+def test_read_index_status_empty_repo_returns_empty_list(temp_cwd_repo):
+    assert read_index_status() == []
+
+
+@pytest.mark.parametrize(
+    'repo_fixture', [
+        'single_untracked_repo',
+        'single_unstaged_modify_repo',
+        'single_staged_modify_repo',
+        'single_unstaged_delete_repo',
+        'single_staged_delete_repo',
+        'single_unstaged_plus_multi_files_in_new_dir_repo',
+        'single_staged_modify_repo_plus_multi_files_in_new_dir_repo',
+    ]
+)
+def test_read_index_status_matches_git_status(repo_fixture, request):
+    request.getfixturevalue(repo_fixture)
+    assert read_index_status() == _git_status()
+
+
+def test_read_index_status_unborn_branch_staged_files_are_added(temp_cwd_repo):
+    Path('a.py').write_text('a')
+    Path('b.py').write_text('b')
+    subprocess.run(['git', 'add', 'a.py', 'b.py'])
+    Path('b.py').write_text('changed')
+    assert read_index_status() == [GitFileStatus('A ', 'a.py'), GitFileStatus('AM', 'b.py')] == _git_status()
+
+
+def test_read_worktree_changes_same_size_edit_is_changed(single_staged_modify_repo_plus_multi_files_in_new_dir_repo):
+    _commit_nested_files()
+    Path('src/pkg1/module4.py').write_text('5')
+    repo_git_dir = git_dir.find_git_dir()
+    assert read_worktree_changes(repo_git_dir, Path.cwd()) == ['src/pkg1/module4.py']
+    assert read_worktree_changes(repo_git_dir, Path.cwd(), scope=['src/pkg0']) == []
+    assert read_worktree_changes(repo_git_dir, Path.cwd(), excluded_paths={'src/pkg1/module4.py'}) == []
+
+
+@pytest.mark.parametrize('index_version', [2, 4])
+@pytest.mark.parametrize('packed', [False, True])
+@pytest.mark.parametrize('workers', [None, 1, 3])
+def test_read_index_status_nested_changes_match_git_status(single_unstaged_modify_repo, index_version, packed, workers):
+    _commit_nested_files()
+    Path('src/pkg0/module0.py').write_text('modified')
+    Path('src/pkg1/module1.py').unlink()
+    Path('src/pkg2/module2.py').write_text('staged')
+    Path('src/new').mkdir()
+    Path('src/new/added.py').write_text('added')
+    subprocess.run(['git', 'add', 'src/pkg2/module2.py', 'src/new/added.py'])
+    subprocess.run(['git', 'rm', '-q', '--cached', 'src/pkg0/module3.py'])
+    subprocess.run(['git', 'rm', '-rq', '--cached', 'src/pkg1'])
+    if packed:
+        subprocess.run(['git', 'gc', '-q'], capture_output=True)
+    subprocess.run(['git', 'update-index', '--index-version', str(index_version)])
+    result = read_index_status(workers=workers)
+    assert len(result) > 5
+    assert result == _git_status()
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Requires symlink support.')
+@pytest.mark.parametrize('workers', [2, 16])
+def test_read_index_status_parallel_unsupported_entry_returns_none(single_unstaged_modify_repo, workers):
+    _commit_nested_files()
+    os.symlink('setup.py', 'src/pkg1/link')
+    subprocess.run(['git', 'add', 'src/pkg1/link'])
+    subprocess.run(['git', 'config', 'core.symlinks', 'false'])
+    assert read_index_status(workers=workers) is None
+
+
+@pytest.mark.parametrize(
+    'entry_count, expected', [
+        (0, 1),
+        (100, 1),
+        (4000, 2),
+        (10 ** 7, 32),
+    ]
+)
+def test_get_worker_count(entry_count, expected):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(os, 'cpu_count', lambda: 64)
+        assert get_worker_count(entry_count) == expected
+
+
+def test_get_worker_count_unknown_cpu_count():
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(os, 'cpu_count', lambda: None)
+        assert get_worker_count(10 ** 7) == 5
+
+
+def test_read_index_status_same_contents_rewritten_is_clean(single_unstaged_modify_repo):
+    subprocess.run(['git', 'commit', '-qam', 'modify'], capture_output=True)
+    Path('setup.py').write_text('Hello World!')
+    os.utime('setup.py', (1, 1))
+    assert read_index_status() == [] == _git_status()
+
+
+def test_read_index_status_file_replaced_by_directory(single_unstaged_modify_repo):
+    Path('setup.py').unlink()
+    Path('setup.py').mkdir()
+    Path('setup.py/inner.py').write_text('inner')
+    assert read_index_status() == [GitFileStatus(' D', 'setup.py')] == _git_status()
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Requires file mode and symlink support.')
+def test_read_index_status_mode_and_type_changes_match_git_status(single_unstaged_modify_repo):
+    subprocess.run(['git', 'commit', '-qam', 'modify'], capture_output=True)
+    Path('run.sh').write_text('echo')
+    Path('target.txt').write_text('target')
+    os.symlink('target.txt', 'link')
+    subprocess.run(['git', 'add', '-A'], capture_output=True)
+    subprocess.run(['git', 'commit', '-qm', 'files'], capture_output=True)
+    os.chmod('run.sh', 0o755)
+    Path('link').unlink()
+    Path('link').write_text('not a link')
+    os.remove('target.txt')
+    os.symlink('run.sh', 'target.txt')
+    result = read_index_status()
+    assert result == [
+        GitFileStatus(' T', 'link'), GitFileStatus(' M', 'run.sh'), GitFileStatus(' T', 'target.txt'),
+    ]
+    assert result == _git_status()
+
+
+def test_read_index_status_intent_to_add(single_unstaged_modify_repo):
+    Path('ita.py').write_text('ita')
+    subprocess.run(['git', 'add', '-N', 'ita.py'])
+    assert GitFileStatus(' A', 'ita.py') in read_index_status()
+    assert read_index_status() == _git_status()
+
+
+def test_read_index_status_skip_worktree_is_clean(single_unstaged_modify_repo):
+    subprocess.run(['git', 'update-index', '--skip-worktree', 'setup.py'])
+    assert read_index_status() == [] == _git_status()
+
+
+def test_read_index_status_filter_attributes_with_changed_file_returns_none(single_unstaged_modify_repo):
+    Path('.gitattributes').write_text('*.py text eol=crlf\n')
+    subprocess.run(['git', 'add', '.gitattributes'])
+    os.utime('setup.py', (1, 1))
+    assert read_index_status() is None
+
+
+def test_read_index_status_submodule_returns_none(single_unstaged_modify_repo):
+    subprocess.run(['git', 'update-index', '--add', '--cacheinfo', f"160000,{'1' * 40},sub"])
+    assert read_index_status() is None
+
+
+def test_read_index_status_sha256_repo_returns_none(temp_cwd):
+    subprocess.run(['git', 'init', '--object-format=sha256'], capture_output=True)
+    assert read_index_status() is None
+
+
+def test_generate_file_changes_index_reader_does_not_run_git(single_staged_modify_repo):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', _fail_stream)
+        result = list(generate_file_changes(False, StatusOptions(use_index_reader=True)))
+    assert len(result) == 1
+    assert result[0].after_path == '/setup.py'
+
+
+def test_generate_file_changes_index_reader_unsupported_falls_back_to_git(single_unstaged_modify_repo):
+    subprocess.run(['git', 'update-index', '--add', '--cacheinfo', f"160000,{'1' * 40},sub"])
+    result = list(generate_file_changes(False, StatusOptions(use_index_reader=True)))
+    assert len(result) == 2
+
+
+def _fail_stream(*args, **kwargs):
+    raise AssertionError("Git Status was run.")
+    yield
+
+
+@pytest.mark.parametrize('scope', [['src/pkg0'], ['src/pkg2', 'setup.py'], ['src/new'], ['missing']])
+def test_read_index_status_scope_matches_git_status_pathspecs(single_unstaged_modify_repo, scope):
+    _commit_nested_files()
+    Path('src/pkg0/module0.py').write_text('modified')
+    Path('src/pkg2/module2.py').write_text('staged')
+    Path('src/new').mkdir()
+    Path('src/new/added.py').write_text('added')
+    subprocess.run(['git', 'add', 'src/pkg2/module2.py', 'src/new/added.py'])
+    subprocess.run(['git', 'rm', '-q', '--cached', 'src/pkg0/module3.py'])
+    expected = list(generate_file_status_v2(stream_git_status(pathspecs=[f':(top,literal){p}' for p in scope])))
+    assert read_index_status(scope=scope) == expected
@@ -2,28 +2,14 @@
 """
 import subprocess
 from pathlib import Path
-from typing import Callable
 
 import pytest
 from changelist_data.file_change import create_fc, update_fc
 
-from changelist_init.git import generate_file_changes
+from changelist_init.git import generate_file_changes, autotune_status_profile, status_profile, status_pool, StatusOptions
+from changelist_init.git.git_dir import find_git_dir, get_state_dir
 
-from test.changelist_init.conftest import FC_PATH_SETUP, _SAMPLE_FC_0, _SAMPLE_FC_1, _SAMPLE_FC_2
-
-
-def wrap_stdout(out: str):
-    """Wrap a string in a CompletedProcess object, as if it were stdout.
-    """
-    return subprocess.CompletedProcess(
-        args=[],
-        returncode=0,
-        stdout=out,
-    )
-
-
-def mock_subprocess(output: str) -> Callable:
-    return lambda **kwargs: wrap_stdout(output)
+from test.changelist_init.conftest import FC_PATH_SETUP, _SAMPLE_FC_0, _SAMPLE_FC_1, _SAMPLE_FC_2, mock_popen
 
 
 def test_generate_file_changes_all_changes_given_single_untracked_returns_file_change(
@@ -31,7 +17,7 @@ def test_generate_file_changes_all_changes_given_single_untracked_returns_file_c
     git_status_line_untracked_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_untracked_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_untracked_setup))
         result = list(generate_file_changes(input_all.include_untracked))
     assert len(result) == 1
     assert result[0].before_path is None
@@ -42,7 +28,7 @@ def test_generate_file_changes_tracked_only_given_single_unstaged_create_returns
     git_status_line_unstaged_create_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_unstaged_create_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_unstaged_create_setup))
         result = list(generate_file_changes(False))
     assert len(result) == 1
     assert result[0].before_path is None
@@ -53,7 +39,7 @@ def test_generate_file_changes_all_changes_given_single_unstaged_create_returns_
     git_status_line_unstaged_create_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_unstaged_create_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_unstaged_create_setup))
         result = list(generate_file_changes(True))
     assert len(result) == 1
     assert result[0].before_path is None
@@ -64,7 +50,7 @@ def test_generate_file_changes_tracked_only_given_single_staged_create_returns_f
     git_status_line_staged_create_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_staged_create_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_staged_create_setup))
         result = list(generate_file_changes(False))
     assert len(result) == 1
     assert result[0].before_path is None
@@ -75,7 +61,7 @@ def test_generate_file_changes_all_changes_given_single_staged_create_returns_fi
     git_status_line_staged_create_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_staged_create_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_staged_create_setup))
         result = list(generate_file_changes(True))
     assert len(result) == 1
     assert result[0].before_path is None
@@ -86,7 +72,7 @@ def test_generate_file_changes_tracked_only_given_single_unstaged_modify_returns
     git_status_line_unstaged_modify_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_unstaged_modify_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_unstaged_modify_setup))
         result = list(generate_file_changes(False))
     assert len(result) == 1
     assert result[0].after_path == result[0].before_path
@@ -97,7 +83,7 @@ def test_generate_file_changes_all_changes_given_single_unstaged_modify_returns_
     git_status_line_unstaged_modify_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_unstaged_modify_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_unstaged_modify_setup))
         result = list(generate_file_changes(True))
     assert len(result) == 1
     assert result[0].after_path == result[0].before_path
@@ -108,7 +94,7 @@ def test_generate_file_changes_tracked_only_given_single_staged_modify_returns_f
     git_status_line_staged_modify_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_staged_modify_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_staged_modify_setup))
         result = list(generate_file_changes(False))
     assert len(result) == 1
     assert result[0].after_path == result[0].before_path
@@ -119,7 +105,7 @@ def test_generate_file_changes_all_changes_given_single_staged_modify_returns_fi
     git_status_line_staged_modify_setup
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_staged_modify_setup))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_staged_modify_setup))
         result = list(generate_file_changes(True))
     assert len(result) == 1
     assert result[0].after_path == result[0].before_path
@@ -130,7 +116,7 @@ def test_generate_file_changes_all_changes_given_multi_init_this_returns_file_ch
     git_status_line_multi_init_this
 ):
     with pytest.MonkeyPatch.context() as c:
-        c.setattr(subprocess, 'run', mock_subprocess(git_status_line_multi_init_this))
+        c.setattr(subprocess, 'Popen', mock_popen(git_status_line_multi_init_this))
         result = list(generate_file_changes(True))
     # Includes untracked files, but ignores Directories
     assert len(result) == 33
@@ -223,3 +209,169 @@ def test_generate_file_changes_init_repo_touch_files_add_half_include_untracked_
     #
     result = list(generate_file_changes(include_untracked=True))
     assert len(result) == 2 * file_count
+
+
+@pytest.mark.parametrize('use_index_reader', [False, True])
+def test_generate_file_changes_concurrent_untracked_matches_git_status(
+    single_staged_modify_repo_plus_multi_files_in_new_dir_repo, use_index_reader
+):
+    Path('setup.py').write_text('unstaged')
+    expected = list(generate_file_changes(True))
+    result = list(generate_file_changes(True, StatusOptions(concurrent_untracked=True, use_index_reader=use_index_reader)))
+    assert len(result) == 3
+    assert result == expected
+
+
+def test_generate_file_changes_concurrent_untracked_ignored_without_include_untracked(
+    single_unstaged_plus_multi_files_in_new_dir_repo
+):
+    result = list(generate_file_changes(False, StatusOptions(concurrent_untracked=True)))
+    assert len(result) == 1
+
+
+@pytest.mark.parametrize('status_shards', [2, 5])
+@pytest.mark.parametrize('include_untracked', [False, True])
+def test_generate_file_changes_status_shards_matches_git_status(
+    single_staged_modify_repo_plus_multi_files_in_new_dir_repo, status_shards, include_untracked
+):
+    for name in ('lib', 'docs'):
+        Path(name).mkdir()
+        Path(name, 'file.md').write_text(name)
+    subprocess.run(['git', 'add', 'lib'])
+    expected = sorted(generate_file_changes(include_untracked), key=lambda fc: fc.after_path or fc.before_path)
+    result = list(generate_file_changes(include_untracked, StatusOptions(status_shards=status_shards)))
+    assert result == expected
+
+
+def test_generate_file_changes_status_shards_deleted_directory(single_unstaged_modify_repo):
+    Path('lib').mkdir()
+    Path('lib/file.py').write_text('lib')
+    subprocess.run(['git', 'add', 'lib'])
+    subprocess.run(['git', 'commit', '-qm', 'lib'], capture_output=True)
+    Path('lib/file.py').unlink()
+    Path('lib').rmdir()
+    result = list(generate_file_changes(False, StatusOptions(status_shards=2, shard_paths=['setup.py'])))
+    assert [fc.before_path for fc in result] == ['/lib/file.py', '/setup.py']
+
+
+@pytest.mark.parametrize(
+    'options', [
+        {},
+        {'use_index_reader': True},
+        {'concurrent_untracked': True},
+        {'concurrent_untracked': True, 'use_index_reader': True},
+        {'status_shards': 2},
+        {'time_budget': 60.0},
+    ]
+)
+def test_generate_file_changes_scope_limits_files(single_unstaged_plus_multi_files_in_new_dir_repo, options):
+    Path('lib').mkdir()
+    Path('lib/module.py').write_text('lib')
+    subprocess.run(['git', 'add', 'lib'])
+    result = list(generate_file_changes(True, StatusOptions(scope=['test', 'lib/module.py'], **options)))
+    assert sorted(fc.after_path for fc in result) == ['/lib/module.py', '/test/__init__.py', '/test/source_file.py']
+
+
+def test_generate_file_changes_scope_with_cache_is_keyed_on_scope(single_unstaged_plus_multi_files_in_new_dir_repo):
+    assert len(list(generate_file_changes(True, StatusOptions(use_cache=True, scope=['test'])))) == 2
+    assert len(list(generate_file_changes(True, StatusOptions(use_cache=True)))) == 3
+    assert len(list(generate_file_changes(True, StatusOptions(use_cache=True, scope=['setup.py'])))) == 1
+
+
+@pytest.mark.parametrize('options', [{}, {'status_shards': 2}, {'concurrent_untracked': True}])
+def test_generate_file_changes_fsmonitor_matches_git_status(single_unstaged_plus_multi_files_in_new_dir_repo, options):
+    expected = list(generate_file_changes(True, StatusOptions(**options)))
+    assert list(generate_file_changes(True, StatusOptions(fsmonitor=True, **options))) == expected
+    assert list(generate_file_changes(True, StatusOptions(fsmonitor=True, **options))) == expected
+
+
+def test_generate_file_changes_uses_status_profile(single_unstaged_plus_multi_files_in_new_dir_repo):
+    expected = list(generate_file_changes(True))
+    status_profile.write_status_profile(
+        get_state_dir(find_git_dir()), status_profile.StatusProfile(config=['core.untrackedCache=true'])
+    )
+    index_bytes = (find_git_dir() / 'index').read_bytes()
+    assert list(generate_file_changes(True)) == expected
+    assert (find_git_dir() / 'index').read_bytes() == index_bytes
+    assert list(generate_file_changes(True, StatusOptions(write_index=True))) == expected
+    assert b'UNTR' in (find_git_dir() / 'index').read_bytes()
+
+
+def test_autotune_status_profile_is_persisted(single_unstaged_plus_multi_files_in_new_dir_repo):
+    result = autotune_status_profile(True, repeats=1)
+    assert result.seconds <= result.default_seconds
+    assert status_profile.get_repository_profile() == result.profile
+    assert len(list(generate_file_changes(True))) == 3
+
+
+def test_autotune_status_profile_not_repo_returns_none(temp_cwd):
+    assert autotune_status_profile(True) is None
+
+
+@pytest.fixture
+def untracked_directories_repo(single_unstaged_plus_multi_files_in_new_dir_repo):
+    """ Adds a large untracked directory, and a nested repository, to the repo with an untracked test directory.
+    """
+    Path('build/sub').mkdir(parents=True)
+    for i in range(20):
+        Path(f'build/sub/{i}.o').write_text('o')
+    Path('nested').mkdir()
+    subprocess.run(['git', 'init', 'nested'], capture_output=True)
+    Path('nested/module.py').write_text('x = 1')
+    yield single_unstaged_plus_multi_files_in_new_dir_repo
+
+
+@pytest.mark.parametrize('options', [{}, {'concurrent_untracked': True}, {'status_shards': 2}, {'time_budget': 60.0}])
+def test_generate_file_changes_collapse_untracked_lists_directories(untracked_directories_repo, options):
+    result = list(generate_file_changes(True, StatusOptions(collapse_untracked=True, **options)))
+    assert sorted(fc.after_path for fc in result if fc.after_dir) == ['/build', '/nested', '/test']
+    assert len(result) == 4
+
+
+def test_generate_file_changes_expand_untracked_lists_small_directory_files(untracked_directories_repo):
+    result = list(generate_file_changes(True, StatusOptions(collapse_untracked=True, expand_untracked=5)))
+    assert sorted(fc.after_path for fc in result) == [
+        '/build', '/nested', '/setup.py', '/test/__init__.py', '/test/source_file.py',
+    ]
+
+
+def test_generate_file_changes_collapse_untracked_cache_is_keyed_on_collapse(untracked_directories_repo):
+    assert len(list(generate_file_changes(True, StatusOptions(use_cache=True, collapse_untracked=True)))) == 4
+    assert len(list(generate_file_changes(True, StatusOptions(use_cache=True)))) == 23  # The nested repository is not listed
+
+
+def test_generate_file_changes_max_files_reports_truncation(untracked_directories_repo):
+    truncations = []
+    result = list(generate_file_changes(True, StatusOptions(use_cache=True, max_files=5), on_truncated=truncations.append))
+    assert len(result) == 5
+    assert truncations[0].max_files == 5
+    assert not truncations[0].is_exhaustive
+    assert len(list(generate_file_changes(True, StatusOptions(use_cache=True)))) == 23  # The truncated records are not cached
+
+
+def test_generate_file_changes_max_files_zero_reports_truncation(single_unstaged_plus_multi_files_in_new_dir_repo):
+    truncations = []
+    assert list(generate_file_changes(True, StatusOptions(max_files=0), on_truncated=truncations.append)) == []
+    assert len(truncations) == 1
+    assert sum(truncations[0].overflow_counts.values()) == 1
+
+
+def test_generate_file_changes_max_files_not_reached(single_unstaged_plus_multi_files_in_new_dir_repo):
+    truncations = []
+    assert len(list(generate_file_changes(True, StatusOptions(max_files=3), on_truncated=truncations.append))) == 3
+    assert truncations == []
+
+
+@pytest.mark.parametrize(
+    'options', [
+        {},
+        {'collapse_untracked': True},
+        {'scope': ['test']},
+    ]
+)
+def test_generate_file_changes_parse_processes_matches_streamed_changes(untracked_directories_repo, options):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_pool, '_MIN_CHUNK_SIZE', 1)
+        c.setattr(status_pool.os, 'cpu_count', lambda: 2)
+        result = list(generate_file_changes(True, StatusOptions(parse_processes=2, **options)))
+    assert result == list(generate_file_changes(True, StatusOptions(**options)))
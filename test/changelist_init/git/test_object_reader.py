@@ -0,0 +1,92 @@
+""" Testing Git Object Reader Methods.
+"""
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelist_init.git.git_dir import find_git_dir
+from changelist_init.git.object_reader import ObjectReader, apply_delta, read_offset_varint, is_tree_mode
+
+
+def _rev_parse(revision: str) -> bytes:
+    return bytes.fromhex(
+        subprocess.run(['git', 'rev-parse', revision], capture_output=True, text=True).stdout.strip()
+    )
+
+
+@pytest.mark.parametrize(
+    'data, expected', [
+        (b'\x00', (0, 1)),
+        (b'\x7f', (127, 1)),
+        (b'\x80\x00', (128, 2)),
+        (b'\x81\x01', (257, 2)),
+    ]
+)
+def test_read_offset_varint(data, expected):
+    assert read_offset_varint(data, 0) == expected
+
+
+def test_apply_delta_copy_and_insert():
+    base = b'Hello World'
+    # Source size 11, target size 10, copy 6 bytes from offset 0, insert 'Git!'
+    delta = bytes([11, 10, 0x90, 6, 4]) + b'Git!'
+    assert apply_delta(base, delta) == b'Hello Git!'
+
+
+def test_apply_delta_copy_with_offset():
+    delta = bytes([11, 5, 0x91, 6, 5])
+    assert apply_delta(b'Hello World', delta) == b'World'
+
+
+def test_apply_delta_invalid_opcode_raises_value_error():
+    with pytest.raises(ValueError):
+        apply_delta(b'base', bytes([4, 1, 0]))
+
+
+def test_is_tree_mode():
+    assert is_tree_mode(0o40000)
+    assert not is_tree_mode(0o100644)
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_object_reader_reads_commit_tree_and_blob(single_unstaged_modify_repo, packed):
+    if packed:
+        subprocess.run(['git', 'gc', '-q'], capture_output=True)
+        assert len(list(Path('.git/objects/pack').glob('*.pack'))) == 1
+    with ObjectReader(find_git_dir()) as reader:
+        tree_oid = reader.read_commit_tree(_rev_parse('HEAD'))
+        assert tree_oid == _rev_parse('HEAD^{tree}')
+        entries = reader.read_tree(tree_oid)
+        assert entries == [(b'setup.py', 0o100644, _rev_parse('HEAD:setup.py'))]
+        assert reader.read(entries[0][2]) == (b'blob', b'Hellow')
+
+
+def test_object_reader_reads_deltified_objects(single_unstaged_modify_repo):
+    contents = ''.join(f"line {i}\n" for i in range(200))
+    for i in range(3):
+        Path('setup.py').write_text(contents + f"change {i}\n")
+        subprocess.run(['git', 'commit', '-qam', f'c{i}'], capture_output=True)
+    subprocess.run(['git', 'gc', '-q', '--aggressive'], capture_output=True)
+    with ObjectReader(find_git_dir()) as reader:
+        for i, revision in enumerate(('HEAD~2', 'HEAD~1', 'HEAD')):
+            assert reader.read(_rev_parse(f'{revision}:setup.py')) == (b'blob', (contents + f"change {i}\n").encode())
+
+
+def test_object_reader_missing_object_raises_key_error(single_unstaged_modify_repo):
+    with ObjectReader(find_git_dir()) as reader, pytest.raises(KeyError):
+        reader.read(bytes(20))
+
+
+def test_object_reader_wrong_type_raises_value_error(single_unstaged_modify_repo):
+    with ObjectReader(find_git_dir()) as reader, pytest.raises(ValueError):
+        reader.read_tree(_rev_parse('HEAD'))
+        with pytest.raises(ValueError):
+            reader.read_commit_tree(_rev_parse('HEAD^{tree}'))
+
+
+def test_object_reader_alternates_are_searched(single_unstaged_modify_repo, tmp_path):
+    subprocess.run(['git', 'clone', '-q', '--shared', '.', str(tmp_path / 'clone')], capture_output=True)
+    oid = _rev_parse('HEAD:setup.py')
+    with ObjectReader(find_git_dir(tmp_path / 'clone')) as reader:
+        assert reader.read(oid) == (b'blob', b'Hellow')
@@ -0,0 +1,229 @@
+""" Testing Git Status Cache Methods.
+"""
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelist_init.git import status_runner, git_dir
+from changelist_init.git import status_cache
+from changelist_init.git.status_cache import cached_file_status, compute_cache_key, read_cache, write_cache, \
+    get_refresh_paths, get_head_commit
+from changelist_init.git.status_collector import collect_file_status
+from changelist_init.git.status_reader import GitFileStatus
+
+
+def _collect(include_untracked: bool = True) -> list[GitFileStatus]:
+    return list(cached_file_status(include_untracked, collect_file_status(include_untracked)))
+
+
+def _collect_incremental(refreshed: list[list[str]], include_untracked: bool = True) -> list[GitFileStatus]:
+    def refresh_status(paths: list[str]):
+        refreshed.append(paths)
+        return collect_file_status(include_untracked, pathspecs=status_runner.get_scope_pathspecs(paths))
+    return list(cached_file_status(
+        include_untracked, collect_file_status(include_untracked), refresh_status=refresh_status
+    ))
+
+
+@pytest.fixture(autouse=True)
+def settled_signatures():
+    """ Record the stat signatures of files written by the test, just before the collection.
+    """
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_cache, '_RACY_INTERVAL_NS', 0)
+        yield
+
+
+def _commit(*paths: str):
+    subprocess.run(['git', 'add', *paths], capture_output=True)
+    subprocess.run(['git', 'commit', '-qm', 'commit'], capture_output=True)
+
+
+def _fail_stream(*args, **kwargs):
+    raise AssertionError("Git Status was run.")
+    yield
+
+
+def test_cached_file_status_not_a_repo_passes_records_through(temp_cwd):
+    def producer():
+        yield GitFileStatus('??', 'a.py')
+        return True
+    assert list(cached_file_status(True, producer())) == [GitFileStatus('??', 'a.py')]
+
+
+def test_cached_file_status_second_run_replays_without_git(single_untracked_repo):
+    first = _collect()
+    assert first == [GitFileStatus('??', 'setup.py')]
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', _fail_stream)
+        assert _collect() == first
+
+
+def test_cached_file_status_untracked_flag_is_part_of_key(single_untracked_repo):
+    _collect(include_untracked=True)
+    assert _collect(include_untracked=False) == []
+
+
+def test_cached_file_status_modified_cached_path_invalidates(single_unstaged_modify_repo):
+    assert _collect() == [GitFileStatus(' M', 'setup.py')]
+    Path('setup.py').write_text('Hellow')  # Revert to the committed contents
+    assert _collect() == []
+
+
+def test_cached_file_status_clean_tracked_file_edit_invalidates(single_unstaged_modify_repo):
+    subprocess.run(['git', 'checkout', 'setup.py'], capture_output=True)
+    assert _collect() == []
+    Path('setup.py').write_text('Hellos')
+    assert _collect() == [GitFileStatus(' M', 'setup.py')]
+
+
+def test_cached_file_status_new_untracked_file_invalidates(single_untracked_repo):
+    _collect()
+    Path('new.py').write_text('new')
+    assert _collect() == [GitFileStatus('??', 'new.py'), GitFileStatus('??', 'setup.py')]
+
+
+def test_cached_file_status_recently_modified_path_is_not_replayed(single_untracked_repo):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_cache, '_RACY_INTERVAL_NS', 3600 * 1_000_000_000)
+        _collect()
+        c.setattr(status_runner, 'stream_git_status_blocks', _fail_stream)
+        with pytest.raises(AssertionError):
+            _collect()
+
+
+def test_cached_file_status_index_change_invalidates(single_unstaged_modify_repo):
+    assert _collect() == [GitFileStatus(' M', 'setup.py')]
+    subprocess.run(['git', 'add', 'setup.py'], capture_output=True)
+    assert _collect() == [GitFileStatus('M ', 'setup.py')]
+
+
+def test_cached_file_status_incomplete_collection_is_not_cached(single_untracked_repo):
+    def producer():
+        yield GitFileStatus('??', 'setup.py')
+        return False
+    list(cached_file_status(True, producer()))
+    repo_git_dir = git_dir.find_git_dir()
+    key = compute_cache_key(repo_git_dir, True)
+    assert read_cache(repo_git_dir, Path.cwd(), key) is None
+
+
+def test_read_cache_malformed_file_returns_none(single_untracked_repo):
+    repo_git_dir = git_dir.find_git_dir()
+    key = compute_cache_key(repo_git_dir, True)
+    (state_dir := git_dir.get_state_dir(repo_git_dir)).mkdir()
+    (state_dir / 'status_cache.json').write_text('{"key": ')
+    assert read_cache(repo_git_dir, Path.cwd(), key) is None
+    (state_dir / 'status_cache.json').write_text(json.dumps({'key': key, 'records': [[1]]}))
+    assert read_cache(repo_git_dir, Path.cwd(), key) is None
+
+
+def test_write_cache_then_read_cache_round_trip(single_untracked_repo):
+    repo_git_dir = git_dir.find_git_dir()
+    key = compute_cache_key(repo_git_dir, True, 'token-1')
+    records = [GitFileStatus('??', 'setup.py'), GitFileStatus(' D', 'missing.py')]
+    write_cache(repo_git_dir, Path.cwd(), key, records)
+    assert list(read_cache(repo_git_dir, Path.cwd(), key)) == records
+    assert read_cache(repo_git_dir, Path.cwd(), compute_cache_key(repo_git_dir, True, 'token-2')) is None
+
+
+def test_cached_file_status_incremental_commit_refreshes_committed_paths(single_staged_modify_repo):
+    refreshed = []
+    assert _collect_incremental(refreshed) == [GitFileStatus('M ', 'setup.py')]
+    _commit()
+    assert _collect_incremental(refreshed) == []
+    assert refreshed == [['setup.py']]
+
+
+def test_cached_file_status_incremental_staged_new_file_is_refreshed(single_unstaged_modify_repo):
+    refreshed = []
+    _collect_incremental(refreshed, include_untracked=False)
+    Path('new.py').write_text('new')
+    subprocess.run(['git', 'add', 'new.py'], capture_output=True)
+    assert _collect_incremental(refreshed, include_untracked=False) == [
+        GitFileStatus('A ', 'new.py'), GitFileStatus(' M', 'setup.py'),
+    ]
+    assert refreshed == [['new.py', 'setup.py']]
+
+
+def test_cached_file_status_incremental_checkout_refreshes_changed_paths(single_unstaged_modify_repo):
+    subprocess.run(['git', 'stash', '-q'], capture_output=True)
+    subprocess.run(['git', 'checkout', '-qb', 'feature'], capture_output=True)
+    Path('feature.py').write_text('feature')
+    _commit('feature.py')
+    refreshed = []
+    assert _collect_incremental(refreshed, include_untracked=False) == []
+    subprocess.run(['git', 'checkout', '-q', '-'], capture_output=True)
+    assert _collect_incremental(refreshed, include_untracked=False) == []
+    assert refreshed == [['feature.py']]
+    assert not Path('feature.py').exists()
+
+
+def test_cached_file_status_incremental_no_changed_paths_does_not_run_git(single_unstaged_modify_repo):
+    subprocess.run(['git', 'checkout', 'setup.py'], capture_output=True)
+    refreshed = []
+    assert _collect_incremental(refreshed) == []
+    subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m', 'empty'], capture_output=True)
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', _fail_stream)
+        assert _collect_incremental(refreshed) == []
+    assert refreshed == []
+
+
+def test_cached_file_status_incremental_clean_tracked_file_edit_is_refreshed(single_unstaged_modify_repo):
+    subprocess.run(['git', 'checkout', 'setup.py'], capture_output=True)
+    refreshed = []
+    assert _collect_incremental(refreshed) == []
+    subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m', 'empty'], capture_output=True)
+    Path('setup.py').write_text('Hellos')
+    assert _collect_incremental(refreshed) == [GitFileStatus(' M', 'setup.py')]
+    assert refreshed == [['setup.py']]
+
+
+def test_get_refresh_paths_missing_commit_returns_none(single_unstaged_modify_repo):
+    repo_git_dir = git_dir.find_git_dir()
+    key = compute_cache_key(repo_git_dir, True)
+    write_cache(repo_git_dir, Path.cwd(), key, [GitFileStatus(' M', 'setup.py')], '0' * 40)
+    assert get_refresh_paths(repo_git_dir, key, get_head_commit(repo_git_dir)) is None
+
+
+def test_get_refresh_paths_different_options_returns_none(single_unstaged_modify_repo):
+    repo_git_dir = git_dir.find_git_dir()
+    head = get_head_commit(repo_git_dir)
+    write_cache(repo_git_dir, Path.cwd(), compute_cache_key(repo_git_dir, True), [], head)
+    assert get_refresh_paths(repo_git_dir, compute_cache_key(repo_git_dir, False), head) is None
+    assert get_refresh_paths(repo_git_dir, compute_cache_key(repo_git_dir, True, scope=['src']), head) is None
+    assert get_refresh_paths(repo_git_dir, compute_cache_key(repo_git_dir, True), head) == ['setup.py']
+
+
+def test_get_refresh_paths_cache_without_head_returns_none(single_unstaged_modify_repo):
+    repo_git_dir = git_dir.find_git_dir()
+    key = compute_cache_key(repo_git_dir, True)
+    write_cache(repo_git_dir, Path.cwd(), key, [])
+    assert get_refresh_paths(repo_git_dir, key, get_head_commit(repo_git_dir)) is None
+
+
+def test_get_refresh_paths_outside_scope_are_excluded(single_unstaged_modify_repo):
+    repo_git_dir = git_dir.find_git_dir()
+    head = get_head_commit(repo_git_dir)
+    key = compute_cache_key(repo_git_dir, True, scope=['src'])
+    write_cache(repo_git_dir, Path.cwd(), key, [GitFileStatus('??', 'src/a.py')], head)
+    subprocess.run(['git', 'rm', '-q', '--cached', 'setup.py'], capture_output=True)
+    assert get_refresh_paths(repo_git_dir, key, head, ['src']) == ['src/a.py']
+    assert get_refresh_paths(repo_git_dir, compute_cache_key(repo_git_dir, True), head) is None
+
+
+def test_get_refresh_paths_above_limit_returns_none(single_unstaged_modify_repo):
+    repo_git_dir = git_dir.find_git_dir()
+    head = get_head_commit(repo_git_dir)
+    key = compute_cache_key(repo_git_dir, True)
+    write_cache(repo_git_dir, Path.cwd(), key, [GitFileStatus(' M', 'setup.py')], head)
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_cache, '_MAX_REFRESH_PATHS', 0)
+        assert get_refresh_paths(repo_git_dir, key, head) is None
+
+
+def test_get_head_commit_unborn_branch_returns_none(temp_cwd_repo):
+    assert get_head_commit(git_dir.find_git_dir()) is None
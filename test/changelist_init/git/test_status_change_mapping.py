@@ -3,7 +3,11 @@
 import pytest
 from changelist_data import file_change
 
-from changelist_init.git.status_change_mapping import get_status_code_change_map
+from changelist_init.git.status_change_mapping import get_status_code_change_map, map_file_status_to_changes, \
+    create_directory_fc, create_status_summary, describe_status_summary, StatusSummary, get_change_paths
+from changelist_init.git.git_status_lists import GitStatusLists
+from changelist_init.git.git_tracking_status import GitTrackingStatus
+from changelist_init.git.status_reader import GitFileStatus
 
 
 @pytest.mark.parametrize(
@@ -82,3 +86,88 @@ def test_get_status_code_change_map_unmerged_codes_returns_update_fc(status_code
 )
 def test_get_status_code_change_map_unsupported_codes_returns_none(status_code):
     assert get_status_code_change_map(status_code) is None
+
+
+def test_create_directory_fc():
+    assert create_directory_fc('/build') == file_change.FileChange(None, None, '/build', True)
+
+
+def test_map_file_status_to_changes_collapsed_directory_returns_directory_fc():
+    result = list(map_file_status_to_changes([GitFileStatus('??', 'build/'), GitFileStatus('??', 'setup.py')]))
+    assert result == [create_directory_fc('/build'), file_change.create_fc('/setup.py')]
+
+
+def test_map_file_status_to_changes_undecodable_path_is_escaped():
+    result = list(map_file_status_to_changes([GitFileStatus('??', b'caf\xe9.py'.decode(errors='surrogateescape'))]))
+    assert result == [file_change.create_fc('/caf\\xe9.py')]
+
+
+def test_map_file_status_to_changes_undecodable_path_replace_policy():
+    status_path = b'caf\xe9.py'.decode(errors='surrogateescape')
+    result = list(map_file_status_to_changes([GitFileStatus('??', status_path)], path_errors='replace'))
+    assert result == [file_change.create_fc('/caf�.py')]
+
+
+def test_map_file_status_to_changes_utf8_path_is_unchanged():
+    result = list(map_file_status_to_changes([GitFileStatus('??', 'café.py')]))
+    assert result == [file_change.create_fc('/café.py')]
+
+
+def test_map_file_status_to_changes_interleaved_codes_keep_order():
+    records = [GitFileStatus('??', 'a.py'), GitFileStatus(' M', 'b.py'), GitFileStatus('??', 'c.py'),
+               GitFileStatus(' D', 'd.py')]
+    assert list(map_file_status_to_changes(records)) == [
+        file_change.create_fc('/a.py'), file_change.update_fc('/b.py'), file_change.create_fc('/c.py'),
+        file_change.delete_fc('/d.py'),
+    ]
+
+
+def test_map_file_status_to_changes_summary_counts_each_code():
+    summaries = []
+    records = [GitFileStatus('??', 'a.py'), GitFileStatus(' M', 'b.py'), GitFileStatus('??', 'build/'),
+               GitFileStatus('  ', 'c.py'), GitFileStatus('D ', 'd.py')]
+    list(map_file_status_to_changes(records, on_summary=summaries.append))
+    assert summaries == [StatusSummary({'??': 2, ' M': 1, '  ': 1, 'D ': 1}, 2, 1, 1, 1)]
+
+
+def test_map_file_status_to_changes_unrecognized_code_is_printed_once(capsys):
+    records = [GitFileStatus('  ', 'a.py'), GitFileStatus('??', 'b.py'), GitFileStatus('  ', 'c.py')]
+    assert list(map_file_status_to_changes(records)) == [file_change.create_fc('/b.py')]
+    assert capsys.readouterr().out == 'Unrecognized Git Status Code:(  )\n'
+
+
+def test_map_file_status_to_changes_code_outside_table_is_mapped():
+    assert list(map_file_status_to_changes([GitFileStatus('XM', 'a.py')])) == [file_change.update_fc('/a.py')]
+
+
+def test_create_status_summary_empty():
+    assert create_status_summary({}) == StatusSummary({}, 0, 0, 0, 0)
+
+
+def test_describe_status_summary():
+    summary = StatusSummary({'??': 2, ' D': 1}, 2, 0, 1, 0)
+    assert describe_status_summary(summary) == '2 created, 0 updated, 1 deleted, 0 unrecognized'
+
+
+def test_map_file_status_to_changes_status_lists_classifies_mapped_records():
+    status_lists = GitStatusLists()
+    records = [GitFileStatus('M ', 'a.py'), GitFileStatus(' M', 'b.py'), GitFileStatus('MM', 'c.py'),
+               GitFileStatus('??', 'build/'), GitFileStatus('  ', 'd.py'), GitFileStatus('A ', 'e.py')]
+    result = list(map_file_status_to_changes(records, status_lists=status_lists))
+    assert len(result) == 5
+    assert status_lists.get_list(GitTrackingStatus.STAGED) == [GitFileStatus('M ', 'a.py'), GitFileStatus('A ', 'e.py')]
+    assert status_lists.get_list(GitTrackingStatus.UNSTAGED) == [GitFileStatus(' M', 'b.py')]
+    assert status_lists.get_list(GitTrackingStatus.PARTIAL_STAGE) == [GitFileStatus('MM', 'c.py')]
+    assert status_lists.get_list(GitTrackingStatus.UNTRACKED) == [GitFileStatus('??', 'build/')]
+
+
+def test_map_file_status_to_changes_status_lists_receive_converted_path():
+    status_lists = GitStatusLists()
+    status_path = b'caf\xe9.py'.decode(errors='surrogateescape')
+    list(map_file_status_to_changes([GitFileStatus('M ', status_path)], status_lists=status_lists))
+    assert status_lists.get_list(GitTrackingStatus.STAGED) == [GitFileStatus('M ', 'caf\\xe9.py')]
+
+
+def test_get_change_paths():
+    records = [GitFileStatus('M ', 'src/a.py'), GitFileStatus('??', 'build/')]
+    assert get_change_paths(records) == {'/src/a.py', '/build'}
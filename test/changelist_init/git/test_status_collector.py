@@ -0,0 +1,292 @@
+""" Testing Git Status Collector Methods.
+"""
+import subprocess
+
+import pytest
+
+from changelist_init.git import status_runner
+from changelist_init.git.status_collector import collect_file_status, collect_file_status_concurrently, \
+    limit_file_status, describe_truncation, StatusTruncation
+from changelist_init.git.status_reader import GitFileStatus
+
+
+def mock_stream_git_status(outputs: dict[str, list[bytes]], timed_out: set[str]):
+    """ Create a stream_git_status_blocks replacement, with records and timeout behaviour for each untracked mode.
+    """
+    def stream(include_untracked=False, deadline=None, untracked_mode=None, pathspecs=None, config=None, write_index=False):
+        stream.calls.append((untracked_mode, deadline))
+        stream.configs.append(config)
+        yield from (record + b'\0' for record in outputs[untracked_mode])
+        if untracked_mode in timed_out:
+            raise subprocess.TimeoutExpired(['git'], 0)
+    stream.calls = []
+    stream.configs = []
+    return stream
+
+
+def test_collect_file_status_no_budget_single_attempt_without_deadline():
+    stream = mock_stream_git_status({'all': [b'? a.py', b'? b.py']}, set())
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        result = list(collect_file_status(True))
+    assert [r.file_path for r in result] == ['a.py', 'b.py']
+    assert stream.calls == [('all', None)]
+
+
+def test_collect_file_status_tracked_only_budget_is_unbounded():
+    stream = mock_stream_git_status({'no': [b'? a.py']}, set())
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        result = list(collect_file_status(False, time_budget=1.0))
+    assert len(result) == 1
+    assert stream.calls == [('no', None)]
+
+
+def test_collect_file_status_within_budget_does_not_fall_back():
+    stream = mock_stream_git_status({'all': [b'? a.py']}, set())
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        result = list(collect_file_status(True, time_budget=1.0))
+    assert len(result) == 1
+    assert len(stream.calls) == 1
+    assert stream.calls[0][1] is not None
+
+
+def test_collect_file_status_timeout_falls_back_and_skips_collected_paths():
+    stream = mock_stream_git_status(
+        {
+            'all': [b'? a.py'],
+            'normal': [b'? a.py', b'? build/'],
+            'no': [],
+        },
+        {'all'},
+    )
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        result = list(collect_file_status(True, time_budget=1.0))
+    assert [r.file_path for r in result] == ['a.py']
+    assert [call[0] for call in stream.calls] == ['all', 'normal']
+
+
+def test_collect_file_status_all_timeouts_final_mode_has_no_deadline():
+    stream = mock_stream_git_status(
+        {
+            'all': [b'? a.py'],
+            'normal': [],
+            'no': [b'1 .M N... 100644 100644 100644 0 0 setup.py'],
+        },
+        {'all', 'normal'},
+    )
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        result = list(collect_file_status(True, time_budget=1.0))
+    assert [r.file_path for r in result] == ['a.py', 'setup.py']
+    assert stream.calls[-1] == ('no', None)
+
+
+def test_collect_file_status_reports_progress():
+    stream = mock_stream_git_status({'all': [f'? {i}.py'.encode() for i in range(2500)]}, set())
+    progress = []
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        result = list(collect_file_status(True, on_progress=progress.append))
+    assert len(result) == 2500
+    assert progress == [1000, 2000, 2500]
+
+
+def mock_stream_untracked_files(outputs: dict[bool, list[bytes]], timed_out: set[bool]):
+    """ Create a stream_untracked_files replacement, with records and timeout behaviour for each directory mode.
+    """
+    def stream(deadline=None, collapse_directories=False, pathspecs=None):
+        stream.calls.append((collapse_directories, deadline is not None))
+        yield from outputs[collapse_directories]
+        if collapse_directories in timed_out:
+            raise subprocess.TimeoutExpired(['git'], 0)
+    stream.calls = []
+    return stream
+
+
+def tracked_records(*paths: str, is_complete: bool = True):
+    yield from (GitFileStatus(' M', p) for p in paths)
+    return is_complete
+
+
+def collect_concurrently(tracked, *args, **kwargs) -> tuple[list[GitFileStatus], bool]:
+    generator = collect_file_status_concurrently(tracked, *args, **kwargs)
+    records = []
+    while True:
+        try:
+            records.append(next(generator))
+        except StopIteration as stop:
+            return records, stop.value
+
+
+def test_collect_file_status_concurrently_tracked_records_first():
+    stream = mock_stream_untracked_files({False: [b'new.py', b'build/']}, set())
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_untracked_files', stream)
+        records, is_complete = collect_concurrently(tracked_records('a.py', 'b.py'))
+    assert records == [GitFileStatus(' M', 'a.py'), GitFileStatus(' M', 'b.py'), GitFileStatus('??', 'new.py')]
+    assert is_complete
+    assert stream.calls == [(False, False)]
+
+
+def test_collect_file_status_concurrently_incomplete_tracked_records():
+    stream = mock_stream_untracked_files({False: []}, set())
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_untracked_files', stream)
+        records, is_complete = collect_concurrently(tracked_records('a.py', is_complete=False))
+    assert len(records) == 1
+    assert not is_complete
+
+
+def test_collect_file_status_concurrently_timeout_collapses_directories():
+    stream = mock_stream_untracked_files({False: [b'a.py'], True: [b'a.py', b'b.py', b'build/']}, {False})
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_untracked_files', stream)
+        records, is_complete = collect_concurrently(tracked_records(), time_budget=1.0)
+    assert [r.file_path for r in records] == ['a.py', 'b.py']
+    assert not is_complete
+    assert stream.calls == [(False, True), (True, True)]
+
+
+def test_collect_file_status_concurrently_all_timeouts_lists_no_untracked_files():
+    stream = mock_stream_untracked_files({False: [], True: []}, {False, True})
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_untracked_files', stream)
+        records, is_complete = collect_concurrently(tracked_records('a.py'), time_budget=1.0)
+    assert [r.file_path for r in records] == ['a.py']
+    assert not is_complete
+
+
+def test_collect_file_status_concurrently_untracked_error_is_raised():
+    def stream(deadline=None, collapse_directories=False, pathspecs=None):
+        exit("Git Untracked Files Runner Error: fatal")
+        yield
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_untracked_files', stream)
+        with pytest.raises(SystemExit):
+            collect_concurrently(tracked_records('a.py'))
+
+
+def test_collect_file_status_concurrently_untracked_os_error_is_raised():
+    def stream(deadline=None, collapse_directories=False, pathspecs=None):
+        raise OSError("git not found")
+        yield
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_untracked_files', stream)
+        with pytest.raises(OSError):
+            collect_concurrently(tracked_records('a.py'))
+
+
+def test_collect_file_status_concurrently_reports_progress():
+    stream = mock_stream_untracked_files({False: [f'{i}.py'.encode() for i in range(1500)]}, set())
+    progress = []
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_untracked_files', stream)
+        records, _ = collect_concurrently(tracked_records(*(f't{i}.py' for i in range(700))), on_progress=progress.append)
+    assert len(records) == 2200
+    assert progress == [1000, 2000, 2200]
+
+
+def test_collect_file_status_pathspec_shards_sorted_by_path():
+    outputs = [[b'? z.py', b'? a/b.py'], [b'? m.py'], [b'? a/a.py', b'? m.py']]
+    def run_sharded(pathspec_shards, untracked_mode='no', deadline=None, config=None, write_index=False):
+        run_sharded.calls.append((pathspec_shards, untracked_mode, config))
+        yield from outputs
+    run_sharded.calls = []
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'run_sharded_git_status', run_sharded)
+        result = list(collect_file_status(True, pathspec_shards=[['x'], ['y'], ['z']]))
+    assert [r.file_path for r in result] == ['a/a.py', 'a/b.py', 'm.py', 'z.py']
+    assert run_sharded.calls == [([['x'], ['y'], ['z']], 'all', None)]
+
+
+def test_collect_file_status_status_config_passed_to_each_attempt():
+    stream = mock_stream_git_status({'all': [b'? a.py'], 'normal': [], 'no': []}, {'all'})
+    config = ['core.untrackedCache=true']
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        list(collect_file_status(True, time_budget=1.0, status_config=config))
+    assert stream.configs == [config, config]
+
+
+def test_collect_file_status_single_pathspec_shard_streams_git_status():
+    stream = mock_stream_git_status({'no': [b'? a.py']}, set())
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        assert len(list(collect_file_status(False, pathspec_shards=[[':/']]))) == 1
+
+
+def test_collect_file_status_collapse_untracked_starts_in_normal_mode():
+    stream = mock_stream_git_status({'normal': [b'? build/', b'? a.py'], 'no': []}, {'normal'})
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, 'stream_git_status_blocks', stream)
+        result = list(collect_file_status(True, time_budget=1.0, collapse_untracked=True))
+    assert [r.file_path for r in result] == ['build/', 'a.py']
+    assert [mode for mode, _ in stream.calls] == ['normal', 'no']
+
+
+def generate_records(*paths: str, is_complete: bool = True):
+    """ A GitFileStatus Generator of untracked records, returning the completion status.
+    """
+    for path in paths:
+        yield GitFileStatus('??', path)
+    return is_complete
+
+
+def test_limit_file_status_under_limit_returns_completion():
+    truncations = []
+    records = limit_file_status(generate_records('a.py', 'b.py'), 2, truncations.append)
+    assert [r.file_path for r in records] == ['a.py', 'b.py']
+    assert truncations == []
+
+
+def test_limit_file_status_counts_dropped_records_by_directory():
+    truncations = []
+    result = list(limit_file_status(generate_records('a.py', 'b.py', 'build/x.o', 'c.py'), 2, truncations.append))
+    assert [r.file_path for r in result] == ['a.py', 'b.py']
+    assert truncations == [StatusTruncation(2, {'build': 1, '': 1}, True)]
+
+
+def test_limit_file_status_stops_counting_and_closes_generator():
+    truncations = []
+    records = generate_records(*(f'build/{i}.o' for i in range(100)))
+    result = list(limit_file_status(records, 2, truncations.append))
+    assert len(result) == 2
+    assert truncations == [StatusTruncation(2, {'build': 2}, False)]
+    assert records.gi_frame is None
+
+
+def test_limit_file_status_truncated_returns_false():
+    records = limit_file_status(generate_records('a.py', 'b.py'), 1)
+    assert next(records).file_path == 'a.py'
+    with pytest.raises(StopIteration) as stop:
+        next(records)
+    assert stop.value.value is False
+
+
+def test_limit_file_status_zero_limit_counts_one_record():
+    truncations = []
+    records = limit_file_status(generate_records('a.py', 'build/x.o'), 0, truncations.append)
+    with pytest.raises(StopIteration) as stop:
+        next(records)
+    assert stop.value.value is False
+    assert truncations == [StatusTruncation(0, {'': 1}, False)]
+
+
+def test_limit_file_status_zero_limit_no_records_returns_completion():
+    records = limit_file_status(generate_records(), 0)
+    with pytest.raises(StopIteration) as stop:
+        next(records)
+    assert stop.value.value is True
+
+
+def test_describe_truncation():
+    truncation = StatusTruncation(5, {'': 1, 'build': 30, 'docs': 2}, False)
+    assert describe_truncation(truncation) == 'Stopped at 5 files. Not listed: build/ 30+, docs/ 2+, / 1+.'
+
+
+def test_describe_truncation_many_directories_are_summarized():
+    truncation = StatusTruncation(5, {f'd{i:02}': 1 for i in range(12)}, True)
+    assert describe_truncation(truncation).endswith('d09/ 1, 2 more directories.')
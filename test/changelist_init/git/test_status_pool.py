@@ -0,0 +1,89 @@
+""" Testing Status Pool Methods.
+"""
+from unittest.mock import Mock
+
+import pytest
+from changelist_data.file_change import create_fc, update_fc
+
+from changelist_init.git import status_pool
+from changelist_init.git.git_status_lists import GitStatusLists
+from changelist_init.git.git_tracking_status import GitTrackingStatus
+from changelist_init.git.status_change_mapping import create_directory_fc
+from changelist_init.git.status_pool import map_status_buffer
+
+
+def _status_buffer(count: int) -> bytes:
+    return b''.join(
+        (f"1 .M N... 100644 100644 100644 {'0' * 40} {'0' * 40} src/module_{i}.py" if i % 2 else f'? build_{i}/')
+        .encode() + b'\0'
+        for i in range(count)
+    )
+
+
+def _expected_changes(count: int, keep_directories: bool = False) -> list:
+    return [
+        update_fc(f'/src/module_{i}.py') if i % 2 else create_directory_fc(f'/build_{i}')
+        for i in range(count) if i % 2 or keep_directories
+    ]
+
+
+@pytest.fixture
+def small_chunks():
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_pool, '_MIN_CHUNK_SIZE', 1)
+        c.setattr(status_pool.os, 'cpu_count', lambda: 4)
+        yield
+
+
+def test_map_status_buffer_small_output_is_mapped_in_process():
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_pool, 'ProcessPoolExecutor', Mock(side_effect=AssertionError('a process was started')))
+        assert map_status_buffer(_status_buffer(20), 4) == _expected_changes(20)
+
+
+def test_map_status_buffer_worker_processes_keep_output_order(small_chunks):
+    assert map_status_buffer(_status_buffer(100), 3) == _expected_changes(100)
+
+
+def test_map_status_buffer_worker_processes_keep_directories(small_chunks):
+    assert map_status_buffer(_status_buffer(100), 3, keep_directories=True) == _expected_changes(100, True)
+
+
+def test_map_status_buffer_worker_processes_apply_path_errors(small_chunks):
+    status_buffer = b'? caf\xe9.py\0' + _status_buffer(10) + b'? na\xefve.py\0'
+    result = map_status_buffer(status_buffer, 2, path_errors='replace')
+    assert result == [create_fc('/caf�.py'), *_expected_changes(10), create_fc('/na�ve.py')]
+
+
+def test_map_status_buffer_single_cpu_is_mapped_in_process(small_chunks):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_pool.os, 'cpu_count', lambda: 1)
+        c.setattr(status_pool, 'ProcessPoolExecutor', Mock(side_effect=AssertionError('a process was started')))
+        assert map_status_buffer(_status_buffer(20), 4) == _expected_changes(20)
+
+
+def test_map_status_buffer_shared_memory_unavailable_is_mapped_in_process(small_chunks):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_pool.shared_memory, 'SharedMemory', Mock(side_effect=OSError()))
+        assert map_status_buffer(_status_buffer(20), 4) == _expected_changes(20)
+
+
+@pytest.mark.parametrize('cpu_count', [1, 4])
+def test_map_status_buffer_summary_counts_every_chunk(small_chunks, cpu_count):
+    summaries = []
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_pool.os, 'cpu_count', lambda: cpu_count)
+        map_status_buffer(_status_buffer(100), 3, keep_directories=True, on_summary=summaries.append)
+    assert summaries[0].code_counts == {'??': 50, ' M': 50}
+    assert summaries[0].created == summaries[0].updated == 50
+
+
+@pytest.mark.parametrize('cpu_count', [1, 4])
+def test_map_status_buffer_status_lists_are_in_output_order(small_chunks, cpu_count):
+    status_lists = GitStatusLists()
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_pool.os, 'cpu_count', lambda: cpu_count)
+        map_status_buffer(_status_buffer(100), 3, keep_directories=True, status_lists=status_lists)
+    unstaged = status_lists.get_list(GitTrackingStatus.UNSTAGED)
+    assert [record.file_path for record in unstaged] == [f'src/module_{i}.py' for i in range(1, 100, 2)]
+    assert len(status_lists.get_table(GitTrackingStatus.UNTRACKED)) == 50
@@ -0,0 +1,127 @@
+""" Testing Git Status Profile Methods.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from changelist_init.git import status_profile
+from changelist_init.git.git_capabilities import GitCapabilities
+from changelist_init.git.git_dir import find_git_dir, get_state_dir
+from changelist_init.git.status_profile import StatusProfile, DEFAULT_PROFILE, find_fastest_profile, \
+    describe_profile, read_status_profile, write_status_profile, get_repository_profile
+from changelist_init.git.status_reader import GitFileStatus
+
+
+RECORDS = [GitFileStatus('?', 'b.py'), GitFileStatus('M', 'a.py')]
+
+ALL_CAPABILITIES = GitCapabilities(version=(2, 45), fsmonitor_daemon=True, untracked_cache=True)
+
+
+def fake_collect(cost, records=lambda profile: RECORDS):
+    """ Create a collect function that advances a fake clock by the cost of each profile.
+    """
+    clock = [0.0]
+    def collect(profile):
+        collect.profiles.append(profile)
+        clock[0] += cost(profile)
+        return records(profile)
+    collect.profiles = []
+    collect.time = SimpleNamespace(perf_counter=lambda: clock[0])
+    return collect
+
+
+def find_with_fake_clock(collect, include_untracked=True, capabilities=ALL_CAPABILITIES):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_profile, 'time', collect.time)
+        return find_fastest_profile(collect, include_untracked, capabilities, repeats=2)
+
+
+def test_find_fastest_profile_equal_times_keeps_default():
+    result = find_with_fake_clock(fake_collect(lambda profile: 1.0))
+    assert result.profile == DEFAULT_PROFILE
+    assert result.seconds == result.default_seconds == 1.0
+
+
+def test_find_fastest_profile_faster_settings_are_combined():
+    def cost(profile):
+        config = profile.config or []
+        return 1.0 - 0.2 * ('index.threads=false' in config) - 0.3 * ('core.untrackedCache=true' in config)
+    result = find_with_fake_clock(fake_collect(cost))
+    assert result.profile == StatusProfile(config=['index.threads=false', 'core.untrackedCache=true'])
+    assert result.seconds == pytest.approx(0.5)
+
+
+def test_find_fastest_profile_small_improvement_is_ignored():
+    result = find_with_fake_clock(fake_collect(lambda profile: 1.0 - 0.01 * (profile.config is not None)))
+    assert result.profile == DEFAULT_PROFILE
+
+
+def test_find_fastest_profile_different_records_are_rejected():
+    collect = fake_collect(
+        lambda profile: 0.1 if profile.concurrent_untracked else 1.0,
+        lambda profile: RECORDS[:1] if profile.concurrent_untracked else RECORDS,
+    )
+    assert not find_with_fake_clock(collect).profile.concurrent_untracked
+
+
+def test_find_fastest_profile_concurrent_untracked_is_kept():
+    result = find_with_fake_clock(fake_collect(lambda profile: 0.5 if profile.concurrent_untracked else 1.0))
+    assert result.profile == StatusProfile(concurrent_untracked=True)
+
+
+def test_find_fastest_profile_tracked_only_skips_untracked_candidates():
+    collect = fake_collect(lambda profile: 1.0)
+    find_with_fake_clock(collect, include_untracked=False)
+    assert not any(profile.concurrent_untracked for profile in collect.profiles)
+    assert not any('core.untrackedCache=true' in (profile.config or []) for profile in collect.profiles)
+
+
+def test_find_fastest_profile_index_writes_are_not_a_candidate():
+    collect = fake_collect(lambda profile: 1.0)
+    find_with_fake_clock(collect)
+    assert StatusProfile(config=[]) not in collect.profiles
+    assert all(
+        profile == DEFAULT_PROFILE or len(profile.config or []) > 0 or profile.concurrent_untracked
+        for profile in collect.profiles
+    )
+
+
+def test_describe_profile():
+    assert describe_profile(DEFAULT_PROFILE) == 'default options'
+    assert describe_profile(StatusProfile(['index.threads=false'], True)) == 'index.threads=false, concurrent untracked'
+
+
+def test_write_status_profile_is_read(temp_cwd_repo):
+    state_dir = get_state_dir(find_git_dir())
+    profile = StatusProfile(config=['core.preloadIndex=false'], concurrent_untracked=True)
+    write_status_profile(state_dir, profile)
+    assert read_status_profile(state_dir) == profile
+    assert get_repository_profile() == profile
+
+
+def test_read_status_profile_other_binary_returns_none(temp_cwd_repo):
+    state_dir = get_state_dir(find_git_dir())
+    write_status_profile(state_dir, StatusProfile(config=[]))
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_profile.git_capabilities, 'get_binary_key', lambda: ['/other/git', 1, 1])
+        assert read_status_profile(state_dir) is None
+
+
+@pytest.mark.parametrize('contents', ['', '[]', '{"binary": null}', json.dumps({'config': [1]})])
+def test_read_status_profile_malformed_returns_none(temp_cwd_repo, contents):
+    state_dir = get_state_dir(find_git_dir())
+    write_status_profile(state_dir, StatusProfile(config=[]))
+    stored = json.loads((state_dir / 'status_profile.json').read_text())
+    if contents.startswith('{"config"'):
+        contents = json.dumps({**stored, 'config': [1]})
+    (state_dir / 'status_profile.json').write_text(contents)
+    assert read_status_profile(state_dir) is None
+
+
+def test_get_repository_profile_not_repo_returns_default(temp_cwd):
+    assert get_repository_profile() == DEFAULT_PROFILE
+
+
+def test_get_repository_profile_not_tuned_returns_default(temp_cwd_repo):
+    assert get_repository_profile() == DEFAULT_PROFILE
@@ -1,103 +1,213 @@
 """ Testing Git Status Reader Methods.
 """
-from changelist_init.git.status_reader import read_git_status_line, generate_file_status
+from itertools import chain, pairwise
 
-from test.changelist_init.conftest import GIT_STATUS_FILE_PATH_SETUP
+import pytest
 
+from changelist_init.git.status_reader import read_git_status_record, generate_file_status_v2, \
+    generate_untracked_file_status, read_status_batch, iterate_status_batch, StatusBatch, GitFileStatus, \
+    split_status_buffer, generate_file_status_blocks, generate_status_pairs
 
-def test_read_git_status_line_empty_str_returns_none():
-    assert read_git_status_line("") is None
+from test.changelist_init.conftest import GIT_STATUS_FILE_PATH_SETUP
 
 
-def test_read_git_status_line_directory_returns_none():
-    assert read_git_status_line("a_directory/") is None
+def _ordinary_record(xy: str, file_path: str) -> bytes:
+    return f"1 {xy} N... 100644 100644 100644 {'0' * 40} {'0' * 40} {file_path}".encode()
 
 
-def test_read_git_status_line_nested_directory_returns_none():
-    assert read_git_status_line("a/directory/") is None
+@pytest.mark.parametrize(
+    'record', [
+        b'',
+        b'? ',
+        b'# branch.oid (initial)',
+        b'? a_directory/',
+        b'1 .M N...',
+        b'x unknown record',
+    ]
+)
+def test_read_git_status_record_rejected_records_return_none(record):
+    assert read_git_status_record(record) is None
 
 
-def test_read_git_status_line_single_untracked(
-    git_status_line_untracked_setup
-):
-    result = read_git_status_line(git_status_line_untracked_setup)
+def test_read_git_status_record_untracked():
+    result = read_git_status_record(b'? setup.py')
     assert result.code == '??'
     assert result.file_path == GIT_STATUS_FILE_PATH_SETUP
 
 
-def test_read_git_status_line_single_unstaged_create(
-    git_status_line_unstaged_create_setup
-):
-    result = read_git_status_line(git_status_line_unstaged_create_setup)
-    assert result.code == ' A'
+def test_read_git_status_record_ignored():
+    result = read_git_status_record(b'! setup.py')
+    assert result.code == '!!'
     assert result.file_path == GIT_STATUS_FILE_PATH_SETUP
 
 
-def test_read_git_status_line_single_unstaged_modify(
-    git_status_line_unstaged_modify_setup
-):
-    result = read_git_status_line(git_status_line_unstaged_modify_setup)
-    assert result.code == ' M'
+@pytest.mark.parametrize(
+    'xy, expected_code', [
+        ('.M', ' M'),
+        ('M.', 'M '),
+        ('A.', 'A '),
+        ('AM', 'AM'),
+        ('.D', ' D'),
+        ('D.', 'D '),
+        ('.T', ' T'),
+    ]
+)
+def test_read_git_status_record_ordinary_changes(xy, expected_code):
+    result = read_git_status_record(_ordinary_record(xy, GIT_STATUS_FILE_PATH_SETUP))
+    assert result.code == expected_code
     assert result.file_path == GIT_STATUS_FILE_PATH_SETUP
 
 
-def test_read_git_status_line_single_staged_create(
-    git_status_line_staged_create_setup
-):
-    result = read_git_status_line(git_status_line_staged_create_setup)
-    assert result.code == 'A '
-    assert result.file_path == GIT_STATUS_FILE_PATH_SETUP
+def test_read_git_status_record_path_with_spaces():
+    result = read_git_status_record(_ordinary_record('.M', 'a dir/a file.py'))
+    assert result.file_path == 'a dir/a file.py'
 
 
-def test_read_git_status_line_single_staged_modify(
-    git_status_line_staged_modify_setup
-):
-    result = read_git_status_line(git_status_line_staged_modify_setup)
-    assert result.code == 'M '
+def test_read_git_status_record_unmerged():
+    record = f"u UU N... 100644 100644 100644 100644 {'0' * 40} {'0' * 40} {'0' * 40} setup.py".encode()
+    result = read_git_status_record(record)
+    assert result.code == 'UU'
     assert result.file_path == GIT_STATUS_FILE_PATH_SETUP
 
 
-def test_read_git_status_line_single_partial_staged_create(
-    git_status_line_partial_staged_create_setup
-):
-    result = read_git_status_line(git_status_line_partial_staged_create_setup)
-    assert result.code == 'MA'
-    assert result.file_path == GIT_STATUS_FILE_PATH_SETUP
+def test_read_git_status_record_non_utf8_path_is_surrogate_escaped():
+    result = read_git_status_record(b'? file\xff.py')
+    assert result.file_path == 'file\udcff.py'
 
 
-def test_read_git_status_line_single_partial_staged_modify(
-    git_status_line_partial_staged_modify_setup
-):
-    result = read_git_status_line(git_status_line_partial_staged_modify_setup)
-    assert result.code == 'MM'
-    assert result.file_path == GIT_STATUS_FILE_PATH_SETUP
+def test_generate_file_status_v2_rename_record_consumes_original_path():
+    records = [
+        f"2 R. N... 100644 100644 100644 {'0' * 40} {'0' * 40} R100 new.py".encode(),
+        b'old.py',
+        b'? setup.py',
+    ]
+    result = list(generate_file_status_v2(records))
+    assert len(result) == 2
+    assert result[0].code == 'R '
+    assert result[0].file_path == 'new.py'
+    assert result[1].file_path == GIT_STATUS_FILE_PATH_SETUP
 
 
-def test_generate_file_status_multi_untracked_returns_git_status_lists(
-    git_status_line_multi_untracked
-):
-    result = list(generate_file_status(git_status_line_multi_untracked))
-    assert len(result) == 2
+def test_generate_file_status_v2_skips_headers_and_directories():
+    records = [b'# branch.oid (initial)', b'? build/', b'? setup.py']
+    result = list(generate_file_status_v2(records))
+    assert len(result) == 1
 
 
-def test_generate_file_status_multi_unstaged_create_returns_git_status_lists(
-    git_status_line_multi_unstaged_create
-):
-    result = list(generate_file_status(git_status_line_multi_unstaged_create))
-    assert len(result) == 2
+def test_generate_untracked_file_status_skips_directories_and_empty_paths():
+    result = list(generate_untracked_file_status([b'build/', b'', b'setup.py', b'src/\xff.py']))
+    assert [r.code for r in result] == ['??', '??']
+    assert result[0].file_path == GIT_STATUS_FILE_PATH_SETUP
+    assert result[1].file_path == 'src/\udcff.py'
 
 
-def test_generate_file_status_multi_staged_create_returns_git_status_lists(
-    git_status_line_multi_staged_create
-):
-    result = list(generate_file_status(git_status_line_multi_staged_create))
-    assert len(result) == 2
+def test_generate_file_status_v2_keep_directories_keeps_untracked_directories():
+    records = [b'# branch.oid (initial)', b'? build/', b'? setup.py']
+    result = list(generate_file_status_v2(records, keep_directories=True))
+    assert [r.file_path for r in result] == ['build/', 'setup.py']
+    assert result[0].code == '??'
 
 
-def test_generate_file_status_multi_partial_staged_create_returns_git_status_lists(
-    git_status_line_partial_staged_create_setup,
-    git_status_line_partial_staged_modify_setup
-):
-    test_input = git_status_line_partial_staged_create_setup + '\n' + git_status_line_partial_staged_modify_setup
-    result = list(generate_file_status(test_input))
-    assert len(result) == 2
+def test_read_git_status_record_keep_directories_ignored_directory_returns_none():
+    assert read_git_status_record(b'! build/', keep_directories=True) is None
+
+
+def test_generate_untracked_file_status_keep_directories():
+    result = list(generate_untracked_file_status([b'build/', b'', b'setup.py'], keep_directories=True))
+    assert [r.file_path for r in result] == ['build/', 'setup.py']
+
+
+def test_split_status_buffer_empty_buffer_returns_no_chunks():
+    assert split_status_buffer(b'', 4) == []
+
+
+def test_split_status_buffer_single_chunk_is_whole_buffer():
+    assert split_status_buffer(b'? a.py\0? b.py\0', 1) == [(0, 14)]
+
+
+def test_split_status_buffer_chunks_start_at_records():
+    status_buffer = b''.join(_ordinary_record('.M', f'src/module_{i}.py') + b'\0' for i in range(10))
+    chunks = split_status_buffer(status_buffer, 3)
+    assert len(chunks) == 3
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(status_buffer)
+    assert all(end == start for (_, end), (start, _) in pairwise(chunks))
+    records = [list(generate_file_status_v2(status_buffer[start:end].split(b'\0'))) for start, end in chunks]
+    assert list(chain.from_iterable(records)) == list(generate_file_status_v2(status_buffer.split(b'\0')))
+
+
+def test_split_status_buffer_rename_record_keeps_original_path():
+    rename = f"2 R. N... 100644 100644 100644 {'0' * 40} {'0' * 40} R100 new.py".encode()
+    status_buffer = rename + b'\0old.py\0? a.py\0'
+    assert split_status_buffer(status_buffer, 2) == [(0, len(rename) + 8), (len(rename) + 8, len(status_buffer))]
+
+
+def test_split_status_buffer_more_chunks_than_records():
+    assert split_status_buffer(b'? a.py\0? b.py\0', 10) == [(0, 7), (7, 14)]
+
+
+def test_read_status_batch_returns_parallel_lists():
+    block = b'\0'.join((_ordinary_record('.M', 'src/a b.py'), _ordinary_record('A.', 'c.py'), b'? setup.py', b''))
+    assert read_status_batch(block) == StatusBatch([' M', 'A ', '??'], ['src/a b.py', 'c.py', 'setup.py'])
+
+
+def test_read_status_batch_empty_block_returns_empty_lists():
+    assert read_status_batch(b'') == StatusBatch([], [])
+
+
+@pytest.mark.parametrize(
+    'records', [
+        [b'2 R. N... 100644 100644 100644 0 0 R100 new.py', b'old.py'],
+        [b'u UU N... 100644 100644 100644 100644 0 0 0 a.py'],
+        [b'? a.py', _ordinary_record('.M', 'b.py')],
+        [_ordinary_record('.M', 'a.py'), b'1 .M N... 100644 100644 100644 0 0 b.py'],
+        [_ordinary_record('.M', 'dir/')],
+        [b'# branch.oid 0'],
+    ]
+)
+def test_read_status_batch_other_records_return_none(records):
+    assert read_status_batch(b'\0'.join(records) + b'\0') is None
+
+
+@pytest.mark.parametrize('keep_directories', [False, True])
+@pytest.mark.parametrize(
+    'records', [
+        [_ordinary_record('.M', 'a.py'), b'? build/', b'? ', b'?  ', b'? c.py'],
+        [_ordinary_record('MM', 'caf\xc3\xa9 \xff.py'), b'? \xe9t\xe9.py'],
+        [_ordinary_record('.D', 'a.py')],
+    ]
+)
+def test_read_status_batch_matches_record_reader(records, keep_directories):
+    expected = list(generate_file_status_v2(records, keep_directories))
+    assert list(iterate_status_batch(read_status_batch(b'\0'.join(records) + b'\0', keep_directories))) == expected
+
+
+def test_read_status_batch_sha256_object_names():
+    record = f"1 .M N... 100644 100644 100644 {'0' * 64} {'0' * 64} a.py".encode()
+    assert read_status_batch(record + b'\0') == StatusBatch([' M'], ['a.py'])
+
+
+def test_generate_file_status_blocks_rename_across_blocks_falls_back():
+    blocks = [
+        _ordinary_record('.M', 'a.py') + b'\0',
+        b'2 R. N... 100644 100644 100644 0 0 R100 new.py\0',
+        b'1 .M old.py\0' + _ordinary_record('.M', 'z.py') + b'\0',
+    ]
+    assert list(generate_file_status_blocks(blocks)) == [
+        GitFileStatus(' M', 'a.py'), GitFileStatus('R ', 'new.py'), GitFileStatus(' M', 'z.py'),
+    ]
+
+
+def test_generate_status_pairs_matches_generate_file_status_blocks():
+    blocks = [
+        _ordinary_record('.M', 'a.py') + b'\0? build/\0',
+        b'2 R. N... 100644 100644 100644 0 0 R100 new.py\0',
+        b'1 .M old.py\0' + _ordinary_record('.M', 'z.py') + b'\0',
+    ]
+    result = list(generate_status_pairs(blocks, keep_directories=True))
+    assert result == [(' M', 'a.py'), ('??', 'build/'), ('R ', 'new.py'), (' M', 'z.py')]
+    assert result == list(generate_file_status_blocks(blocks, keep_directories=True))
+
+
+def test_iterate_status_batch_returns_git_file_status():
+    result = list(iterate_status_batch(StatusBatch(['??'], ['setup.py'])))
+    assert result == [GitFileStatus('??', 'setup.py')]
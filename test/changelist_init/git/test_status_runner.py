@@ -1,140 +1,328 @@
 """ Testing Git Status Runner.
 """
+import os
 import subprocess
+import time
+from pathlib import Path
 
 import pytest
 
-from changelist_init.git.status_runner import run_git_status
+from changelist_init.git.status_runner import stream_git_status, stream_untracked_files, \
+    split_pathspec_shards, run_sharded_git_status, run_git_diff_paths, read_git_status_buffer, stream_git_status_blocks
+from changelist_init.git import status_runner
 
 
-def test_run_git_status_empty_dir_raises_exit_not_a_git_repo(temp_cwd):
+def _read_status_lines(include_untracked: bool = False) -> str:
+    """ The streamed Porcelain V2 records, written as Porcelain V1 lines.
+    """
+    lines = []
+    for record in stream_git_status(include_untracked):
+        text = record.decode()
+        if text.startswith('? '):
+            lines.append('?? ' + text[2:])
+        else:
+            lines.append(text[2:4].replace('.', ' ') + ' ' + text.split(' ', 8)[8])
+    return ''.join(line + '\n' for line in lines)
+
+
+def test_status_lines_empty_dir_raises_exit_not_a_git_repo(temp_cwd):
     with pytest.raises(SystemExit):
-        run_git_status()
+        _read_status_lines()
 
 
-def test_run_git_status_empty_git_repo(temp_cwd):
+def test_status_lines_empty_git_repo(temp_cwd):
     subprocess.run(['git', 'init'], capture_output=True)
-    assert len(run_git_status()) == 0
+    assert len(_read_status_lines()) == 0
 
 
-def test_run_git_status_include_untracked_empty_git_repo(temp_cwd):
+def test_status_lines_include_untracked_empty_git_repo(temp_cwd):
     subprocess.run(['git', 'init'], capture_output=True)
-    assert len(run_git_status(include_untracked=True)) == 0
+    assert len(_read_status_lines(include_untracked=True)) == 0
 
 
-def test_run_git_status_single_untracked_returns_empty_str(
+def test_status_lines_single_untracked_returns_empty_str(
     single_untracked_repo,
     git_status_line_untracked_setup
 ):
-    result = run_git_status()
+    result = _read_status_lines()
     assert result == ""
 
 
-def test_run_git_status_include_untracked_single_untracked_returns_untracked(
+def test_status_lines_include_untracked_single_untracked_returns_untracked(
     single_untracked_repo,
     git_status_line_untracked_setup
 ):
-    result = run_git_status(include_untracked=True)
+    result = _read_status_lines(include_untracked=True)
     assert result == git_status_line_untracked_setup + "\n"
 
 
-def test_run_git_status_single_unstaged_modify_returns_unstaged_modify(
+def test_status_lines_single_unstaged_modify_returns_unstaged_modify(
     single_unstaged_modify_repo,
     git_status_line_unstaged_modify_setup
 ):
-    result = run_git_status()
+    result = _read_status_lines()
     assert result == git_status_line_unstaged_modify_setup + "\n"
 
 
-def test_run_git_status_include_untracked_single_unstaged_modify_returns_unstaged_modify(
+def test_status_lines_include_untracked_single_unstaged_modify_returns_unstaged_modify(
     single_unstaged_modify_repo,
     git_status_line_unstaged_modify_setup
 ):
-    result = run_git_status(include_untracked=True)
+    result = _read_status_lines(include_untracked=True)
     assert result == git_status_line_unstaged_modify_setup + "\n"
 
 
-def test_run_git_status_single_staged_create_returns_staged_create(
+def test_status_lines_single_staged_create_returns_staged_create(
     single_staged_modify_repo,
     git_status_line_staged_modify_setup
 ):
-    result = run_git_status()
+    result = _read_status_lines()
     assert result == git_status_line_staged_modify_setup + "\n"
 
 
-def test_run_git_status_include_untracked_single_staged_create_returns_staged_create(
+def test_status_lines_include_untracked_single_staged_create_returns_staged_create(
     single_staged_modify_repo,
     git_status_line_staged_modify_setup
 ):
-    result = run_git_status(include_untracked=True)
+    result = _read_status_lines(include_untracked=True)
     assert result == git_status_line_staged_modify_setup + "\n"
 
 
-def test_run_git_status_single_unstaged_delete_returns_unstaged_delete(
+def test_status_lines_single_unstaged_delete_returns_unstaged_delete(
     single_unstaged_delete_repo,
     git_status_line_unstaged_delete_setup
 ):
-    result = run_git_status()
+    result = _read_status_lines()
     assert result == git_status_line_unstaged_delete_setup + "\n"
 
 
-def test_run_git_status_include_untracked_single_unstaged_delete_returns_unstaged_delete(
+def test_status_lines_include_untracked_single_unstaged_delete_returns_unstaged_delete(
     single_unstaged_delete_repo,
     git_status_line_unstaged_delete_setup
 ):
-    result = run_git_status(include_untracked=True)
+    result = _read_status_lines(include_untracked=True)
     assert result == git_status_line_unstaged_delete_setup + "\n"
 
 
-def test_run_git_status_single_staged_delete_returns_staged_create(
+def test_status_lines_single_staged_delete_returns_staged_create(
     single_staged_delete_repo,
     git_status_line_staged_delete_setup
 ):
-    result = run_git_status()
+    result = _read_status_lines()
     assert result == git_status_line_staged_delete_setup + "\n"
 
 
-def test_run_git_status_include_untracked_single_staged_delete_returns_staged_create(
+def test_status_lines_include_untracked_single_staged_delete_returns_staged_create(
     single_staged_delete_repo,
     git_status_line_staged_delete_setup
 ):
-    result = run_git_status(include_untracked=True)
+    result = _read_status_lines(include_untracked=True)
     assert result == git_status_line_staged_delete_setup + "\n"
 
 
-def test_run_git_status_single_unstaged_plus_multi_files_in_new_dir(
+def test_status_lines_single_unstaged_plus_multi_files_in_new_dir(
     single_unstaged_plus_multi_files_in_new_dir_repo,
     git_status_line_unstaged_modify_setup
 ):
-    result = run_git_status()
+    result = _read_status_lines()
     assert result == git_status_line_unstaged_modify_setup + '\n'
 
 
-def test_run_git_status_single_unstaged_plus_multi_files_in_new_dir_include_untracked_returns_untracked_single_and_new_dir(
+def test_status_lines_single_unstaged_plus_multi_files_in_new_dir_include_untracked_returns_untracked_single_and_new_dir(
     single_unstaged_plus_multi_files_in_new_dir_repo,
     git_status_line_unstaged_modify_setup
 ):
-    result = run_git_status(include_untracked=True)
+    result = _read_status_lines(include_untracked=True)
     assert result == f"""{git_status_line_unstaged_modify_setup}
 ?? test/__init__.py
 ?? test/source_file.py
 """
 
 
-def test_run_git_status_single_staged_plus_multi_files_in_new_dir_returns_empty_str(
+def test_status_lines_single_staged_plus_multi_files_in_new_dir_returns_empty_str(
     single_staged_modify_repo_plus_multi_files_in_new_dir_repo,
     git_status_line_staged_modify_setup
 ):
-    result = run_git_status()
+    result = _read_status_lines()
     assert result == f"{git_status_line_staged_modify_setup}\n"
 
 
-def test_run_git_status_single_staged_plus_multi_files_in_new_dir_include_untracked_returns_untracked(
+def test_status_lines_single_staged_plus_multi_files_in_new_dir_include_untracked_returns_untracked(
     single_staged_modify_repo_plus_multi_files_in_new_dir_repo,
     git_status_line_staged_modify_setup
 ):
-    result = run_git_status(include_untracked=True)
+    result = _read_status_lines(include_untracked=True)
     assert result == f"""{git_status_line_staged_modify_setup}
 ?? test/__init__.py
 ?? test/source_file.py
 """
+
+
+def test_stream_git_status_empty_dir_raises_exit_not_a_git_repo(temp_cwd):
+    with pytest.raises(SystemExit, match='Git Status Runner Error:'):
+        list(stream_git_status())
+
+
+def test_stream_git_status_empty_git_repo_yields_nothing(temp_cwd_repo):
+    assert list(stream_git_status(include_untracked=True)) == []
+
+
+def test_stream_git_status_single_untracked_ignore_untracked_yields_nothing(single_untracked_repo):
+    assert list(stream_git_status()) == []
+
+
+def test_stream_git_status_include_untracked_single_untracked_yields_untracked_record(single_untracked_repo):
+    assert list(stream_git_status(include_untracked=True)) == [b'? setup.py']
+
+
+def test_stream_git_status_single_unstaged_modify_yields_v2_record(single_unstaged_modify_repo):
+    result = list(stream_git_status())
+    assert len(result) == 1
+    assert result[0].startswith(b'1 .M ')
+    assert result[0].endswith(b' setup.py')
+
+
+def test_stream_git_status_include_untracked_multi_files_in_new_dir_yields_all_files(
+    single_unstaged_plus_multi_files_in_new_dir_repo
+):
+    result = list(stream_git_status(include_untracked=True))
+    assert result[1:] == [b'? test/__init__.py', b'? test/source_file.py']
+
+
+def test_read_git_status_buffer_matches_streamed_records(single_unstaged_plus_multi_files_in_new_dir_repo):
+    records = list(stream_git_status(include_untracked=True))
+    assert read_git_status_buffer('all') == b''.join(record + b'\0' for record in records)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64 * 1024])
+def test_stream_git_status_blocks_end_with_whole_records(single_unstaged_plus_multi_files_in_new_dir_repo, chunk_size):
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(status_runner, '_STREAM_CHUNK_SIZE', chunk_size)
+        blocks = list(stream_git_status_blocks(include_untracked=True))
+    assert all(block.endswith(b'\0') for block in blocks)
+    assert b''.join(blocks) == read_git_status_buffer('all')
+
+
+def test_read_git_status_buffer_not_a_git_repo_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='Git Status Runner Error:'):
+        read_git_status_buffer()
+
+
+def test_stream_git_status_close_early_kills_process(single_unstaged_plus_multi_files_in_new_dir_repo):
+    generator = stream_git_status(include_untracked=True)
+    assert next(generator).startswith(b'1 ')
+    generator.close()
+
+
+def test_stream_git_status_deadline_not_reached_yields_all_records(single_untracked_repo):
+    result = list(stream_git_status(include_untracked=True, deadline=time.monotonic() + 60))
+    assert result == [b'? setup.py']
+
+
+def test_stream_git_status_deadline_passed_raises_timeout_expired(single_untracked_repo):
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(stream_git_status(include_untracked=True, deadline=time.monotonic() - 1))
+
+
+def test_stream_git_status_untracked_mode_normal_collapses_directories(
+    single_unstaged_plus_multi_files_in_new_dir_repo
+):
+    result = list(stream_git_status(untracked_mode='normal'))
+    assert result[1:] == [b'? test/']
+
+
+def test_stream_git_status_from_subdirectory_paths_are_relative_to_repository_root(
+    single_unstaged_plus_multi_files_in_new_dir_repo
+):
+    os.chdir('test')
+    result = list(stream_git_status(include_untracked=True))
+    assert result[0].endswith(b' setup.py')
+    assert result[1:] == [b'? test/__init__.py', b'? test/source_file.py']
+
+
+def test_stream_untracked_files_empty_dir_raises_exit_not_a_git_repo(temp_cwd):
+    with pytest.raises(SystemExit, match='Git Untracked Files Runner Error:'):
+        list(stream_untracked_files())
+
+
+def test_stream_untracked_files_single_unstaged_modify_yields_nothing(single_unstaged_modify_repo):
+    assert list(stream_untracked_files()) == []
+
+
+def test_stream_untracked_files_from_subdirectory_lists_repository_paths(
+    single_unstaged_plus_multi_files_in_new_dir_repo
+):
+    os.chdir('test')
+    assert list(stream_untracked_files()) == [b'test/__init__.py', b'test/source_file.py']
+
+
+def test_stream_untracked_files_collapse_directories(single_unstaged_plus_multi_files_in_new_dir_repo):
+    assert list(stream_untracked_files(collapse_directories=True)) == [b'test/']
+
+
+def test_stream_untracked_files_excludes_ignored_files(single_unstaged_plus_multi_files_in_new_dir_repo):
+    Path('.gitignore').write_text('test/__init__.py\n')
+    assert list(stream_untracked_files()) == [b'.gitignore', b'test/source_file.py']
+
+
+def test_stream_untracked_files_deadline_passed_raises_timeout_expired(single_untracked_repo):
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(stream_untracked_files(deadline=time.monotonic() - 1))
+
+
+def test_stream_git_status_pathspecs_limit_output(single_unstaged_plus_multi_files_in_new_dir_repo):
+    result = list(stream_git_status(include_untracked=True, pathspecs=[':(top,literal)test']))
+    assert result == [b'? test/__init__.py', b'? test/source_file.py']
+
+
+def test_split_pathspec_shards_single_shard_matches_repository(temp_cwd):
+    Path('src').mkdir()
+    assert split_pathspec_shards(Path.cwd(), 1) == [[':/']]
+
+
+def test_split_pathspec_shards_top_level_entries(temp_cwd):
+    for name in ('c', 'a', 'b', '.git'):
+        Path(name).mkdir()
+    Path('d.py').write_text('')
+    assert split_pathspec_shards(Path.cwd(), 3) == [
+        [':(top,literal)a', ':(top,literal)d.py'],
+        [':(top,literal)b'],
+        [':/', ':(top,exclude,literal)a', ':(top,exclude,literal)d.py', ':(top,exclude,literal)b'],
+    ]
+
+
+def test_split_pathspec_shards_more_shards_than_paths(temp_cwd):
+    assert split_pathspec_shards(Path.cwd(), 8, ['lib/', 'app']) == [
+        [':(top,literal)app'],
+        [':/', ':(top,exclude,literal)app'],
+    ]
+
+
+def test_split_pathspec_shards_empty_paths_single_shard(temp_cwd):
+    assert split_pathspec_shards(Path.cwd(), 4, ['/']) == [[':/']]
+
+
+def test_run_sharded_git_status_each_shard_is_yielded(single_unstaged_plus_multi_files_in_new_dir_repo):
+    shards = split_pathspec_shards(Path.cwd(), 2)
+    result = sorted(run_sharded_git_status(shards, 'all'))
+    assert len(result) == 2
+    assert [b'? test/__init__.py', b'? test/source_file.py'] in result
+
+
+def test_run_sharded_git_status_deadline_passed_raises_timeout_expired(single_untracked_repo):
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(run_sharded_git_status([[':/']], 'all', deadline=time.monotonic() - 1))
+
+
+def test_run_git_diff_paths_between_commits(single_unstaged_modify_repo):
+    subprocess.run(['git', 'mv', 'setup.py', 'renamed.py'], capture_output=True)
+    subprocess.run(['git', 'commit', '-qm', 'rename'], capture_output=True)
+    assert run_git_diff_paths(['HEAD~1', 'HEAD']) == ['renamed.py', 'setup.py']
+
+
+def test_run_git_diff_paths_cached_returns_staged_paths(single_staged_modify_repo):
+    assert run_git_diff_paths(['HEAD'], cached=True) == ['setup.py']
+
+
+def test_run_git_diff_paths_unknown_commit_returns_none(single_unstaged_modify_repo):
+    assert run_git_diff_paths(['0' * 40, 'HEAD']) is None
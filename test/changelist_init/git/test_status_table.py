@@ -0,0 +1,56 @@
+""" Testing Status Table Methods.
+"""
+import pytest
+
+from changelist_init.git.status_reader import GitFileStatus
+from changelist_init.git.status_table import StatusTable
+
+
+RECORDS = [
+    GitFileStatus('??', 'setup.py'),
+    GitFileStatus(' M', 'src/module.py'),
+    GitFileStatus('??', 'café.py'),
+    GitFileStatus('M ', ''),
+]
+
+
+def test_status_table_empty():
+    table = StatusTable()
+    assert len(table) == 0
+    assert list(table) == []
+
+
+def test_status_table_iteration_returns_records_in_order():
+    assert list(StatusTable(RECORDS)) == RECORDS
+
+
+def test_status_table_append_after_iteration():
+    table = StatusTable(RECORDS[:1])
+    assert list(table) == RECORDS[:1]
+    table.append(RECORDS[1])
+    assert list(table) == RECORDS[:2]
+
+
+@pytest.mark.parametrize('index', [0, 1, 2, 3, -1, -4])
+def test_status_table_getitem(index):
+    table = StatusTable(RECORDS)
+    assert table[index] == RECORDS[index]
+    assert table.get_code(index) == RECORDS[index].code
+    assert table.get_path(index) == RECORDS[index].file_path
+
+
+@pytest.mark.parametrize('index', [4, -5])
+def test_status_table_getitem_out_of_range_raises_index_error(index):
+    with pytest.raises(IndexError):
+        StatusTable(RECORDS)[index]
+
+
+def test_status_table_undecodable_path_round_trip():
+    record = GitFileStatus('??', b'caf\xe9.py'.decode(errors='surrogateescape'))
+    assert list(StatusTable([record])) == [record]
+
+
+def test_status_table_codes_are_stored_once():
+    table = StatusTable(RECORDS * 100)
+    assert len(table) == 400
+    assert table._code_names == ['??', ' M', 'M ']
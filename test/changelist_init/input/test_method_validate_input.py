@@ -1,9 +1,10 @@
 """ Testing Input Init Package Method.
 """
+import os
 from pathlib import Path
 
 import pytest
-from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR, WORKSPACE_FILE_PATH_STR
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR, WORKSPACE_FILE_PATH_STR, StorageType
 
 from changelist_init import data
 from changelist_init.input import validate_input
@@ -80,3 +81,187 @@ def test_validate_input_invalid_arg_raises_exit(temp_cwd):
     args = ['--unknown_arg']
     with pytest.raises(SystemExit):
         validate_input(args)
+
+
+def test_validate_input_time_budget_returns_float(temp_cwd):
+    result = validate_input(['--time_budget', '2.5'])
+    assert result.time_budget == 2.5
+
+
+def test_validate_input_no_time_budget_returns_none(temp_cwd):
+    assert validate_input(['-u']).time_budget is None
+
+
+@pytest.mark.parametrize(
+    'time_budget', ['0', '-1', 'abc']
+)
+def test_validate_input_invalid_time_budget_raises_exit(temp_cwd, time_budget):
+    with pytest.raises(SystemExit):
+        validate_input(['--time_budget', time_budget])
+
+
+def test_validate_input_index_reader_flag(temp_cwd):
+    assert validate_input(['--index_reader']).use_index_reader
+    assert not validate_input([]).use_index_reader
+
+
+def test_validate_input_workers_returns_int(temp_cwd):
+    assert validate_input(['--workers', '4']).workers == 4
+    assert validate_input([]).workers is None
+
+
+@pytest.mark.parametrize(
+    'workers', ['0', '-2', 'many']
+)
+def test_validate_input_invalid_workers_raises_exit(temp_cwd, workers):
+    with pytest.raises(SystemExit):
+        validate_input(['--workers', workers])
+
+
+def test_validate_input_concurrent_untracked_flag(temp_cwd):
+    assert validate_input(['-u', '--concurrent_untracked']).concurrent_untracked
+    assert not validate_input(['-u']).concurrent_untracked
+
+
+def test_validate_input_status_shards_and_paths(temp_cwd):
+    result = validate_input(['--status_shards', '3', '--shard_path', 'app', '--shard_path', 'lib'])
+    assert result.status_shards == 3
+    assert result.shard_paths == ['app', 'lib']
+
+
+def test_validate_input_status_shards_default(temp_cwd):
+    result = validate_input(['-u'])
+    assert result.status_shards == 1
+    assert result.shard_paths is None
+
+
+@pytest.mark.parametrize(
+    'args', [['--status_shards', '0'], ['--status_shards', 'x'], ['--shard_path', ' ']]
+)
+def test_validate_input_invalid_status_shards_raises_exit(temp_cwd, args):
+    with pytest.raises(SystemExit):
+        validate_input(args)
+
+
+def test_validate_input_path_not_a_repo_raises_exit(temp_cwd):
+    with pytest.MonkeyPatch.context() as c:
+        c.delenv('GIT_WORK_TREE', raising=False)
+        with pytest.raises(SystemExit):
+            validate_input(['--path', 'src'])
+
+
+def test_validate_input_paths_are_relative_to_repository_root(temp_cwd_repo):
+    Path('src').mkdir()
+    os.chdir('src')
+    assert validate_input(['--path', 'pkg', '--path', '../lib/']).scope == ['src/pkg', 'lib']
+
+
+def test_validate_input_path_repository_root_has_no_scope(temp_cwd_repo):
+    assert validate_input(['--path', 'src', '--path', '.']).scope is None
+    assert validate_input([]).scope is None
+
+
+@pytest.mark.parametrize(
+    'path', ['..', ' ']
+)
+def test_validate_input_invalid_path_raises_exit(temp_cwd_repo, path):
+    with pytest.raises(SystemExit):
+        validate_input(['--path', path])
+
+
+def test_validate_input_serve_flag(temp_cwd):
+    assert validate_input(['--serve']).serve
+    assert not validate_input([]).serve
+
+
+def test_validate_input_storage_loader_is_used(temp_cwd):
+    calls = []
+    def loader(storage_type, file_path):
+        calls.append((storage_type, file_path))
+    assert validate_input(['--changelists_file', 'data.xml'], loader).storage is None
+    assert calls == [(StorageType.CHANGELISTS, Path('data.xml'))]
+
+
+def test_validate_input_incremental_implies_status_cache(temp_cwd):
+    result = validate_input(['--incremental'])
+    assert result.incremental
+    assert result.use_status_cache
+    assert validate_input(['--incremental', '--status_cache']).use_status_cache
+    assert not validate_input([]).incremental
+
+
+def test_validate_input_hook_name_and_arguments(temp_cwd):
+    result = validate_input(['-u', '--hook', 'post-checkout', 'a1', 'b2', '1'])
+    assert result.hook == ['post-checkout', 'a1', 'b2', '1']
+    assert validate_input([]).hook is None
+
+
+def test_validate_input_write_index(temp_cwd):
+    assert validate_input(['--write_index']).write_index
+    assert not validate_input([]).write_index
+
+
+def test_validate_input_fsmonitor(temp_cwd):
+    assert validate_input(['--fsmonitor']).fsmonitor
+    assert not validate_input([]).fsmonitor
+
+
+def test_validate_input_autotune(temp_cwd):
+    assert validate_input(['--autotune', '-u']).autotune
+    assert not validate_input([]).autotune
+
+
+def test_validate_input_collapse_untracked(temp_cwd):
+    result = validate_input(['-u', '--collapse_untracked', '--expand_untracked', '10'])
+    assert result.collapse_untracked
+    assert result.expand_untracked == 10
+
+
+def test_validate_input_negative_expand_untracked_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='The Expand Untracked entry limit must not be negative.'):
+        validate_input(['--expand_untracked', '-1'])
+
+
+def test_validate_input_max_files(temp_cwd):
+    assert validate_input(['--max_files', '100']).max_files == 100
+    assert validate_input([]).max_files is None
+
+
+def test_validate_input_zero_max_files_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='The Max Files limit must be at least 1.'):
+        validate_input(['--max_files', '0'])
+
+
+def test_validate_input_path_errors(temp_cwd):
+    assert validate_input(['--path_errors', 'replace']).path_errors == 'replace'
+    assert validate_input([]).path_errors == 'backslashreplace'
+
+
+def test_validate_input_unknown_path_errors_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='Unable to Parse Arguments.'):
+        validate_input(['--path_errors', 'surrogateescape'])
+
+
+def test_validate_input_parse_processes(temp_cwd):
+    assert validate_input(['--parse_processes', '4']).parse_processes == 4
+    assert validate_input([]).parse_processes == 1
+
+
+def test_validate_input_zero_parse_processes_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='The number of Parse Processes must be at least 1.'):
+        validate_input(['--parse_processes', '0'])
+
+
+def test_validate_input_summary(temp_cwd):
+    assert validate_input(['--summary']).summary
+    assert not validate_input([]).summary
+
+
+def test_validate_input_staged_changelist(temp_cwd):
+    assert validate_input(['--staged_changelist', 'Staged']).staged_changelist == 'Staged'
+    assert validate_input([]).staged_changelist is None
+
+
+def test_validate_input_empty_staged_changelist_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='The Staged Changelist name was invalid.'):
+        validate_input(['--staged_changelist', ' '])
@@ -0,0 +1,173 @@
+""" Testing Git Hook Integration.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR
+
+from changelist_init.__main__ import main
+from changelist_init.data import fc_to_cl_map
+from changelist_init.data.changelist_index import ChangelistIndex
+from changelist_init.hooks import get_hook_paths, install_hooks, get_hooks_dir
+
+
+CHANGELIST_DATA_PATH = Path(CHANGELISTS_FILE_PATH_STR)
+
+
+def _commit(*paths: str):
+    subprocess.run(['git', 'add', *paths], capture_output=True)
+    subprocess.run(['git', 'commit', '-qm', 'commit'], capture_output=True)
+
+
+def _rev_parse(revision: str) -> str:
+    return subprocess.run(['git', 'rev-parse', revision], capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def merge_scopes():
+    """ Records the scope of each merge into the Changelists.
+    """
+    scopes = []
+    original = fc_to_cl_map.reconcile_file_changes
+    original_indexed = ChangelistIndex.merge_file_changes
+    def merge_indexed(index, cls, files, scope=None, remove=True, exact_scope=False):
+        if (deltas := original_indexed(index, cls, files, scope, remove, exact_scope)) is not None:
+            scopes.append(scope)
+        return deltas
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(fc_to_cl_map, 'reconcile_file_changes', lambda changelists, default_cl, file_changes, scope=None, remove=True, exact_scope=False:
+            scopes.append(scope) or original(changelists, default_cl, file_changes, scope, remove, exact_scope))
+        c.setattr(ChangelistIndex, 'merge_file_changes', merge_indexed)
+        yield scopes
+
+
+def test_get_hook_paths_post_commit_returns_committed_paths(single_staged_modify_repo):
+    _commit()
+    assert get_hook_paths('post-commit', []) == ['setup.py']
+
+
+def test_get_hook_paths_post_commit_root_commit_returns_none(temp_cwd_repo):
+    subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m', 'root'], capture_output=True)
+    assert get_hook_paths('post-commit', []) is None
+
+
+def test_get_hook_paths_post_checkout_returns_differing_paths(single_unstaged_modify_repo):
+    Path('setup.py').write_text('Hellow')
+    initial_head = _rev_parse('HEAD')
+    Path('feature.py').write_text('feature')
+    _commit('feature.py')
+    assert get_hook_paths('post-checkout', [initial_head, _rev_parse('HEAD'), '1']) == ['feature.py']
+
+
+@pytest.mark.parametrize(
+    'hook_args', [
+        ['0' * 40, 'HEAD', '1'],
+        ['HEAD', 'HEAD', '0'],
+        ['HEAD'],
+    ]
+)
+def test_get_hook_paths_post_checkout_without_paths_returns_none(single_unstaged_modify_repo, hook_args):
+    assert get_hook_paths('post-checkout', hook_args) is None
+
+
+def test_get_hook_paths_post_merge_returns_merged_paths(single_unstaged_modify_repo):
+    Path('setup.py').write_text('Hellow')
+    subprocess.run(['git', 'checkout', '-qb', 'feature'], capture_output=True)
+    Path('feature.py').write_text('feature')
+    _commit('feature.py')
+    subprocess.run(['git', 'checkout', '-q', '-'], capture_output=True)
+    subprocess.run(['git', 'merge', '-q', 'feature'], capture_output=True)
+    assert get_hook_paths('post-merge', ['0']) == ['feature.py']
+
+
+def test_get_hook_paths_post_merge_squash_returns_staged_paths(single_staged_modify_repo):
+    assert get_hook_paths('post-merge', ['1']) == ['setup.py']
+
+
+@pytest.mark.parametrize(
+    'hook_name, hook_args', [
+        ('post-merge', []),
+        ('pre-commit', []),
+    ]
+)
+def test_get_hook_paths_unsupported_returns_none(temp_cwd_repo, hook_name, hook_args):
+    assert get_hook_paths(hook_name, hook_args) is None
+
+
+def test_install_hooks_writes_scripts_with_arguments(temp_cwd_repo):
+    installed = install_hooks(['-u'])
+    assert [p.name for p in installed] == ['post-commit', 'post-checkout', 'post-merge']
+    script = installed[0].read_text()
+    assert script.startswith('#!/bin/sh\n')
+    assert script.endswith(' -m changelist_init -u --hook post-commit "$@"\n')
+    if os.name != 'nt':
+        assert os.access(installed[0], os.X_OK)
+
+
+def test_install_hooks_existing_hook_is_not_replaced(temp_cwd_repo, capsys):
+    (hooks_dir := get_hooks_dir()).mkdir(exist_ok=True)
+    (hooks_dir / 'post-merge').write_text('#!/bin/sh\necho custom\n')
+    assert [p.name for p in install_hooks([])] == ['post-commit', 'post-checkout']
+    assert (hooks_dir / 'post-merge').read_text() == '#!/bin/sh\necho custom\n'
+    assert 'Skipped the existing hook:' in capsys.readouterr().out
+
+
+def test_install_hooks_installed_hook_is_replaced(temp_cwd_repo):
+    install_hooks(['-u'])
+    installed = install_hooks([])
+    assert len(installed) == 3
+    assert ' -m changelist_init --hook post-commit "$@"\n' in installed[0].read_text()
+
+
+def test_install_hooks_not_repo_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='Installing hooks requires a Git Repository.'):
+        install_hooks([])
+
+
+def test_main_install_hooks_passes_other_arguments(temp_cwd_repo):
+    sys.argv = ['changelist-init', '--install_hooks', '-u']
+    main()
+    assert (get_hooks_dir() / 'post-checkout').read_text().endswith(' -u --hook post-checkout "$@"\n')
+    assert not CHANGELIST_DATA_PATH.exists()
+
+
+def test_main_hook_post_commit_updates_committed_paths(single_unstaged_plus_multi_files_in_new_dir_repo, merge_scopes):
+    sys.argv = ['changelist-init', '-u']
+    main()
+    _commit('test/__init__.py')
+    sys.argv = ['changelist-init', '-u', '--hook', 'post-commit']
+    main()
+    assert merge_scopes == [['test/__init__.py']]
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert '/test/__init__.py' not in file_contents
+    assert '<change afterPath="/test/source_file.py" afterDir="false" />' in file_contents
+
+
+def test_main_hook_paths_outside_input_scope_do_nothing(single_staged_modify_repo, merge_scopes):
+    sys.argv = ['changelist-init']
+    main()
+    _commit()
+    sys.argv = ['changelist-init', '--path', 'src', '--hook', 'post-commit']
+    Path('src').mkdir()
+    main()
+    assert merge_scopes == []
+    assert '/setup.py' in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_main_hook_file_checkout_updates_all_paths(single_unstaged_modify_repo, merge_scopes):
+    sys.argv = ['changelist-init']
+    main()
+    subprocess.run(['git', 'checkout', 'setup.py'], capture_output=True)
+    sys.argv = ['changelist-init', '--hook', 'post-checkout', 'HEAD', 'HEAD', '0']
+    main()
+    assert merge_scopes == [None]
+    assert '/setup.py' not in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_main_invalid_hook_name_raises_exit(temp_cwd_repo):
+    sys.argv = ['changelist-init', '--hook', 'pre-commit']
+    with pytest.raises(SystemExit, match='The Hook name was invalid.'):
+        main()
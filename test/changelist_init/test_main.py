@@ -1,11 +1,18 @@
 """ Testing Main Module
 """
+import os
+import subprocess
 import sys
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
+from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
 from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR, WORKSPACE_FILE_PATH_STR
 
+from changelist_init import server
+from changelist_init.data import fc_to_cl_map
+from changelist_init.data.changelist_index import ChangelistIndex
 from changelist_init.__main__ import main
 from test.changelist_init.conftest import write_workspace_file, MINIMUM_WORKSPACE_XML_FILE_CONTENTS, \
     DEFAULT_CL_WORKSPACE_XML_FILE_CONTENTS
@@ -144,3 +151,235 @@ def test_main_single_staged_delete_repo_(
     file_contents = CHANGELIST_DATA_PATH.read_text()
     assert '<list default="true" id="4a74640f-90b3-86a1-ab28-af29299c84fd" name="Initial Changelist" comment="">' in file_contents
     assert '<change beforePath="/setup.py" beforeDir="false" />' in file_contents
+
+
+def test_main_second_run_unchanged_status_does_not_write_file(single_staged_modify_repo):
+    sys.argv = ['changelist-init']
+    main()
+    initial_mtime = CHANGELIST_DATA_PATH.stat().st_mtime_ns
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(ChangelistDataStorage, 'write_to_storage', _fail_write)
+        main()
+    assert CHANGELIST_DATA_PATH.stat().st_mtime_ns == initial_mtime
+
+
+def test_main_second_run_changed_status_writes_file(single_staged_modify_repo):
+    sys.argv = ['changelist-init']
+    main()
+    Path('setup.py').unlink()
+    main()
+    assert '<change beforePath="/setup.py" beforeDir="false" />' in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_main_second_run_storage_file_edited_merges_again(single_staged_modify_repo, default_changelists_xml):
+    sys.argv = ['changelist-init']
+    main()
+    CHANGELIST_DATA_PATH.write_text(default_changelists_xml)
+    main()
+    assert 'afterPath="/setup.py"' in CHANGELIST_DATA_PATH.read_text()
+
+
+def _fail_write(self):
+    raise AssertionError("The Storage file was written.")
+
+
+def test_main_path_arg_leaves_entries_outside_scope(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u']
+    main()
+    Path('setup.py').unlink()
+    Path('test/__init__.py').unlink()
+    sys.argv = ['changelist-init', '-u', '--path', 'test']
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    # The setup.py modification is outside the scope, and was not updated to a deletion
+    assert '<change beforePath="/setup.py" beforeDir="false" afterPath="/setup.py" afterDir="false" />' in file_contents
+    assert '/test/__init__.py' not in file_contents
+    assert '<change afterPath="/test/source_file.py" afterDir="false" />' in file_contents
+
+
+def test_main_serve_arg_runs_server(temp_cwd_repo):
+    sys.argv = ['changelist-init', '--serve']
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(server, 'serve_cl_init', serve := Mock())
+        main()
+    serve.assert_called_once_with()
+    assert not CHANGELIST_DATA_PATH.exists()
+
+
+def test_main_autotune_arg_prints_profile(single_unstaged_plus_multi_files_in_new_dir_repo, capsys):
+    sys.argv = ['changelist-init', '--autotune', '-u']
+    main()
+    assert 'Status Profile: ' in capsys.readouterr().out
+    assert not CHANGELIST_DATA_PATH.exists()
+    assert Path('.git/changelist-init/status_profile.json').exists()
+
+
+def test_main_autotune_not_repo_raises_exit(temp_cwd):
+    sys.argv = ['changelist-init', '--autotune']
+    with pytest.raises(SystemExit, match='Autotune requires a Git Repository.'):
+        main()
+
+
+@pytest.fixture
+def merge_scopes():
+    """ Records the scope of each merge into the Changelists.
+    """
+    scopes = []
+    original = fc_to_cl_map.reconcile_file_changes
+    original_indexed = ChangelistIndex.merge_file_changes
+    def merge_indexed(index, cls, files, scope=None, remove=True, exact_scope=False):
+        if (deltas := original_indexed(index, cls, files, scope, remove, exact_scope)) is not None:
+            scopes.append(scope)
+        return deltas
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(fc_to_cl_map, 'reconcile_file_changes', lambda changelists, default_cl, file_changes, scope=None, remove=True, exact_scope=False:
+            scopes.append(scope) or original(changelists, default_cl, file_changes, scope, remove, exact_scope))
+        c.setattr(ChangelistIndex, 'merge_file_changes', merge_indexed)
+        yield scopes
+
+
+def test_main_incremental_patches_changed_paths(single_unstaged_plus_multi_files_in_new_dir_repo, merge_scopes):
+    sys.argv = ['changelist-init', '-u', '--incremental']
+    main()
+    Path('test/__init__.py').unlink()
+    main()
+    # The first run creates the Default Changelist, without mapping existing files
+    # The untracked Changelists data file was written by the first run, after its status was collected
+    assert merge_scopes == [['.changelists/data.xml', 'test/__init__.py']]
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert '/test/__init__.py' not in file_contents
+    assert '<change afterPath="/test/source_file.py" afterDir="false" />' in file_contents
+    assert '<change beforePath="/setup.py" beforeDir="false" afterPath="/setup.py" afterDir="false" />' in file_contents
+
+
+def test_main_incremental_second_run_patches_changelist_index(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u', '--incremental']
+    main()
+    Path('test/__init__.py').unlink()
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(fc_to_cl_map, 'reconcile_file_changes', Mock(side_effect=AssertionError('every file was mapped')))
+        main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert '/test/__init__.py' not in file_contents
+    assert '<change afterPath="/test/source_file.py" afterDir="false" />' in file_contents
+
+
+def test_main_incremental_unchanged_changelists_do_not_record_changelist_index(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u', '--incremental']
+    main()
+    main()  # The data file created by the first run is merged
+    index_file = Path('.git/changelist-init/changelist_indexes.json')
+    os.utime(index_file, ns=(1_000_000_000, 1_000_000_000))
+    Path('.git/changelist-init/status_fingerprints.json').unlink()
+    main()
+    assert index_file.stat().st_mtime_ns == 1_000_000_000
+
+
+def test_main_full_update_does_not_record_changelist_index(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u']
+    main()
+    assert not Path('.git/changelist-init/changelist_indexes.json').exists()
+
+
+def test_main_storage_file_edited_ignores_changelist_index(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u', '--incremental']
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    moved_change = '<change afterPath="/test/source_file.py" afterDir="false" />'
+    CHANGELIST_DATA_PATH.write_text(file_contents.replace(moved_change, '').replace(
+        '</changelists>', f'<list id="2" name="Other" comment="">{moved_change}</list></changelists>',
+    ))
+    Path('test/__init__.py').unlink()
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert file_contents.count('/test/source_file.py') == 1
+    assert file_contents.index('name="Other"') < file_contents.index('/test/source_file.py')
+
+
+def test_main_unchanged_changelists_are_not_written(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init']
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    os.utime(CHANGELIST_DATA_PATH, ns=(1_000_000_000, 1_000_000_000))
+    main()
+    assert CHANGELIST_DATA_PATH.stat().st_mtime_ns == 1_000_000_000
+    assert CHANGELIST_DATA_PATH.read_text() == file_contents
+
+
+def test_main_incremental_commit_removes_committed_file(single_staged_modify_repo, merge_scopes):
+    sys.argv = ['changelist-init', '--incremental']
+    main()
+    assert '/setup.py' in CHANGELIST_DATA_PATH.read_text()
+    subprocess.run(['git', 'commit', '-qm', 'commit'], capture_output=True)
+    main()
+    assert '/setup.py' not in CHANGELIST_DATA_PATH.read_text()
+    assert merge_scopes == [['setup.py']]
+
+
+def test_main_incremental_storage_file_edited_merges_all_paths(
+    single_staged_modify_repo, default_changelists_xml, merge_scopes,
+):
+    sys.argv = ['changelist-init', '--incremental']
+    main()
+    CHANGELIST_DATA_PATH.write_text(default_changelists_xml)
+    Path('setup.py').unlink()
+    main()
+    assert merge_scopes == [None]
+    assert '<change beforePath="/setup.py" beforeDir="false" />' in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_main_max_files_notes_truncation_until_full_update(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u', '--max_files', '1']
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert 'comment="Changelist Init: Stopped at 1 files. Not listed: test/ 1+."' in file_contents
+    assert file_contents.count('<change ') == 1
+    sys.argv = ['changelist-init', '-u']
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert 'comment=""' in file_contents
+    assert file_contents.count('<change ') == 4
+
+
+def test_main_max_files_keeps_files_beyond_limit(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u']
+    main()
+    recorded_state = (state_file := Path('.git/changelist-init/status_fingerprints.json')).read_bytes()
+    sys.argv = ['changelist-init', '-u', '--max_files', '1']
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert 'comment="Changelist Init: Stopped at 1 files.' in file_contents
+    assert file_contents.count('<change ') == 3
+    assert state_file.read_bytes() == recorded_state
+
+
+def test_main_summary_prints_status_counts(single_unstaged_plus_multi_files_in_new_dir_repo, capsys):
+    sys.argv = ['changelist-init', '-u', '--summary']
+    main()
+    assert capsys.readouterr().out == 'Git Status: 2 created, 1 updated, 0 deleted, 0 unrecognized\n'
+
+
+def test_main_staged_changelist_follows_git_index(single_unstaged_plus_multi_files_in_new_dir_repo):
+    sys.argv = ['changelist-init', '-u', '--staged_changelist', 'Staged']
+    main()
+    assert 'name="Staged"' not in CHANGELIST_DATA_PATH.read_text()
+    subprocess.run(['git', 'add', 'setup.py'], capture_output=True)
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    staged_list = file_contents[file_contents.index('name="Staged"'):]
+    assert '<change beforePath="/setup.py"' in staged_list
+    assert file_contents.count('/setup.py"') == 2
+    subprocess.run(['git', 'reset', '-q', 'setup.py'], capture_output=True)
+    main()
+    file_contents = CHANGELIST_DATA_PATH.read_text()
+    assert '<change beforePath="/setup.py"' not in file_contents[file_contents.index('name="Staged"'):]
+
+
+@pytest.mark.skipif(sys.platform != 'linux', reason='Requires file names that are not UTF-8.')
+def test_main_undecodable_file_name_is_escaped_and_parsed_again(temp_cwd_repo):
+    Path(b'caf\xe9.py'.decode(errors='surrogateescape')).write_text('x = 1')
+    sys.argv = ['changelist-init', '-u']
+    main()
+    assert 'afterPath="/caf\\xe9.py"' in CHANGELIST_DATA_PATH.read_text()
+    main()
+    assert CHANGELIST_DATA_PATH.read_text().count('afterPath="/caf\\xe9.py"') == 1
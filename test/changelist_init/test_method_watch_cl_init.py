@@ -0,0 +1,141 @@
+""" Testing CL-Init Package Method: watch_cl_init
+"""
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from changelist_data.storage.changelist_data_storage import ChangelistDataStorage
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR
+
+import changelist_init
+from changelist_init import watch_cl_init, process_cl_init, _get_watch_scope
+from changelist_init.input import validate_input
+from changelist_init.watch.watch_changes import WatchChanges
+
+
+CHANGELIST_DATA_PATH = Path(CHANGELISTS_FILE_PATH_STR)
+
+OTHER_CHANGELIST_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<changelists>
+  <list default="true" id="12345678" name="Initial Changelist" comment="" />
+  <list id="87654321" name="Other" comment="">
+    <change afterPath="/other.py" afterDir="false" />
+  </list>
+</changelists>"""
+
+
+@pytest.fixture
+def watching():
+    """ Starts watch_cl_init in a thread, and stops it after the test.
+    """
+    stop_event = threading.Event()
+    threads = []
+
+    def start(arguments: list[str]):
+        input_data = validate_input(arguments)
+        process_cl_init(input_data)
+        thread = threading.Thread(target=watch_cl_init, args=(input_data, stop_event), daemon=True)
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.2)  # Allow the watches to be created
+
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(changelist_init, '_STOP_CHECK_INTERVAL', 0.05)
+        yield start
+        stop_event.set()
+        for thread in threads:
+            thread.join(5)
+
+
+def wait_until(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_watch_cl_init_not_a_repo_raises_exit(temp_cwd):
+    Path('.changelists').mkdir()
+    input_data = validate_input([])
+    with pytest.raises(SystemExit):
+        watch_cl_init(input_data, threading.Event())
+
+
+def test_watch_cl_init_modified_file_is_added(single_unstaged_plus_multi_files_in_new_dir_repo, watching):
+    subprocess.run(['git', 'add', 'test'])
+    subprocess.run(['git', 'commit', '-qm', 'test'], capture_output=True)
+    watching([])
+    assert 'test/source_file.py' not in CHANGELIST_DATA_PATH.read_text()
+    Path('test/source_file.py').write_text('modified')
+    assert wait_until(lambda: '/test/source_file.py' in CHANGELIST_DATA_PATH.read_text())
+
+
+def test_watch_cl_init_untracked_directory_is_added(single_unstaged_modify_repo, watching):
+    watching(['-u'])
+    Path('src').mkdir()
+    Path('src/module.py').write_text('new')
+    assert wait_until(lambda: '<change afterPath="/src/module.py" afterDir="false" />' in CHANGELIST_DATA_PATH.read_text())
+
+
+def test_watch_cl_init_commit_refreshes_all_paths(single_staged_modify_repo, watching):
+    watching([])
+    assert '/setup.py' in CHANGELIST_DATA_PATH.read_text()
+    subprocess.run(['git', 'commit', '-qm', 'commit'], capture_output=True)
+    assert wait_until(lambda: '/setup.py' not in CHANGELIST_DATA_PATH.read_text())
+
+
+def test_watch_cl_init_external_storage_write_is_read_again(single_unstaged_modify_repo, watching):
+    watching([])
+    CHANGELIST_DATA_PATH.write_text(OTHER_CHANGELIST_XML)
+    time.sleep(0.5)
+    Path('setup.py').write_text('modified again')
+    assert wait_until(lambda: '/setup.py' in CHANGELIST_DATA_PATH.read_text())
+    assert '<change afterPath="/other.py" afterDir="false" />' in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_watch_cl_init_unchanged_status_does_not_write(single_unstaged_modify_repo, watching):
+    writes = []
+    original_write = ChangelistDataStorage.write_to_storage
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(ChangelistDataStorage, 'write_to_storage', lambda self: writes.append(1) or original_write(self))
+        watching([])
+        writes.clear()
+        Path('setup.py').write_text('modified twice')
+        Path('ignored.py').write_text('untracked')
+        time.sleep(1.0)
+    assert writes == []
+
+
+def test_watch_cl_init_outside_scope_is_ignored(single_unstaged_plus_multi_files_in_new_dir_repo, watching):
+    watching(['-u', '--path', 'test'])
+    Path('outside.py').write_text('untracked')
+    Path('test/inside.py').write_text('untracked')
+    assert wait_until(lambda: '/test/inside.py' in CHANGELIST_DATA_PATH.read_text())
+    assert '/outside.py' not in CHANGELIST_DATA_PATH.read_text()
+
+
+@pytest.mark.parametrize(
+    'changes, input_scope, expected', [
+        (WatchChanges({'b.py', 'a/c.py'}, False), None, ['a/c.py', 'b.py']),
+        (WatchChanges({'b.py', 'a/c.py'}, True), None, None),
+        (WatchChanges({'b.py', 'a/c.py'}, True), ['a'], ['a']),
+        (WatchChanges({'b.py', 'a/c.py'}, False), ['a'], ['a/c.py']),
+        (WatchChanges({'.changelists/data.xml'}, False), None, []),
+        (WatchChanges({f'{i}.py' for i in range(1001)}, False), ['src'], ['src']),
+    ]
+)
+def test_get_watch_scope(changes, input_scope, expected):
+    assert _get_watch_scope(changes, '.changelists/data.xml', input_scope) == expected
+
+
+def test_process_cl_init_watch_interrupted_returns(single_unstaged_modify_repo):
+    def interrupt(input_data):
+        raise KeyboardInterrupt
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(changelist_init, 'watch_cl_init', interrupt)
+        process_cl_init(validate_input(['--watch']))
+    assert '/setup.py' in CHANGELIST_DATA_PATH.read_text()
@@ -0,0 +1,239 @@
+""" Testing Server Module.
+"""
+import json
+import socket
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from changelist_data import load_storage
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR, StorageType
+
+from changelist_init import server
+from changelist_init.server import serve_cl_init, run_request, StorageCache
+from changelist_init_client import send_request, get_socket_path
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Requires Unix Domain Sockets')
+
+CHANGELIST_DATA_PATH = Path(CHANGELISTS_FILE_PATH_STR)
+
+OTHER_CHANGELIST_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<changelists>
+  <list default="true" id="12345678" name="Initial Changelist" comment="" />
+  <list id="87654321" name="Other" comment="">
+    <change afterPath="/other.py" afterDir="false" />
+  </list>
+</changelists>"""
+
+
+@pytest.fixture
+def serving(temp_cwd_repo):
+    """ Starts serve_cl_init in a thread, and stops it after the test.
+    """
+    stop_event = threading.Event()
+    ready_event = threading.Event()
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(server, '_ACCEPT_TIMEOUT', 0.05)
+        thread = threading.Thread(target=serve_cl_init, args=(stop_event, ready_event), daemon=True)
+        thread.start()
+        assert ready_event.wait(5)
+        yield temp_cwd_repo
+        stop_event.set()
+        thread.join(5)
+
+
+@pytest.fixture
+def counting_loader():
+    """ Counts the calls to load_storage made by the Storage Cache.
+    """
+    loader = Mock(wraps=load_storage)
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(server, 'load_storage', loader)
+        yield loader
+
+
+def test_send_request_no_arguments_creates_changelists_file(serving):
+    response = send_request([])
+    assert response == {'output': '', 'error': None, 'status': 0}
+    assert CHANGELIST_DATA_PATH.exists()
+
+
+def test_send_request_include_untracked_adds_file(serving):
+    Path('module.py').write_text('x = 1')
+    response = send_request(['-u'])
+    assert response['status'] == 0
+    assert '/module.py' in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_send_request_subdirectory_cwd_runs_in_subdirectory(serving):
+    Path('src').mkdir()
+    Path('src/module.py').write_text('x = 1')
+    Path('setup.py').write_text('')
+    response = send_request(['-u', '--path', '.'], cwd=str(Path('src').absolute()))
+    assert response['status'] == 0
+    # The default storage path is relative to the working directory of the client
+    file_contents = (Path('src') / CHANGELIST_DATA_PATH).read_text()
+    assert '/src/module.py' in file_contents
+    assert '/setup.py' not in file_contents
+
+
+def test_send_request_repeated_reuses_storage(serving, counting_loader):
+    send_request([])
+    Path('module.py').write_text('x = 1')
+    send_request(['-u'])
+    send_request(['-u'])
+    assert counting_loader.call_count == 1
+    assert '/module.py' in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_send_request_external_write_reloads_storage(serving, counting_loader):
+    send_request([])
+    CHANGELIST_DATA_PATH.write_text(OTHER_CHANGELIST_XML)
+    response = send_request([])
+    assert response['status'] == 0
+    assert counting_loader.call_count == 2
+    assert 'name="Other"' in CHANGELIST_DATA_PATH.read_text()
+
+
+def test_send_request_invalid_arguments_returns_error(serving):
+    response = send_request(['--unknown'])
+    assert response['error'] == 'Unable to Parse Arguments.'
+    assert response['status'] == 1
+
+
+def test_send_request_watch_returns_error(serving):
+    response = send_request(['--watch'])
+    assert response['error'] == 'Watch, Serve and Install Hooks modes are not available through the server.'
+    assert not CHANGELIST_DATA_PATH.exists()
+
+
+def test_serve_cwd_outside_repository_returns_error(serving):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(get_socket_path(serving.name))
+        client.sendall(json.dumps({'argv': [], 'cwd': str(Path.cwd().parent)}).encode() + b'\n')
+        response = json.loads(client.makefile('rb').readline())
+    assert response['error'].startswith("The working directory is outside the repository:")
+    assert not CHANGELIST_DATA_PATH.exists()
+
+
+def test_send_request_autotune_returns_profile(serving):
+    response = send_request(['--autotune'])
+    assert 'Status Profile: ' in response['output']
+    assert not CHANGELIST_DATA_PATH.exists()
+
+
+def test_send_request_time_budget_output_is_returned(serving):
+    Path('module.py').write_text('x = 1')
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(server, 'process_cl_init', lambda _: print('Time Budget Exceeded'))
+        response = send_request(['-u'])
+    assert response['output'] == 'Time Budget Exceeded\n'
+
+
+def test_serve_invalid_request_returns_error(serving):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(get_socket_path(serving.name))
+        client.sendall(json.dumps({'argv': [1], 'cwd': serving.name}).encode() + b'\n')
+        response = json.loads(client.makefile('rb').readline())
+    assert response['error'] == 'The request was invalid.'
+
+
+def test_serve_server_already_listening_raises_exit(serving):
+    with pytest.raises(SystemExit, match='A server is already listening on:'):
+        serve_cl_init()
+
+
+def test_serve_stopped_removes_socket_file(temp_cwd_repo):
+    stop_event = threading.Event()
+    stop_event.set()
+    serve_cl_init(stop_event)
+    assert Path('.changelists').exists()
+    assert not Path(get_socket_path(temp_cwd_repo.name)).exists()
+
+
+def test_serve_stale_socket_file_is_replaced(temp_cwd_repo):
+    socket_path = get_socket_path(temp_cwd_repo.name)
+    Path(socket_path).parent.mkdir()
+    Path(socket_path).write_text('')
+    stop_event = threading.Event()
+    stop_event.set()
+    serve_cl_init(stop_event)
+    assert not Path(socket_path).exists()
+
+
+def test_serve_not_repo_raises_exit(temp_cwd):
+    with pytest.raises(SystemExit, match='Serve mode requires a Git Repository.'):
+        serve_cl_init()
+
+
+def test_run_request_os_error_returns_server_error(temp_cwd_repo):
+    storage_cache = StorageCache()
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(server, 'process_cl_init', Mock(side_effect=OSError('failure')))
+        response = run_request([], temp_cwd_repo.name, storage_cache)
+    assert response['error'] == "Server Error: OSError('failure')"
+    assert response['status'] == 1
+
+
+def test_run_request_programming_error_is_raised(temp_cwd_repo):
+    initial_cwd = Path.cwd()
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(server, 'process_cl_init', Mock(side_effect=TypeError('failure')))
+        with pytest.raises(TypeError):
+            run_request([], temp_cwd_repo.name, StorageCache())
+    assert Path.cwd() == initial_cwd
+
+
+def test_run_request_cwd_outside_root_returns_error(temp_cwd_repo):
+    process = Mock()
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(server, 'process_cl_init', process)
+        response = run_request([], str(Path.cwd().parent), StorageCache(), Path.cwd())
+    assert response['error'].startswith("The working directory is outside the repository:")
+    assert response['status'] == 1
+    process.assert_not_called()
+
+
+def test_run_request_cwd_symlink_outside_root_returns_error(temp_cwd_repo):
+    Path('link').symlink_to(Path.cwd().parent)
+    response = run_request([], str(Path('link').absolute()), StorageCache(), Path.cwd())
+    assert response['status'] == 1
+
+
+def test_run_request_restores_cwd(temp_cwd_repo):
+    initial_cwd = Path.cwd()
+    Path('src').mkdir()
+    run_request([], str(Path('src').absolute()), StorageCache())
+    assert Path.cwd() == initial_cwd
+
+
+def test_storage_cache_unchanged_file_returns_same_object(temp_cwd_repo):
+    storage_cache = StorageCache()
+    CHANGELIST_DATA_PATH.parent.mkdir()
+    CHANGELIST_DATA_PATH.write_text(OTHER_CHANGELIST_XML)
+    storage = storage_cache.load_storage(StorageType.CHANGELISTS, None)
+    assert storage_cache.load_storage(StorageType.CHANGELISTS, None) is storage
+
+
+def test_storage_cache_record_write_keeps_object(temp_cwd_repo):
+    storage_cache = StorageCache()
+    storage = storage_cache.load_storage(StorageType.CHANGELISTS, None)
+    storage.write_to_storage()
+    storage_cache.record_write(storage)
+    assert storage_cache.load_storage(StorageType.CHANGELISTS, None) is storage
+
+
+def test_storage_cache_clear_loads_new_object(temp_cwd_repo):
+    storage_cache = StorageCache()
+    storage = storage_cache.load_storage(StorageType.CHANGELISTS, None)
+    storage_cache.clear()
+    assert storage_cache.load_storage(StorageType.CHANGELISTS, None) is not storage
+
+
+def test_storage_cache_missing_workspace_returns_changelists_storage(temp_cwd_repo):
+    storage_cache = StorageCache()
+    storage = storage_cache.load_storage(StorageType.WORKSPACE, None)
+    assert storage.storage_type == StorageType.CHANGELISTS
+    assert storage_cache.load_storage(StorageType.WORKSPACE, None) is storage
@@ -0,0 +1,112 @@
+""" Testing State File Methods.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from changelist_data import ChangelistDataStorage, StorageType, new_tree
+from changelist_data.storage.storage_type import CHANGELISTS_FILE_PATH_STR
+
+from changelist_init import state_file
+from changelist_init.state_file import storage_key, file_signature, read_state, write_state, update_state
+
+
+def test_storage_key_contains_type_and_absolute_path(temp_cwd):
+    storage = ChangelistDataStorage(new_tree(), StorageType.CHANGELISTS, Path(CHANGELISTS_FILE_PATH_STR))
+    assert storage_key(storage) == f"{StorageType.CHANGELISTS.value}:{Path(CHANGELISTS_FILE_PATH_STR).absolute()}"
+
+
+def test_file_signature_missing_file_returns_none(temp_cwd):
+    assert file_signature(Path('missing.txt')) is None
+
+
+def test_file_signature_changes_with_size(temp_cwd):
+    path = Path('file.txt')
+    path.write_text('a')
+    signature = file_signature(path)
+    path.write_text('ab')
+    assert file_signature(path) != signature
+    assert file_signature(path)[1] == 2
+
+
+def test_read_state_missing_file_returns_none(temp_cwd):
+    assert read_state(Path('state'), 'file.json') is None
+
+
+def test_read_state_malformed_file_returns_none(temp_cwd):
+    Path('state').mkdir()
+    Path('state/file.json').write_text('{')
+    assert read_state(Path('state'), 'file.json') is None
+
+
+def test_write_state_creates_dir_and_leaves_no_temp_file(temp_cwd):
+    assert write_state(Path('state'), 'file.json', {'key': [1, 2]})
+    assert read_state(Path('state'), 'file.json') == {'key': [1, 2]}
+    assert os.listdir('state') == ['file.json']
+
+
+def test_write_state_unserializable_value_raises_type_error(temp_cwd):
+    with pytest.raises(TypeError):
+        write_state(Path('state'), 'file.json', {'key': object()})
+
+
+def test_write_state_state_dir_is_a_file_returns_false(temp_cwd):
+    Path('state').write_text('')
+    assert not write_state(Path('state'), 'file.json', {})
+
+
+def test_update_state_receives_current_value(temp_cwd):
+    write_state(Path('state'), 'file.json', {'a': 1})
+    assert update_state(Path('state'), 'file.json', lambda state: {**state, 'b': 2})
+    assert read_state(Path('state'), 'file.json') == {'a': 1, 'b': 2}
+    assert os.listdir('state') == ['file.json']
+
+
+def test_update_state_none_leaves_file_unchanged(temp_cwd):
+    write_state(Path('state'), 'file.json', {'a': 1})
+    assert not update_state(Path('state'), 'file.json', lambda state: None)
+    assert read_state(Path('state'), 'file.json') == {'a': 1}
+    assert os.listdir('state') == ['file.json']
+
+
+def test_update_state_exception_releases_lock(temp_cwd):
+    def update(state):
+        raise ValueError
+    with pytest.raises(ValueError):
+        update_state(Path('state'), 'file.json', update)
+    assert not Path('state/file.json.lock').exists()
+
+
+def test_update_state_lock_held_returns_false(temp_cwd):
+    Path('state').mkdir()
+    Path('state/file.json.lock').write_text('')
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(state_file, '_LOCK_TIMEOUT', 0.05)
+        assert not update_state(Path('state'), 'file.json', lambda state: {'a': 1})
+    assert read_state(Path('state'), 'file.json') is None
+
+
+def test_update_state_stale_lock_is_removed(temp_cwd):
+    Path('state').mkdir()
+    Path('state/file.json.lock').write_text('')
+    stale_time = time.time() - 2 * state_file._STALE_LOCK_SECONDS
+    os.utime('state/file.json.lock', (stale_time, stale_time))
+    assert update_state(Path('state'), 'file.json', lambda state: {'a': 1})
+    assert read_state(Path('state'), 'file.json') == {'a': 1}
+    assert not Path('state/file.json.lock').exists()
+
+
+def test_update_state_concurrent_updates_keep_every_record(temp_cwd):
+    def add_record(key: str):
+        def update(state):
+            time.sleep(0.001)
+            return {**(state or {}), key: True}
+        assert update_state(Path('state'), 'file.json', update)
+    threads = [threading.Thread(target=add_record, args=(str(n),)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert read_state(Path('state'), 'file.json') == {str(n): True for n in range(8)}
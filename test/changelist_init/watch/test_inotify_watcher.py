@@ -0,0 +1,92 @@
+""" Testing Inotify Watcher.
+"""
+import ctypes
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelist_init.git import git_dir
+from changelist_init.watch.inotify_watcher import InotifyWatcher, is_inotify_available
+
+
+pytestmark = pytest.mark.skipif(not is_inotify_available(), reason='Requires Linux inotify.')
+
+
+def _create_watcher() -> InotifyWatcher:
+    return InotifyWatcher(Path.cwd(), git_dir.find_git_dir())
+
+
+def _read_all(watcher: InotifyWatcher):
+    paths, full_refresh = set(), False
+    while (changes := watcher.read_changes(0.2)) is not None:
+        paths |= changes.paths
+        full_refresh = full_refresh or changes.full_refresh
+    return paths, full_refresh
+
+
+def test_read_changes_no_events_returns_none(temp_cwd_repo):
+    with _create_watcher() as watcher:
+        assert watcher.read_changes(0) is None
+
+
+def test_read_changes_file_modified_in_subdirectory(single_unstaged_plus_multi_files_in_new_dir_repo):
+    with _create_watcher() as watcher:
+        Path('test/source_file.py').write_text('modified')
+        Path('setup.py').unlink()
+        assert _read_all(watcher) == ({'test/source_file.py', 'setup.py'}, False)
+
+
+def test_read_changes_new_directory_is_watched(temp_cwd_repo):
+    with _create_watcher() as watcher:
+        Path('src').mkdir()
+        assert _read_all(watcher) == ({'src'}, False)
+        Path('src/module.py').write_text('new')
+        assert _read_all(watcher) == ({'src/module.py'}, False)
+
+
+def test_read_changes_git_index_requires_full_refresh(single_untracked_repo):
+    with _create_watcher() as watcher:
+        subprocess.run(['git', 'add', 'setup.py'])
+        paths, full_refresh = _read_all(watcher)
+        assert full_refresh
+        assert paths == set()
+
+
+def test_read_changes_head_lock_requires_full_refresh(temp_cwd_repo):
+    with _create_watcher() as watcher:
+        Path('.git/HEAD.lock').write_text('ref: refs/heads/main')
+        os.remove('.git/HEAD.lock')
+        assert _read_all(watcher) == (set(), True)
+
+
+def test_read_changes_ignores_other_git_dir_files(temp_cwd_repo):
+    with _create_watcher() as watcher:
+        Path('.git/description').write_text('edited')
+        assert watcher.read_changes(0.2) is None
+
+
+def test_read_changes_removed_directory_stops_watching(temp_cwd_repo):
+    Path('src').mkdir()
+    with _create_watcher() as watcher:
+        os.rmdir('src')
+        assert _read_all(watcher) == ({'src'}, False)
+        assert 'src' not in watcher._dirs.values()
+
+
+def test_close_twice_does_not_raise(temp_cwd_repo):
+    watcher = _create_watcher()
+    watcher.close()
+    watcher.close()
+
+
+def test_init_missing_git_dir_raises_os_error(temp_cwd):
+    with pytest.raises(OSError):
+        InotifyWatcher(Path.cwd(), Path.cwd() / 'missing')
+
+
+def test_is_inotify_available_libc_without_inotify_returns_false():
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(ctypes, 'CDLL', lambda *args, **kwargs: object())
+        assert not is_inotify_available()
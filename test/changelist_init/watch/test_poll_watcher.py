@@ -0,0 +1,60 @@
+""" Testing Poll Watcher.
+"""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from changelist_init.git import git_dir
+from changelist_init.watch.poll_watcher import PollWatcher
+
+
+def _create_watcher() -> PollWatcher:
+    return PollWatcher(Path.cwd(), git_dir.find_git_dir(), interval=0.01)
+
+
+def test_read_changes_no_changes_returns_none(single_unstaged_plus_multi_files_in_new_dir_repo):
+    with _create_watcher() as watcher:
+        assert watcher.read_changes(0.05) is None
+        assert watcher.read_changes(0) is None
+
+
+def test_read_changes_created_modified_and_deleted_files(single_unstaged_plus_multi_files_in_new_dir_repo):
+    with _create_watcher() as watcher:
+        Path('test/source_file.py').write_text('modified content')
+        Path('setup.py').unlink()
+        Path('new.py').write_text('new')
+        changes = watcher.read_changes(None)
+    assert changes.paths == {'test/source_file.py', 'setup.py', 'new.py'}
+    assert not changes.full_refresh
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Requires file mode support.')
+def test_read_changes_mode_change(single_untracked_repo):
+    with _create_watcher() as watcher:
+        os.chmod('setup.py', 0o755)
+        assert watcher.read_changes(1.0).paths == {'setup.py'}
+
+
+def test_read_changes_git_index_requires_full_refresh(single_untracked_repo):
+    with _create_watcher() as watcher:
+        subprocess.run(['git', 'add', 'setup.py'])
+        changes = watcher.read_changes(1.0)
+    assert changes.full_refresh
+    assert changes.paths == set()
+
+
+def test_read_changes_git_directory_files_are_not_paths(temp_cwd_repo):
+    with _create_watcher() as watcher:
+        Path('.git/description').write_text('edited')
+        assert watcher.read_changes(0.05) is None
+
+
+def test_read_changes_commit_requires_full_refresh(single_staged_modify_repo):
+    with _create_watcher() as watcher:
+        subprocess.run(['git', 'commit', '-qm', 'commit'], capture_output=True)
+        # Ignore the Index write, to check that the branch ref alone requires a refresh
+        watcher._git_state[1:] = watcher._take_git_state()[1:]
+        changes = watcher.read_changes(1.0)
+    assert changes.full_refresh
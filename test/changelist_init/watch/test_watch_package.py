@@ -0,0 +1,68 @@
+""" Testing Watch Package Methods.
+"""
+from pathlib import Path
+
+import pytest
+
+from changelist_init import watch
+from changelist_init.git import git_dir
+from changelist_init.watch import create_watcher, wait_for_changes
+from changelist_init.watch.inotify_watcher import InotifyWatcher, is_inotify_available
+from changelist_init.watch.poll_watcher import PollWatcher
+from changelist_init.watch.watch_changes import WatchChanges
+
+
+class ScriptedWatcher:
+    """ A Watcher that returns a scripted sequence of changes, and records each timeout.
+    """
+
+    def __init__(self, changes: list[WatchChanges | None]):
+        self.changes = changes
+        self.timeouts = []
+
+    def read_changes(self, timeout):
+        self.timeouts.append(timeout)
+        return self.changes.pop(0) if len(self.changes) > 0 else None
+
+
+def test_wait_for_changes_timeout_returns_none():
+    watcher = ScriptedWatcher([None])
+    assert wait_for_changes(watcher, timeout=0.5) is None
+    assert watcher.timeouts == [0.5]
+
+
+def test_wait_for_changes_combines_burst_until_quiet():
+    watcher = ScriptedWatcher([
+        WatchChanges({'a.py'}, False), WatchChanges({'b.py'}, True), WatchChanges({'a.py'}, False), None,
+        WatchChanges({'late.py'}, False),
+    ])
+    result = wait_for_changes(watcher, debounce=0.1)
+    assert result == WatchChanges({'a.py', 'b.py'}, True)
+    assert watcher.timeouts[0] is None
+    assert all(t <= 0.1 for t in watcher.timeouts[1:])
+    assert len(watcher.changes) == 1
+
+
+def test_wait_for_changes_max_delay_ends_continuous_burst():
+    watcher = ScriptedWatcher([WatchChanges({f'{i}.py'}, False) for i in range(10 ** 6)])
+    result = wait_for_changes(watcher, debounce=0.1, max_delay=0.05)
+    assert 0 < len(result.paths) < 10 ** 6
+    assert not result.full_refresh
+
+
+def test_create_watcher_prefers_inotify(temp_cwd_repo):
+    with create_watcher(Path.cwd(), git_dir.find_git_dir()) as watcher:
+        if is_inotify_available():
+            assert isinstance(watcher, InotifyWatcher)
+        else:
+            assert isinstance(watcher, PollWatcher)
+
+
+def test_create_watcher_inotify_error_falls_back_to_polling(temp_cwd_repo):
+    def fail(*args):
+        raise OSError(28, 'No space left on device')
+    with pytest.MonkeyPatch.context() as c:
+        c.setattr(watch.inotify_watcher, 'is_inotify_available', lambda: True)
+        c.setattr(watch.inotify_watcher, 'InotifyWatcher', fail)
+        with create_watcher(Path.cwd(), git_dir.find_git_dir()) as watcher:
+            assert isinstance(watcher, PollWatcher)
@@ -0,0 +1,99 @@
+""" Testing Changelist Init Client.
+"""
+import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+import changelist_init_client
+from changelist_init_client import main, find_socket_path, get_socket_path, send_request, socket_address
+
+
+@pytest.fixture
+def repo_cwd(tmp_path, monkeypatch):
+    """ Changes the Working Directory to a new Git Repository.
+    """
+    subprocess.run(['git', 'init'], cwd=tmp_path, capture_output=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_get_socket_path_returns_changelists_dir_path():
+    assert get_socket_path('repo') == os.path.join('repo', '.changelists', 'cl-init.sock')
+
+
+def test_find_socket_path_subdirectory_returns_root_socket(repo_cwd):
+    (repo_cwd / 'src').mkdir()
+    assert find_socket_path(str(repo_cwd / 'src')) == get_socket_path(str(repo_cwd))
+
+
+def test_find_socket_path_outside_repo_returns_none(tmp_path):
+    assert find_socket_path(str(tmp_path)) is None
+
+
+def test_send_request_no_socket_file_returns_none(repo_cwd):
+    assert send_request([]) is None
+
+
+def test_send_request_outside_repo_returns_none(tmp_path):
+    assert send_request([], cwd=str(tmp_path)) is None
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Requires Unix Domain Sockets')
+def test_send_request_no_server_listening_returns_none(repo_cwd):
+    socket_path = Path(get_socket_path(str(repo_cwd)))
+    socket_path.parent.mkdir()
+    socket_path.write_text('')
+    assert send_request([]) is None
+
+
+def test_socket_address_short_path_returns_path():
+    with socket_address('/repo/.changelists/cl-init.sock') as address:
+        assert address == '/repo/.changelists/cl-init.sock'
+
+
+def test_socket_address_long_path_enters_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(changelist_init_client, '_MAX_SOCKET_PATH_LENGTH', 8)
+    initial_cwd = os.getcwd()
+    with socket_address(str(tmp_path / 'cl-init.sock')) as address:
+        assert address == 'cl-init.sock'
+        assert Path.cwd() == tmp_path.resolve()
+    assert os.getcwd() == initial_cwd
+
+
+def test_main_no_server_runs_in_process(repo_cwd, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['cl-init-client'])
+    main()
+    assert (repo_cwd / '.changelists' / 'data.xml').exists()
+
+
+def test_main_response_prints_output(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'argv', ['cl-init-client'])
+    monkeypatch.setattr(changelist_init_client, 'send_request', Mock(return_value={
+        'output': 'Time Budget Exceeded\n', 'error': None, 'status': 0,
+    }))
+    main()
+    assert capsys.readouterr().out == 'Time Budget Exceeded\n'
+
+
+def test_main_response_error_raises_exit(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['cl-init-client', '--unknown'])
+    monkeypatch.setattr(changelist_init_client, 'send_request', Mock(return_value={
+        'output': '', 'error': 'Unable to Parse Arguments.', 'status': 1,
+    }))
+    with pytest.raises(SystemExit, match='Unable to Parse Arguments.'):
+        main()
+
+
+def test_main_response_status_raises_exit(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['cl-init-client'])
+    monkeypatch.setattr(changelist_init_client, 'send_request', Mock(return_value={
+        'output': '', 'error': None, 'status': 2,
+    }))
+    with pytest.raises(SystemExit) as e:
+        main()
+    assert e.value.code == 2